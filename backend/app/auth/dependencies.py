@@ -1,12 +1,15 @@
 """
 Auth dependencies and permission lists for NimbleLIMS.
-Centralizes get_current_user, get_user_permissions, and RBAC decorators.
+Centralizes get_current_user, the request-scoped AuthContext, and RBAC decorators.
 """
 from typing import List
 
 from app.core.security import (
+    AuthContext,
+    get_auth_context,
     get_current_user,
     get_user_permissions,
+    resolve_auth_context,
     CORE_PERMISSIONS,
 )
 from app.core.rbac import (
@@ -37,8 +40,11 @@ from app.core.rbac import (
 )
 
 __all__ = [
+    "AuthContext",
+    "get_auth_context",
     "get_current_user",
     "get_user_permissions",
+    "resolve_auth_context",
     "CORE_PERMISSIONS",
     "ALL_PERMISSION_NAMES",
     "require_permission",
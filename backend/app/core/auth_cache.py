@@ -0,0 +1,347 @@
+"""
+Per-process auth context cache and jti denylist Bloom filter.
+
+The steady-state auth path (token -> User + Role -> permission names) is served
+from process memory so authenticated requests cost no extra round trips:
+
+- User rows (with their Role) are snapshotted as plain column dicts and
+  re-attached to the request Session with ``merge(load=False)`` — no SELECT.
+- Role permission names are cached per role id.
+- Revoked jtis are mirrored into a Bloom filter rebuilt from ``revoked_tokens``
+  every JTI_DENYLIST_REFRESH_SECONDS; a miss means "definitely not revoked" and
+  skips the denylist query, a hit falls through to the authoritative lookup.
+
+Entries expire after AUTH_CACHE_TTL_SECONDS, which bounds staleness across
+workers. The users/roles/permissions routers invalidate the local process
+immediately via ``invalidate_user`` / ``invalidate_role`` / ``invalidate_all``.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from app.core.config import (
+    AUTH_CACHE_MAX_ENTRIES,
+    AUTH_CACHE_TTL_SECONDS,
+    JTI_DENYLIST_REFRESH_SECONDS,
+)
+from models.revoked_token import RevokedToken
+from models.user import Permission, Role, User
+
+
+def _column_values(obj: Any) -> Dict[str, Any]:
+    mapper = sa_inspect(obj).mapper
+    return {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+
+
+@dataclass(frozen=True)
+class _UserEntry:
+    user: Dict[str, Any]
+    role: Optional[Dict[str, Any]]
+    role_id: Optional[UUID]
+    role_version: int
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class _PermissionEntry:
+    names: Tuple[str, ...]
+    role_version: int
+    expires_at: float
+
+
+class AuthContextCache:
+    """Thread-safe TTL/LRU cache of user snapshots and role permission sets."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[UUID, _UserEntry]" = OrderedDict()
+        self._permissions: Dict[UUID, _PermissionEntry] = {}
+        self._role_versions: Dict[UUID, int] = {}
+        # Bumped on every invalidation; fills started before a bump are dropped
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _role_version(self, role_id: Optional[UUID]) -> int:
+        if role_id is None:
+            return 0
+        return self._role_versions.get(role_id, 0)
+
+    def get_user(self, user_id: UUID) -> Optional[_UserEntry]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            if (
+                entry.expires_at <= time.monotonic()
+                or entry.role_version != self._role_version(entry.role_id)
+            ):
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+            return entry
+
+    def put_user(self, user: User, *, generation: int) -> None:
+        if not self.enabled:
+            return
+        role = user.role
+        user_values = _column_values(user)
+        role_values = _column_values(role) if role is not None else None
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._users[user.id] = _UserEntry(
+                user=user_values,
+                role=role_values,
+                role_id=user.role_id,
+                role_version=self._role_version(user.role_id),
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+            self._users.move_to_end(user.id)
+            while len(self._users) > self.max_entries:
+                self._users.popitem(last=False)
+
+    def get_permissions(self, role_id: UUID) -> Optional[Tuple[str, ...]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._permissions.get(role_id)
+            if entry is None:
+                return None
+            if (
+                entry.expires_at <= time.monotonic()
+                or entry.role_version != self._role_version(role_id)
+            ):
+                del self._permissions[role_id]
+                return None
+            return entry.names
+
+    def put_permissions(
+        self, role_id: UUID, names: Iterable[str], *, generation: int
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._permissions[role_id] = _PermissionEntry(
+                names=tuple(names),
+                role_version=self._role_version(role_id),
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            self._users.pop(user_id, None)
+
+    def invalidate_role(self, role_id: UUID) -> None:
+        """Drop a role's permission set and every user snapshot carrying it."""
+        with self._lock:
+            self._generation += 1
+            self._role_versions[role_id] = self._role_versions.get(role_id, 0) + 1
+            self._permissions.pop(role_id, None)
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._users.clear()
+            self._permissions.clear()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class JtiDenylist:
+    """In-memory mirror of revoked_tokens used to skip the per-request lookup."""
+
+    def __init__(self, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._filter: Optional[BloomFilter] = None
+        self._loaded_at = 0.0
+        # Local revocations replayed into the next rebuild (its SELECT may predate the commit)
+        self._recent: Dict[str, float] = {}
+
+    def might_be_revoked(self, db: Session, jti: str) -> bool:
+        """False means the jti is definitely not revoked; True means check the table."""
+        if self.refresh_seconds <= 0:
+            return True
+        if self._filter is None or time.monotonic() - self._loaded_at >= self.refresh_seconds:
+            self._refresh(db)
+        current = self._filter
+        if current is None:
+            return True
+        return jti in current
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            self._recent[jti] = time.monotonic()
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._filter = None
+            self._loaded_at = 0.0
+            self._recent.clear()
+
+    def _refresh(self, db: Session) -> None:
+        started = time.monotonic()
+        try:
+            rows = (
+                db.query(RevokedToken.jti)
+                .filter(RevokedToken.expires_at > datetime.now(timezone.utc))
+                .all()
+            )
+        except Exception:
+            # Table missing in create_all unit tests — fall back to per-request lookups
+            return
+        bloom = BloomFilter(capacity=max(1024, len(rows) * 2))
+        for row in rows:
+            bloom.add(row.jti)
+        with self._lock:
+            horizon = started - self.refresh_seconds
+            self._recent = {j: t for j, t in self._recent.items() if t >= horizon}
+            for jti in self._recent:
+                bloom.add(jti)
+            self._filter = bloom
+            self._loaded_at = started
+
+
+auth_cache = AuthContextCache(AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_ENTRIES)
+jti_denylist = JtiDenylist(JTI_DENYLIST_REFRESH_SECONDS)
+
+# Per-request tally of permission queries that reached the database (debug header).
+# A mutable cell is shared into threadpool-run dependencies via context copying.
+_permission_queries: ContextVar[Optional[List[int]]] = ContextVar(
+    "permission_queries", default=None
+)
+
+
+def begin_permission_query_count():
+    """Start a fresh counter for the current request; returns (token, cell)."""
+    cell = [0]
+    return _permission_queries.set(cell), cell
+
+
+def end_permission_query_count(token) -> None:
+    _permission_queries.reset(token)
+
+
+def _attach(db: Session, model, values: Dict[str, Any]):
+    existing = db.identity_map.get(identity_key(model, values["id"]))
+    if existing is not None:
+        return existing
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return db.merge(instance, load=False)
+
+
+def load_user(db: Session, user_id: UUID) -> Optional[User]:
+    """
+    Return the User (with Role) for user_id, attached to db.
+
+    Warm entries are merged into the session without a query; the Role is
+    set as the committed (already-loaded) value of ``user.role``.
+    """
+    existing = db.identity_map.get(identity_key(User, user_id))
+    if existing is not None:
+        return existing
+
+    entry = auth_cache.get_user(user_id)
+    if entry is not None:
+        user = _attach(db, User, entry.user)
+        if entry.role is not None and "role" not in sa_inspect(user).dict:
+            set_committed_value(user, "role", _attach(db, Role, entry.role))
+        return user
+
+    generation = auth_cache.generation
+    user = (
+        db.query(User)
+        .options(joinedload(User.role))
+        .filter(User.id == user_id)
+        .first()
+    )
+    if user is not None:
+        auth_cache.put_user(user, generation=generation)
+    return user
+
+
+def load_role_permissions(db: Session, role_id: UUID) -> Tuple[str, ...]:
+    """Permission names granted to role_id (cached per role version)."""
+    cached = auth_cache.get_permissions(role_id)
+    if cached is not None:
+        return cached
+    generation = auth_cache.generation
+    cell = _permission_queries.get()
+    if cell is not None:
+        cell[0] += 1
+    rows = (
+        db.query(Permission.name)
+        .join(Role, Permission.roles)
+        .filter(Role.id == role_id)
+        .all()
+    )
+    names = tuple(row.name for row in rows)
+    auth_cache.put_permissions(role_id, names, generation=generation)
+    return names
+
+
+def invalidate_user(user_id: UUID) -> None:
+    auth_cache.invalidate_user(user_id)
+
+
+def invalidate_role(role_id: UUID) -> None:
+    auth_cache.invalidate_role(role_id)
+
+
+def invalidate_all() -> None:
+    """Drop every cached auth context and force a denylist reload."""
+    auth_cache.invalidate_all()
+    jti_denylist.reset()
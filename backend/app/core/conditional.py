@@ -0,0 +1,143 @@
+"""
+Conditional GET for reference-data endpoints (lists, units, analyses, ...).
+
+These bodies only change when an admin router calls
+``invalidate_reference_data``, so each rendered body is kept per (path,
+variant) along with the reference_cache versions of the kinds it was built
+from:
+
+- the ETag is a hash of the body bytes, so it is strong and agrees across
+  workers and restarts;
+- while those versions are unchanged the body is served from memory, and a
+  matching If-None-Match is answered 304 without a query;
+- invalidating any contributing kind bumps its version, so the next request
+  renders again.
+
+Bodies expire with REFERENCE_CACHE_TTL_SECONDS; 0 disables the body cache
+(ETags and 304s still apply, but every request renders).
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import REFERENCE_CACHE_TTL_SECONDS
+from app.core.reference_cache import reference_cache
+
+# Distinct (path, variant) bodies kept; search/page variants make the key space open-ended
+RESPONSE_CACHE_MAX_ENTRIES = 256
+
+# Responses depend on the caller's permissions; clients must revalidate every use
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class RenderedBody:
+    body: bytes
+    etag: str
+    versions: Tuple[int, ...]
+    expires_at: float
+
+
+class RenderedResponseCache:
+    """Thread-safe TTL/LRU cache of rendered JSON bodies keyed by (path, variant)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._bodies: "OrderedDict[Hashable, RenderedBody]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: Hashable, versions: Tuple[int, ...]) -> Optional[RenderedBody]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            rendered = self._bodies.get(key)
+            if rendered is None:
+                return None
+            if rendered.versions != versions or rendered.expires_at <= time.monotonic():
+                del self._bodies[key]
+                return None
+            self._bodies.move_to_end(key)
+            return rendered
+
+    def put(self, key: Hashable, rendered: RenderedBody, current_versions: Tuple[int, ...]) -> None:
+        """Store rendered unless a contributing kind was invalidated while it rendered."""
+        if not self.enabled or rendered.versions != current_versions:
+            return
+        with self._lock:
+            self._bodies[key] = rendered
+            self._bodies.move_to_end(key)
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+
+
+rendered_responses = RenderedResponseCache(REFERENCE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def _versions(kinds: Iterable[str]) -> Tuple[int, ...]:
+    return tuple(reference_cache.version(kind) for kind in kinds)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(
+    request: Request,
+    kinds: Iterable[str],
+    variant: Hashable,
+    render: Callable[[], Any],
+) -> Response:
+    """
+    JSON response for render() with a strong ETag, or 304 if the client's
+    If-None-Match matches. render() runs only on a body-cache miss.
+
+    kinds are the reference kinds the body is built from; variant must cover
+    everything else it depends on (permissions, query parameters).
+    """
+    kinds = tuple(kinds)
+    key = (request.url.path, variant)
+    versions = _versions(kinds)
+    rendered = rendered_responses.get(key, versions)
+    if rendered is None:
+        body = JSONResponse(jsonable_encoder(render())).body
+        rendered = RenderedBody(
+            body=body,
+            etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+            versions=versions,
+            expires_at=time.monotonic() + rendered_responses.ttl_seconds,
+        )
+        rendered_responses.put(key, rendered, _versions(kinds))
+
+    headers = {"ETag": rendered.etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
@@ -1,15 +1,134 @@
 """
 Unit conversion utilities for NimbleLims
+
+Multipliers come from an immutable UnitTable built once per reference-cache
+snapshot of the units table, so conversions cost no queries and unit edits
+(which invalidate that snapshot) are picked up on the next call. Scalar
+helpers keep their Decimal arithmetic; convert_many() converts whole arrays
+with NumPy, or with Decimal multipliers when exact=True.
 """
 from decimal import Decimal
-from typing import Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
 from sqlalchemy.orm import Session
-from models.unit import Unit
+
+from app.core.reference_cache import UNITS, list_entry, reference_cache
 
 
 class ConversionError(Exception):
     """Raised when unit conversion fails"""
-    pass
+
+    def __init__(self, message: str, index: Optional[int] = None):
+        super().__init__(message)
+        # Position in a convert_many() input that failed, when there is one
+        self.index = index
+
+
+class UnitTable:
+    """
+    Immutable multiplier lookup over one units snapshot.
+
+    Only active units with a multiplier are convertible, as before. Built once
+    per reference-cache load of the units table (see unit_table()), so it is
+    rebuilt whenever a unit is created or edited.
+    """
+
+    def __init__(self, units: Mapping[UUID, Any]):
+        convertible = sorted(
+            (u for u in units.values() if u.active and u.multiplier is not None),
+            key=lambda u: str(u.id),
+        )
+        self._units = MappingProxyType(dict(units))
+        self._index = MappingProxyType({u.id: i for i, u in enumerate(convertible)})
+        self._exact = tuple(Decimal(str(u.multiplier)) for u in convertible)
+        self._types = tuple(u.type for u in convertible)
+        codes = {type_id: code for code, type_id in enumerate(dict.fromkeys(self._types))}
+        type_codes = np.array([codes[t] for t in self._types], dtype=np.intp)
+        type_codes.setflags(write=False)
+        self._type_codes = type_codes
+        factors = np.array([float(m) for m in self._exact], dtype=np.float64)
+        factors.setflags(write=False)
+        self._factors = factors
+
+    def position(self, unit_id, index: Optional[int] = None) -> int:
+        """Row of unit_id in the multiplier arrays, or ConversionError."""
+        try:
+            key = unit_id if isinstance(unit_id, UUID) else UUID(str(unit_id))
+        except (TypeError, ValueError):
+            raise ConversionError(f"Unit {unit_id} not found", index=index)
+        position = self._index.get(key)
+        if position is not None:
+            return position
+        unit = self._units.get(key)
+        if unit is None or not unit.active:
+            raise ConversionError(f"Unit {unit_id} not found", index=index)
+        raise ConversionError(f"Unit {unit_id} has no multiplier defined", index=index)
+
+    def multiplier(self, unit_id) -> Decimal:
+        return self._exact[self.position(unit_id)]
+
+    def unit_type(self, unit_id) -> UUID:
+        return self._types[self.position(unit_id)]
+
+    def positions(self, unit_ids: Sequence) -> np.ndarray:
+        return np.fromiter(
+            (self.position(unit_id, index=i) for i, unit_id in enumerate(unit_ids)),
+            dtype=np.intp,
+            count=len(unit_ids),
+        )
+
+    @property
+    def factors(self) -> np.ndarray:
+        return self._factors
+
+    @property
+    def exact_factors(self) -> Tuple[Decimal, ...]:
+        return self._exact
+
+    @property
+    def type_codes(self) -> np.ndarray:
+        """Small-int code per row; equal codes mean the same unit type."""
+        return self._type_codes
+
+
+_table: Optional[Tuple[Any, UnitTable]] = None
+
+
+def unit_table(db: Session) -> UnitTable:
+    """
+    UnitTable for the current units snapshot.
+
+    The reference cache hands back the same snapshot object until the units
+    table is invalidated (or its TTL lapses), so the table is keyed on it.
+    """
+    global _table
+    units = reference_cache.get(db, UNITS)
+    cached = _table
+    if cached is not None and cached[0] is units:
+        return cached[1]
+    table = UnitTable(units)
+    _table = (units, table)
+    return table
+
+
+def base_unit_id(db: Session, type_name: str) -> Optional[UUID]:
+    """
+    The active base unit (multiplier 1) of the named unit type, e.g. "volume".
+    The first by name when several are configured, so it is only a reporting
+    label for such types (mass: g and cfu are both seeded with multiplier 1).
+    """
+    candidates = [
+        u for u in reference_cache.get(db, UNITS).values()
+        if u.active and u.multiplier is not None and Decimal(str(u.multiplier)) == 1
+    ]
+    for unit in sorted(candidates, key=lambda u: (u.name, str(u.id))):
+        type_entry = list_entry(db, unit.type)
+        if type_entry is not None and type_entry.name == type_name:
+            return unit.id
+    return None
 
 
 def convert_to_base_unit(value: float, unit_id: str, db: Session) -> float:
@@ -27,15 +146,8 @@ def convert_to_base_unit(value: float, unit_id: str, db: Session) -> float:
     Raises:
         ConversionError: If unit not found or conversion fails
     """
-    unit = db.query(Unit).filter(Unit.id == unit_id, Unit.active == True).first()
-    
-    if not unit:
-        raise ConversionError(f"Unit {unit_id} not found")
-    
-    if unit.multiplier is None:
-        raise ConversionError(f"Unit {unit_id} has no multiplier defined")
-    
-    return float(Decimal(str(value)) * Decimal(str(unit.multiplier)))
+    multiplier = unit_table(db).multiplier(unit_id)
+    return float(Decimal(str(value)) * multiplier)
 
 
 def convert_from_base_unit(value: float, unit_id: str, db: Session) -> float:
@@ -53,15 +165,81 @@ def convert_from_base_unit(value: float, unit_id: str, db: Session) -> float:
     Raises:
         ConversionError: If unit not found or conversion fails
     """
-    unit = db.query(Unit).filter(Unit.id == unit_id, Unit.active == True).first()
-    
-    if not unit:
-        raise ConversionError(f"Unit {unit_id} not found")
-    
-    if unit.multiplier is None:
-        raise ConversionError(f"Unit {unit_id} has no multiplier defined")
-    
-    return float(Decimal(str(value)) / Decimal(str(unit.multiplier)))
+    multiplier = unit_table(db).multiplier(unit_id)
+    return float(Decimal(str(value)) / multiplier)
+
+
+def convert(value, from_unit, to_unit, db: Session, *, exact: bool = False):
+    """
+    Convert one value between two units of the same type.
+
+    Args:
+        value: The value to convert
+        from_unit: The ID of the unit value is expressed in
+        to_unit: The ID of the unit to convert to
+        db: Database session
+        exact: Return a Decimal computed from the stored multipliers instead of a float
+
+    Returns:
+        The converted value
+
+    Raises:
+        ConversionError: If a unit is not found or the units have different types
+    """
+    return convert_many([value], from_unit, to_unit, db, exact=exact)[0]
+
+
+def convert_many(values, from_units, to_unit, db: Session, *, exact: bool = False):
+    """
+    Convert an array of values in one pass.
+
+    Args:
+        values: Sequence or array of values
+        from_units: One unit ID for every value, or a sequence with one per value
+        to_unit: The ID of the unit to convert to, or None for each value's base unit
+        db: Database session
+        exact: Compute with Decimal multipliers (for regulated values) and return
+            a list of Decimal; otherwise return a float64 ndarray
+
+    Returns:
+        The converted values, in input order
+
+    Raises:
+        ConversionError: If a unit is not found, lengths differ, or a from unit's
+            type differs from to_unit's (index names the offending value)
+    """
+    table = unit_table(db)
+    count = len(values)
+    if isinstance(from_units, (str, UUID)):
+        rows = np.full(count, table.position(from_units), dtype=np.intp)
+    else:
+        if len(from_units) != count:
+            raise ConversionError("Values and units lists must have the same length")
+        rows = table.positions(from_units)
+
+    target = None
+    if to_unit is not None:
+        target = table.position(to_unit)
+        mismatched = np.flatnonzero(table.type_codes[rows] != table.type_codes[target])
+        if mismatched.size:
+            i = int(mismatched[0])
+            raise ConversionError(
+                f"Value {i} cannot be converted to unit {to_unit}: different unit types",
+                index=i,
+            )
+
+    if exact:
+        factors = table.exact_factors
+        divisor = factors[target] if target is not None else Decimal(1)
+        return [
+            Decimal(str(value)) * factors[row] / divisor
+            for value, row in zip(values, rows)
+        ]
+
+    result = np.asarray(values, dtype=np.float64) * table.factors[rows]
+    if target is not None:
+        result = result / table.factors[target]
+    return result
 
 
 def calculate_volume_from_concentration_and_amount(
@@ -98,6 +276,31 @@ def calculate_volume_from_concentration_and_amount(
     return amount_base / concentration_base
 
 
+def pooled_volumes(
+    concentrations,
+    concentration_units,
+    amounts,
+    amount_units,
+    db: Session
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-sample (concentration, volume) in base units for a pool.
+    Volume = amount / concentration; samples without a positive concentration get 0.
+
+    Raises:
+        ConversionError: If conversion fails (index names the sample)
+    """
+    concentration_base = convert_many(concentrations, concentration_units, None, db)
+    amount_base = convert_many(amounts, amount_units, None, db)
+    volumes = np.divide(
+        amount_base,
+        concentration_base,
+        out=np.zeros_like(amount_base),
+        where=concentration_base > 0,
+    )
+    return concentration_base, volumes
+
+
 def calculate_pooled_concentration(
     concentrations: list[float],
     concentration_units: list[str],
@@ -129,34 +332,22 @@ def calculate_pooled_concentration(
         raise ConversionError("Cannot calculate pooled concentration: no samples provided")
     
     # Get base concentration unit
-    base_concentration_unit = db.query(Unit).filter(
-        Unit.type == "concentration",  # Assuming this list entry exists
-        Unit.multiplier == 1.0  # Base unit
-    ).first()
+    base_concentration_unit = base_unit_id(db, "concentration")
     
     if not base_concentration_unit:
         raise ConversionError("Base concentration unit not found")
     
-    total_weighted_concentration = 0.0
-    total_volume = 0.0
-    
-    for i in range(len(concentrations)):
-        # Convert to base units
-        concentration_base = convert_to_base_unit(concentrations[i], concentration_units[i], db)
-        amount_base = convert_to_base_unit(amounts[i], amount_units[i], db)
-        
-        # Calculate volume
-        if concentration_base > 0:
-            volume = amount_base / concentration_base
-            total_weighted_concentration += concentration_base * volume
-            total_volume += volume
+    concentration_base, volumes = pooled_volumes(
+        concentrations, concentration_units, amounts, amount_units, db
+    )
+    total_volume = float(volumes.sum())
     
     if total_volume == 0:
         raise ConversionError("Cannot calculate pooled concentration: total volume is zero")
     
-    pooled_concentration = total_weighted_concentration / total_volume
+    pooled_concentration = float((concentration_base * volumes).sum()) / total_volume
     
-    return float(pooled_concentration), str(base_concentration_unit.id)
+    return pooled_concentration, str(base_concentration_unit)
 
 
 def calculate_pooled_volume(
@@ -185,22 +376,14 @@ def calculate_pooled_volume(
         raise ConversionError("Cannot calculate pooled volume: no samples provided")
     
     # Get base volume unit
-    base_volume_unit = db.query(Unit).filter(
-        Unit.type == "volume",  # Assuming this list entry exists
-        Unit.multiplier == 1.0  # Base unit
-    ).first()
+    base_volume_unit = base_unit_id(db, "volume")
     
     if not base_volume_unit:
         raise ConversionError("Base volume unit not found")
     
-    total_volume = 0.0
-    
-    for i in range(len(amounts)):
-        # Convert to base units
-        amount_base = convert_to_base_unit(amounts[i], amount_units[i], db)
-        total_volume += amount_base
+    total_volume = float(convert_many(amounts, amount_units, None, db).sum())
     
-    return float(total_volume), str(base_volume_unit.id)
+    return total_volume, str(base_volume_unit)
 
 
 def validate_result_value(
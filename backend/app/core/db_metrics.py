@@ -0,0 +1,240 @@
+"""
+Connection pool instrumentation for the request and background engines.
+
+Each engine built by app.database uses TimedQueuePool and is registered here
+under a name ("app", "background"). Per pool we track:
+
+- checkout wait time (time spent inside the pool's get, including timeouts),
+- connection hold time from checkout to checkin, labelled by the route
+  template that held it (set by DbRouteLabelMiddleware; "background" outside
+  a request),
+- live size / checked-out / overflow gauges read from the pool itself.
+
+Exposed as JSON or Prometheus text via GET /admin/metrics/db-pool.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+_CHECKOUT_AT_KEY = "metrics_checkout_at"
+_ROUTE_KEY = "metrics_route"
+
+# ASGI scope of the request being served (routing fills in scope["route"])
+_current_scope: ContextVar[Optional[dict]] = ContextVar("db_metrics_scope", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics), not thread-safe on its own."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = []
+        running = 0
+        for bound, n in zip(self.buckets, self._counts):
+            running += n
+            cumulative.append((bound, running))
+        return {
+            "buckets": [{"le": bound, "count": n} for bound, n in cumulative],
+            "count": self.count,
+            "sum": round(self.sum, 6),
+        }
+
+
+class PoolMetrics:
+    """Counters and histograms for one connection pool."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait = Histogram()
+        self.hold_by_route: Dict[str, Histogram] = {}
+
+    def observe_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait.observe(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def observe_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def observe_hold(self, route: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.hold_by_route.get(route)
+            if hist is None:
+                hist = self.hold_by_route[route] = Histogram()
+            hist.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds": self.wait.snapshot(),
+                "hold_seconds_by_route": {
+                    route: hist.snapshot()
+                    for route, hist in sorted(self.hold_by_route.items())
+                },
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long callers waited for a connection."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        if self.metrics is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+_registry: Dict[str, Tuple[Engine, PoolMetrics]] = {}
+
+
+def current_route_label() -> str:
+    scope = _current_scope.get()
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return "unmatched"
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """Attach pool listeners to engine and register it under name."""
+    metrics = PoolMetrics(name)
+    if isinstance(engine.pool, TimedQueuePool):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info[_CHECKOUT_AT_KEY] = time.perf_counter()
+        connection_record.info[_ROUTE_KEY] = current_route_label()
+        metrics.observe_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop(_CHECKOUT_AT_KEY, None)
+        route = connection_record.info.pop(_ROUTE_KEY, "background")
+        if started is not None:
+            metrics.observe_hold(route, time.perf_counter() - started)
+
+    _registry[name] = (engine, metrics)
+    return metrics
+
+
+def _pool_gauges(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # Negative until the pool has opened pool_size connections
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+def pool_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Gauges plus counters/histograms for every registered pool."""
+    return {
+        name: {**_pool_gauges(engine), **metrics.snapshot()}
+        for name, (engine, metrics) in sorted(_registry.items())
+    }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(lines: List[str], metric: str, labels: str, hist: Dict[str, Any]) -> None:
+    for bucket in hist["buckets"]:
+        lines.append(f'{metric}_bucket{{{labels},le="{bucket["le"]}"}} {bucket["count"]}')
+    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {hist["count"]}')
+    lines.append(f"{metric}_sum{{{labels}}} {hist['sum']}")
+    lines.append(f"{metric}_count{{{labels}}} {hist['count']}")
+
+
+def render_prometheus(snapshot: Dict[str, Dict[str, Any]]) -> str:
+    """Prometheus text exposition (0.0.4) of a pool_snapshot()."""
+    lines: List[str] = []
+    gauges = ("pool_size", "checked_out", "checked_in", "overflow")
+    for gauge in gauges:
+        lines.append(f"# TYPE nimble_db_pool_{gauge} gauge")
+        for name, pool in snapshot.items():
+            if gauge in pool:
+                lines.append(f'nimble_db_pool_{gauge}{{pool="{name}"}} {pool[gauge]}')
+    for counter in ("checkouts", "timeouts"):
+        lines.append(f"# TYPE nimble_db_pool_{counter}_total counter")
+        for name, pool in snapshot.items():
+            lines.append(f'nimble_db_pool_{counter}_total{{pool="{name}"}} {pool[counter]}')
+    lines.append("# TYPE nimble_db_pool_wait_seconds histogram")
+    for name, pool in snapshot.items():
+        _render_histogram(lines, "nimble_db_pool_wait_seconds", f'pool="{name}"', pool["wait_seconds"])
+    lines.append("# TYPE nimble_db_connection_hold_seconds histogram")
+    for name, pool in snapshot.items():
+        for route, hist in pool["hold_seconds_by_route"].items():
+            labels = f'pool="{name}",route="{_escape(route)}"'
+            _render_histogram(lines, "nimble_db_connection_hold_seconds", labels, hist)
+    return "\n".join(lines) + "\n"
+
+
+class DbRouteLabelMiddleware:
+    """Pure ASGI middleware exposing the request scope to pool checkout listeners."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
@@ -0,0 +1,408 @@
+"""
+Server-sent events: progress for jobs, fits, imports, promotions and SOP
+parses, streamed at GET /v1/events so the UI never has to poll.
+
+Publishing:
+- ``publish_event(db, type, data, ...)`` inserts an events row and
+  ``pg_notify``s it on EVENTS_CHANNEL in the caller's transaction, so every
+  API worker sees it after commit (and nothing is sent if it rolls back).
+  The job worker and API processes publish the same way.
+- ``publish_event_now`` commits on its own background session, for progress
+  from inside a long transaction (streaming import).
+
+Delivery: one ``EventBroker`` per process LISTENs in a daemon thread (as
+ReferenceDataListener does) and hands each notification to the streams whose
+caller may see it (``EventScope``):
+- user_id set: that user
+- client_id set: users of that client
+- Administrators / System client users: everything
+Payloads carry ids, status and progress only; details come from the usual
+RLS-protected endpoints.
+
+Resume: each message's SSE id is events.id. A reconnecting EventSource sends
+Last-Event-ID and the stream replays newer rows before going live. The same
+replay fills anything the broker may have missed (listener reconnect, a slow
+client's full queue, an event too large for a notification). When the rows
+after a client's id are gone (pruned, or more than EVENTS_REPLAY_LIMIT), it
+gets a ``reset`` event instead: refetch current state.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import anyio
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, insert, or_, text
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    EVENTS_HEARTBEAT_SECONDS,
+    EVENTS_QUEUE_SIZE,
+    EVENTS_REPLAY_LIMIT,
+    EVENTS_RETENTION_SECONDS,
+)
+from models.event import Event
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "lims_events"
+
+JOB = "job"
+FIT = "fit"
+IMPORT = "import"
+PROMOTION = "promotion"
+SOP_PARSE = "sop_parse"
+# Sent by the stream itself: events were missed, refetch state
+RESET = "reset"
+
+# pg_notify payloads are capped at 8000 bytes; larger events are announced
+# without data and replayed from the table
+_NOTIFY_MAX_BYTES = 7500
+# EventSource reconnect delay
+RETRY_MS = 3000
+
+# Queued to a subscription when it must replay from the table
+_RESYNC = object()
+
+
+def _str_or_none(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+# ── Publishing ────────────────────────────────────────────────────────────────
+
+
+def publish_event(
+    db: Session,
+    type: str,
+    data: Dict[str, Any],
+    *,
+    user_id: Optional[UUID] = None,
+    client_id: Optional[UUID] = None,
+) -> int:
+    """Record and announce an event in db's transaction; returns its id."""
+    data = jsonable_encoder(data)
+    event_id = db.execute(
+        insert(Event)
+        .values(type=type, user_id=user_id, client_id=client_id, data=data)
+        .returning(Event.id)
+    ).scalar_one()
+    event = {
+        "id": event_id,
+        "type": type,
+        "user_id": _str_or_none(user_id),
+        "client_id": _str_or_none(client_id),
+        "data": data,
+    }
+    payload = json.dumps(event, separators=(",", ":"))
+    if len(payload.encode()) > _NOTIFY_MAX_BYTES:
+        payload = json.dumps({**event, "data": None}, separators=(",", ":"))
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": EVENTS_CHANNEL, "payload": payload},
+    )
+    return event_id
+
+
+def publish_event_now(
+    type: str,
+    data: Dict[str, Any],
+    *,
+    user_id: Optional[UUID] = None,
+    client_id: Optional[UUID] = None,
+) -> None:
+    """Best-effort publish committed right away, outside the caller's transaction."""
+    from app.database import BackgroundSessionLocal
+
+    db = BackgroundSessionLocal()
+    try:
+        publish_event(db, type, data, user_id=user_id, client_id=client_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.warning("Could not publish %s event", type, exc_info=True)
+    finally:
+        db.close()
+
+
+def prune_events(db: Session, *, retention_seconds: float = EVENTS_RETENTION_SECONDS) -> int:
+    """Delete events older than the retention window (job worker sweep); returns rows deleted."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=retention_seconds)
+    deleted = db.query(Event).filter(Event.created_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+# ── Visibility + replay ───────────────────────────────────────────────────────
+
+
+class EventScope:
+    """Which events a stream's caller may see."""
+
+    def __init__(self, user_id: UUID, client_id: Optional[UUID], everything: bool = False) -> None:
+        self.user_id = user_id
+        self.client_id = client_id
+        self.everything = everything
+        self._user = str(user_id)
+        self._client = _str_or_none(client_id)
+
+    @classmethod
+    def for_user(cls, user) -> "EventScope":
+        from app.core.rbac import is_system_client_or_admin
+
+        return cls(user.id, user.client_id, is_system_client_or_admin(user))
+
+    def allows(self, event: Dict[str, Any]) -> bool:
+        if self.everything:
+            return True
+        if event.get("user_id") == self._user:
+            return True
+        return self._client is not None and event.get("client_id") == self._client
+
+    def filter(self, query):
+        if self.everything:
+            return query
+        visible = [Event.user_id == self.user_id]
+        if self.client_id is not None:
+            visible.append(Event.client_id == self.client_id)
+        return query.filter(or_(*visible))
+
+
+def latest_event_id(db: Session) -> int:
+    return db.query(func.coalesce(func.max(Event.id), 0)).scalar()
+
+
+def replay_events(
+    db: Session, scope: EventScope, after_id: int, *, limit: int = EVENTS_REPLAY_LIMIT
+) -> Tuple[List[Dict[str, Any]], bool, int]:
+    """
+    Visible events after after_id, oldest first. Returns (events, reset, last_id):
+    reset means events may be missing (pruned, or more than limit), in which case
+    events is empty and last_id jumps to the newest event.
+    """
+    rows = (
+        scope.filter(db.query(Event).filter(Event.id > after_id))
+        .order_by(Event.id)
+        .limit(limit + 1)
+        .all()
+    )
+    reset = len(rows) > limit
+    if not reset and after_id > 0:
+        oldest = db.query(func.min(Event.id)).scalar()
+        reset = oldest is None or oldest > after_id + 1
+    if reset:
+        return [], True, max(after_id, latest_event_id(db))
+    events = [
+        {
+            "id": row.id,
+            "type": row.type,
+            "user_id": _str_or_none(row.user_id),
+            "client_id": _str_or_none(row.client_id),
+            "data": row.data,
+        }
+        for row in rows
+    ]
+    return events, False, events[-1]["id"] if events else after_id
+
+
+def format_sse(event_type: str, data: Any, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+# ── Per-process broker ────────────────────────────────────────────────────────
+
+
+class _Subscription:
+    def __init__(self, scope: EventScope, loop: asyncio.AbstractEventLoop) -> None:
+        self.scope = scope
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(EVENTS_QUEUE_SIZE)
+
+    def push(self, item: Any) -> None:
+        """Called from the listener thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._deliver, item)
+        except RuntimeError:
+            pass  # loop closed; the stream is gone
+
+    def _deliver(self, item: Any) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog and replay from the table instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESYNC)
+
+
+class EventBroker:
+    """Daemon thread fanning EVENTS_CHANNEL notifications out to this process's streams."""
+
+    retry_seconds = 5.0
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self._subscriptions: Set[_Subscription] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Written by stop() to wake the select() below immediately
+        self._wake_read, self._wake_write = os.pipe()
+
+    def subscribe(self, scope: EventScope) -> _Subscription:
+        subscription = _Subscription(scope, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-broker", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: _Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def stop(self) -> None:
+        self._stop.set()
+        os.write(self._wake_write, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=self.retry_seconds)
+            self._thread = None
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+    def _broadcast(self, item: Any) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if item is _RESYNC or subscription.scope.allows(item):
+                subscription.push(item)
+
+    def _connect(self):
+        # Dedicated DBAPI connection: LISTEN holds it for the process lifetime
+        dialect = self.engine.dialect
+        cargs, cparams = dialect.create_connect_args(self.engine.url)
+        connection = dialect.loaded_dbapi.connect(*cargs, **cparams)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {EVENTS_CHANNEL}")
+        return connection
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                # Anything published before LISTEN (or during an outage) was missed
+                self._broadcast(_RESYNC)
+                while not self._stop.is_set():
+                    readable, _, _ = select.select([connection, self._wake_read], [], [])
+                    if connection not in readable:
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        try:
+                            event = json.loads(notify.payload)
+                        except ValueError:
+                            continue
+                        self._broadcast(event)
+            except Exception:
+                logger.warning("Event broker disconnected; retrying", exc_info=True)
+                self._stop.wait(self.retry_seconds)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+_broker: Optional[EventBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_event_broker() -> EventBroker:
+    """This process's broker; its listener starts with the first stream."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            from app.database import engine
+
+            _broker = EventBroker(engine)
+        return _broker
+
+
+def stop_event_broker() -> None:
+    global _broker
+    with _broker_lock:
+        if _broker is not None:
+            _broker.stop()
+            _broker = None
+
+
+def _replay(scope: EventScope, after_id: int) -> Tuple[List[Dict[str, Any]], bool, int]:
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return replay_events(db, scope, after_id)
+    finally:
+        db.close()
+
+
+async def event_stream(
+    scope: EventScope,
+    after_id: int,
+    *,
+    broker: Optional[EventBroker] = None,
+    heartbeat_seconds: float = EVENTS_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """SSE body: replay after after_id, then live events, with keep-alive comments."""
+    broker = broker or get_event_broker()
+    # Subscribe before replaying so nothing committed in between is lost
+    subscription = broker.subscribe(scope)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        last_id = after_id
+        # Ids the latest replay sent; an id is visible only once committed, so a
+        # live event below the replay's last id may still be new
+        replayed: Set[int] = set()
+        resync = True
+        while True:
+            if resync:
+                resync = False
+                events, reset, through = await anyio.to_thread.run_sync(_replay, scope, last_id)
+                if reset:
+                    yield format_sse(RESET, {}, through)
+                replayed = {event["id"] for event in events}
+                for event in events:
+                    yield format_sse(event["type"], event["data"], event["id"])
+                last_id = max(last_id, through)
+            try:
+                item = await asyncio.wait_for(subscription.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is _RESYNC or item.get("data") is None:
+                resync = True
+                continue
+            if item["id"] in replayed:
+                continue
+            last_id = max(last_id, item["id"])
+            yield format_sse(item["type"], item["data"], item["id"])
+    finally:
+        broker.unsubscribe(subscription)
@@ -11,10 +11,21 @@ Templates support placeholders:
 - {CLIENT} / {CLIABV}: Client abbreviation if set, else client name (from linked client); both placeholders are synonyms
 - {BATCH}: Batch name (e.g. when generating sample names in batch context)
 - {PROJECT}: Project name (e.g. when generating sample names in project context)
+
+Any other {KEY} is filled from context values (key upper-cased) when provided.
+
+Batch callers (bulk accession, aliquot execution) use generate_names: the template is
+compiled once per (template text, padding) version, {SEQ} values are reserved as one
+block, and uniqueness is checked for the whole batch in one query. Sequences known to
+exist are cached per process so the CREATE SEQUENCE IF NOT EXISTS DDL runs once.
 """
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Mapping, Sequence, Set, Tuple
 import re
+import threading
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
@@ -57,16 +68,45 @@ def _sequence_name(entity_type: str, sequence_key: Optional[str] = None) -> str:
     return f'name_template_seq_{entity_type}'
 
 
+# Sequences known to exist (committed). Creation is transactional in Postgres, so names
+# created in a session are only trusted after that session commits.
+_known_sequences: Set[str] = set()
+_known_sequences_lock = threading.Lock()
+_PENDING_SEQUENCES_KEY = "name_template_sequences_created"
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_created_sequences(session):
+    created = session.info.pop(_PENDING_SEQUENCES_KEY, None)
+    if created:
+        with _known_sequences_lock:
+            _known_sequences.update(created)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_created_sequences(session):
+    session.info.pop(_PENDING_SEQUENCES_KEY, None)
+
+
+def forget_known_sequences() -> None:
+    """Drop the per-process sequence cache (e.g. after sequences are dropped out of band)."""
+    with _known_sequences_lock:
+        _known_sequences.clear()
+
+
 def _ensure_sequence_exists(db: Session, entity_type: str, sequence_key: Optional[str] = None) -> None:
     """
     Create the sequence for entity_type (and optional sequence_key) if it does not exist.
     Sequences are created on first use, not in migrations.
     When sequence_key is set (e.g. project name), the sequence is per-context (e.g. per project for samples).
+    Skipped entirely once the sequence is known to exist in this process.
     """
     if entity_type not in ALLOWED_ENTITY_TYPES_FOR_SEQ:
         return
     safe_key = _sanitize_sequence_key(sequence_key) if sequence_key else None
     sequence_name = _sequence_name(entity_type, safe_key)
+    if sequence_name in _known_sequences:
+        return
     # Sequence name is safe: entity_type from allowed list, safe_key is sanitized alphanumeric + underscore
     db.execute(text(f"""
         CREATE SEQUENCE IF NOT EXISTS {sequence_name}
@@ -76,6 +116,7 @@ def _ensure_sequence_exists(db: Session, entity_type: str, sequence_key: Optiona
         NO MAXVALUE
         CACHE 1
     """))
+    db.info.setdefault(_PENDING_SEQUENCES_KEY, set()).add(sequence_name)
 
 
 def get_next_sequence(db: Session, entity_type: str, sequence_key: Optional[str] = None) -> int:
@@ -92,6 +133,38 @@ def get_next_sequence(db: Session, entity_type: str, sequence_key: Optional[str]
     return result.scalar()
 
 
+# Entity types with a name column checked for uniqueness, mapped to their tables.
+_ENTITY_TABLES = {
+    'sample': 'samples',
+    'project': 'projects',
+    'batch': 'batches',
+    'analysis': 'analyses',
+    'container': 'containers',
+}
+
+
+def get_next_sequence_block(
+    db: Session,
+    entity_type: str,
+    count: int,
+    sequence_key: Optional[str] = None,
+) -> List[int]:
+    """
+    Reserve count values from the entity's sequence in a single round trip.
+    Values are ascending but may have gaps if other sessions draw concurrently.
+    """
+    if count <= 0:
+        return []
+    safe_key = _sanitize_sequence_key(sequence_key) if sequence_key else None
+    _ensure_sequence_exists(db, entity_type, safe_key)
+    sequence_name = _sequence_name(entity_type, safe_key)
+    result = db.execute(
+        text(f"SELECT nextval('{sequence_name}') FROM generate_series(1, :n)"),
+        {'n': count},
+    )
+    return [row[0] for row in result]
+
+
 def check_name_uniqueness(db: Session, entity_type: str, name: str) -> bool:
     """
     Check if a generated name is unique for the entity type.
@@ -104,26 +177,131 @@ def check_name_uniqueness(db: Session, entity_type: str, name: str) -> bool:
     Returns:
         True if name is unique, False otherwise
     """
-    # Map entity types to their model classes and table names
-    entity_models = {
-        'sample': ('Sample', 'samples'),
-        'project': ('Project', 'projects'),
-        'batch': ('Batch', 'batches'),
-        'analysis': ('Analysis', 'analyses'),
-        'container': ('Container', 'containers'),
-    }
-    
-    if entity_type not in entity_models:
-        return True  # Unknown entity type, assume unique
-    
-    table_name = entity_models[entity_type][1]
-    # Check if name exists in the table
+    return not find_existing_names(db, entity_type, [name])
+
+
+def find_existing_names(db: Session, entity_type: str, names: Sequence[str]) -> Set[str]:
+    """Return the subset of names already used by entity_type, in one query."""
+    table_name = _ENTITY_TABLES.get(entity_type)
+    if table_name is None or not names:
+        return set()  # Unknown entity type, assume unique
     result = db.execute(
-        text(f"SELECT COUNT(*) FROM {table_name} WHERE name = :name"),
-        {'name': name}
+        text(f"SELECT name FROM {table_name} WHERE name = ANY(:names)"),
+        {'names': list(names)}
     )
-    count = result.scalar()
-    return count == 0
+    return {row[0] for row in result}
+
+
+_PLACEHOLDER_RE = re.compile(r'\{([A-Za-z0-9_]+)\}')
+_DATE_PLACEHOLDERS = ('YYYY', 'YY', 'MM', 'DD', 'YYYYMMDD')
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A name template split once into literal and placeholder parts."""
+    # (is_placeholder, text) pairs; text is the placeholder name without braces
+    parts: Tuple[Tuple[bool, str], ...]
+    placeholders: frozenset
+    seq_padding_digits: int
+
+    @property
+    def has_seq(self) -> bool:
+        return 'SEQ' in self.placeholders
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Substitute values; placeholders without a value stay as literal {NAME}."""
+        out = []
+        for is_placeholder, part in self.parts:
+            if not is_placeholder:
+                out.append(part)
+            elif part in values:
+                out.append(values[part])
+            else:
+                out.append('{' + part + '}')
+        return ''.join(out)
+
+
+@lru_cache(maxsize=256)
+def _compile(template: str, seq_padding_digits: int) -> CompiledTemplate:
+    parts: List[Tuple[bool, str]] = []
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(template):
+        if match.start() > pos:
+            parts.append((False, template[pos:match.start()]))
+        parts.append((True, match.group(1)))
+        pos = match.end()
+    if pos < len(template):
+        parts.append((False, template[pos:]))
+    return CompiledTemplate(
+        parts=tuple(parts),
+        placeholders=frozenset(name for is_ph, name in parts if is_ph),
+        seq_padding_digits=seq_padding_digits,
+    )
+
+
+def compile_template(template_obj: NameTemplate) -> CompiledTemplate:
+    """Compiled form of a NameTemplate, cached per (template text, padding) version."""
+    return _compile(template_obj.template, template_obj.seq_padding_digits or 1)
+
+
+@dataclass(frozen=True)
+class NameContext:
+    """
+    Placeholder inputs shared by every name in a generate_names call.
+
+    values holds extra context such as project_name / batch_name; any {KEY}
+    in the template is filled from values[key] (key upper-cased) when present.
+    """
+    client_name: Optional[str] = None
+    reference_date: Optional[datetime] = None
+    values: Mapping[str, Any] = field(default_factory=dict)
+
+
+def _builtin_values(compiled: CompiledTemplate, context: NameContext) -> Dict[str, str]:
+    """Values for the built-in placeholders (everything except {SEQ}) used by the template."""
+    used = compiled.placeholders
+    now = context.reference_date if context.reference_date else datetime.now()
+    values: Dict[str, str] = {}
+    
+    # Date placeholders
+    if used.intersection(_DATE_PLACEHOLDERS):
+        values['YYYY'] = str(now.year)
+        values['YY'] = str(now.year % 100).zfill(2)
+        values['MM'] = f"{now.month:02d}"
+        values['DD'] = f"{now.day:02d}"
+        values['YYYYMMDD'] = now.strftime('%Y%m%d')
+    
+    # Client placeholder (client_name is typically client.abbreviation or client.name from caller)
+    # {CLIENT} and {CLIABV} are synonyms (CLIABV = client abbreviation)
+    if 'CLIENT' in used or 'CLIABV' in used:
+        if context.client_name:
+            client_code = context.client_name.upper().replace(' ', '').replace('-', '')[:10]
+        else:
+            client_code = 'UNKNOWN'
+        values['CLIENT'] = client_code
+        values['CLIABV'] = client_code
+    
+    extra = context.values
+    # Batch placeholder (e.g. sample names in batch context)
+    if 'BATCH' in used:
+        batch_name = extra.get('batch_name') or extra.get('BATCH')
+        values['BATCH'] = (batch_name and str(batch_name).strip()) or 'UNKNOWN'
+    
+    # Project placeholder (e.g. sample names in project context)
+    if 'PROJECT' in used:
+        project_name = extra.get('project_name') or extra.get('PROJECT')
+        values['PROJECT'] = (project_name and str(project_name).strip()) or 'UNKNOWN'
+    
+    return values
+
+
+def _sequence_key_for(compiled: CompiledTemplate, builtin: Dict[str, str]) -> Optional[str]:
+    """
+    Sequence scope = template resolved with built-in placeholders and {SEQ} removed,
+    so e.g. each project gets its own sequence (01, 02, ...) for {PROJECT}-{SEQ}.
+    """
+    prefix = compiled.render({**builtin, 'SEQ': ''}).strip()
+    return _sanitize_sequence_key(prefix) if prefix else None
 
 
 def generate_name(
@@ -146,116 +324,86 @@ def generate_name(
         **kwargs: Additional context for template placeholders
     
     Returns:
-        Generated unique name string
+        Generated unique name string (a UUID if no active template or retries are exhausted)
+    """
+    context = NameContext(client_name=client_name, reference_date=reference_date, values=kwargs)
+    return generate_names(db, entity_type, 1, context, max_retries=max_retries)[0]
+
+
+def generate_names(
+    db: Session,
+    entity_type: str,
+    count: int,
+    context: Optional[NameContext] = None,
+    max_retries: int = 10,
+) -> List[str]:
+    """
+    Generate count unique names for an entity type in a handful of queries.
     
-    Raises:
-        ValueError: If no active template found for entity_type
-        RuntimeError: If unable to generate unique name after max_retries
+    The active template is compiled once, {SEQ} values are reserved as a block
+    (get_next_sequence_block), and uniqueness is checked for the whole batch with
+    one query. Names that collide with existing rows are re-drawn from a fresh
+    block, up to max_retries rounds; anything still unresolved falls back to a
+    UUID, as generate_name always has.
+    
+    Args:
+        db: Database session
+        entity_type: Type of entity (sample, project, batch, analysis, container)
+        count: Number of names to generate
+        context: Shared placeholder inputs (client, reference date, extra values)
+        max_retries: Maximum number of rounds for names that are not unique
+    
+    Returns:
+        List of count generated names, in sequence order
     """
+    if count <= 0:
+        return []
     template_obj = get_active_template(db, entity_type)
     if not template_obj:
         # Fallback to UUID if no template
-        return str(uuid.uuid4())
+        return [str(uuid.uuid4()) for _ in range(count)]
     
-    template = template_obj.template
-    now = reference_date if reference_date else datetime.now()
+    context = context or NameContext()
+    compiled = compile_template(template_obj)
+    builtin = _builtin_values(compiled, context)
+    # Built-ins win over extra context values of the same name
+    values = {str(key).upper(): str(value) for key, value in context.values.items()}
+    values.update(builtin)
     
-    # Retry loop for uniqueness
+    if not compiled.has_seq:
+        # Without a sequence every render is identical: at most one can be unique
+        name = compiled.render(values)
+        first = name if check_name_uniqueness(db, entity_type, name) else str(uuid.uuid4())
+        return [first] + [str(uuid.uuid4()) for _ in range(count - 1)]
+    
+    sequence_key = _sequence_key_for(compiled, builtin)
+    names: List[str] = []
+    needed = count
     for attempt in range(max_retries):
-        # Build replacement dictionary (non-SEQ first so we can compute sequence_key from "name without SEQ")
-        replacements: Dict[str, str] = {}
-        
-        # Date placeholders
-        if '{YYYY}' in template:
-            replacements['{YYYY}'] = str(now.year)
-        if '{YY}' in template:
-            replacements['{YY}'] = str(now.year % 100).zfill(2)
-        if '{MM}' in template:
-            replacements['{MM}'] = f"{now.month:02d}"
-        if '{DD}' in template:
-            replacements['{DD}'] = f"{now.day:02d}"
-        if '{YYYYMMDD}' in template:
-            replacements['{YYYYMMDD}'] = now.strftime('%Y%m%d')
-        
-        # Client placeholder (client_name is typically client.abbreviation or client.name from caller)
-        # {CLIENT} and {CLIABV} are synonyms (CLIABV = client abbreviation)
-        if '{CLIENT}' in template or '{CLIABV}' in template:
-            if client_name:
-                client_code = client_name.upper().replace(' ', '').replace('-', '')[:10]
-                replacements['{CLIENT}'] = client_code
-                replacements['{CLIABV}'] = client_code
-            else:
-                replacements['{CLIENT}'] = 'UNKNOWN'
-                replacements['{CLIABV}'] = 'UNKNOWN'
-        
-        # Batch placeholder (e.g. sample names in batch context)
-        if '{BATCH}' in template:
-            batch_name = kwargs.get('batch_name') or kwargs.get('BATCH')
-            replacements['{BATCH}'] = (batch_name and str(batch_name).strip()) or 'UNKNOWN'
-        
-        # Project placeholder (e.g. sample names in project context)
-        if '{PROJECT}' in template:
-            project_name = kwargs.get('project_name') or kwargs.get('PROJECT')
-            replacements['{PROJECT}'] = (project_name and str(project_name).strip()) or 'UNKNOWN'
-        
-        # Sequence placeholder: scope by "name without SEQ" so e.g. each project gets its own sequence (01, 02, ...)
-        if '{SEQ}' in template:
-            seq_padding_digits = template_obj.seq_padding_digits or 1
-            # Compute sequence_key = resolved template with {SEQ} removed (e.g. "UTC2600001-" for {PROJECT}-{SEQ})
-            prefix = template
-            for ph, val in replacements.items():
-                prefix = prefix.replace(ph, val)
-            prefix = prefix.replace('{SEQ}', '').strip()
-            sequence_key = _sanitize_sequence_key(prefix) if prefix else None
-            seq = get_next_sequence(db, entity_type, sequence_key=sequence_key)
-            formatted_seq = str(seq).zfill(seq_padding_digits)
-            replacements['{SEQ}'] = formatted_seq
-        
-        # Apply replacements
-        result = template
-        for placeholder, value in replacements.items():
-            result = result.replace(placeholder, value)
-        
-        # Apply any additional kwargs replacements
-        for key, value in kwargs.items():
-            placeholder = f'{{{key.upper()}}}'
-            if placeholder in result:
-                result = result.replace(placeholder, str(value))
-        
-        # Check uniqueness
-        if check_name_uniqueness(db, entity_type, result):
-            return result
-        
-        # If not unique and we have SEQ, try again with next sequence
-        if '{SEQ}' in template:
-            continue
+        block = get_next_sequence_block(db, entity_type, needed, sequence_key=sequence_key)
+        candidates = [
+            compiled.render({**values, 'SEQ': str(seq).zfill(compiled.seq_padding_digits)})
+            for seq in block
+        ]
+        taken = find_existing_names(db, entity_type, candidates)
+        names.extend(name for name in candidates if name not in taken)
+        needed = count - len(names)
+        if needed == 0:
+            return names
     
     # If we exhausted retries, fallback to UUID
-    return str(uuid.uuid4())
+    return names + [str(uuid.uuid4()) for _ in range(needed)]
 
 
-def generate_name_for_sample(
+def sample_name_context(
     db: Session,
     project_id: Optional[str] = None,
     received_date: Optional[datetime] = None,
     batch_id: Optional[str] = None,
     batch_name: Optional[str] = None,
     **kwargs
-) -> str:
-    """
-    Generate a name for a sample, optionally using project's client, project name, and batch name.
-    
-    Args:
-        db: Database session
-        project_id: Optional project ID to get client (abbreviation or name) and project name for {PROJECT}
-        received_date: Optional received date to use for date placeholders
-        batch_id: Optional batch ID to resolve batch name for {BATCH}
-        batch_name: Optional batch name for {BATCH} (used if batch_id not provided)
-        **kwargs: Additional context for template placeholders
-    
-    Returns:
-        Generated sample name
-    """
+) -> NameContext:
+    """Resolve client, project name and batch name for sample templates (one lookup per call)."""
     client_name = None
     project_name = None
     if project_id:
@@ -277,14 +425,33 @@ def generate_name_for_sample(
             batch_name = batch.name
     if batch_name is not None:
         kwargs = {**kwargs, 'batch_name': batch_name}
+    return NameContext(client_name=client_name, reference_date=received_date, values=kwargs)
+
+
+def generate_name_for_sample(
+    db: Session,
+    project_id: Optional[str] = None,
+    received_date: Optional[datetime] = None,
+    batch_id: Optional[str] = None,
+    batch_name: Optional[str] = None,
+    **kwargs
+) -> str:
+    """
+    Generate a name for a sample, optionally using project's client, project name, and batch name.
     
-    return generate_name(
-        db, 
-        'sample', 
-        client_name=client_name, 
-        reference_date=received_date,
-        **kwargs
-    )
+    Args:
+        db: Database session
+        project_id: Optional project ID to get client (abbreviation or name) and project name for {PROJECT}
+        received_date: Optional received date to use for date placeholders
+        batch_id: Optional batch ID to resolve batch name for {BATCH}
+        batch_name: Optional batch name for {BATCH} (used if batch_id not provided)
+        **kwargs: Additional context for template placeholders
+    
+    Returns:
+        Generated sample name
+    """
+    context = sample_name_context(db, project_id, received_date, batch_id, batch_name, **kwargs)
+    return generate_names(db, 'sample', 1, context)[0]
 
 
 def generate_name_for_project(
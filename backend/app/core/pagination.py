@@ -0,0 +1,155 @@
+"""
+Keyset pagination cursors and list-endpoint paging.
+
+A cursor is the sort key of the last row on a page, serialized as URL-safe
+base64 JSON. Clients treat it as opaque and send it back as ?cursor= to get
+the rows strictly after that key; the server decodes it and filters with a
+row-value comparison on the same indexed sort key, so deep pages cost the
+same as page 1.
+
+paginate() wraps that for ORM list queries, together with the ?count= mode:
+exact runs count(*) (the legacy behaviour), estimate reads the planner's row
+estimate from EXPLAIN, none skips counting.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a sort key (JSON-serializable scalars; UUIDs/dates as str)."""
+    raw = json.dumps([v if v is None or isinstance(v, (int, float, bool)) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def decode_cursor(cursor: str, arity: int) -> List[Any]:
+    """Sort key from encode_cursor; 400 if it is malformed or the wrong shape."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != arity:
+        raise _invalid_cursor()
+    return values
+
+
+class CountMode(str, Enum):
+    """How list endpoints compute ``total``."""
+    exact = "exact"
+    estimate = "estimate"
+    none = "none"
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    total: Optional[int]
+    pages: Optional[int]
+    next_cursor: Optional[str] = None
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>, executed with the statement's own bind processing."""
+    inherit_cache = False
+
+    def __init__(self, statement) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimate_count(query: Query) -> int:
+    """Planner row estimate for query (no rows are read; RLS quals are part of the plan)."""
+    statement = query.order_by(None).enable_eagerloads(False).statement
+    plan = query.session.connection().execute(_Explain(statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cursor_value(column, value):
+    """Coerce a JSON cursor value back to the column's Python type."""
+    if value is None:
+        raise _invalid_cursor()
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type is uuid.UUID:
+            return uuid.UUID(value)
+        if isinstance(value, python_type):
+            return value
+        return python_type(value)
+    except (ValueError, TypeError, AttributeError):
+        raise _invalid_cursor()
+
+
+def paginate(
+    query: Query,
+    sort_key: Sequence[Any],
+    *,
+    page: int = 1,
+    size: int = 10,
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.exact,
+) -> Page:
+    """
+    One page of query ordered by sort_key (ascending ORM columns, NOT NULL,
+    ending in a unique column so the order is total).
+
+    With cursor the page starts after that key and page is ignored; otherwise
+    OFFSET (page - 1) * size. next_cursor is set whenever more rows follow.
+    """
+    if count == CountMode.exact:
+        total = query.order_by(None).count()
+    elif count == CountMode.estimate:
+        total = estimate_count(query)
+    else:
+        total = None
+
+    rows_query = query.order_by(*sort_key)
+    if cursor:
+        values = decode_cursor(cursor, len(sort_key))
+        after = [_cursor_value(column, value) for column, value in zip(sort_key, values)]
+        rows_query = rows_query.filter(tuple_(*sort_key) > tuple_(*after))
+    else:
+        rows_query = rows_query.offset((page - 1) * size)
+
+    # One extra row tells whether a next page exists without a count
+    items = rows_query.limit(size + 1).all()
+    next_cursor = None
+    if len(items) > size:
+        items = items[:size]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in sort_key])
+
+    pages = (total + size - 1) // size if total is not None else None
+    return Page(items=items, total=total, pages=pages, next_cursor=next_cursor)
@@ -6,7 +6,7 @@ from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.database import get_db
 from models.user import User, Role, Permission
-from app.core.security import get_current_user, get_user_permissions
+from app.core.security import AuthContext, get_auth_context, get_current_user
 from uuid import UUID
 
 # System client ID (hardcoded for consistency with migrations)
@@ -56,17 +56,13 @@ def require_permission(permission: str):
     Dependency factory for permission-based authorization.
     Returns a dependency that checks if the current user has the required permission.
     """
-    def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ) -> User:
-        user_permissions = get_user_permissions(current_user, db)
-        if permission not in user_permissions:
+    def permission_checker(auth: AuthContext = Depends(get_auth_context)) -> User:
+        if not auth.has(permission):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Permission '{permission}' required"
             )
-        return current_user
+        return auth.user
     
     return permission_checker
 
@@ -76,17 +72,13 @@ def require_any_permission(permissions: List[str]):
     Dependency factory for requiring any of the specified permissions.
     Returns a dependency that checks if the current user has at least one of the required permissions.
     """
-    def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ) -> User:
-        user_permissions = get_user_permissions(current_user, db)
-        if not any(perm in user_permissions for perm in permissions):
+    def permission_checker(auth: AuthContext = Depends(get_auth_context)) -> User:
+        if not auth.has_any(permissions):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"One of the following permissions required: {', '.join(permissions)}"
             )
-        return current_user
+        return auth.user
     
     return permission_checker
 
@@ -96,18 +88,14 @@ def require_all_permissions(permissions: List[str]):
     Dependency factory for requiring all of the specified permissions.
     Returns a dependency that checks if the current user has all of the required permissions.
     """
-    def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
-    ) -> User:
-        user_permissions = get_user_permissions(current_user, db)
-        missing_permissions = [perm for perm in permissions if perm not in user_permissions]
+    def permission_checker(auth: AuthContext = Depends(get_auth_context)) -> User:
+        missing_permissions = auth.missing(permissions)
         if missing_permissions:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Missing required permissions: {', '.join(missing_permissions)}"
             )
-        return current_user
+        return auth.user
     
     return permission_checker
 
@@ -0,0 +1,431 @@
+"""
+Per-process reference-data cache: lists / list entries, units, container types
+and analyses (with their analyte ids).
+
+Status lookups such as "the id of test_status 'In Process'" used to cost one
+or two queries each, several times per request. Reference tables are small,
+not under RLS, and change only through admin routers, so each kind is loaded
+whole on first use and served from memory:
+
+- Every kind carries a version stamp, bumped on invalidation; a load that
+  started before a bump is returned to its caller but not stored.
+- Admin routers call ``invalidate_reference_data(db, kind, ...)``: the local
+  process drops the kind at once, and ``pg_notify`` on the same transaction
+  tells every worker after commit (nothing is sent if it rolls back).
+  Until that session commits or rolls back, its own reads of those kinds
+  bypass the cache, so its uncommitted rows are never snapshotted.
+- ``ReferenceDataListener`` LISTENs on REFERENCE_CACHE_CHANNEL in a daemon
+  thread and invalidates on each notification, and drops everything after a
+  reconnect since notifications may have been missed.
+
+Entries also expire after REFERENCE_CACHE_TTL_SECONDS, which bounds staleness
+if the listener is down. 0 disables the cache (every call queries).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import select
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import REFERENCE_CACHE_LISTEN, REFERENCE_CACHE_TTL_SECONDS
+from models.analysis import Analysis, AnalysisAnalyte
+from models.container import ContainerType
+from models.list import List as ListModel, ListEntry
+from models.unit import Unit
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_CACHE_CHANNEL = "reference_data"
+
+LISTS = "lists"
+UNITS = "units"
+CONTAINER_TYPES = "container_types"
+ANALYSES = "analyses"
+# Version-only kinds: nothing is snapshotted here, but their versions key the
+# rendered GET bodies in app.core.conditional
+ANALYTES = "analytes"
+TEST_BATTERIES = "test_batteries"
+KINDS = (LISTS, UNITS, CONTAINER_TYPES, ANALYSES, ANALYTES, TEST_BATTERIES)
+# session.info key: kinds the session has invalidated but not yet committed
+_PENDING_KINDS_KEY = "reference_data_pending"
+
+
+@dataclass(frozen=True)
+class ListSnapshot:
+    id: UUID
+    name: str
+    active: bool
+
+
+@dataclass(frozen=True)
+class ListEntrySnapshot:
+    id: UUID
+    list_id: UUID
+    list_name: str
+    name: str
+    active: bool
+
+
+@dataclass(frozen=True)
+class UnitSnapshot:
+    id: UUID
+    name: str
+    multiplier: Optional[Decimal]
+    type: UUID
+    active: bool
+
+
+@dataclass(frozen=True)
+class ContainerTypeSnapshot:
+    id: UUID
+    name: str
+    capacity: Optional[Decimal]
+    material: Optional[str]
+    dimensions: Optional[str]
+    preservative: Optional[str]
+    active: bool
+
+
+@dataclass(frozen=True)
+class AnalysisSnapshot:
+    id: UUID
+    name: str
+    shelf_life: Optional[int]
+    active: bool
+    analyte_ids: Tuple[UUID, ...]
+
+
+@dataclass(frozen=True)
+class ListData:
+    lists_by_name: Dict[str, ListSnapshot]
+    entries_by_id: Dict[UUID, ListEntrySnapshot]
+    entries_by_key: Dict[Tuple[str, str], ListEntrySnapshot]
+    # Per list name, and per entry name across lists; each sorted by entry name
+    entries_by_list: Dict[str, Tuple[ListEntrySnapshot, ...]]
+    entries_by_name: Dict[str, Tuple[ListEntrySnapshot, ...]]
+
+
+def _load_lists(db: Session) -> ListData:
+    lists = db.query(ListModel.id, ListModel.name, ListModel.active).all()
+    names = {row.id: row.name for row in lists}
+    entries_by_id: Dict[UUID, ListEntrySnapshot] = {}
+    entries_by_key: Dict[Tuple[str, str], ListEntrySnapshot] = {}
+    entries_by_list: Dict[str, List[ListEntrySnapshot]] = {}
+    entries_by_name: Dict[str, List[ListEntrySnapshot]] = {}
+    rows = db.query(ListEntry.id, ListEntry.list_id, ListEntry.name, ListEntry.active).order_by(
+        ListEntry.name, ListEntry.id
+    ).all()
+    for row in rows:
+        entry = ListEntrySnapshot(
+            id=row.id,
+            list_id=row.list_id,
+            list_name=names.get(row.list_id, ""),
+            name=row.name,
+            active=bool(row.active),
+        )
+        entries_by_id[entry.id] = entry
+        entries_by_key[(entry.list_name, entry.name)] = entry
+        entries_by_list.setdefault(entry.list_name, []).append(entry)
+        entries_by_name.setdefault(entry.name, []).append(entry)
+    return ListData(
+        lists_by_name={row.name: ListSnapshot(row.id, row.name, bool(row.active)) for row in lists},
+        entries_by_id=entries_by_id,
+        entries_by_key=entries_by_key,
+        entries_by_list={name: tuple(entries) for name, entries in entries_by_list.items()},
+        entries_by_name={name: tuple(entries) for name, entries in entries_by_name.items()},
+    )
+
+
+def _load_units(db: Session) -> Dict[UUID, UnitSnapshot]:
+    rows = db.query(Unit.id, Unit.name, Unit.multiplier, Unit.type, Unit.active).all()
+    return {
+        row.id: UnitSnapshot(row.id, row.name, row.multiplier, row.type, bool(row.active))
+        for row in rows
+    }
+
+
+def _load_container_types(db: Session) -> Dict[UUID, ContainerTypeSnapshot]:
+    rows = db.query(
+        ContainerType.id, ContainerType.name, ContainerType.capacity, ContainerType.material,
+        ContainerType.dimensions, ContainerType.preservative, ContainerType.active,
+    ).all()
+    return {
+        row.id: ContainerTypeSnapshot(
+            row.id, row.name, row.capacity, row.material, row.dimensions, row.preservative,
+            bool(row.active),
+        )
+        for row in rows
+    }
+
+
+def _load_analyses(db: Session) -> Dict[UUID, AnalysisSnapshot]:
+    analyte_ids: Dict[UUID, List[UUID]] = {}
+    for row in db.query(AnalysisAnalyte.analysis_id, AnalysisAnalyte.analyte_id).all():
+        analyte_ids.setdefault(row.analysis_id, []).append(row.analyte_id)
+    rows = db.query(Analysis.id, Analysis.name, Analysis.shelf_life, Analysis.active).all()
+    return {
+        row.id: AnalysisSnapshot(
+            row.id, row.name, row.shelf_life, bool(row.active),
+            tuple(sorted(analyte_ids.get(row.id, ()), key=str)),
+        )
+        for row in rows
+    }
+
+
+_LOADERS: Dict[str, Callable[[Session], Any]] = {
+    LISTS: _load_lists,
+    UNITS: _load_units,
+    CONTAINER_TYPES: _load_container_types,
+    ANALYSES: _load_analyses,
+}
+
+
+@dataclass(frozen=True)
+class _Entry:
+    data: Any
+    version: int
+    expires_at: float
+
+
+class ReferenceDataCache:
+    """Thread-safe, TTL-bounded snapshots of each reference kind."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._versions: Dict[str, int] = {kind: 0 for kind in KINDS}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def version(self, kind: str) -> int:
+        return self._versions[kind]
+
+    def get(self, db: Session, kind: str) -> Any:
+        """
+        Snapshot for kind, loading it with db on a miss. A session with
+        uncommitted writes to kind always loads, and nothing is stored.
+        """
+        pending = db.info.get(_PENDING_KINDS_KEY, ()) if db is not None else ()
+        cacheable = self.enabled and kind not in pending
+        if cacheable:
+            with self._lock:
+                entry = self._entries.get(kind)
+                if entry is not None and entry.expires_at > time.monotonic():
+                    return entry.data
+                version = self._versions[kind]
+        data = _LOADERS[kind](db)
+        if cacheable:
+            with self._lock:
+                if version == self._versions[kind]:
+                    self._entries[kind] = _Entry(
+                        data=data, version=version,
+                        expires_at=time.monotonic() + self.ttl_seconds,
+                    )
+        return data
+
+    def invalidate(self, *kinds: str) -> None:
+        with self._lock:
+            for kind in kinds or KINDS:
+                self._versions[kind] += 1
+                self._entries.pop(kind, None)
+
+
+reference_cache = ReferenceDataCache(REFERENCE_CACHE_TTL_SECONDS)
+
+
+def list_by_name(db: Session, name: str) -> Optional[ListSnapshot]:
+    return reference_cache.get(db, LISTS).lists_by_name.get(name)
+
+
+def _active_filter(snapshot, active_only: bool):
+    if snapshot is None or (active_only and not snapshot.active):
+        return None
+    return snapshot
+
+
+def list_entry(
+    db: Session, entry_id: UUID, *, active_only: bool = False
+) -> Optional[ListEntrySnapshot]:
+    return _active_filter(reference_cache.get(db, LISTS).entries_by_id.get(entry_id), active_only)
+
+
+def find_list_entry(
+    db: Session, list_name: str, entry_name: str, *, active_only: bool = True
+) -> Optional[ListEntrySnapshot]:
+    """The entry named entry_name in list list_name, or None."""
+    entry = reference_cache.get(db, LISTS).entries_by_key.get((list_name, entry_name))
+    return _active_filter(entry, active_only)
+
+
+def list_entry_id(
+    db: Session, list_name: str, entry_name: str, *, active_only: bool = True
+) -> Optional[UUID]:
+    entry = find_list_entry(db, list_name, entry_name, active_only=active_only)
+    return entry.id if entry is not None else None
+
+
+def list_entry_ids(
+    db: Session, list_name: str, entry_names: Iterable[str], *, active_only: bool = True
+) -> List[UUID]:
+    """Ids of the named entries in list_name that exist (in entry_names order)."""
+    ids = (list_entry_id(db, list_name, name, active_only=active_only) for name in entry_names)
+    return [entry_id for entry_id in ids if entry_id is not None]
+
+
+def list_entries(
+    db: Session, list_name: str, *, active_only: bool = False
+) -> Tuple[ListEntrySnapshot, ...]:
+    """Entries of list_name ordered by name."""
+    entries = reference_cache.get(db, LISTS).entries_by_list.get(list_name, ())
+    return tuple(e for e in entries if e.active) if active_only else entries
+
+
+def entries_named(db: Session, entry_name: str) -> Tuple[ListEntrySnapshot, ...]:
+    """Entries called entry_name in any list."""
+    return reference_cache.get(db, LISTS).entries_by_name.get(entry_name, ())
+
+
+def get_unit(db: Session, unit_id: UUID, *, active_only: bool = False) -> Optional[UnitSnapshot]:
+    return _active_filter(reference_cache.get(db, UNITS).get(unit_id), active_only)
+
+
+def get_container_type(
+    db: Session, type_id: UUID, *, active_only: bool = False
+) -> Optional[ContainerTypeSnapshot]:
+    return _active_filter(reference_cache.get(db, CONTAINER_TYPES).get(type_id), active_only)
+
+
+def get_analysis(db: Session, analysis_id: UUID) -> Optional[AnalysisSnapshot]:
+    return reference_cache.get(db, ANALYSES).get(analysis_id)
+
+
+def analysis_analyte_ids(db: Session, analysis_id: UUID) -> Tuple[UUID, ...]:
+    snapshot = get_analysis(db, analysis_id)
+    return snapshot.analyte_ids if snapshot is not None else ()
+
+
+def invalidate_reference_data(db: Optional[Session], *kinds: str) -> None:
+    """
+    Drop kinds (all when none given) here now, and in every worker once db's
+    transaction commits.
+    """
+    reference_cache.invalidate(*kinds)
+    if db is not None:
+        db.info.setdefault(_PENDING_KINDS_KEY, set()).update(kinds or KINDS)
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": REFERENCE_CACHE_CHANNEL, "payload": ",".join(kinds or KINDS)},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_writes(session):
+    kinds = session.info.pop(_PENDING_KINDS_KEY, None)
+    if kinds:
+        # Another session may have reloaded the old rows before this commit
+        reference_cache.invalidate(*kinds)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending_writes(session):
+    session.info.pop(_PENDING_KINDS_KEY, None)
+
+
+class ReferenceDataListener:
+    """Daemon thread applying reference_data NOTIFYs to reference_cache."""
+
+    retry_seconds = 5.0
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Written by stop() to wake the select() below immediately
+        self._wake_read, self._wake_write = os.pipe()
+
+    def start(self) -> None:
+        if self._thread is not None or not reference_cache.enabled:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="reference-data-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        os.write(self._wake_write, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=self.retry_seconds)
+            self._thread = None
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+    def _connect(self):
+        # Dedicated DBAPI connection: LISTEN holds it for the process lifetime
+        dialect = self.engine.dialect
+        cargs, cparams = dialect.create_connect_args(self.engine.url)
+        connection = dialect.loaded_dbapi.connect(*cargs, **cparams)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {REFERENCE_CACHE_CHANNEL}")
+        return connection
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                # Anything cached before LISTEN (or during an outage) may be stale
+                reference_cache.invalidate()
+                while not self._stop.is_set():
+                    readable, _, _ = select.select([connection, self._wake_read], [], [])
+                    if connection not in readable:
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        kinds = [k for k in notify.payload.split(",") if k in KINDS]
+                        reference_cache.invalidate(*kinds)
+            except Exception:
+                logger.warning("Reference data listener disconnected; retrying", exc_info=True)
+                self._stop.wait(self.retry_seconds)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+_listener: Optional[ReferenceDataListener] = None
+
+
+def start_reference_listener() -> None:
+    """Start this process's listener (app startup); no-op if disabled."""
+    global _listener
+    if not REFERENCE_CACHE_LISTEN or _listener is not None:
+        return
+    from app.database import engine
+
+    _listener = ReferenceDataListener(engine)
+    _listener.start()
+
+
+def stop_reference_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
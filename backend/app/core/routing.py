@@ -0,0 +1,107 @@
+"""
+Route class that keeps sync-DB ``async def`` handlers off the event loop.
+
+Most routers declare handlers ``async def`` but do all their work through the
+synchronous SQLAlchemy Session, so every query blocks the uvicorn loop for its
+full duration. DbOffloadRoute detects handlers that
+
+- are coroutine functions,
+- take ``Depends(get_db)``, and
+- never suspend (no ``await`` / ``async for`` / ``async with`` in their body),
+
+and runs them to completion on a bounded worker pool (DB_THREADPOOL_SIZE)
+instead. Handlers that do await (uploads, request bodies) stay on the loop.
+"""
+from __future__ import annotations
+
+import ast
+import functools
+import inspect
+import logging
+import textwrap
+from typing import Any, Callable, Optional
+
+import anyio
+from fastapi import params
+from fastapi.dependencies.utils import get_typed_return_annotation, get_typed_signature
+from fastapi.routing import APIRoute
+
+from app.core.config import DB_THREADPOOL_SIZE
+from app.database import get_db
+
+logger = logging.getLogger(__name__)
+
+_OFFLOADED_MARKER = "__db_offloaded__"
+_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def _db_limiter() -> anyio.CapacityLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(DB_THREADPOOL_SIZE)
+    return _limiter
+
+
+def _depends_on_db(endpoint: Callable[..., Any]) -> bool:
+    for param in inspect.signature(endpoint).parameters.values():
+        default = param.default
+        if isinstance(default, params.Depends) and default.dependency is get_db:
+            return True
+    return False
+
+
+def _never_suspends(endpoint: Callable[..., Any]) -> bool:
+    """True when the handler body contains no await points (checked via AST)."""
+    try:
+        source = textwrap.dedent(inspect.getsource(endpoint))
+        tree = ast.parse(source)
+    except (OSError, TypeError, SyntaxError):
+        return False
+    return not any(
+        isinstance(node, (ast.Await, ast.AsyncFor, ast.AsyncWith))
+        for node in ast.walk(tree)
+    )
+
+
+def _run_to_completion(coro) -> Any:
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Offloaded endpoint suspended; it must not await")
+
+
+def offload_sync_db_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an eligible handler so its body runs on the DB worker pool."""
+    if getattr(endpoint, _OFFLOADED_MARKER, False):
+        return endpoint
+    if not inspect.iscoroutinefunction(endpoint):
+        return endpoint
+    if not _depends_on_db(endpoint) or not _never_suspends(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def offloaded(*args: Any, **kwargs: Any) -> Any:
+        coro = endpoint(*args, **kwargs)
+        return await anyio.to_thread.run_sync(
+            _run_to_completion, coro, limiter=_db_limiter()
+        )
+
+    # Resolve annotations against the handler's own module (string annotations)
+    return_annotation = get_typed_return_annotation(endpoint)
+    offloaded.__signature__ = get_typed_signature(endpoint).replace(
+        return_annotation=(
+            inspect.Signature.empty if return_annotation is None else return_annotation
+        )
+    )
+    setattr(offloaded, _OFFLOADED_MARKER, True)
+    logger.debug("Offloading %s.%s to DB worker pool", endpoint.__module__, endpoint.__name__)
+    return offloaded
+
+
+class DbOffloadRoute(APIRoute):
+    """APIRoute that offloads sync-DB async handlers (see module docstring)."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, offload_sync_db_endpoint(endpoint), **kwargs)
@@ -1,8 +1,9 @@
 """
 Security utilities for authentication and authorization
 """
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Tuple
+from typing import FrozenSet, Iterable, Optional, List, Tuple
 from uuid import UUID, uuid4
 import jwt
 import hashlib
@@ -11,8 +12,9 @@ import secrets
 import bcrypt
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from app.database import get_db, set_rls_context
+from app.core.auth_cache import load_role_permissions, load_user
 from models.user import User, Role, Permission
 from app.schemas.auth import TokenData
 from app.core.config import (
@@ -261,6 +263,8 @@ def get_current_user(
     """Get the current authenticated user; enforce must-change-password gate."""
     token, auth_via = _extract_token(request, credentials)
     require_csrf_for_cookie_auth(request, auth_via)
+    # New request on this session — drop any AuthContext resolved by a previous one
+    db.info.pop(_AUTH_CONTEXT_KEY, None)
     token_data = verify_token(token, db=db)
 
     # Invalid sub must be 401 (not 500 from DB UUID cast)
@@ -273,12 +277,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = (
-        db.query(User)
-        .options(joinedload(User.role))
-        .filter(User.id == user_uuid)
-        .first()
-    )
+    user = load_user(db, user_uuid)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -305,28 +304,75 @@ def get_current_user(
     return user
 
 
-def get_user_permissions(user: User, db: Session) -> List[str]:
-    """Get user permissions from their role"""
-    permissions = db.query(Permission.name).join(
-        Role, Permission.roles
-    ).filter(Role.id == user.role_id).all()
+@dataclass(frozen=True)
+class AuthContext:
+    """Caller identity and permission set, resolved once per request."""
+
+    user: User
+    user_id: UUID
+    role_name: Optional[str]
+    client_id: Optional[UUID]
+    permission_names: Tuple[str, ...]
+    permissions: FrozenSet[str]
+
+    def has(self, permission: str) -> bool:
+        return permission in self.permissions
+
+    def has_any(self, permissions: Iterable[str]) -> bool:
+        return not self.permissions.isdisjoint(permissions)
+
+    def missing(self, permissions: Iterable[str]) -> List[str]:
+        return [perm for perm in permissions if perm not in self.permissions]
+
+
+_AUTH_CONTEXT_KEY = "auth_context"
+
+
+def resolve_auth_context(user: User, db: Session) -> AuthContext:
+    """
+    Return the request's AuthContext for user, building it on first use.
+
+    Memoized on the request Session (cleared by get_current_user / get_db), so
+    every RBAC dependency, router and helper in a request shares one lookup.
+    """
+    ctx = db.info.get(_AUTH_CONTEXT_KEY)
+    if ctx is not None and ctx.user_id == user.id:
+        return ctx
+    names = load_role_permissions(db, user.role_id)
+    ctx = AuthContext(
+        user=user,
+        user_id=user.id,
+        role_name=user.role.name if user.role is not None else None,
+        client_id=user.client_id,
+        permission_names=names,
+        permissions=frozenset(names),
+    )
+    db.info[_AUTH_CONTEXT_KEY] = ctx
+    return ctx
+
+
+def get_auth_context(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> AuthContext:
+    """Dependency: request-scoped AuthContext (FastAPI caches it per request)."""
+    return resolve_auth_context(current_user, db)
 
-    return [perm.name for perm in permissions]
+
+def get_user_permissions(user: User, db: Session) -> List[str]:
+    """Get user permissions from their role (request-scoped, auth-cache backed)"""
+    return list(resolve_auth_context(user, db).permission_names)
 
 
 def require_permission(permission: str):
     """Dependency factory for permission-based authorization"""
-    def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db),
-    ):
-        user_permissions = get_user_permissions(current_user, db)
-        if permission not in user_permissions:
+    def permission_checker(auth: AuthContext = Depends(get_auth_context)):
+        if not auth.has(permission):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Permission '{permission}' required",
             )
-        return current_user
+        return auth.user
 
     return permission_checker
 
@@ -0,0 +1,127 @@
+"""
+Content-addressed on-disk cache of rendered dose-response SVGs.
+
+Keys hash everything a render depends on (result id, fit_version, render
+parameters), so entries never need invalidating: a refit or a changed
+exclusion set simply produces a new key. Files live under SVG_CACHE_DIR,
+shared by every worker on the host; writes are atomic renames. Reads bump
+the file's mtime and the oldest files are evicted once the directory passes
+SVG_CACHE_MAX_BYTES (0 disables the cache).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import SVG_CACHE_DIR, SVG_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Eviction trims to this fraction of the limit so it does not run on every put
+_EVICT_TO = 0.8
+
+
+def render_key(*parts: Any) -> str:
+    """Stable hex digest of the render inputs."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class SvgRenderCache:
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._approx_bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.svg"
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            svg = path.read_text(encoding="utf-8")
+            os.utime(path)
+        except OSError:
+            return None
+        return svg
+
+    def put(self, key: str, svg: str) -> None:
+        if not self.enabled:
+            return
+        path = self._path(key)
+        data = svg.encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("SVG cache write failed", extra={"error": str(exc)})
+            return
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan_bytes()
+            else:
+                self._approx_bytes += len(data)
+            if self._approx_bytes > self.max_bytes:
+                self._approx_bytes = self._evict()
+
+    def _files(self):
+        return [p for p in self.directory.glob("*/*.svg") if p.is_file()]
+
+    def _scan_bytes(self) -> int:
+        total = 0
+        for path in self._files():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self) -> int:
+        """Delete least recently used files down to _EVICT_TO of the limit; return bytes kept."""
+        entries = []
+        for path in self._files():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * _EVICT_TO
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        return total
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._files():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._approx_bytes = 0
+
+
+svg_cache = SvgRenderCache(SVG_CACHE_DIR, SVG_CACHE_MAX_BYTES)
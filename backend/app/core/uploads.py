@@ -1,7 +1,8 @@
 """Upload size limits (S8 — security-med-low-s7-s15)."""
 from __future__ import annotations
 
-from typing import Optional
+import os
+from typing import BinaryIO, Optional
 
 from fastapi import HTTPException, UploadFile, status
 
@@ -25,25 +26,53 @@ async def read_upload_capped(
     if cl is not None:
         try:
             if int(cl) > max_bytes:
-                raise HTTPException(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail={
-                        "code": "upload_too_large",
-                        "message": f"{label} exceeds {max_bytes} bytes",
-                        "max_bytes": max_bytes,
-                    },
-                )
+                raise _too_large(label, max_bytes)
         except ValueError:
             pass
 
     content = await file.read()
     if len(content) > max_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail={
-                "code": "upload_too_large",
-                "message": f"{label} exceeds {max_bytes} bytes",
-                "max_bytes": max_bytes,
-            },
-        )
+        raise _too_large(label, max_bytes)
     return content
+
+
+def _too_large(label: str, max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail={
+            "code": "upload_too_large",
+            "message": f"{label} exceeds {max_bytes} bytes",
+            "max_bytes": max_bytes,
+        },
+    )
+
+
+def spooled_upload_capped(
+    file: UploadFile,
+    *,
+    max_bytes: int,
+    field_name: Optional[str] = None,
+) -> BinaryIO:
+    """
+    Return the upload's spooled file (rewound) without reading it into memory.
+
+    Starlette has already spooled the part to a temp file; the cap is checked
+    against Content-Length when present and then against the spooled size.
+    """
+    label = field_name or (file.filename or "file")
+    cl = file.headers.get("content-length") if file.headers else None
+    if cl is not None:
+        try:
+            too_large = int(cl) > max_bytes
+        except ValueError:
+            too_large = False
+        if too_large:
+            raise _too_large(label, max_bytes)
+
+    spooled = file.file
+    spooled.seek(0, os.SEEK_END)
+    size = spooled.tell()
+    spooled.seek(0)
+    if size > max_bytes:
+        raise _too_large(label, max_bytes)
+    return spooled
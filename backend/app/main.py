@@ -4,7 +4,7 @@ FastAPI application for NimbleLims
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import validate_security_config
-from app.routers import auth, samples, tests, containers, batches, results, aliquots, lists, projects, analyses, analytes, units, users, roles, permissions, clients, test_batteries, client_projects, custom_attributes, help, admin, sequences, workflows, experiments, lims_runs, sop_parse, lims_run_checklists, dose_response, field_definitions, eln_processes, eln_process_definitions, entries, sample_journey, instrument_catalog, data_parsers
+from app.routers import auth, samples, tests, containers, batches, results, aliquots, lists, projects, analyses, analytes, units, users, roles, permissions, clients, test_batteries, client_projects, custom_attributes, help, admin, sequences, workflows, experiments, lims_runs, sop_parse, lims_run_checklists, dose_response, field_definitions, eln_processes, eln_process_definitions, entries, sample_journey, instrument_catalog, data_parsers, jobs, events
 import logging
 
 # S3: refuse missing/default JWT secret unless explicit local insecure flags
@@ -48,6 +48,39 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(LoggingMiddleware)
 
+# Debug: report how many permission queries hit the DB for this request (expect 0–1)
+from app.core.config import AUTH_DEBUG_HEADERS
+from app.core.auth_cache import begin_permission_query_count, end_permission_query_count
+
+class AuthDebugHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        token, cell = begin_permission_query_count()
+        try:
+            response = await call_next(request)
+        finally:
+            end_permission_query_count(token)
+        response.headers["X-Permission-Queries"] = str(cell[0])
+        return response
+
+if AUTH_DEBUG_HEADERS:
+    app.add_middleware(AuthDebugHeadersMiddleware)
+
+# Labels pool checkouts with the route holding the connection (/admin/metrics/db-pool)
+from app.core.db_metrics import DbRouteLabelMiddleware
+
+app.add_middleware(DbRouteLabelMiddleware)
+
+# Reference-data cache: LISTEN for admin edits made by other workers
+from app.core.reference_cache import start_reference_listener, stop_reference_listener
+
+app.add_event_handler("startup", start_reference_listener)
+app.add_event_handler("shutdown", stop_reference_listener)
+
+# Server-sent events: the per-process LISTEN broker starts with the first stream
+from app.core.events import stop_event_broker
+
+app.add_event_handler("shutdown", stop_event_broker)
+
 # CORS middleware (credentials required for P4 cookie AuthN)
 from app.core.config import CORS_ORIGINS
 
@@ -87,6 +120,7 @@ app.include_router(custom_attributes.router, tags=["custom-attributes"])
 app.include_router(field_definitions.router, tags=["field-definitions"])
 app.include_router(help.router, prefix="/help", tags=["help"])
 app.include_router(admin.router, tags=["admin"])
+app.include_router(admin.metrics_router)
 app.include_router(workflows.workflow_templates_router, prefix="/admin")
 app.include_router(workflows.workflows_router, prefix="/workflows")
 app.include_router(sequences.router, tags=["admin"])
@@ -101,6 +135,8 @@ app.include_router(eln_process_definitions.router, prefix="/v1")
 app.include_router(entries.router, prefix="/v1")
 app.include_router(sample_journey.router, prefix="/v1")
 app.include_router(dose_response.router, prefix="/v1")
+app.include_router(jobs.router, prefix="/v1")
+app.include_router(events.router, prefix="/v1")
 logger.info("All routers registered")
 
 @app.get("/")
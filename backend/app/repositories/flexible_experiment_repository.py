@@ -4,8 +4,13 @@ Pure DB access — no business logic, no HTTP exceptions.
 """
 from __future__ import annotations
 
+import csv
+import io
+import json
 import uuid
-from typing import List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import Session
 
 from models.flexible_experiment import (
@@ -165,6 +170,83 @@ class LimsRunDataRepository:
         self.db.add_all(objects)
         return objects
 
+    # Session-local staging table: COPY FROM is rejected on tables with row-level
+    # security, so rows are COPYed here and moved with INSERT ... SELECT (RLS-checked)
+    _STAGE_TABLE = "_lims_run_data_stage"
+
+    def copy_rows(
+        self,
+        run_id: uuid.UUID,
+        rows: Iterable[dict],
+        *,
+        import_id: Optional[uuid.UUID],
+        created_by: Optional[uuid.UUID],
+        chunk_rows: int,
+        on_chunk: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Stream rows into lims_run_data with COPY ... FROM STDIN (CSV), chunk_rows
+        per round trip, inside the session's transaction. Returns rows written.
+        on_chunk(rows_written_so_far) is called after each full chunk.
+        """
+        stage = self._STAGE_TABLE
+        self.db.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {stage} ("
+            "id uuid, container_id uuid, well_position varchar(10), "
+            "sample_id uuid, row_data jsonb) ON COMMIT DROP"
+        ))
+        copy_sql = (
+            f"COPY {stage} (id, container_id, well_position, sample_id, row_data) "
+            "FROM STDIN WITH (FORMAT csv)"
+        )
+        move = text(
+            "INSERT INTO lims_run_data (id, lims_run_id, container_id, well_position, "
+            "sample_id, row_data, import_id, created_by, modified_by) "
+            "SELECT id, :run_id, container_id, well_position, sample_id, row_data, "
+            f":import_id, :user_id, :user_id FROM {stage}"
+        ).bindparams(*(
+            bindparam(name, type_=PostgresUUID(as_uuid=True))
+            for name in ("run_id", "import_id", "user_id")
+        ))
+        params = {"run_id": run_id, "import_id": import_id, "user_id": created_by}
+        cursor = self.db.connection().connection.cursor()
+
+        def flush(buf: io.StringIO) -> None:
+            buf.seek(0)
+            cursor.copy_expert(copy_sql, buf)
+            self.db.execute(move, params)
+            self.db.execute(text(f"TRUNCATE {stage}"))
+
+        written = 0
+        pending = 0
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        try:
+            for row in rows:
+                # None → empty unquoted field → NULL under FORMAT csv
+                writer.writerow((
+                    uuid.uuid4(),
+                    row.get("container_id"),
+                    row.get("well_position"),
+                    row.get("sample_id"),
+                    json.dumps(row["row_data"]),
+                ))
+                pending += 1
+                if pending >= chunk_rows:
+                    flush(buf)
+                    written += pending
+                    pending = 0
+                    if on_chunk is not None:
+                        on_chunk(written)
+                    buf = io.StringIO()
+                    writer = csv.writer(buf)
+            if pending:
+                flush(buf)
+                written += pending
+        finally:
+            cursor.close()
+        return written
+
 
 class InstrumentParserRepository:
     """Deprecated template-scoped parsers — no-op / empty after P1."""
@@ -1,11 +1,13 @@
 """
-Admin router for name templates management
+Admin router for name templates management and operational metrics
 """
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.name_template import NameTemplate
 from models.user import User, Role
 from app.schemas.name_template import (
@@ -18,10 +20,12 @@ from pydantic import BaseModel
 from app.core.security import get_current_user
 from app.core.rbac import require_config_edit
 from app.core.name_generation import generate_name
+from app.core.db_metrics import pool_snapshot, render_prometheus
 from uuid import UUID
 from datetime import datetime
 
-router = APIRouter(prefix="/admin/name-templates", tags=["name-templates"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/admin/name-templates", tags=["name-templates"])
+metrics_router = APIRouter(route_class=DbOffloadRoute, prefix="/admin/metrics", tags=["admin"])
 
 
 def is_administrator(user: User, db: Session) -> bool:
@@ -389,3 +393,18 @@ async def delete_name_template(
     
     return None
 
+
+@metrics_router.get("/db-pool")
+async def get_db_pool_metrics(
+    format: str = Query("json", pattern="^(json|prometheus)$", description="json or prometheus"),
+    current_user: User = Depends(require_config_edit),
+):
+    """
+    Connection pool gauges, checkout wait and per-route hold-time histograms
+    for this worker's request and background pools.
+    Requires config:edit permission.
+    """
+    snapshot = pool_snapshot()
+    if format == "prometheus":
+        return PlainTextResponse(render_prometheus(snapshot), media_type="text/plain; version=0.0.4")
+    return {"pools": snapshot}
@@ -6,9 +6,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.conversions import ConversionError, base_unit_id, pooled_volumes
 from models.sample import Sample
 from models.container import Container, Contents
-from models.unit import Unit
 from models.user import User
 from app.schemas.aliquot import (
     AliquotCreateRequest, DerivativeCreateRequest, AliquotResponse, DerivativeResponse,
@@ -19,11 +20,12 @@ from app.core.rbac import (
     require_project_access
 )
 from app.core.security import get_current_user
+from app.core.reference_cache import find_list_entry
 from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.post("", response_model=AliquotResponse)
@@ -69,14 +71,7 @@ async def create_aliquot(
         )
     
     # Get "Available for Testing" status
-    from models.list import ListEntry, List as ListModel
-    sample_status_list = db.query(ListModel).filter(ListModel.name == "sample_status").first()
-    available_status = None
-    if sample_status_list:
-        available_status = db.query(ListEntry).filter(
-            ListEntry.list_id == sample_status_list.id,
-            ListEntry.name == "Available for Testing"
-        ).first()
+    available_status = find_list_entry(db, "sample_status", "Available for Testing", active_only=False)
     
     if not available_status:
         raise HTTPException(
@@ -173,14 +168,7 @@ async def create_derivative(
         )
     
     # Get "Available for Testing" status
-    from models.list import ListEntry, List as ListModel
-    sample_status_list = db.query(ListModel).filter(ListModel.name == "sample_status").first()
-    available_status = None
-    if sample_status_list:
-        available_status = db.query(ListEntry).filter(
-            ListEntry.list_id == sample_status_list.id,
-            ListEntry.name == "Available for Testing"
-        ).first()
+    available_status = find_list_entry(db, "sample_status", "Available for Testing", active_only=False)
     
     if not available_status:
         raise HTTPException(
@@ -268,53 +256,35 @@ async def pool_samples(
                     detail="Access denied: insufficient project permissions"
                 )
     
-    # Calculate pooled values using units multipliers
-    total_volume = 0.0
-    total_concentration = 0.0
-    concentration_units_id = None
-    
-    # Get base units for calculations
-    base_volume_unit = db.query(Unit).filter(
-        Unit.type == "volume",  # Assuming this list entry exists
-        Unit.multiplier == 1.0  # Base unit
-    ).first()
-    
-    base_concentration_unit = db.query(Unit).filter(
-        Unit.type == "concentration",  # Assuming this list entry exists
-        Unit.multiplier == 1.0  # Base unit
-    ).first()
-    
+    # Pooled values from unit multipliers (cached; no per-sample unit queries)
+    base_volume_unit = base_unit_id(db, "volume")
+    base_concentration_unit = base_unit_id(db, "concentration")
+
     if not base_volume_unit or not base_concentration_unit:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Base units not configured"
         )
-    
-    # Process each sample
+
+    try:
+        concentration_base, volumes = pooled_volumes(
+            pooling_data.concentrations,
+            pooling_data.concentration_units,
+            pooling_data.amounts,
+            pooling_data.amount_units,
+            db,
+        )
+    except ConversionError as e:
+        sample_id = pooling_data.samples[e.index] if e.index is not None else None
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid units for sample {sample_id}: {e}" if sample_id else str(e)
+        )
+    total_volume = float(volumes.sum())
+    total_concentration = float((concentration_base * volumes).sum())
+
+    # Create contents entries
     for i, sample_id in enumerate(pooling_data.samples):
-        sample = next(s for s in samples if s.id == sample_id)
-        
-        # Get units
-        amount_unit = db.query(Unit).filter(Unit.id == pooling_data.amount_units[i]).first()
-        concentration_unit = db.query(Unit).filter(Unit.id == pooling_data.concentration_units[i]).first()
-        
-        if not amount_unit or not concentration_unit:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid units for sample {sample_id}"
-            )
-        
-        # Convert to base units
-        amount_base = float(pooling_data.amounts[i]) * float(amount_unit.multiplier)
-        concentration_base = float(pooling_data.concentrations[i]) * float(concentration_unit.multiplier)
-        
-        # Calculate volume from concentration and amount
-        volume = amount_base / concentration_base if concentration_base > 0 else 0
-        
-        total_volume += volume
-        total_concentration += concentration_base * volume
-        
-        # Create contents entry
         contents = Contents(
             container_id=pooling_data.container_id,
             sample_id=sample_id,
@@ -334,9 +304,9 @@ async def pool_samples(
         container_id=pooling_data.container_id,
         pooled_samples=pooling_data.samples,
         total_volume=total_volume,
-        total_volume_units=base_volume_unit.id,
+        total_volume_units=base_volume_unit,
         average_concentration=average_concentration,
-        concentration_units=base_concentration_unit.id,
+        concentration_units=base_concentration_unit,
         notes=pooling_data.notes
     )
 
@@ -2,10 +2,13 @@
 Analyses router for NimbleLIMS
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.conditional import conditional_response
+from app.core.reference_cache import ANALYSES, ANALYTES, invalidate_reference_data
 from models.analysis import Analysis, Analyte, AnalysisAnalyte
 from models.user import User
 from app.schemas.analysis import (
@@ -19,14 +22,14 @@ from app.schemas.analysis import (
     AnalyteLinkRequest,
     AnalyteSimple,
 )
-from app.core.security import get_current_user, get_user_permissions
+from app.core.security import get_current_user, resolve_auth_context
 from app.core.rbac import require_any_permission
 from uuid import UUID
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 def _build_analysis_response(analysis: Analysis) -> AnalysisResponse:
@@ -54,6 +57,7 @@ def _build_analysis_response(analysis: Analysis) -> AnalysisResponse:
 
 @router.get("", response_model=AnalysisListResponse)
 async def get_analyses(
+    request: Request,
     search: Optional[str] = Query(None, description="Search by name or method (ilike)"),
     active: Optional[bool] = Query(None, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
@@ -66,51 +70,56 @@ async def get_analyses(
     - search: Filter by name or method (case-insensitive)
     - active: Filter by active status (default: show all for config:edit users, only active for others)
     - Supports pagination via page and size parameters
+    - Supports If-None-Match: an unchanged body is answered 304 from memory
     """
     try:
         # Check if user has config:edit permission
-        user_permissions = get_user_permissions(current_user, db)
-        has_config_edit = "config:edit" in user_permissions
-        
-        # Base query with eager loading of analytes
-        query = db.query(Analysis).options(joinedload(Analysis.analytes))
-        
-        # Apply active filter
-        if active is not None:
-            query = query.filter(Analysis.active == active)
-        elif not has_config_edit:
-            # For non-config users, default to only active
-            query = query.filter(Analysis.active == True)
-        
-        # Apply search filter (ilike on name and method)
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Analysis.name.ilike(search_pattern),
-                    Analysis.method.ilike(search_pattern)
+        has_config_edit = resolve_auth_context(current_user, db).has("config:edit")
+        
+        def render():
+            # Base query with eager loading of analytes
+            query = db.query(Analysis).options(joinedload(Analysis.analytes))
+
+            # Apply active filter
+            if active is not None:
+                query = query.filter(Analysis.active == active)
+            elif not has_config_edit:
+                # For non-config users, default to only active
+                query = query.filter(Analysis.active == True)
+
+            # Apply search filter (ilike on name and method)
+            if search:
+                search_pattern = f"%{search}%"
+                query = query.filter(
+                    or_(
+                        Analysis.name.ilike(search_pattern),
+                        Analysis.method.ilike(search_pattern)
+                    )
                 )
+
+            # Get total count
+            total = query.count()
+
+            # Apply pagination
+            offset = (page - 1) * size
+            analyses = query.order_by(Analysis.name).offset(offset).limit(size).all()
+
+            # Calculate pages
+            pages = (total + size - 1) // size if total > 0 else 0
+
+            # Build response
+            result = [_build_analysis_response(analysis) for analysis in analyses]
+
+            return AnalysisListResponse(
+                analyses=result,
+                total=total,
+                page=page,
+                size=size,
+                pages=pages,
             )
-        
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * size
-        analyses = query.order_by(Analysis.name).offset(offset).limit(size).all()
-        
-        # Calculate pages
-        pages = (total + size - 1) // size if total > 0 else 0
-        
-        # Build response
-        result = [_build_analysis_response(analysis) for analysis in analyses]
-        
-        return AnalysisListResponse(
-            analyses=result,
-            total=total,
-            page=page,
-            size=size,
-            pages=pages,
+
+        return conditional_response(
+            request, (ANALYSES, ANALYTES), (has_config_edit, search, active, page, size), render
         )
     except Exception as e:
         logger.error(f"Error in get_analyses: {e}", exc_info=True)
@@ -197,6 +206,7 @@ async def create_analysis(
         )
         
         db.add(new_analysis)
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         db.refresh(new_analysis)
         
@@ -267,6 +277,7 @@ async def update_analysis(
             analysis.custom_attributes = analysis_data.custom_attributes
         
         analysis.modified_by = current_user.id
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         db.refresh(analysis)
         
@@ -312,6 +323,7 @@ async def delete_analysis(
         
         analysis.active = False
         analysis.modified_by = current_user.id
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         
         return None
@@ -410,6 +422,7 @@ async def link_analytes_to_analysis(
             analysis.analytes.append(analyte)
         
         analysis.modified_by = current_user.id
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         db.refresh(analysis)
         
@@ -465,6 +478,7 @@ async def update_analysis_analytes(
         # Clear existing analytes and set new ones
         analysis.analytes = analytes
         analysis.modified_by = current_user.id
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         db.refresh(analysis)
         
@@ -520,6 +534,7 @@ async def unlink_analyte_from_analysis(
         
         analysis.analytes.remove(analyte_to_remove)
         analysis.modified_by = current_user.id
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         
         return None
@@ -656,6 +671,7 @@ async def create_analysis_analyte_rule(
         )
         
         db.add(new_rule)
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         db.refresh(new_rule)
         
@@ -748,6 +764,7 @@ async def update_analysis_analyte_rule(
         if rule_data.default_value is not None:
             rule.default_value = rule_data.default_value
         
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         db.refresh(rule)
         
@@ -809,6 +826,7 @@ async def delete_analysis_analyte_rule(
             )
         
         db.delete(rule)
+        invalidate_reference_data(db, ANALYSES)
         db.commit()
         
         return None
@@ -2,10 +2,13 @@
 Analytes router for NimbleLIMS
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.conditional import conditional_response
+from app.core.reference_cache import ANALYTES, invalidate_reference_data
 from models.analysis import Analyte, AnalysisAnalyte, AnalyteAlias
 from models.user import User
 from app.schemas.analyte import (
@@ -16,7 +19,7 @@ from app.schemas.analyte import (
     AnalyteAliasCreate,
     AnalyteAliasRead,
 )
-from app.core.security import get_current_user, get_user_permissions
+from app.core.security import get_current_user, resolve_auth_context
 from app.core.rbac import require_any_permission
 from uuid import UUID
 from sqlalchemy.orm import joinedload
@@ -25,7 +28,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 def _alias_strings(analyte: Analyte) -> list:
@@ -56,6 +59,7 @@ def _build_analyte_response(analyte: Analyte) -> AnalyteResponse:
 
 @router.get("", response_model=AnalyteListResponse)
 async def get_analytes(
+    request: Request,
     search: Optional[str] = Query(None, description="Search by name or CAS number (ilike)"),
     active: Optional[bool] = Query(None, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
@@ -68,61 +72,66 @@ async def get_analytes(
     - search: Filter by name or CAS number (case-insensitive)
     - active: Filter by active status (default: show all for config:edit users, only active for others)
     - Supports pagination via page and size parameters
+    - Supports If-None-Match: an unchanged body is answered 304 from memory
     """
     try:
         # Check if user has config:edit permission
-        user_permissions = get_user_permissions(current_user, db)
-        has_config_edit = "config:edit" in user_permissions
+        has_config_edit = resolve_auth_context(current_user, db).has("config:edit")
         
-        # Base query
-        query = db.query(Analyte)
-        
-        # Apply active filter
-        if active is not None:
-            query = query.filter(Analyte.active == active)
-        elif not has_config_edit:
-            # For non-config users, default to only active
-            query = query.filter(Analyte.active == True)
-        
-        # Apply search filter (ilike on name and cas_number)
-        if search:
-            search_pattern = f"%{search}%"
-            # Handle case where cas_number column may not exist yet
-            if hasattr(Analyte, 'cas_number'):
-                query = query.filter(
-                    or_(
-                        Analyte.name.ilike(search_pattern),
-                        Analyte.cas_number.ilike(search_pattern)
+        def render():
+            # Base query
+            query = db.query(Analyte)
+
+            # Apply active filter
+            if active is not None:
+                query = query.filter(Analyte.active == active)
+            elif not has_config_edit:
+                # For non-config users, default to only active
+                query = query.filter(Analyte.active == True)
+
+            # Apply search filter (ilike on name and cas_number)
+            if search:
+                search_pattern = f"%{search}%"
+                # Handle case where cas_number column may not exist yet
+                if hasattr(Analyte, 'cas_number'):
+                    query = query.filter(
+                        or_(
+                            Analyte.name.ilike(search_pattern),
+                            Analyte.cas_number.ilike(search_pattern)
+                        )
                     )
-                )
-            else:
-                query = query.filter(Analyte.name.ilike(search_pattern))
-        
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * size
-        analytes = (
-            query.options(joinedload(Analyte.aliases))
-            .order_by(Analyte.name)
-            .offset(offset)
-            .limit(size)
-            .all()
-        )
-        
-        # Calculate pages
-        pages = (total + size - 1) // size if total > 0 else 0
-        
-        # Build response
-        result = [_build_analyte_response(analyte) for analyte in analytes]
-        
-        return AnalyteListResponse(
-            analytes=result,
-            total=total,
-            page=page,
-            size=size,
-            pages=pages,
+                else:
+                    query = query.filter(Analyte.name.ilike(search_pattern))
+
+            # Get total count
+            total = query.count()
+
+            # Apply pagination
+            offset = (page - 1) * size
+            analytes = (
+                query.options(joinedload(Analyte.aliases))
+                .order_by(Analyte.name)
+                .offset(offset)
+                .limit(size)
+                .all()
+            )
+
+            # Calculate pages
+            pages = (total + size - 1) // size if total > 0 else 0
+
+            # Build response
+            result = [_build_analyte_response(analyte) for analyte in analytes]
+
+            return AnalyteListResponse(
+                analytes=result,
+                total=total,
+                page=page,
+                size=size,
+                pages=pages,
+            )
+
+        return conditional_response(
+            request, (ANALYTES,), (has_config_edit, search, active, page, size), render
         )
     except Exception as e:
         logger.error(f"Error in get_analytes: {e}", exc_info=True)
@@ -228,6 +237,7 @@ async def add_analyte_alias(
         created_by=current_user.id,
     )
     db.add(row)
+    invalidate_reference_data(db, ANALYTES)
     db.commit()
     db.refresh(row)
     return AnalyteAliasRead.model_validate(row)
@@ -250,6 +260,7 @@ async def delete_analyte_alias(
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Alias not found")
     db.delete(row)
+    invalidate_reference_data(db, ANALYTES)
     db.commit()
     return None
 
@@ -302,6 +313,7 @@ async def create_analyte(
             new_analyte.custom_attributes = analyte_data.custom_attributes or {}
         
         db.add(new_analyte)
+        invalidate_reference_data(db, ANALYTES)
         db.commit()
         db.refresh(new_analyte)
         
@@ -376,6 +388,7 @@ async def update_analyte(
             analyte.custom_attributes = analyte_data.custom_attributes
         
         analyte.modified_by = current_user.id
+        invalidate_reference_data(db, ANALYTES)
         db.commit()
         db.refresh(analyte)
         
@@ -423,6 +436,7 @@ async def delete_analyte(
         
         analyte.active = False
         analyte.modified_by = current_user.id
+        invalidate_reference_data(db, ANALYTES)
         db.commit()
         
         return None
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.user import User
 from app.schemas.auth import (
     LoginRequest,
@@ -27,13 +28,14 @@ from app.core.security import (
     require_csrf_for_cookie_auth,
 )
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.auth_cache import invalidate_user
 from app.core.auth_cookies import (
     set_auth_cookies,
     clear_auth_cookies,
     get_access_token_from_cookie,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 def _issue_token(user: User, permissions: list, *, must_change: bool) -> str:
@@ -127,6 +129,7 @@ async def login(
 
     user.last_login = func.now()
     db.commit()
+    invalidate_user(user.id)
 
     set_current_user_id(
         str(user.id),
@@ -191,6 +194,7 @@ async def change_password(
     current_user.must_change_password = False
     db.add(current_user)
     db.commit()
+    invalidate_user(current_user.id)
     db.refresh(current_user)
 
     permissions = get_user_permissions(current_user, db)
@@ -8,6 +8,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, text, func
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.pagination import CountMode, paginate
+from app.core.reference_cache import (
+    LISTS, find_list_entry, get_container_type, invalidate_reference_data, list_entry,
+)
 from models.batch import Batch, BatchContainer
 from models.container import Container, Contents, ContainerType
 from models.sample import Sample
@@ -27,7 +32,7 @@ from app.core.security import get_current_user
 from datetime import datetime
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 def build_batch_response(batch: Batch, batch_containers: list) -> BatchResponse:
@@ -62,6 +67,8 @@ async def get_batches(
     status: Optional[UUID] = Query(None, description="Filter by status ID"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor (overrides page)"),
+    count: CountMode = Query(CountMode.exact, description="How to compute total: exact, estimate (planner row estimate) or none"),
     current_user: User = Depends(require_batch_read),
     db: Session = Depends(get_db)
 ):
@@ -83,19 +90,14 @@ async def get_batches(
     if status:
         query = query.filter(Batch.status == status)
     
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * size
-    batches = query.offset(offset).limit(size).all()
-    
-    # Calculate pages
-    pages = (total + size - 1) // size
+    result = paginate(
+        query, (Batch.created_at, Batch.id),
+        page=page, size=size, cursor=cursor, count=count
+    )
     
     # Load containers for each batch
     batch_responses = []
-    for batch in batches:
+    for batch in result.items:
         batch_containers = db.query(BatchContainer).filter(
             BatchContainer.batch_id == batch.id
         ).all()
@@ -103,10 +105,11 @@ async def get_batches(
     
     return BatchListResponse(
         batches=batch_responses,
-        total=total,
+        total=result.total,
         page=page,
         size=size,
-        pages=pages
+        pages=result.pages,
+        next_cursor=result.next_cursor
     )
 
 
@@ -591,10 +594,7 @@ async def create_batch(
     
     # Validate status exists and is active
     if batch_data.status:
-        status_entry = db.query(ListEntry).filter(
-            ListEntry.id == batch_data.status,
-            ListEntry.active == True
-        ).first()
+        status_entry = list_entry(db, batch_data.status, active_only=True)
         if not status_entry:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -631,29 +631,25 @@ async def create_batch(
     # All QC creation happens atomically within the batch creation transaction
     if batch_data.qc_additions and qc_project_id:
         # Get "Received" status for QC samples
-        from models.list import List
-        sample_status_list = db.query(List).filter(
-            List.name == "sample_status"
-        ).first()
-        
-        if not sample_status_list:
-            # Create sample_status list if it doesn't exist
-            sample_status_list = List(
-                name="sample_status",
-                description="Sample status list",
-                created_by=current_user.id,
-                modified_by=current_user.id
-            )
-            db.add(sample_status_list)
-            db.flush()
-        
-        received_status = db.query(ListEntry).filter(
-            ListEntry.list_id == sample_status_list.id,
-            ListEntry.name == "Received",
-            ListEntry.active == True
-        ).first()
+        received_status = find_list_entry(db, "sample_status", "Received")
         
         if not received_status:
+            from models.list import List
+            sample_status_list = db.query(List).filter(
+                List.name == "sample_status"
+            ).first()
+            
+            if not sample_status_list:
+                # Create sample_status list if it doesn't exist
+                sample_status_list = List(
+                    name="sample_status",
+                    description="Sample status list",
+                    created_by=current_user.id,
+                    modified_by=current_user.id
+                )
+                db.add(sample_status_list)
+                db.flush()
+            
             # Create "Received" status if it doesn't exist
             received_status = ListEntry(
                 name="Received",
@@ -665,14 +661,12 @@ async def create_batch(
             db.add(received_status)
             db.flush()
             db.refresh(received_status)  # Ensure ID is available
+            invalidate_reference_data(db, LISTS)
         
         # Create QC samples - each QC addition specifies its own container
         for qc_idx, qc_addition in enumerate(batch_data.qc_additions):
             # Validate QC type exists
-            qc_type_entry = db.query(ListEntry).filter(
-                ListEntry.id == qc_addition.qc_type,
-                ListEntry.active == True
-            ).first()
+            qc_type_entry = list_entry(db, qc_addition.qc_type, active_only=True)
             
             if not qc_type_entry:
                 raise HTTPException(
@@ -698,10 +692,7 @@ async def create_batch(
             qc_matrix = qc_addition.matrix_id
             
             # Validate the matrix exists
-            matrix_entry = db.query(ListEntry).filter(
-                ListEntry.id == qc_matrix,
-                ListEntry.active == True
-            ).first()
+            matrix_entry = list_entry(db, qc_matrix, active_only=True)
             if not matrix_entry:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -741,10 +732,7 @@ async def create_batch(
                     )
             
             # Validate that the provided container type exists
-            container_type = db.query(ContainerType).filter(
-                ContainerType.id == qc_addition.container_type_id,
-                ContainerType.active == True
-            ).first()
+            container_type = get_container_type(db, qc_addition.container_type_id, active_only=True)
             if not container_type:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -1093,11 +1081,7 @@ async def update_batch_status(
         )
     
     # Validate status exists
-    from models.list import ListEntry
-    status_entry = db.query(ListEntry).filter(
-        ListEntry.id == status_id,
-        ListEntry.active == True
-    ).first()
+    status_entry = list_entry(db, status_id, active_only=True)
     
     if not status_entry:
         raise HTTPException(
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.client import ClientProject
 from models.user import User
 from app.schemas.client_project import (
@@ -21,7 +22,7 @@ from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("", response_model=ClientProjectListResponse)
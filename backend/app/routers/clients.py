@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.client import Client
 from models.user import User
 from app.schemas.client import ClientResponse, ClientCreate, ClientUpdate
@@ -15,7 +16,7 @@ from app.core.rbac import require_permission, is_system_client_or_admin
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("", response_model=List[ClientResponse])
@@ -32,7 +33,11 @@ async def get_clients(
     - Client users: see only their own client record
     """
     # Set current user for RLS so DB policies can evaluate
-    set_current_user_id(str(current_user.id), db)
+    set_current_user_id(
+        str(current_user.id),
+        db,
+        client_id=str(current_user.client_id) if current_user.client_id else None,
+    )
     # Verify the same connection has app.current_user_id set (for RLS and diagnostics)
     row = db.execute(text("SELECT current_setting('app.current_user_id', true)")).fetchone()
     rv = row[0] if row else None
@@ -2,9 +2,10 @@
 Containers router for NimbleLims
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.container import Container, ContainerType, Contents
 from models.user import User
 from app.schemas.container import (
@@ -16,16 +17,19 @@ from app.core.rbac import (
     require_sample_create, require_sample_read, require_sample_update,
     require_config_edit
 )
-from app.core.security import get_current_user, get_user_permissions
+from app.core.security import get_current_user, resolve_auth_context
+from app.core.conditional import conditional_response
+from app.core.reference_cache import CONTAINER_TYPES, get_container_type, invalidate_reference_data
 from datetime import datetime
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 # Container Types endpoints
 @router.get("/types", response_model=List[ContainerTypeResponse])
 async def get_container_types(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -33,17 +37,20 @@ async def get_container_types(
     Get all container types.
     For users with config:edit permission, returns all container types (active and inactive).
     For other users, returns only active container types.
+    Supports If-None-Match: an unchanged body is answered 304 from memory.
     """
     # Check if user has config:edit permission
-    user_permissions = get_user_permissions(current_user, db)
-    has_config_edit = "config:edit" in user_permissions
-    
-    # If user has config:edit permission, show all container types; otherwise, only active
-    if has_config_edit:
-        container_types = db.query(ContainerType).all()
-    else:
-        container_types = db.query(ContainerType).filter(ContainerType.active == True).all()
-    return [ContainerTypeResponse.from_orm(ct) for ct in container_types]
+    has_config_edit = resolve_auth_context(current_user, db).has("config:edit")
+
+    def render():
+        # If user has config:edit permission, show all container types; otherwise, only active
+        query = db.query(ContainerType)
+        if not has_config_edit:
+            query = query.filter(ContainerType.active == True)
+        container_types = query.order_by(ContainerType.name, ContainerType.id).all()
+        return [ContainerTypeResponse.from_orm(ct) for ct in container_types]
+
+    return conditional_response(request, (CONTAINER_TYPES,), has_config_edit, render)
 
 
 @router.post("/types", response_model=ContainerTypeResponse)
@@ -68,6 +75,7 @@ async def create_container_type(
     )
     
     db.add(container_type)
+    invalidate_reference_data(db, CONTAINER_TYPES)
     db.commit()
     db.refresh(container_type)
     
@@ -104,6 +112,7 @@ async def update_container_type(
     container_type.modified_by = current_user.id
     container_type.modified_at = datetime.utcnow()
     
+    invalidate_reference_data(db, CONTAINER_TYPES)
     db.commit()
     db.refresh(container_type)
     
@@ -214,10 +223,7 @@ async def create_container(
     Implements US-5: Container Management.
     """
     # Validate container type exists
-    container_type = db.query(ContainerType).filter(
-        ContainerType.id == container_data.type_id,
-        ContainerType.active == True
-    ).first()
+    container_type = get_container_type(db, container_data.type_id, active_only=True)
     
     if not container_type:
         raise HTTPException(
@@ -379,10 +385,7 @@ async def update_container(
     
     # Validate container type if being updated
     if container_data.type_id is not None:
-        container_type = db.query(ContainerType).filter(
-            ContainerType.id == container_data.type_id,
-            ContainerType.active == True
-        ).first()
+        container_type = get_container_type(db, container_data.type_id, active_only=True)
         
         if not container_type:
             raise HTTPException(
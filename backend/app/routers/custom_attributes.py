@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.custom_attributes_config import CustomAttributeConfig
 from models.user import User, Role
 from app.schemas.custom_attributes_config import (
@@ -18,7 +19,7 @@ from app.core.security import get_current_user
 from app.core.rbac import require_config_edit
 from uuid import UUID
 
-router = APIRouter(prefix="/admin/custom-attributes", tags=["custom-attributes"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/admin/custom-attributes", tags=["custom-attributes"])
 
 
 def is_administrator(user: User, db: Session) -> bool:
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.core.rbac import require_config_edit
 from app.core.security import get_current_user
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.schemas.data_parser import (
     DataParserCreate,
     DataParserNewVersion,
@@ -23,7 +24,7 @@ from app.services.data_parser_service import (
 )
 from models.user import User
 
-router = APIRouter(prefix="/data-parsers", tags=["data-parsers"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/data-parsers", tags=["data-parsers"])
 
 
 def _svc(db: Session = Depends(get_db), user: User = Depends(get_current_user)) -> DataParserService:
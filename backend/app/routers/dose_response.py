@@ -12,12 +12,17 @@ from typing import List, Optional
 
 _logger = logging.getLogger(__name__)
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import hashlib
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, defer, joinedload
 
+from app.core.conditional import etag_matches
 from app.core.rbac import require_experiment_manage
+from app.core.reference_cache import entries_named
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.schemas.dose_response import (
     BatchReviewRequest,
     DoseResponseResultDetail,
@@ -26,12 +31,14 @@ from app.schemas.dose_response import (
     DoseResponseSummary,
     ExcludeRequest,
     ExclusionRead,
-    FitResponse,
     ResetFitRequest,
     ReviewRequest,
 )
+from app.schemas.job import JobRead
 from app.services.dose_response_fit import DoseResponseFitService
-from app.services.r_calculator_client import RCalculatorClient
+from app.services.dose_response_svg import DoseResponseSvgService, render_svg
+from app.services.job_handlers import DOSE_RESPONSE_FIT
+from app.services.job_queue import JobQueue
 from models.dose_response import (
     CurveCategory,
     DoseResponseResult,
@@ -39,11 +46,13 @@ from models.dose_response import (
     ReviewStatus,
 )
 from models.flexible_experiment import LimsRunData, LimsRun
+from models.job import Job
 from models.user import User
 
-router = APIRouter(prefix="/lims-runs", tags=["dose-response"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/lims-runs", tags=["dose-response"])
 
-_r_client = RCalculatorClient()
+# Thumbnails belong to an immutable result row (a refit creates a new row)
+THUMBNAIL_CACHE_CONTROL = "private, max-age=31536000, immutable"
 
 
 def _get_run(run_id: uuid.UUID, db: Session) -> LimsRun:
@@ -55,10 +64,23 @@ def _get_run(run_id: uuid.UUID, db: Session) -> LimsRun:
 
 # ── Fit ───────────────────────────────────────────────────────────────────────
 
+def _enqueue_fit(
+    db: Session, current_user: User, run_id: uuid.UUID, sample_id: Optional[uuid.UUID]
+) -> Job:
+    DoseResponseFitService(db, current_user).check_fittable(run_id)
+    return JobQueue(db).enqueue(
+        DOSE_RESPONSE_FIT,
+        {"run_id": run_id, "sample_id": sample_id},
+        user=current_user,
+        dedupe_key=f"{DOSE_RESPONSE_FIT}:{run_id}",
+    )
+
+
 @router.post(
     "/{run_id}/dose-response/fit",
-    response_model=FitResponse,
-    summary="Fit dose-response curves for all compounds in a run",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue dose-response fitting for all compounds in a run",
 )
 def trigger_fit(
     run_id: uuid.UUID,
@@ -66,21 +88,23 @@ def trigger_fit(
     current_user: User = Depends(require_experiment_manage),
 ):
     """
-    Synchronous. Blocks until all compounds are fitted (up to 60s).
-    Returns 409 if a fit is already in progress for this run.
-    Returns 422 if controls are missing or normalization is invalid.
-    Returns 503 if the R calculation service is unavailable or times out.
+    Queues the fit on the job worker and returns 202 with the job; poll
+    GET /v1/jobs/{id}. On success job.result is the FitResponse.
+    Returns 404/422 up front if the run is missing or not fittable, and 409 if
+    a fit is already queued, running or in progress for this run.
+    Failures while fitting (missing controls, invalid normalization, backend
+    unavailable) surface as job.error with the same status and detail.
     All results are written in a single transaction — partial writes never occur.
+    Full-size SVGs are pre-rendered by the same job afterwards.
     """
-    svc = DoseResponseFitService(db, current_user, r_client=_r_client)
-    result = svc.trigger_fit(run_id)
-    return FitResponse(**result)
+    return JobRead.model_validate(_enqueue_fit(db, current_user, run_id, None))
 
 
 @router.post(
     "/{run_id}/dose-response/refit/{sample_id}",
-    response_model=FitResponse,
-    summary="Re-fit a single compound after data point knockout",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a re-fit of a single compound after data point knockout",
 )
 def trigger_refit(
     run_id: uuid.UUID,
@@ -89,13 +113,11 @@ def trigger_refit(
     current_user: User = Depends(require_experiment_manage),
 ):
     """
-    Creates a new dose_response_results row (fit_version + 1).
+    Queued like /fit. The job creates a new dose_response_results row (fit_version + 1).
     Old row: superseded_by = new row id.
     New row: review_status = 'pending' — scientist must re-review.
     """
-    svc = DoseResponseFitService(db, current_user, r_client=_r_client)
-    result = svc.trigger_refit(run_id, sample_id)
-    return FitResponse(**result)
+    return JobRead.model_validate(_enqueue_fit(db, current_user, run_id, sample_id))
 
 
 @router.post(
@@ -136,6 +158,7 @@ def reset_fit_in_progress(
 )
 def list_results(
     run_id: uuid.UUID,
+    request: Request,
     category: Optional[CurveCategory] = Query(None),
     review_status: Optional[ReviewStatus] = Query(None),
     page: int = Query(1, ge=1),
@@ -145,12 +168,14 @@ def list_results(
 ):
     """
     Returns only the latest version per compound (superseded_by IS NULL).
-    Includes thumbnail_svg for the Curve Curator grid.
+    Thumbnails are linked (thumbnail_url), not inlined, so the browser caches them.
     """
     _get_run(run_id, db)
 
+    has_thumbnail = DoseResponseResult.thumbnail_svg.isnot(None).label("has_thumbnail")
     q = (
-        db.query(DoseResponseResult)
+        db.query(DoseResponseResult, has_thumbnail)
+        .options(defer(DoseResponseResult.thumbnail_svg))
         .filter(
             DoseResponseResult.lims_run_id == run_id,
             DoseResponseResult.superseded_by.is_(None),
@@ -167,18 +192,22 @@ def list_results(
 
     # Attach sample names
     from models.sample import Sample
-    sample_ids = [r.sample_id for r in rows]
+    sample_ids = [r.sample_id for r, _ in rows]
     samples_by_id = {}
     if sample_ids:
         for s in db.query(Sample).filter(Sample.id.in_(sample_ids)).all():
             samples_by_id[s.id] = s
 
     results = []
-    for row in rows:
+    for row, row_has_thumbnail in rows:
         sample = samples_by_id.get(row.sample_id)
         d = DoseResponseResultSummary.model_validate(row)
         if sample:
             d.sample_name = sample.name
+        if row_has_thumbnail:
+            d.thumbnail_url = request.app.url_path_for(
+                "get_result_thumbnail", run_id=str(run_id), result_id=str(row.id)
+            )
         results.append(d)
 
     return DoseResponseResultListResponse(
@@ -217,6 +246,36 @@ def get_result(
     return detail
 
 
+@router.get(
+    "/{run_id}/dose-response/results/{result_id}/thumbnail.svg",
+    summary="Get a result's thumbnail SVG (Curve Curator grid)",
+)
+def get_result_thumbnail(
+    run_id: uuid.UUID,
+    result_id: uuid.UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_experiment_manage),
+):
+    """Immutable per result row: served with a strong ETag and a one-year max-age."""
+    thumbnail = (
+        db.query(DoseResponseResult.thumbnail_svg)
+        .filter(
+            DoseResponseResult.id == result_id,
+            DoseResponseResult.lims_run_id == run_id,
+        )
+        .scalar()
+    )
+    if not thumbnail:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thumbnail not found")
+
+    etag = '"' + hashlib.sha256(thumbnail.encode("utf-8")).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": THUMBNAIL_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=thumbnail, media_type="image/svg+xml", headers=headers)
+
+
 @router.get(
     "/{run_id}/dose-response/results/{result_id}/svg",
     summary="Get full-size SVG for a result (PDF export hook)",
@@ -224,10 +283,14 @@ def get_result(
 def get_result_svg(
     run_id: uuid.UUID,
     result_id: uuid.UUID,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_experiment_manage),
 ):
-    """Generates a full-size SVG via the R service. Not cached — generated on demand."""
+    """
+    Renders a full-size SVG from the stored fit, cached by render inputs
+    (result, fit_version, labels, exclusions). The cache key is the ETag.
+    """
     result = (
         db.query(DoseResponseResult)
         .filter(
@@ -238,108 +301,13 @@ def get_result_svg(
     )
     if not result:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Result not found")
-
-    from models.sample import Sample
-    from models.list import ListEntry
-    from models.template_well import TemplateWellDefinition
-    from app.services.dose_response_fit import DoseResponseFitService
-
-    sample = db.query(Sample).filter(Sample.id == result.sample_id).first()
     run = _get_run(run_id, db)
 
-    well_defs = {
-        wd.well_position: wd
-        for wd in db.query(TemplateWellDefinition)
-        .filter(TemplateWellDefinition.template_id == run.experiment_template_id)
-        .all()
-    }
-
-    # Load the original data points (non-excluded) from lims_run_data
-    excluded_ids = {
-        str(exc.lims_run_data_id)
-        for exc in db.query(LimsRunDataExclusion)
-        .join(LimsRunData, LimsRunDataExclusion.lims_run_data_id == LimsRunData.id)
-        .filter(LimsRunData.lims_run_id == run_id)
-        .all()
-    }
-    data_rows = (
-        db.query(LimsRunData)
-        .filter(
-            LimsRunData.lims_run_id == run_id,
-            LimsRunData.sample_id == result.sample_id,
-        )
-        .all()
-    )
-
-    # Compute % inhibition normalization from run's control wells
-    template_def = (run.experiment_template.template_definition or {})
-    dr_config = template_def.get("dose_response_config", {})
-    result_col = dr_config.get("result_column")
-
-    all_run_rows = (
-        db.query(LimsRunData)
-        .filter(LimsRunData.lims_run_id == run_id)
-        .all()
-    )
-    all_sample_ids = {r.sample_id for r in all_run_rows if r.sample_id}
-    samples_map = {s.id: s for s in db.query(Sample).filter(Sample.id.in_(all_sample_ids)).all()} if all_sample_ids else {}
-    qc_entries = db.query(ListEntry).filter(ListEntry.name.in_(["positive_control", "negative_control"])).all()
-    qc_by_id = {e.id: e.name for e in qc_entries}
-
-    pos_signals: list = []
-    neg_signals: list = []
-    for r in all_run_rows:
-        if not r.sample_id:
-            continue
-        if str(r.id) in excluded_ids:
-            continue
-        s = samples_map.get(r.sample_id)
-        if not s:
-            continue
-        sig = DoseResponseFitService._extract_signal(r, result_col)
-        if sig is None:
-            continue
-        qc_name = qc_by_id.get(s.qc_type)
-        if qc_name == "positive_control":
-            pos_signals.append(sig)
-        elif qc_name == "negative_control":
-            neg_signals.append(sig)
-
-    if pos_signals and neg_signals:
-        pos_mean = sum(pos_signals) / len(pos_signals)
-        neg_mean = sum(neg_signals) / len(neg_signals)
-        if pos_mean != neg_mean:
-            def _norm(sig: float) -> float:
-                return (sig - neg_mean) / (pos_mean - neg_mean) * 100.0
-        else:
-            def _norm(sig: float) -> float:
-                return sig
-    else:
-        def _norm(sig: float) -> float:
-            return sig
-
-    points = []
-    for row in data_rows:
-        wd = well_defs.get(row.well_position or "")
-        if not wd or wd.concentration_value is None:
-            continue
-        sig = DoseResponseFitService._extract_signal(row, result_col)
-        points.append({
-            "conc": float(wd.concentration_value),
-            "response": _norm(sig) if sig is not None else 0.0,
-            "point_id": str(row.id),
-        })
-
-    svg = _r_client.full_svg(
-        points=points,
-        model=result.model,
-        excluded_point_ids=list(excluded_ids),
-        x_label=f"Concentration",
-        y_label="% Inhibition",
-        title=sample.name if sample else str(result.sample_id),
-    )
-    from fastapi.responses import Response
-    return Response(content=svg, media_type="image/svg+xml")
+    render = DoseResponseSvgService(db).render_requests(run, [result])[0]
+    headers = {"ETag": render.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), render.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=render_svg(render), media_type="image/svg+xml", headers=headers)
 
 
 # ── Summary ───────────────────────────────────────────────────────────────────
@@ -9,6 +9,7 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.rbac import require_experiment_manage
 from app.services.eln_process_service import ELNProcessService
 from app.schemas.eln_process_definition import (
@@ -24,6 +25,7 @@ from app.schemas.eln_process import ELNProcessRead
 from models.user import User
 
 router = APIRouter(
+    route_class=DbOffloadRoute,
     prefix="/eln-process-definitions",
     tags=["eln-process-definitions"],
 )
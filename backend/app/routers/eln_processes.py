@@ -11,6 +11,7 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.rbac import require_experiment_manage
 from app.services.eln_process_service import ELNProcessService
 from app.schemas.eln_process import (
@@ -36,6 +37,7 @@ from models.sample import Sample
 from fastapi import HTTPException
 
 router = APIRouter(
+    route_class=DbOffloadRoute,
     prefix="/eln-processes",
     tags=["eln-processes"],
 )
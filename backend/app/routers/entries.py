@@ -16,6 +16,7 @@ import csv
 import io
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.rbac import require_experiment_manage
 from app.services.entry_service import EntryService
 from app.services.aliquot_plan_service import AliquotPlanService
@@ -41,7 +42,7 @@ from app.schemas.aliquot_plan import (
 from models.user import User
 from sqlalchemy.orm import Session
 
-router = APIRouter(tags=["entries"])
+router = APIRouter(route_class=DbOffloadRoute, tags=["entries"])
 
 
 def get_service(
@@ -0,0 +1,66 @@
+"""
+Server-sent events API — /api/v1/events
+
+Routes:
+    GET    /events    — text/event-stream of job, fit, import, promotion and
+                        SOP parse events visible to the caller (app/core/events.py)
+
+Event types and data:
+    job        {job_id, kind, status, attempts, progress_current, progress_total, progress_message}
+    fit        {run_id, fit_in_progress}
+    import     {run_id, import_id, status, rows}
+    promotion  {run_id, status, create_count, update_count}
+    sop_parse  {sop_parse_job_id, status}
+    reset      {} — events may have been missed; refetch state
+
+Browsers use EventSource (cookie auth), which resends Last-Event-ID on
+reconnect; other clients may pass ?last_event_id= instead.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.events import EventScope, event_stream, latest_event_id
+from app.core.routing import DbOffloadRoute
+from app.core.security import get_current_user
+from app.database import get_db
+from models.user import User
+
+router = APIRouter(route_class=DbOffloadRoute, prefix="/events", tags=["events"])
+
+
+def _parse_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+@router.get("", summary="Stream progress events (server-sent events)")
+def stream_events(
+    request: Request,
+    last_event_id: Optional[int] = Query(None, ge=0, description="Resume after this event id"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Replays events after Last-Event-ID (header) or last_event_id, then streams
+    live ones; with neither, starts from now, so clients should refetch their
+    state once the stream is open. Idle streams get a keep-alive
+    comment every EVENTS_HEARTBEAT_SECONDS.
+    """
+    scope = EventScope.for_user(current_user)
+    after_id = last_event_id
+    if after_id is None:
+        after_id = _parse_event_id(request.headers.get("last-event-id"))
+    if after_id is None:
+        after_id = latest_event_id(db)
+    # The stream outlives this request's session; give its connection back now
+    db.close()
+    return StreamingResponse(
+        event_stream(scope, after_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -11,6 +11,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.security import get_current_user
 from app.core.rbac import require_experiment_manage
 from app.services.experiment_service import ExperimentService
@@ -42,11 +43,13 @@ from models.user import User
 
 # Prefixes are applied in main: /api/v1/experiment-templates, /api/v1/experiments
 experiment_templates_router = APIRouter(
+    route_class=DbOffloadRoute,
     prefix="/experiment-templates",
     tags=["experiment-templates"],
 )
 
 experiments_router = APIRouter(
+    route_class=DbOffloadRoute,
     prefix="/experiments",
     tags=["experiments"],
 )
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.field_definition import FieldDefinition
 from models.list import List as ListModel
 from app.schemas.field_definition import (
@@ -19,7 +20,7 @@ from app.core.security import get_current_user
 from app.core.rbac import require_config_edit
 from models.user import User
 
-router = APIRouter(prefix="/admin/fields", tags=["field-definitions"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/admin/fields", tags=["field-definitions"])
 
 
 @router.get("", response_model=FieldDefinitionListResponse)
@@ -5,6 +5,8 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.pagination import CountMode, paginate
 from models.help_entry import HelpEntry
 from models.user import User, Role
 from app.schemas.help import (
@@ -13,11 +15,11 @@ from app.schemas.help import (
     HelpEntryUpdate,
     HelpEntryListResponse,
 )
-from app.core.security import get_current_user, get_user_permissions
+from app.core.security import get_current_user, resolve_auth_context
 from app.core.rbac import require_config_edit
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 def role_name_to_slug(role_name: str) -> str:
@@ -109,6 +111,8 @@ async def get_help_entries(
     section: Optional[str] = Query(None, description="Filter by section"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor (overrides page)"),
+    count: CountMode = Query(CountMode.exact, description="How to compute total: exact, estimate (planner row estimate) or none"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -139,8 +143,7 @@ async def get_help_entries(
         Paginated list of help entries matching the role filter and section (if provided)
     """
     # Check if user has config:edit permission (for Help Management page)
-    user_permissions = get_user_permissions(current_user, db)
-    has_config_edit = "config:edit" in user_permissions
+    has_config_edit = resolve_auth_context(current_user, db).has("config:edit")
     
     # Determine role filter
     if role:
@@ -176,22 +179,18 @@ async def get_help_entries(
     if section:
         query = query.filter(HelpEntry.section == section)
     
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * size
-    help_entries = query.order_by(HelpEntry.section, HelpEntry.created_at).offset(offset).limit(size).all()
-    
-    # Calculate pages
-    pages = (total + size - 1) // size if total > 0 else 0
+    result = paginate(
+        query, (HelpEntry.section, HelpEntry.created_at, HelpEntry.id),
+        page=page, size=size, cursor=cursor, count=count
+    )
     
     return HelpEntryListResponse(
-        help_entries=[HelpEntryResponse.model_validate(entry) for entry in help_entries],
-        total=total,
+        help_entries=[HelpEntryResponse.model_validate(entry) for entry in result.items],
+        total=result.total,
         page=page,
         size=size,
-        pages=pages
+        pages=result.pages,
+        next_cursor=result.next_cursor
     )
 
 
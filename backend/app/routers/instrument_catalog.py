@@ -11,8 +11,9 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
 from app.core.rbac import require_config_edit
-from app.core.security import get_current_user, get_user_permissions
+from app.core.security import get_current_user, resolve_auth_context
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.schemas.instrument_catalog import (
     CroSourceCreate,
     CroSourceResponse,
@@ -28,13 +29,13 @@ from models.client import Client
 from models.instrument import CroSource, Instrument, InstrumentType
 from models.user import User
 
-instrument_types_router = APIRouter(prefix="/instrument-types", tags=["instrument-types"])
-instruments_router = APIRouter(prefix="/instruments", tags=["instruments"])
-cro_sources_router = APIRouter(prefix="/cro-sources", tags=["cro-sources"])
+instrument_types_router = APIRouter(route_class=DbOffloadRoute, prefix="/instrument-types", tags=["instrument-types"])
+instruments_router = APIRouter(route_class=DbOffloadRoute, prefix="/instruments", tags=["instruments"])
+cro_sources_router = APIRouter(route_class=DbOffloadRoute, prefix="/cro-sources", tags=["cro-sources"])
 
 
 def _has_config_edit(user: User, db: Session) -> bool:
-    return "config:edit" in get_user_permissions(user, db)
+    return resolve_auth_context(user, db).has("config:edit")
 
 
 def _active_filter(query, model, user: User, db: Session):
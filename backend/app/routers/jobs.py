@@ -0,0 +1,31 @@
+"""
+Job status API — /api/v1/jobs
+
+Routes that queue work (dose-response fit/refit, run publish, SOP parse)
+answer 202 with a JobRead; clients poll GET /jobs/{id} until the job has
+succeeded (result) or failed (error: status_code + detail, as the route
+would have returned inline).
+"""
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user
+from app.core.routing import DbOffloadRoute
+from app.database import get_db
+from app.schemas.job import JobRead
+from app.services.job_queue import JobQueue
+from models.user import User
+
+router = APIRouter(route_class=DbOffloadRoute, prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=JobRead)
+def get_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Visible to the job's creator and to administrators; 404 otherwise."""
+    return JobRead.model_validate(JobQueue(db).get_for_user(job_id, current_user))
@@ -24,6 +24,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.rbac import require_experiment_manage
 from app.services.lims_run_checklist_service import LimsRunChecklistService
 from app.schemas.lims_run_checklist import (
@@ -36,7 +37,7 @@ from app.schemas.lims_run_checklist import (
 from models.lims_run_checklist import LimsRunChecklistStepStatus
 from models.user import User
 
-router = APIRouter(tags=["lims-run-checklists"])
+router = APIRouter(route_class=DbOffloadRoute, tags=["lims-run-checklists"])
 
 
 def _service(
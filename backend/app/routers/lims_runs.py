@@ -9,9 +9,10 @@ Routes:
     PATCH  /lims-runs/{id}/start               — draft → running (standard) | ordered → running (CRO)
     PATCH  /lims-runs/{id}/results-received    — running → results_received (CRO only)
     PATCH  /lims-runs/{id}/review              — running|results_received → complete
-    PATCH  /lims-runs/{id}/complete            — complete → published (requires experiment:publish)
+    PATCH  /lims-runs/{id}/complete            — complete → published (requires experiment:publish; queued, 202 + job)
     PATCH  /lims-runs/{id}/cancel              — any non-terminal → canceled
-    POST   /lims-runs/{id}/import              — import instrument data (running or results_received)
+    POST   /lims-runs/{id}/import              — import pre-parsed rows (running or results_received; queued, 202 + job)
+    POST   /lims-runs/{id}/import-file         — import a file with the run's data parser (queued, 202 + job)
     GET    /lims-runs/{id}/data                — list imported data rows
     GET    /lims-runs/{id}/worklist            — download robot worklist CSV
 """
@@ -23,8 +24,12 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.security import get_current_user, require_permission
 from app.core.rbac import require_experiment_manage
+from app.schemas.job import JobRead
+from app.services.job_handlers import LIMS_RUN_IMPORT, LIMS_RUN_IMPORT_ROWS, LIMS_RUN_PUBLISH
+from app.services.job_queue import JobQueue
 from app.services.lims_run_service import LimsRunService
 from app.schemas.flexible_experiment import (
     LimsRunCreate,
@@ -33,14 +38,13 @@ from app.schemas.flexible_experiment import (
     LimsRunRead,
     LimsRunListResponse,
     ImportDataRequest,
-    ImportDataResponse,
     LimsRunDataRead,
     LimsRunDataListResponse,
 )
 from models.flexible_experiment import LimsRunStatus, LimsRun
 from models.user import User
 
-router = APIRouter(prefix="/lims-runs", tags=["lims-runs"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/lims-runs", tags=["lims-runs"])
 
 
 def _run_service(
@@ -179,7 +183,7 @@ def submit_for_review(
     return _run_read(run)
 
 
-@router.patch("/{run_id}/complete", response_model=LimsRunRead)
+@router.patch("/{run_id}/complete", response_model=JobRead, status_code=202)
 def publish_run(
     run_id: UUID,
     db: Session = Depends(get_db),
@@ -188,12 +192,20 @@ def publish_run(
     """
     Transition: complete → published (requires experiment:publish).
 
-    When analysis_id is set, promotes instrument data to tests/results in the same
-    transaction. Conflicts with other runs return 409.
+    Checks the transition and analysis_id (400), then queues the publish and
+    returns 202 with the job; poll GET /v1/jobs/{id}. The job promotes
+    instrument data to tests/results in the same transaction as the status
+    change. Conflicts with other runs fail the job with error 409
+    (detail.code = "promotion_conflict", detail.preview).
     """
-    service = LimsRunService(db, current_user=publisher)
-    run = service.publish_run(run_id)
-    return _run_read(run)
+    LimsRunService(db, current_user=publisher).check_publishable(run_id)
+    job = JobQueue(db).enqueue(
+        LIMS_RUN_PUBLISH,
+        {"run_id": run_id},
+        user=publisher,
+        dedupe_key=f"{LIMS_RUN_PUBLISH}:{run_id}",
+    )
+    return JobRead.model_validate(job)
 
 
 @router.get("/{run_id}/promotion/preview")
@@ -218,40 +230,77 @@ def cancel_run(
     return _run_read(run)
 
 
-@router.post("/{run_id}/import", response_model=ImportDataResponse)
+@router.post("/{run_id}/import", response_model=JobRead, status_code=202)
 def import_data(
     run_id: UUID,
     data: ImportDataRequest,
-    service: LimsRunService = Depends(_run_service),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_experiment_manage),
 ):
-    """Import pre-parsed rows (prefer multipart /import-file for CSV + parser)."""
-    return service.import_data(run_id, data.rows)
+    """
+    Import pre-parsed rows (prefer multipart /import-file for CSV + parser).
+    Checks the run accepts data, then queues the import; the job's result is
+    the ImportDataResponse.
+    """
+    LimsRunService(db, current_user=current_user).check_importable(run_id)
+    job = JobQueue(db).enqueue(
+        LIMS_RUN_IMPORT_ROWS,
+        {"run_id": run_id, "rows": [row.model_dump(mode="json") for row in data.rows]},
+        user=current_user,
+    )
+    return JobRead.model_validate(job)
 
 
-@router.post("/{run_id}/import-file")
-async def import_file(
+@router.post("/{run_id}/import-file", response_model=JobRead, status_code=202)
+def import_file(
     run_id: UUID,
     file: UploadFile = File(...),
     instrument_id: Optional[UUID] = Form(None),
     cro_source_id: Optional[UUID] = Form(None),
     parser_id: Optional[UUID] = Form(None),
-    service: LimsRunService = Depends(_run_service),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_experiment_manage),
 ):
     """
     Multipart import: file + instrument_id XOR cro_source_id + optional parser_id.
     Uses active data parser for run.analysis_id + source.
-    """
-    from app.core.uploads import read_upload_capped
 
-    content = await read_upload_capped(file, field_name=file.filename or "import-file")
-    return service.import_file(
+    Checks the run and resolves the parser, then copies the spooled upload
+    (cap: LIMS_IMPORT_MAX_FILE_BYTES) into job_upload_chunks and queues a
+    lims_run.import job in the same commit, so a worker on any host can parse
+    it. The job's result is the ImportFileResponse. Plain def so the copy runs
+    in the threadpool, not on the event loop.
+    """
+    from app.core.config import LIMS_IMPORT_MAX_FILE_BYTES
+    from app.core.uploads import spooled_upload_capped
+    from app.services.job_uploads import stage_upload
+
+    stream = spooled_upload_capped(
+        file,
+        max_bytes=LIMS_IMPORT_MAX_FILE_BYTES,
+        field_name=file.filename or "import-file",
+    )
+    LimsRunService(db, current_user=current_user).check_importable(
         run_id,
-        content,
         instrument_id=instrument_id,
         cro_source_id=cro_source_id,
         parser_id=parser_id,
-        filename=file.filename,
+        require_parser=True,
+    )
+    upload_id = stage_upload(db, stream)
+    job = JobQueue(db).enqueue(
+        LIMS_RUN_IMPORT,
+        {
+            "run_id": run_id,
+            "upload_id": upload_id,
+            "instrument_id": instrument_id,
+            "cro_source_id": cro_source_id,
+            "parser_id": parser_id,
+            "filename": file.filename,
+        },
+        user=current_user,
     )
+    return JobRead.model_validate(job)
 
 
 @router.get("/{run_id}/imports")
@@ -2,18 +2,22 @@
 Lists router for NimbleLims
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.conditional import conditional_response
+from app.core.reference_cache import LISTS, invalidate_reference_data
 from models.list import List as ListModel, ListEntry
 from models.user import User
 from app.schemas.list import ListEntryResponse, ListResponse, ListEntryCreate, ListEntryUpdate, ListCreate, ListUpdate
-from app.core.security import get_current_user, get_user_permissions
+from app.core.security import get_current_user, resolve_auth_context
 from app.core.rbac import require_config_edit
 from datetime import datetime
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.post("", response_model=ListResponse, status_code=status.HTTP_201_CREATED)
@@ -46,6 +50,7 @@ async def create_list(
     )
     
     db.add(new_list)
+    invalidate_reference_data(db, LISTS)
     db.commit()
     db.refresh(new_list)
     
@@ -62,6 +67,7 @@ async def create_list(
 
 @router.get("", response_model=List[ListResponse])
 async def get_lists(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -69,35 +75,37 @@ async def get_lists(
     Get all active lists with their entries.
     For users with config:edit permission, returns all entries (active and inactive).
     For other users, returns only active entries.
+    Supports If-None-Match: an unchanged body is answered 304 from memory.
     """
     # Check if user has config:edit permission
-    user_permissions = get_user_permissions(current_user, db)
-    has_config_edit = "config:edit" in user_permissions
-    
-    lists = db.query(ListModel).filter(ListModel.active == True).all()
-    result = []
-    for list_obj in lists:
-        # If user has config:edit permission, show all entries; otherwise, only active
-        if has_config_edit:
-            entries = db.query(ListEntry).filter(
-                ListEntry.list_id == list_obj.id
-            ).all()
-        else:
-            entries = db.query(ListEntry).filter(
-                ListEntry.list_id == list_obj.id,
-                ListEntry.active == True
-            ).all()
-        list_response = ListResponse(
-            id=list_obj.id,
-            name=list_obj.name,
-            description=list_obj.description,
-            active=list_obj.active,
-            created_at=list_obj.created_at,
-            modified_at=list_obj.modified_at,
-            entries=[ListEntryResponse.from_orm(entry) for entry in entries]
-        )
-        result.append(list_response)
-    return result
+    has_config_edit = resolve_auth_context(current_user, db).has("config:edit")
+
+    def render():
+        # Lists and their entries in one query, grouped below
+        entry_join = ListEntry.list_id == ListModel.id
+        if not has_config_edit:
+            entry_join = and_(entry_join, ListEntry.active == True)
+        rows = db.query(ListModel, ListEntry).outerjoin(ListEntry, entry_join).filter(
+            ListModel.active == True
+        ).order_by(ListModel.name, ListEntry.name, ListEntry.id).all()
+
+        result = []
+        for list_obj, entry in rows:
+            if not result or result[-1].id != list_obj.id:
+                result.append(ListResponse(
+                    id=list_obj.id,
+                    name=list_obj.name,
+                    description=list_obj.description,
+                    active=list_obj.active,
+                    created_at=list_obj.created_at,
+                    modified_at=list_obj.modified_at,
+                    entries=[]
+                ))
+            if entry is not None:
+                result[-1].entries.append(ListEntryResponse.from_orm(entry))
+        return result
+
+    return conditional_response(request, (LISTS,), has_config_edit, render)
 
 
 @router.patch("/{list_id}", response_model=ListResponse)
@@ -141,6 +149,7 @@ async def update_list(
     list_obj.modified_by = current_user.id
     list_obj.modified_at = datetime.utcnow()
     
+    invalidate_reference_data(db, LISTS)
     db.commit()
     db.refresh(list_obj)
     
@@ -182,6 +191,7 @@ async def delete_list(
     list_obj.modified_by = current_user.id
     list_obj.modified_at = datetime.utcnow()
     
+    invalidate_reference_data(db, LISTS)
     db.commit()
     
     return None
@@ -199,8 +209,7 @@ async def get_list_entries(
     For other users, returns only active entries.
     """
     # Check if user has config:edit permission
-    user_permissions = get_user_permissions(current_user, db)
-    has_config_edit = "config:edit" in user_permissions
+    has_config_edit = resolve_auth_context(current_user, db).has("config:edit")
     
     # Find the list by name
     list_obj = db.query(ListModel).filter(
@@ -275,6 +284,7 @@ async def create_list_entry(
     )
     
     db.add(new_entry)
+    invalidate_reference_data(db, LISTS)
     db.commit()
     db.refresh(new_entry)
     
@@ -340,6 +350,7 @@ async def update_list_entry(
     entry.modified_by = current_user.id
     entry.modified_at = datetime.utcnow()
     
+    invalidate_reference_data(db, LISTS)
     db.commit()
     db.refresh(entry)
     
@@ -386,6 +397,7 @@ async def delete_list_entry(
     entry.modified_by = current_user.id
     entry.modified_at = datetime.utcnow()
     
+    invalidate_reference_data(db, LISTS)
     db.commit()
     
     return None
@@ -5,6 +5,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.user import User, Permission
 from app.schemas.user import (
     PermissionResponse,
@@ -13,9 +14,10 @@ from app.schemas.user import (
 )
 from app.core.security import get_current_user
 from app.core.rbac import require_any_permission
+from app.core.auth_cache import invalidate_all
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("", response_model=List[PermissionResponse])
@@ -99,6 +101,7 @@ async def update_permission(
     
     permission.modified_by = current_user.id
     db.commit()
+    invalidate_all()
     db.refresh(permission)
     
     return PermissionResponse.from_orm(permission)
@@ -124,6 +127,7 @@ async def delete_permission(
     permission.active = False
     permission.modified_by = current_user.id
     db.commit()
+    invalidate_all()
     
     return None
 
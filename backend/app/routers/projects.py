@@ -3,9 +3,12 @@ Projects router for NimbleLIMS
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import status as http_status  # get_projects' status filter shadows status
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.pagination import CountMode, paginate
 from models.project import Project
 from models.user import User
 from models.client import Client, ClientProject
@@ -22,7 +25,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("", response_model=ProjectListResponse)
@@ -31,6 +34,8 @@ async def get_projects(
     client_id: Optional[UUID] = Query(None, description="Filter by client ID"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor (overrides page)"),
+    count: CountMode = Query(CountMode.exact, description="How to compute total: exact, estimate (planner row estimate) or none"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -59,19 +64,15 @@ async def get_projects(
         if client_id:
             query = query.filter(Project.client_id == client_id)
         
-        # Get total count (RLS will filter this automatically)
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * size
-        projects = query.order_by(Project.name).offset(offset).limit(size).all()
-        
-        # Calculate pages
-        pages = (total + size - 1) // size if total > 0 else 0
+        # Count and page (RLS filters both); name is unique, id keeps the key total
+        page_result = paginate(
+            query, (Project.name, Project.id),
+            page=page, size=size, cursor=cursor, count=count
+        )
         
         # Convert to response format
         result = []
-        for project in projects:
+        for project in page_result.items:
             try:
                 # Create response object
                 project_response = ProjectResponse(
@@ -109,15 +110,18 @@ async def get_projects(
         
         return ProjectListResponse(
             projects=result,
-            total=total,
+            total=page_result.total,
             page=page,
             size=size,
-            pages=pages,
+            pages=page_result.pages,
+            next_cursor=page_result.next_cursor,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_projects: {e}", exc_info=True)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve projects: {str(e)}"
         )
 
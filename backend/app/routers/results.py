@@ -6,6 +6,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.conversions import ConversionError, convert
+from app.core.pagination import CountMode, paginate
+from app.core.reference_cache import find_list_entry
 from models.result import Result
 from models.test import Test
 from models.sample import Sample
@@ -13,7 +17,6 @@ from models.analysis import AnalysisAnalyte
 from models.user import User
 from models.batch import Batch, BatchContainer
 from models.container import Container, Contents
-from models.list import ListEntry, List as ListModel
 import os
 from app.schemas.result import (
     ResultCreate, ResultUpdate, ResultResponse, ResultListResponse,
@@ -27,11 +30,13 @@ from app.core.rbac import (
     require_any_permission,
     validate_client_access
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, resolve_auth_context
+from app.services.batch_result_entry_service import BatchResultEntryService
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("/", response_model=ResultListResponse)
@@ -42,6 +47,8 @@ async def get_results(
     entered_by: Optional[UUID] = Query(None, description="Filter by user who entered results"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor (overrides page)"),
+    count: CountMode = Query(CountMode.exact, description="How to compute total: exact, estimate (planner row estimate) or none"),
     current_user: User = Depends(require_result_read),
     db: Session = Depends(get_db)
 ):
@@ -90,22 +97,18 @@ async def get_results(
                 Result.custom_attributes.op("@>")(cast(filter_dict, JSONB))
             )
     
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * size
-    results = query.offset(offset).limit(size).all()
-    
-    # Calculate pages
-    pages = (total + size - 1) // size
+    page_result = paginate(
+        query, (Result.created_at, Result.id),
+        page=page, size=size, cursor=cursor, count=count
+    )
     
     return ResultListResponse(
-        results=[ResultResponse.from_orm(result) for result in results],
-        total=total,
+        results=[ResultResponse.from_orm(result) for result in page_result.items],
+        total=page_result.total,
         page=page,
         size=size,
-        pages=pages
+        pages=page_result.pages,
+        next_cursor=page_result.next_cursor
     )
 
 
@@ -210,12 +213,15 @@ async def enter_batch_results_us28(
     Enter results for a batch (US-28: Batch Results Entry).
     Accepts batch_id and list of test results with analyte_results.
     Validates permissions, runs validations, checks QC, and updates test statuses.
+    Analytes and existing results are prefetched in bulk and results are
+    written with one upsert per UPSERT_BATCH_SIZE rows (BatchResultEntryService).
     """
-    from app.core.rbac import require_batch_read
-    
     # Check batch access (batch:read permission)
-    batch_read_check = require_batch_read()
-    await batch_read_check(current_user=current_user, db=db)
+    if not resolve_auth_context(current_user, db).has("batch:read"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission 'batch:read' required"
+        )
     
     # Fetch batch
     batch = db.query(Batch).filter(
@@ -235,18 +241,18 @@ async def enter_batch_results_us28(
     ).all()
     
     if not batch_containers:
-            raise HTTPException(
+        raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Batch has no containers"
-            )
+        )
     
     # Get all samples from batch containers
     container_ids = [bc.container_id for bc in batch_containers]
-    contents = db.query(Contents).filter(
-        Contents.container_id.in_(container_ids)
-    ).all()
-    
-    sample_ids = [c.sample_id for c in contents]
+    sample_ids = [
+        row.sample_id for row in db.query(Contents.sample_id).filter(
+            Contents.container_id.in_(container_ids)
+        )
+    ]
     if not sample_ids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -259,36 +265,20 @@ async def enter_batch_results_us28(
         Test.active == True
     ).all()
     
-    test_ids = {t.id for t in tests}
+    # Build test lookup
+    test_lookup = {t.id: t for t in tests}
     
     # Validate all test_ids in request exist in batch
     requested_test_ids = {tr.test_id for tr in batch_data.results}
-    invalid_test_ids = requested_test_ids - test_ids
+    invalid_test_ids = requested_test_ids - test_lookup.keys()
     if invalid_test_ids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Tests not found in batch: {', '.join(str(tid) for tid in invalid_test_ids)}"
         )
     
-    # Build test lookup
-    test_lookup = {t.id: t for t in tests}
-    
-    # Validation errors per row
-    validation_errors = []
-    qc_failures = []
-    
     # Get "Complete" status for tests
-    test_status_list = db.query(ListModel).filter(
-        ListModel.name == "test_status"
-    ).first()
-    
-    if test_status_list:
-        complete_status_entry = db.query(ListEntry).filter(
-            ListEntry.list_id == test_status_list.id,
-            ListEntry.name == "Complete"
-        ).first()
-    else:
-        complete_status_entry = None
+    complete_status_entry = find_list_entry(db, "test_status", "Complete", active_only=False)
     
     if not complete_status_entry:
         raise HTTPException(
@@ -301,189 +291,16 @@ async def enter_batch_results_us28(
     # Get QC block configuration
     fail_qc_blocks_batch = os.getenv("FAIL_QC_BLOCKS_BATCH", "false").lower() == "true"
     
+    entry = BatchResultEntryService(db, current_user.id)
+    
     # Start transaction
     try:
-        created_results = []
-        updated_tests = []
-        
-        # Process each test result entry
-        for test_result_entry in batch_data.results:
-            test = test_lookup.get(test_result_entry.test_id)
-            if not test:
-                validation_errors.append({
-                    "test_id": str(test_result_entry.test_id),
-                    "error": "Test not found in batch"
-                })
-                continue
-            
-            # Get analysis_analytes for this test
-            analysis_analytes = db.query(AnalysisAnalyte).filter(
-                AnalysisAnalyte.analysis_id == test.analysis_id,
-                AnalysisAnalyte.active == True
-            ).all()
-            
-            analyte_lookup = {aa.analyte_id: aa for aa in analysis_analytes}
-            
-            # Process each analyte result
-            for analyte_result in test_result_entry.analyte_results:
-                analyte_id = analyte_result.analyte_id
-                analysis_analyte = analyte_lookup.get(analyte_id)
-                
-                if not analysis_analyte:
-                    validation_errors.append({
-                        "test_id": str(test_result_entry.test_id),
-                        "analyte_id": str(analyte_id),
-                        "error": "Analyte not configured for this analysis"
-                    })
-                    continue
-                
-                # Validate required analytes
-                if analysis_analyte.is_required and not analyte_result.raw_result and not analyte_result.reported_result:
-                    validation_errors.append({
-                        "test_id": str(test_result_entry.test_id),
-                        "analyte_id": str(analyte_id),
-                        "error": f"Required analyte '{analysis_analyte.reported_name or analysis_analyte.analyte.name}' must have a result"
-                    })
-                    continue
-                
-                # Validate data type
-                if analysis_analyte.data_type == "numeric":
-                    if analyte_result.raw_result:
-                        try:
-                            float(analyte_result.raw_result)
-                        except ValueError:
-                            validation_errors.append({
-                                "test_id": str(test_result_entry.test_id),
-                                "analyte_id": str(analyte_id),
-                                "error": f"Raw result '{analyte_result.raw_result}' is not numeric"
-                            })
-                            continue
-                    
-                    if analyte_result.reported_result:
-                        try:
-                            float(analyte_result.reported_result)
-                        except ValueError:
-                            validation_errors.append({
-                                "test_id": str(test_result_entry.test_id),
-                                "analyte_id": str(analyte_id),
-                                "error": f"Reported result '{analyte_result.reported_result}' is not numeric"
-                            })
-                            continue
-                
-                # Validate range
-                if analysis_analyte.data_type == "numeric" and analyte_result.raw_result:
-                    try:
-                        raw_val = float(analyte_result.raw_result)
-                        if analysis_analyte.low_value is not None and raw_val < analysis_analyte.low_value:
-                            validation_errors.append({
-                                "test_id": str(test_result_entry.test_id),
-                                "analyte_id": str(analyte_id),
-                                "error": f"Raw result {raw_val} is below minimum {analysis_analyte.low_value}"
-                            })
-                            continue
-                        if analysis_analyte.high_value is not None and raw_val > analysis_analyte.high_value:
-                            validation_errors.append({
-                                "test_id": str(test_result_entry.test_id),
-                                "analyte_id": str(analyte_id),
-                                "error": f"Raw result {raw_val} is above maximum {analysis_analyte.high_value}"
-                            })
-                            continue
-                    except ValueError:
-                        pass  # Already caught by data type validation
-                
-                # Check if result already exists (update) or create new
-                existing_result = db.query(Result).filter(
-                    Result.test_id == test_result_entry.test_id,
-                    Result.analyte_id == analyte_id,
-                    Result.replicate == 1,
-                    Result.active == True
-                ).first()
-                
-                if existing_result:
-                    # Update existing result
-                    existing_result.raw_result = analyte_result.raw_result
-                    existing_result.reported_result = analyte_result.reported_result
-                    existing_result.qualifiers = analyte_result.qualifiers
-                    existing_result.modified_by = current_user.id
-                    existing_result.modified_at = datetime.utcnow()
-                    created_results.append(existing_result)
-                else:
-                    # Create new result
-                    new_result = Result(
-                        test_id=test_result_entry.test_id,
-                        analyte_id=analyte_id,
-                        raw_result=analyte_result.raw_result,
-                        reported_result=analyte_result.reported_result,
-                        qualifiers=analyte_result.qualifiers,
-                        entry_date=datetime.utcnow(),
-                        entered_by=current_user.id,
-                        created_by=current_user.id,
-                        modified_by=current_user.id,
-                        replicate=1,
-                    )
-                    db.add(new_result)
-                    created_results.append(new_result)
-    
-            # Check if all required analytes are entered for this test
-            required_analytes = [aa for aa in analysis_analytes if aa.is_required]
-            entered_analyte_ids = {ar.analyte_id for ar in test_result_entry.analyte_results}
-            missing_required = [aa for aa in required_analytes if aa.analyte_id not in entered_analyte_ids]
-            
-            # Check if test has all results (all analytes have results)
-            all_analyte_ids = {aa.analyte_id for aa in analysis_analytes}
-            existing_results = db.query(Result).filter(
-                Result.test_id == test_result_entry.test_id,
-                Result.analyte_id.in_(all_analyte_ids),
-                Result.active == True
-            ).all()
-            existing_analyte_ids = {r.analyte_id for r in existing_results}
-            
-            # Add newly entered analytes
-            all_entered_analyte_ids = existing_analyte_ids | entered_analyte_ids
-            
-            # Update test status to Complete if all analytes have results
-            if all_analyte_ids.issubset(all_entered_analyte_ids) and test.status != complete_status_id:
-                test.status = complete_status_id
-                test.modified_by = current_user.id
-                test.modified_at = datetime.utcnow()
-                updated_tests.append(test)
-        
-        # Check QC samples for failures
-        qc_samples = db.query(Sample).filter(
-            Sample.id.in_(sample_ids),
-            Sample.qc_type.isnot(None),
-            Sample.active == True
-        ).all()
-        
-        if qc_samples:
-            # Get QC test results
-            qc_sample_ids = {s.id for s in qc_samples}
-            qc_tests = db.query(Test).filter(
-                Test.sample_id.in_(qc_sample_ids),
-                Test.active == True
-            ).all()
-            
-            # Check for QC failures (simplified: check if any QC test has no results or failed validation)
-            for qc_test in qc_tests:
-                qc_results = db.query(Result).filter(
-                    Result.test_id == qc_test.id,
-                    Result.active == True
-                ).all()
-                
-                if not qc_results:
-                    qc_failures.append({
-                        "test_id": str(qc_test.id),
-                        "sample_id": str(qc_test.sample_id),
-                        "reason": "No results entered for QC sample"
-                    })
-                else:
-                    # Check if QC results are within expected ranges (simplified check)
-                    # In practice, this would check against QC acceptance criteria
-                    pass
+        validation_errors, result_rows, completed_tests = entry.plan(
+            batch_data.results, test_lookup
+        )
         
-        # If validation errors exist, rollback and return errors
+        # If validation errors exist, nothing has been written; return errors
         if validation_errors:
-            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -492,6 +309,19 @@ async def enter_batch_results_us28(
                 }
             )
         
+        entry.upsert_results(result_rows)
+        
+        # Update test status to Complete where all analytes now have results
+        now = datetime.utcnow()
+        for test in completed_tests:
+            if test.status != complete_status_id:
+                test.status = complete_status_id
+                test.modified_by = current_user.id
+                test.modified_at = now
+        
+        # Check QC samples for failures (QC tests with no results, including this entry)
+        qc_failures = entry.find_qc_failures(sample_ids)
+        
         # If QC failures and blocking is enabled, rollback
         if qc_failures and fail_qc_blocks_batch:
             db.rollback()
@@ -504,34 +334,20 @@ async def enter_batch_results_us28(
             )
         
         # Check if all tests in batch are complete and update batch status
-        all_batch_tests = db.query(Test).filter(
-            Test.sample_id.in_(sample_ids),
-            Test.active == True
-        ).all()
+        completed_status_entry = find_list_entry(db, "batch_status", "Completed", active_only=False)
         
-        # Get batch status list
-        batch_status_list = db.query(ListModel).filter(
-            ListModel.name == "batch_status"
-        ).first()
-        
-        if batch_status_list:
-            completed_status_entry = db.query(ListEntry).filter(
-                ListEntry.list_id == batch_status_list.id,
-                ListEntry.name == "Completed"
-            ).first()
+        if completed_status_entry:
+            # Check if all tests are complete
+            all_tests_complete = all(
+                test.status == complete_status_id for test in tests
+            ) if tests else False
             
-            if completed_status_entry:
-                # Check if all tests are complete
-                all_tests_complete = all(
-                    test.status == complete_status_id for test in all_batch_tests
-                ) if all_batch_tests else False
-                
-                # Update batch status to "Completed" if all tests are complete
-                if all_tests_complete and batch.status != completed_status_entry.id:
-                    batch.status = completed_status_entry.id
-                    batch.end_date = datetime.utcnow()
-                    batch.modified_by = current_user.id
-                    batch.modified_at = datetime.utcnow()
+            # Update batch status to "Completed" if all tests are complete
+            if all_tests_complete and batch.status != completed_status_entry.id:
+                batch.status = completed_status_entry.id
+                batch.end_date = now
+                batch.modified_by = current_user.id
+                batch.modified_at = now
         
         # Commit transaction
         db.commit()
@@ -613,17 +429,22 @@ async def validate_result(
         except ValueError:
             errors.append("Result must be numeric")
     
-    # Validate range
+    # Validate range (limits are in the analyte's default unit; convert exactly when needed)
     if analysis_analyte.low_value is not None or analysis_analyte.high_value is not None:
         try:
             if validation_data.raw_result:
-                raw_val = float(validation_data.raw_result)
+                raw_val = Decimal(validation_data.raw_result.strip())
+                default_unit = analysis_analyte.analyte.units_default if analysis_analyte.analyte else None
+                if validation_data.units and default_unit and validation_data.units != default_unit:
+                    raw_val = convert(raw_val, validation_data.units, default_unit, db, exact=True)
                 if analysis_analyte.low_value is not None and raw_val < analysis_analyte.low_value:
-                    errors.append(f"Raw result {raw_val} is below minimum {analysis_analyte.low_value}")
+                    errors.append(f"Raw result {float(raw_val)} is below minimum {analysis_analyte.low_value}")
                 if analysis_analyte.high_value is not None and raw_val > analysis_analyte.high_value:
-                    errors.append(f"Raw result {raw_val} is above maximum {analysis_analyte.high_value}")
-        except ValueError:
+                    errors.append(f"Raw result {float(raw_val)} is above maximum {analysis_analyte.high_value}")
+        except (InvalidOperation, ValueError):
             pass  # Already caught by data type validation
+        except ConversionError as e:
+            errors.append(f"Cannot convert raw result to the analyte's default unit: {e}")
     
     # Check significant figures
     if analysis_analyte.significant_figures:
@@ -5,6 +5,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.user import User, Role, Permission, role_permissions
 from app.schemas.user import (
     RoleResponse,
@@ -18,9 +19,10 @@ from app.schemas.user import (
 )
 from app.core.security import get_current_user
 from app.core.rbac import require_any_permission
+from app.core.auth_cache import invalidate_role
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 # Roles endpoints
@@ -105,6 +107,7 @@ async def update_role(
     
     role.modified_by = current_user.id
     db.commit()
+    invalidate_role(role.id)
     db.refresh(role)
     
     return RoleResponse.from_orm(role)
@@ -139,6 +142,7 @@ async def delete_role(
     role.active = False
     role.modified_by = current_user.id
     db.commit()
+    invalidate_role(role.id)
     
     return None
 
@@ -206,6 +210,7 @@ async def update_role_permissions(
     
     role.modified_by = current_user.id
     db.commit()
+    invalidate_role(role_id)
     
     # Return updated permissions
     updated_permissions = db.query(Permission).join(role_permissions).filter(
@@ -9,13 +9,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.security import get_current_user
 from app.services.eln_process_service import ELNProcessService
 from app.schemas.eln_process import SampleJourneyResponse
 from models.user import User
 from models.sample import Sample
 
-router = APIRouter(prefix="/samples", tags=["sample-journey"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/samples", tags=["sample-journey"])
 
 
 @router.get("/{sample_id}/journey", response_model=SampleJourneyResponse)
@@ -8,6 +8,8 @@ from sqlalchemy import and_, or_, func, case, text, literal_column
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import cast
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.pagination import CountMode, paginate
 from models.sample import Sample
 from models.project import Project
 from models.user import User
@@ -22,21 +24,25 @@ from app.core.rbac import (
     require_sample_create, require_sample_read, require_sample_update,
     require_sample_delete, require_project_access, validate_client_access
 )
-from app.core.security import get_current_user, set_current_user_id
+from app.core.security import get_current_user
+from app.services.bulk_accession_service import BulkAccessionEngine
+from app.services.eligible_samples_service import EligibleSamplesQuery
+from app.core.reference_cache import find_list_entry, get_container_type, list_by_name, list_entry
 from datetime import datetime, timedelta
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("/eligible", response_model=EligibleSamplesResponse)
-async def get_eligible_samples(
+def get_eligible_samples(
     request: Request,
     test_ids: Optional[str] = Query(None, description="Comma-separated list of test/analysis IDs to filter by"),
     project_id: Optional[str] = Query(None, description="Filter by project ID"),
     include_expired: bool = Query(False, description="Include expired samples in results"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor (overrides page)"),
     current_user: User = Depends(require_sample_read),
     db: Session = Depends(get_db)
 ):
@@ -58,7 +64,10 @@ async def get_eligible_samples(
     - project_id: Filter by specific project
     - include_expired: If False (default), excludes samples with days_until_expiration < 0
     - page/size: Pagination
+    - cursor: next_cursor from the previous page; continues after its last row without OFFSET
     
+    Ordering, day counts and the expired/overdue totals are computed in SQL
+    (EligibleSamplesQuery); only the requested page is loaded.
     RLS enforces access via has_project_access.
     """
     # Parse test_ids (analysis IDs)
@@ -83,188 +92,25 @@ async def get_eligible_samples(
                 detail="Invalid project_id format. Expected UUID."
             )
     
-    # Build base query with project join for due_date inheritance
-    # We need to join with tests and analyses to get shelf_life for expiration calculation
-    now = datetime.utcnow()
-    
-    # Get completed and cancelled test status IDs to exclude
-    from models.list import List, ListEntry
-    test_status_list = db.query(List).filter(List.name == "test_status").first()
-    excluded_status_ids = []
-    if test_status_list:
-        excluded_statuses = db.query(ListEntry.id).filter(
-            ListEntry.list_id == test_status_list.id,
-            ListEntry.name.in_(["Complete", "Completed", "Cancelled", "Canceled"]),
-            ListEntry.active == True
-        ).all()
-        excluded_status_ids = [s.id for s in excluded_statuses]
-    
-    # Subquery to get the minimum shelf_life analysis for each sample
-    # This ensures we use the most restrictive (shortest) shelf_life
-    # Only includes tests that are NOT completed or cancelled
-    if analysis_ids:
-        # Filter by specific analyses
-        shelf_life_subq_query = (
-            db.query(
-                Test.sample_id,
-                func.min(Analysis.shelf_life).label('min_shelf_life'),
-            )
-            .join(Analysis, Test.analysis_id == Analysis.id)
-            .filter(Test.active == True)
-            .filter(Analysis.active == True)
-            .filter(Test.analysis_id.in_(analysis_ids))
-        )
-        # Exclude completed/cancelled tests
-        if excluded_status_ids:
-            shelf_life_subq_query = shelf_life_subq_query.filter(~Test.status.in_(excluded_status_ids))
-        shelf_life_subq = shelf_life_subq_query.group_by(Test.sample_id).subquery()
-    else:
-        # All analyses
-        shelf_life_subq_query = (
-            db.query(
-                Test.sample_id,
-                func.min(Analysis.shelf_life).label('min_shelf_life'),
-            )
-            .join(Analysis, Test.analysis_id == Analysis.id)
-            .filter(Test.active == True)
-            .filter(Analysis.active == True)
-        )
-        # Exclude completed/cancelled tests
-        if excluded_status_ids:
-            shelf_life_subq_query = shelf_life_subq_query.filter(~Test.status.in_(excluded_status_ids))
-        shelf_life_subq = shelf_life_subq_query.group_by(Test.sample_id).subquery()
-    
-    # Main query with computed prioritization fields
-    query = (
-        db.query(
-            Sample,
-            Project.name.label('project_name'),
-            Project.due_date.label('project_due_date'),
-            shelf_life_subq.c.min_shelf_life.label('shelf_life'),
-        )
-        .join(Project, Sample.project_id == Project.id)
-        .outerjoin(shelf_life_subq, Sample.id == shelf_life_subq.c.sample_id)
-        .filter(Sample.active == True)
+    result = EligibleSamplesQuery(db).page(
+        analysis_ids=analysis_ids,
+        project_id=project_id_uuid,
+        include_expired=include_expired,
+        page=page,
+        size=size,
+        cursor=cursor,
     )
-    
-    # Apply project filter
-    if project_id_uuid:
-        query = query.filter(Sample.project_id == project_id_uuid)
-    
-    # If analysis_ids provided, filter to samples that have tests for those analyses
-    # Only include samples with tests that are NOT completed or cancelled
-    if analysis_ids:
-        sample_ids_with_tests_query = (
-            db.query(Test.sample_id)
-            .filter(Test.analysis_id.in_(analysis_ids))
-            .filter(Test.active == True)
-        )
-        # Exclude completed/cancelled tests
-        if excluded_status_ids:
-            sample_ids_with_tests_query = sample_ids_with_tests_query.filter(~Test.status.in_(excluded_status_ids))
-        sample_ids_with_tests = sample_ids_with_tests_query.distinct().subquery()
-        query = query.filter(Sample.id.in_(db.query(sample_ids_with_tests.c.sample_id)))
-    
-    # Get all results for processing (RLS handles access control)
-    all_results = query.all()
-    
-    # Process results and compute prioritization fields
-    eligible_samples = []
-    warnings = []
-    expired_count = 0
-    overdue_count = 0
-    
-    for row in all_results:
-        sample = row[0]  # Sample object
-        project_name = row.project_name
-        project_due_date = row.project_due_date
-        shelf_life = row.shelf_life
-        
-        # Compute effective due date (sample > project)
-        effective_due_date = sample.due_date if sample.due_date else project_due_date
-        
-        # Compute days_until_due
-        days_until_due = None
-        is_overdue = False
-        if effective_due_date:
-            delta = effective_due_date - now
-            days_until_due = delta.days
-            is_overdue = days_until_due < 0
-            if is_overdue:
-                overdue_count += 1
-        
-        # Compute days_until_expiration
-        days_until_expiration = None
-        is_expired = False
-        expiration_warning = None
-        
-        if sample.date_sampled and shelf_life:
-            expiration_date = sample.date_sampled + timedelta(days=shelf_life)
-            delta = expiration_date - now
-            days_until_expiration = delta.days
-            is_expired = days_until_expiration < 0
-            
-            if is_expired:
-                expired_count += 1
-                expiration_warning = f"Sample expired {abs(days_until_expiration)} days ago"
-            elif days_until_expiration <= 3:
-                expiration_warning = f"Sample expires in {days_until_expiration} days"
-        
-        # Skip expired samples if not including them
-        if is_expired and not include_expired:
-            continue
-        
-        eligible_samples.append({
-            'id': sample.id,
-            'name': sample.name,
-            'description': sample.description,
-            'due_date': sample.due_date,
-            'received_date': sample.received_date,
-            'date_sampled': sample.date_sampled,
-            'sample_type': sample.sample_type,
-            'status': sample.status,
-            'matrix': sample.matrix,
-            'project_id': sample.project_id,
-            'qc_type': sample.qc_type,
-            'days_until_expiration': days_until_expiration,
-            'days_until_due': days_until_due,
-            'is_expired': is_expired,
-            'is_overdue': is_overdue,
-            'expiration_warning': expiration_warning,
-            'shelf_life': shelf_life,
-            'project_name': project_name,
-            'project_due_date': project_due_date,
-            'effective_due_date': effective_due_date,
-        })
-    
-    # Sort by days_until_expiration ASC NULLS LAST, then days_until_due ASC NULLS LAST
-    def sort_key(s):
-        # None values should sort last (use a large number)
-        exp = s['days_until_expiration'] if s['days_until_expiration'] is not None else float('inf')
-        due = s['days_until_due'] if s['days_until_due'] is not None else float('inf')
-        return (exp, due)
-    
-    eligible_samples.sort(key=sort_key)
-    
-    # Add warnings
-    if expired_count > 0:
-        warnings.append(f"{expired_count} expired sample(s) found")
-    if overdue_count > 0:
-        warnings.append(f"{overdue_count} overdue sample(s) found")
-    
-    # Apply pagination
-    total = len(eligible_samples)
-    offset = (page - 1) * size
-    paginated_samples = eligible_samples[offset:offset + size]
+    total = result.total
     pages = (total + size - 1) // size if total > 0 else 1
     
     return EligibleSamplesResponse(
-        samples=[EligibleSampleResponse(**s) for s in paginated_samples],
+        samples=[EligibleSampleResponse(**s) for s in result.rows],
         total=total,
         page=page,
         size=size,
         pages=pages,
-        warnings=warnings
+        warnings=result.warnings,
+        next_cursor=result.next_cursor
     )
 
 
@@ -352,14 +198,16 @@ async def get_samples(
     qc_type: Optional[str] = Query(None, description="Filter by QC type ID"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor (overrides page)"),
+    count: CountMode = Query(CountMode.exact, description="How to compute total: exact, estimate (planner row estimate) or none"),
     current_user: User = Depends(require_sample_read),
     db: Session = Depends(get_db)
 ):
     """
     Get samples with filtering and pagination.
-    Scoped by user access via RLS (samples_access policy).
+    Scoped by user access via RLS (samples_access policy); GUCs are bound in get_current_user.
+    Ordered by (created_at, id); ?cursor= pages by keyset, ?count= picks exact/estimate/none totals.
     """
-    set_current_user_id(str(current_user.id), db)
     # Convert empty strings to None and parse UUIDs
     project_id_uuid = None
     status_uuid = None
@@ -459,42 +307,19 @@ async def get_samples(
                 Sample.custom_attributes.op("@>")(cast(filter_dict, JSONB))
             )
     
-    # Get total count - use func.count() directly to avoid subquery wrapping that can interfere with RLS
-    # Build a count query that mirrors the main query filters (without joinedload)
-    from sqlalchemy import func
-    count_query = db.query(func.count(Sample.id)).filter(Sample.active == True)
-    
-    # Apply the same filters to count query
-    if project_id_uuid:
-        count_query = count_query.filter(Sample.project_id == project_id_uuid)
-    if status_uuid:
-        count_query = count_query.filter(Sample.status == status_uuid)
-    if qc_type_uuid:
-        count_query = count_query.filter(Sample.qc_type == qc_type_uuid)
-    
-    # Apply custom_attributes JSONB filters to count query
-    if custom_filters:
-        for attr_name, attr_value in custom_filters.items():
-            filter_dict = {attr_name: attr_value}
-            count_query = count_query.filter(
-                Sample.custom_attributes.op("@>")(cast(filter_dict, JSONB))
-            )
-    
-    total = count_query.scalar()
-    
-    # Apply pagination
-    offset = (page - 1) * size
-    samples = query.offset(offset).limit(size).all()
-    
-    # Calculate pages
-    pages = (total + size - 1) // size
+    # Stable, indexed order (created_at, id) so offset and cursor pages agree
+    result = paginate(
+        query, (Sample.created_at, Sample.id),
+        page=page, size=size, cursor=cursor, count=count
+    )
     
     return SampleListResponse(
-        samples=[SampleResponse.model_validate(sample) for sample in samples],
-        total=total,
+        samples=[SampleResponse.model_validate(sample) for sample in result.items],
+        total=result.total,
         page=page,
         size=size,
-        pages=pages
+        pages=result.pages,
+        next_cursor=result.next_cursor
     )
 
 
@@ -507,9 +332,8 @@ async def get_sample(
     """
     Get a specific sample by ID.
     Access is enforced by RLS (samples_access policy via has_project_access(project_id)).
-    Set app.current_user_id so RLS applies; if the user has no access, the query returns no row -> 404.
+    app.current_user_id is bound by get_current_user; if the user has no access, the query returns no row -> 404.
     """
-    set_current_user_id(str(current_user.id), db)
     sample = db.query(Sample).filter(
         Sample.id == sample_id,
         Sample.active == True
@@ -613,7 +437,6 @@ async def accession_sample(
         logger.info(f"Accessioning sample for user {current_user.id}, client_id={accession_data.client_id}, client_project_id={accession_data.client_project_id}")
         
         from models.client import Client, ClientProject
-        from models.list import List, ListEntry
         from models.project import ProjectUser
         from app.core.name_generation import generate_name_for_sample, generate_name_for_project
         
@@ -654,18 +477,14 @@ async def accession_sample(
             logger.info("Auto-creating project")
             # Auto-create project
             # Get "Active" status for projects
-            project_status_list = db.query(List).filter(List.name == "project_status").first()
-            if not project_status_list:
+            if not list_by_name(db, "project_status"):
                 logger.error("Project status list not found")
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Project status list not found in configuration"
                 )
             
-            active_status = db.query(ListEntry).filter(
-                ListEntry.list_id == project_status_list.id,
-                ListEntry.name == "Active"
-            ).first()
+            active_status = find_list_entry(db, "project_status", "Active", active_only=False)
             
             if not active_status:
                 logger.error("Project status 'Active' not found")
@@ -732,18 +551,14 @@ async def accession_sample(
             project.client_project_id = accession_data.client_project_id
         
         # Get initial status (e.g., "Received")
-        sample_status_list = db.query(List).filter(List.name == "sample_status").first()
-        if not sample_status_list:
+        if not list_by_name(db, "sample_status"):
             logger.error("Sample status list not found")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Sample status list not found in configuration"
             )
         
-        received_status = db.query(ListEntry).filter(
-            ListEntry.list_id == sample_status_list.id,
-            ListEntry.name == "Received"
-        ).first()
+        received_status = find_list_entry(db, "sample_status", "Received", active_only=False)
         
         if not received_status:
             logger.error("Sample status 'Received' not found")
@@ -783,18 +598,14 @@ async def accession_sample(
         db.flush()  # Get the ID without committing
         
         # Get "In Process" status for tests
-        test_status_list = db.query(List).filter(List.name == "test_status").first()
-        if not test_status_list:
+        if not list_by_name(db, "test_status"):
             logger.error("Test status list not found")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Test status list not found in configuration"
             )
         
-        in_process_status = db.query(ListEntry).filter(
-                ListEntry.list_id == test_status_list.id,
-            ListEntry.name == "In Process"
-        ).first()
+        in_process_status = find_list_entry(db, "test_status", "In Process", active_only=False)
         
         if not in_process_status:
             logger.error("Test status 'In Process' not found")
@@ -848,10 +659,8 @@ async def bulk_accession_samples(
     Supports project auto-creation if project_id is not provided.
     """
     from models.client import Client, ClientProject
-    from models.list import List, ListEntry
     from models.project import ProjectUser
-    from models.container import ContainerType
-    from app.core.name_generation import generate_name_for_sample, generate_name_for_project
+    from app.core.name_generation import generate_name_for_project
     
     # Validate client_id is accessible (via RLS)
     client = db.query(Client).filter(Client.id == bulk_data.client_id).first()
@@ -882,10 +691,7 @@ async def bulk_accession_samples(
             )
     
     # Validate container type exists
-    container_type = db.query(ContainerType).filter(
-        ContainerType.id == bulk_data.container_type_id,
-        ContainerType.active == True
-    ).first()
+    container_type = get_container_type(db, bulk_data.container_type_id, active_only=True)
     
     if not container_type:
         raise HTTPException(
@@ -899,17 +705,13 @@ async def bulk_accession_samples(
     if not project_id:
         # Auto-create project
         # Get "Active" status for projects
-        project_status_list = db.query(List).filter(List.name == "project_status").first()
-        if not project_status_list:
+        if not list_by_name(db, "project_status"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Project status list not found in configuration"
             )
         
-        active_status = db.query(ListEntry).filter(
-            ListEntry.list_id == project_status_list.id,
-            ListEntry.name == "Active"
-        ).first()
+        active_status = find_list_entry(db, "project_status", "Active", active_only=False)
         
         if not active_status:
             raise HTTPException(
@@ -979,18 +781,13 @@ async def bulk_accession_samples(
             project.client_project_id = bulk_data.client_project_id
     
     # Get initial status (e.g., "Received")
-    from models.list import List, ListEntry
-    sample_status_list = db.query(List).filter(List.name == "sample_status").first()
-    if not sample_status_list:
+    if not list_by_name(db, "sample_status"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Sample status list not found in configuration"
         )
     
-    received_status = db.query(ListEntry).filter(
-        ListEntry.list_id == sample_status_list.id,
-        ListEntry.name == "Received"
-    ).first()
+    received_status = find_list_entry(db, "sample_status", "Received", active_only=False)
     
     if not received_status:
         raise HTTPException(
@@ -999,17 +796,13 @@ async def bulk_accession_samples(
         )
     
     # Get "In Process" status for tests
-    test_status_list = db.query(List).filter(List.name == "test_status").first()
-    if not test_status_list:
+    if not list_by_name(db, "test_status"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Test status list not found in configuration"
         )
     
-    in_process_status = db.query(ListEntry).filter(
-        ListEntry.list_id == test_status_list.id,
-        ListEntry.name == "In Process"
-    ).first()
+    in_process_status = find_list_entry(db, "test_status", "In Process", active_only=False)
     
     if not in_process_status:
         raise HTTPException(
@@ -1017,155 +810,31 @@ async def bulk_accession_samples(
             detail="Test status 'In Process' not found in configuration"
         )
     
-    # Validate unique names and container names
-    sample_names = []
-    container_names = []
-    client_sample_ids = []
-    
-    auto_name_counter = bulk_data.auto_name_start or 1
-    
-    for unique in bulk_data.uniques:
-        # Generate name if not provided
-        if unique.name:
-            sample_name = unique.name
-        elif bulk_data.auto_name_prefix:
-            sample_name = f"{bulk_data.auto_name_prefix}{auto_name_counter}"
-            auto_name_counter += 1
-        else:
-            # Use name generation if no prefix provided
-            sample_name = generate_name_for_sample(
-                db=db,
-                project_id=str(project_id),
-                received_date=bulk_data.received_date
-            )
-        
-        sample_names.append(sample_name)
-        container_names.append(unique.container_name)
-        
-        if unique.client_sample_id:
-            client_sample_ids.append(unique.client_sample_id)
-    
-    # Check for duplicate sample names
-    existing_samples = db.query(Sample).filter(
-        Sample.name.in_(sample_names),
-        Sample.active == True
-    ).all()
-    
-    if existing_samples:
-        duplicate_names = [s.name for s in existing_samples]
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Duplicate sample names found: {', '.join(duplicate_names)}"
-        )
-    
-    # Check for duplicate container names
-    from models.container import Container
-    existing_containers = db.query(Container).filter(
-        Container.name.in_(container_names),
-        Container.active == True
-    ).all()
-    
-    if existing_containers:
-        duplicate_containers = [c.name for c in existing_containers]
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Duplicate container names found: {', '.join(duplicate_containers)}"
-        )
-    
-    # Check for duplicate client_sample_ids
-    if client_sample_ids:
-        existing_client_ids = db.query(Sample).filter(
-            Sample.client_sample_id.in_(client_sample_ids),
-            Sample.active == True
-        ).all()
-        
-        if existing_client_ids:
-            duplicate_client_ids = [s.client_sample_id for s in existing_client_ids if s.client_sample_id]
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Duplicate client_sample_ids found: {', '.join(duplicate_client_ids)}"
-            )
+    # Set-based engine: fixed number of round trips regardless of sample count
+    accession = BulkAccessionEngine(db, current_user.id)
+    analysis_ids = accession.resolve_analysis_ids(bulk_data.battery_id, bulk_data.assigned_tests)
+    sample_names = accession.resolve_sample_names(bulk_data, project_id)
+    accession.check_conflicts(
+        sample_names,
+        [unique.container_name for unique in bulk_data.uniques],
+        [unique.client_sample_id for unique in bulk_data.uniques if unique.client_sample_id],
+    )
     
     # Create all samples, containers, contents, and tests in a transaction
-    created_samples = []
-    auto_name_counter = bulk_data.auto_name_start or 1
-    
     try:
-        for idx, unique in enumerate(bulk_data.uniques):
-            # Generate name if not provided
-            if unique.name:
-                sample_name = unique.name
-            elif bulk_data.auto_name_prefix:
-                sample_name = f"{bulk_data.auto_name_prefix}{auto_name_counter}"
-                auto_name_counter += 1
-            else:
-                # Use name generation if no prefix provided
-                sample_name = generate_name_for_sample(
-                    db=db,
-                    project_id=str(project_id),
-                    received_date=bulk_data.received_date
-                )
-            
-            # Create sample
-            sample = Sample(
-                name=sample_name,
-                description=unique.description,
-                due_date=bulk_data.due_date,
-                received_date=bulk_data.received_date,
-                sample_type=bulk_data.sample_type,
-                status=received_status.id,
-                matrix=bulk_data.matrix,
-                temperature=unique.temperature if unique.temperature is not None else None,
-                project_id=project_id,
-                qc_type=bulk_data.qc_type,
-                client_sample_id=unique.client_sample_id,
-                created_by=current_user.id,
-                modified_by=current_user.id
-            )
-            db.add(sample)
-            db.flush()  # Get the ID without committing
-            
-            # Project is already linked to client_project if auto-created or updated above
-            
-            # Create container
-            container = Container(
-                name=unique.container_name,
-                type_id=bulk_data.container_type_id,
-                row=1,
-                column=1,
-                created_by=current_user.id,
-                modified_by=current_user.id
-            )
-            db.add(container)
-            db.flush()  # Get the ID without committing
-            
-            # Link sample to container via contents
-            from models.container import Contents
-            contents = Contents(
-                container_id=container.id,
-                sample_id=sample.id
-            )
-            db.add(contents)
-            
-            # Create tests using shared helper function
-            _create_tests_for_sample(
-                db=db,
-                sample=sample,
-                battery_id=bulk_data.battery_id,
-                assigned_tests=bulk_data.assigned_tests,
-                in_process_status_id=in_process_status.id,
-                current_user_id=current_user.id
-            )
-            
-            created_samples.append(sample)
+        sample_ids = accession.create(
+            bulk_data,
+            project_id=project_id,
+            sample_names=sample_names,
+            analysis_ids=analysis_ids,
+            received_status_id=received_status.id,
+            in_process_status_id=in_process_status.id,
+        )
         
         # Commit all changes in a single transaction
         db.commit()
         
-        # Refresh all samples to get full data
-        for sample in created_samples:
-            db.refresh(sample)
-        
+        created_samples = accession.load_samples(sample_ids)
         return [SampleResponse.model_validate(sample) for sample in created_samples]
         
     except Exception as e:
@@ -1339,11 +1008,7 @@ async def update_sample_status(
             )
     
     # Validate status exists
-    from models.list import ListEntry
-    status_entry = db.query(ListEntry).filter(
-        ListEntry.id == status_id,
-        ListEntry.active == True
-    ).first()
+    status_entry = list_entry(db, status_id, active_only=True)
     
     if not status_entry:
         raise HTTPException(
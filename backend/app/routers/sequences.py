@@ -5,12 +5,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.security import get_current_user
 from app.core.rbac import require_config_edit
 from models.user import User
 from pydantic import BaseModel, Field
 
-router = APIRouter(prefix="/admin/sequences", tags=["sequences"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/admin/sequences", tags=["sequences"])
 
 ALLOWED_ENTITY_TYPES = ['sample', 'project', 'batch', 'analysis', 'container']
 
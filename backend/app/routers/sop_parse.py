@@ -8,17 +8,23 @@ Routes:
 """
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, UploadFile
+from fastapi import APIRouter, Depends, File, Form, UploadFile
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.rbac import require_experiment_manage
+from app.services.job_handlers import SOP_PARSE_EXTRACT
+from app.services.job_queue import JobQueue
 from app.services.sop_parse_service import SOPParseService
 from app.schemas.flexible_experiment import SopParseJobRead, SopApplyResponse
 from models.user import User
 
-router = APIRouter(prefix="/sop-parse", tags=["sop-parse"])
+router = APIRouter(route_class=DbOffloadRoute, prefix="/sop-parse", tags=["sop-parse"])
+
+# Extraction is slow and not user-blocking; fits and publishes go first
+SOP_PARSE_JOB_PRIORITY = -10
 
 
 def _sop_service(
@@ -30,13 +36,12 @@ def _sop_service(
 
 @router.post("", response_model=SopParseJobRead, status_code=202)
 async def create_parse_job(
-    background_tasks: BackgroundTasks,
     sop_file: UploadFile = File(..., description="SOP document (text or PDF)"),
     instrument_file: UploadFile = File(..., description="Example instrument output CSV"),
     service: SOPParseService = Depends(_sop_service),
 ):
     """
-    Upload SOP + example instrument file; kick off Claude extraction as background task.
+    Upload SOP + example instrument file; queue Claude extraction on the job worker.
 
     Returns 202 Accepted with job_id immediately.
     Poll GET /sop-parse/{id} to check status.
@@ -57,11 +62,11 @@ async def create_parse_job(
         instrument_filename=instrument_file.filename,
     )
 
-    background_tasks.add_task(
-        SOPParseService.run_extraction_background,
-        job_id=job.id,
-        sop_text=sop_text,
-        instrument_text=instrument_text,
+    JobQueue(service.db).enqueue(
+        SOP_PARSE_EXTRACT,
+        {"sop_parse_job_id": job.id, "sop_text": sop_text, "instrument_text": instrument_text},
+        user=service.current_user,
+        priority=SOP_PARSE_JOB_PRIORITY,
     )
 
     return SopParseJobRead.model_validate(job)
@@ -2,10 +2,13 @@
 Test Batteries router for NimbleLims
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.conditional import conditional_response
+from app.core.reference_cache import TEST_BATTERIES, invalidate_reference_data
 from models.test_battery import TestBattery, BatteryAnalysis
 from models.analysis import Analysis
 from models.test import Test
@@ -24,11 +27,12 @@ from app.core.security import get_current_user
 from app.core.rbac import require_any_permission
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("", response_model=TestBatteryListResponse)
 async def get_test_batteries(
+    request: Request,
     name: Optional[str] = Query(None, description="Filter by name (partial match)"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
@@ -37,50 +41,57 @@ async def get_test_batteries(
 ):
     """
     Get all active test batteries with optional filtering by name.
+    Supports If-None-Match: an unchanged body is answered 304 from memory.
     """
-    query = db.query(TestBattery).filter(TestBattery.active == True)
-    
-    # Apply name filter if provided
-    if name:
-        query = query.filter(TestBattery.name.ilike(f"%{name}%"))
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * size
-    batteries = query.order_by(TestBattery.name).offset(offset).limit(size).all()
-    
-    # Calculate pages
-    pages = (total + size - 1) // size
-    
-    # Get analyses count for each battery
-    result = []
-    for battery in batteries:
-        analyses_count = db.query(func.count(BatteryAnalysis.analysis_id)).filter(
-            BatteryAnalysis.battery_id == battery.id
-        ).scalar() or 0
-        
-        battery_dict = {
-            "id": battery.id,
-            "name": battery.name,
-            "description": battery.description,
-            "active": battery.active,
-            "created_at": battery.created_at,
-            "created_by": battery.created_by,
-            "modified_at": battery.modified_at,
-            "modified_by": battery.modified_by,
-            "analyses_count": analyses_count
-        }
-        result.append(TestBatteryResponse(**battery_dict))
-    
-    return TestBatteryListResponse(
-        batteries=result,
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
-    )
+    def render():
+        query = db.query(TestBattery).filter(TestBattery.active == True)
+
+        # Apply name filter if provided
+        if name:
+            query = query.filter(TestBattery.name.ilike(f"%{name}%"))
+
+        # Get total count
+        total = query.count()
+
+        # Apply pagination
+        offset = (page - 1) * size
+        batteries = query.order_by(TestBattery.name).offset(offset).limit(size).all()
+
+        # Calculate pages
+        pages = (total + size - 1) // size
+
+        # Analyses count for the whole page in one grouped query
+        analyses_counts = dict(
+            db.query(BatteryAnalysis.battery_id, func.count(BatteryAnalysis.analysis_id))
+            .filter(BatteryAnalysis.battery_id.in_([battery.id for battery in batteries]))
+            .group_by(BatteryAnalysis.battery_id)
+            .all()
+        ) if batteries else {}
+
+        result = []
+        for battery in batteries:
+            battery_dict = {
+                "id": battery.id,
+                "name": battery.name,
+                "description": battery.description,
+                "active": battery.active,
+                "created_at": battery.created_at,
+                "created_by": battery.created_by,
+                "modified_at": battery.modified_at,
+                "modified_by": battery.modified_by,
+                "analyses_count": analyses_counts.get(battery.id, 0)
+            }
+            result.append(TestBatteryResponse(**battery_dict))
+
+        return TestBatteryListResponse(
+            batteries=result,
+            total=total,
+            page=page,
+            size=size,
+            pages=pages
+        )
+
+    return conditional_response(request, (TEST_BATTERIES,), (name, page, size), render)
 
 
 @router.get("/{battery_id}", response_model=TestBatteryWithAnalysesResponse)
@@ -161,6 +172,7 @@ async def create_test_battery(
     )
     
     db.add(new_battery)
+    invalidate_reference_data(db, TEST_BATTERIES)
     db.commit()
     db.refresh(new_battery)
     
@@ -212,6 +224,7 @@ async def update_test_battery(
         battery.active = battery_data.active
     
     battery.modified_by = current_user.id
+    invalidate_reference_data(db, TEST_BATTERIES)
     db.commit()
     db.refresh(battery)
     
@@ -272,6 +285,7 @@ async def delete_test_battery(
     
     battery.active = False
     battery.modified_by = current_user.id
+    invalidate_reference_data(db, TEST_BATTERIES)
     db.commit()
     
     return None
@@ -370,6 +384,7 @@ async def add_analysis_to_battery(
     )
     
     db.add(battery_analysis)
+    invalidate_reference_data(db, TEST_BATTERIES)
     db.commit()
     db.refresh(battery_analysis)
     
@@ -420,6 +435,7 @@ async def update_battery_analysis(
     if analysis_data.optional is not None:
         battery_analysis.optional = analysis_data.optional
     
+    invalidate_reference_data(db, TEST_BATTERIES)
     db.commit()
     db.refresh(battery_analysis)
     
@@ -467,6 +483,7 @@ async def remove_analysis_from_battery(
         )
     
     db.delete(battery_analysis)
+    invalidate_reference_data(db, TEST_BATTERIES)
     db.commit()
     
     return None
@@ -7,6 +7,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import cast
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.pagination import CountMode, paginate
+from app.core.reference_cache import find_list_entry, list_entry
 from models.test import Test
 from models.sample import Sample
 from models.user import User
@@ -23,7 +26,7 @@ from app.core.security import get_current_user
 from datetime import datetime
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("", response_model=TestListResponse)
@@ -35,6 +38,8 @@ async def get_tests(
     technician_id: Optional[UUID] = Query(None, description="Filter by technician ID"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response's next_cursor (overrides page)"),
+    count: CountMode = Query(CountMode.exact, description="How to compute total: exact, estimate (planner row estimate) or none"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -82,22 +87,18 @@ async def get_tests(
                 Test.custom_attributes.op("@>")(cast(filter_dict, JSONB))
             )
     
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * size
-    tests = query.offset(offset).limit(size).all()
-    
-    # Calculate pages
-    pages = (total + size - 1) // size
+    result = paginate(
+        query, (Test.created_at, Test.id),
+        page=page, size=size, cursor=cursor, count=count
+    )
     
     return TestListResponse(
-        tests=[TestResponse.from_orm(test) for test in tests],
-        total=total,
+        tests=[TestResponse.from_orm(test) for test in result.items],
+        total=result.total,
         page=page,
         size=size,
-        pages=pages
+        pages=result.pages,
+        next_cursor=result.next_cursor
     )
 
 
@@ -238,11 +239,7 @@ async def assign_test_to_sample(
         )
     
     # Get "In Process" status
-    from models.list import ListEntry
-    in_process_status = db.query(ListEntry).filter(
-        ListEntry.list_id == "test_status",  # Assuming this list exists
-        ListEntry.name == "In Process"
-    ).first()
+    in_process_status = find_list_entry(db, "test_status", "In Process", active_only=False)
     
     if not in_process_status:
         raise HTTPException(
@@ -379,11 +376,7 @@ async def update_test_status(
             )
     
     # Validate status exists
-    from models.list import ListEntry
-    status_entry = db.query(ListEntry).filter(
-        ListEntry.id == status_data.status,
-        ListEntry.active == True
-    ).first()
+    status_entry = list_entry(db, status_data.status, active_only=True)
     
     if not status_entry:
         raise HTTPException(
@@ -440,11 +433,7 @@ async def review_test(
             )
     
     # Get "Complete" status
-    from models.list import ListEntry
-    complete_status = db.query(ListEntry).filter(
-        ListEntry.list_id == "test_status",  # Assuming this list exists
-        ListEntry.name == "Complete"
-    ).first()
+    complete_status = find_list_entry(db, "test_status", "Complete", active_only=False)
     
     if not complete_status:
         raise HTTPException(
@@ -459,11 +448,7 @@ async def review_test(
     test.modified_at = datetime.utcnow()
     
     # Update sample status to "Reviewed" if all tests are complete
-    from models.list import ListEntry
-    reviewed_status = db.query(ListEntry).filter(
-        ListEntry.list_id == "sample_status",  # Assuming this list exists
-        ListEntry.name == "Reviewed"
-    ).first()
+    reviewed_status = find_list_entry(db, "sample_status", "Reviewed", active_only=False)
     
     if reviewed_status:
         # Check if all tests for this sample are complete
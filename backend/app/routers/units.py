@@ -2,13 +2,16 @@
 Units router for NimbleLims
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
+from app.core.conditional import conditional_response
+from app.core.reference_cache import LISTS, UNITS, invalidate_reference_data
 from models.unit import Unit
 from models.user import User
 from models.list import ListEntry
-from app.core.security import get_current_user, get_user_permissions
+from app.core.security import get_current_user, resolve_auth_context
 from app.core.rbac import require_config_edit
 from pydantic import BaseModel
 from uuid import UUID
@@ -50,11 +53,12 @@ class UnitUpdate(BaseModel):
     active: Optional[bool] = None
 
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("", response_model=List[UnitResponse])
 async def get_units(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -63,34 +67,37 @@ async def get_units(
     For users with config:edit permission, returns all units (active and inactive).
     For other users, returns only active units.
     Includes type_name for frontend filtering.
+    Supports If-None-Match: an unchanged body is answered 304 from memory.
     """
     # Check if user has config:edit permission
-    user_permissions = get_user_permissions(current_user, db)
-    has_config_edit = "config:edit" in user_permissions
-    
-    # If user has config:edit permission, show all units; otherwise, only active
-    if has_config_edit:
-        units = db.query(Unit).options(joinedload(Unit.type_rel)).order_by(Unit.name).all()
-    else:
-        units = db.query(Unit).options(joinedload(Unit.type_rel)).filter(Unit.active == True).order_by(Unit.name).all()
-    
-    # Build response with type name
-    result = []
-    for unit in units:
-        unit_dict = {
-            "id": unit.id,
-            "name": unit.name,
-            "description": unit.description,
-            "active": unit.active,
-            "created_at": unit.created_at,
-            "modified_at": unit.modified_at,
-            "multiplier": unit.multiplier,
-            "type": unit.type,
-            "type_name": unit.type_rel.name if unit.type_rel else None
-        }
-        result.append(UnitResponse(**unit_dict))
-    
-    return result
+    has_config_edit = resolve_auth_context(current_user, db).has("config:edit")
+    
+    def render():
+        # If user has config:edit permission, show all units; otherwise, only active
+        if has_config_edit:
+            units = db.query(Unit).options(joinedload(Unit.type_rel)).order_by(Unit.name).all()
+        else:
+            units = db.query(Unit).options(joinedload(Unit.type_rel)).filter(Unit.active == True).order_by(Unit.name).all()
+
+        # Build response with type name
+        result = []
+        for unit in units:
+            unit_dict = {
+                "id": unit.id,
+                "name": unit.name,
+                "description": unit.description,
+                "active": unit.active,
+                "created_at": unit.created_at,
+                "modified_at": unit.modified_at,
+                "multiplier": unit.multiplier,
+                "type": unit.type,
+                "type_name": unit.type_rel.name if unit.type_rel else None
+            }
+            result.append(UnitResponse(**unit_dict))
+
+        return result
+
+    return conditional_response(request, (UNITS, LISTS), has_config_edit, render)
 
 
 @router.post("", response_model=UnitResponse, status_code=status.HTTP_201_CREATED)
@@ -129,6 +136,7 @@ async def create_unit(
     )
     
     db.add(new_unit)
+    invalidate_reference_data(db, UNITS)
     db.commit()
     
     # Reload with relationship
@@ -196,6 +204,7 @@ async def update_unit(
         unit.active = unit_data.active
     
     unit.modified_by = current_user.id
+    invalidate_reference_data(db, UNITS)
     db.commit()
     
     # Reload with relationship
@@ -236,6 +245,7 @@ async def delete_unit(
     # Soft delete
     unit.active = False
     unit.modified_by = current_user.id
+    invalidate_reference_data(db, UNITS)
     db.commit()
     
     return None
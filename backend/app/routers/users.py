@@ -5,6 +5,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from models.user import User, Role
 from models.client import Client
 from app.schemas.user import (
@@ -15,9 +16,10 @@ from app.schemas.user import (
 )
 from app.core.security import get_current_user, get_password_hash, validate_password_complexity
 from app.core.rbac import require_any_permission
+from app.core.auth_cache import invalidate_user
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DbOffloadRoute)
 
 
 @router.get("", response_model=List[UserWithRelationsResponse])
@@ -248,6 +250,7 @@ async def update_user(
     
     user.modified_by = current_user.id
     db.commit()
+    invalidate_user(user.id)
     db.refresh(user)
     
     return UserResponse.from_orm(user)
@@ -276,6 +279,7 @@ async def delete_user(
     user.active = False
     user.modified_by = current_user.id
     db.commit()
+    invalidate_user(user.id)
     
     return None
 
@@ -14,6 +14,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.core.routing import DbOffloadRoute
 from app.core.rbac import require_config_edit, require_workflow_execute
 from app.services.experiment_service import ExperimentService
 from app.schemas.experiment import (
@@ -62,12 +63,14 @@ def _get_experiment_id(context: Dict[str, Any], params: Dict[str, Any], action:
 
 # Admin CRUD under /admin/workflow-templates (prefix added in main)
 workflow_templates_router = APIRouter(
+    route_class=DbOffloadRoute,
     prefix="/workflow-templates",
     tags=["workflow-templates"],
 )
 
 # Execute under /workflows
 workflows_router = APIRouter(
+    route_class=DbOffloadRoute,
     prefix="",
     tags=["workflows"],
 )
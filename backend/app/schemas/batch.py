@@ -87,10 +87,11 @@ class BatchResponse(BatchBase):
 class BatchListResponse(BaseModel):
     """Schema for batch list response with pagination"""
     batches: List[BatchResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Row count per ?count= (exact, planner estimate, or null for none)")
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
 
 
 class BatchCreateWithContainersRequest(BaseModel):
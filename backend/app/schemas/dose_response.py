@@ -30,7 +30,7 @@ class ResetFitRequest(BaseModel):
 # ── Response schemas ───────────────────────────────────────────────────────────
 
 class DoseResponseResultSummary(BaseModel):
-    """Compact result for the Curve Curator grid (includes thumbnail_svg)."""
+    """Compact result for the Curve Curator grid (thumbnail by URL, not inline)."""
     id:               uuid.UUID
     sample_id:        uuid.UUID
     sample_name:      Optional[str] = None
@@ -44,7 +44,7 @@ class DoseResponseResultSummary(BaseModel):
     quality_flag:     str
     points_used:      Optional[int] = None
     points_excluded:  Optional[int] = None
-    thumbnail_svg:    Optional[str] = None
+    thumbnail_url:    Optional[str] = None
     review_status:    ReviewStatus
     reviewed_by:      Optional[uuid.UUID] = None
     reviewed_at:      Optional[datetime] = None
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for help entries
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
@@ -39,8 +39,9 @@ class HelpEntryUpdate(BaseModel):
 class HelpEntryListResponse(BaseModel):
     """Schema for paginated help entry list response"""
     help_entries: List[HelpEntryResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Row count per ?count= (exact, planner estimate, or null for none)")
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
 
@@ -0,0 +1,29 @@
+from __future__ import annotations
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+
+from models.job import JobStatus
+
+
+class JobRead(BaseModel):
+    """A queued operation; poll GET /v1/jobs/{id} until succeeded or failed."""
+    id:               uuid.UUID
+    kind:             str
+    status:           JobStatus
+    priority:         int
+    attempts:         int
+    max_attempts:     int
+    run_after:        datetime
+    progress_current: Optional[int] = None
+    progress_total:   Optional[int] = None
+    progress_message: Optional[str] = None
+    result:           Optional[Dict[str, Any]] = None
+    error:            Optional[Dict[str, Any]] = None  # {"status_code": int, "detail": ...}
+    created_at:       datetime
+    started_at:       Optional[datetime] = None
+    finished_at:      Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -70,7 +70,8 @@ class ProjectResponse(BaseModel):
 class ProjectListResponse(BaseModel):
     """Schema for paginated project list response"""
     projects: List[ProjectResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Row count per ?count= (exact, planner estimate, or null for none)")
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
@@ -71,10 +71,11 @@ class ResultResponse(ResultBase):
 class ResultListResponse(BaseModel):
     """Schema for result list response with pagination"""
     results: List[ResultResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Row count per ?count= (exact, planner estimate, or null for none)")
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
 
 
 class BatchResultEntryRequest(BaseModel):
@@ -121,6 +122,10 @@ class ResultValidationRequest(BaseModel):
     analyte_id: UUID = Field(..., description="ID of analyte")
     raw_result: str = Field(..., description="Raw result to validate")
     reported_result: Optional[str] = Field(None, description="Reported result to validate")
+    units: Optional[UUID] = Field(
+        None,
+        description="Unit raw_result is expressed in; converted to the analyte's default unit before the range check",
+    )
 
 
 class ResultValidationResponse(BaseModel):
@@ -248,10 +248,11 @@ class SampleResponse(SampleBase):
 class SampleListResponse(BaseModel):
     """Schema for sample list response with pagination"""
     samples: List[SampleResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Row count per ?count= (exact, planner estimate, or null for none)")
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
 
 
 class EligibleSampleResponse(BaseModel):
@@ -292,6 +293,7 @@ class EligibleSamplesResponse(BaseModel):
     size: int
     pages: int
     warnings: List[str] = Field(default_factory=list, description="Warnings about expired/expiring samples")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
 
 
 class SampleAccessioningRequest(BaseModel):
@@ -66,10 +66,11 @@ class TestResponse(TestBase):
 class TestListResponse(BaseModel):
     """Schema for test list response with pagination"""
     tests: List[TestResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Row count per ?count= (exact, planner estimate, or null for none)")
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
 
 
 class TestAssignmentRequest(BaseModel):
@@ -9,7 +9,7 @@ Rules (Lab Ops L3–L4, L9):
 """
 from __future__ import annotations
 
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from uuid import UUID, uuid4
 from decimal import Decimal
 from datetime import datetime, timezone
@@ -29,11 +29,13 @@ from app.schemas.aliquot_plan import (
     AliquotExecuteLineResult,
     METHOD_PROFILES,
 )
+from app.core.name_generation import generate_names, get_active_template
+from app.core.conversions import ConversionError, convert, unit_table
+from app.core.reference_cache import entries_named, get_unit, list_entry, list_entry_id
 from models.entry import Entry, normalize_entry_type
 from models.sample import Sample
 from models.container import Container, Contents, ContainerType
 from models.user import User
-from models.list import ListEntry, List as ListModel
 from models.experiment import ExperimentSampleExecution
 
 
@@ -110,6 +112,47 @@ class AliquotPlanService:
         lines = [AliquotPlanLine.model_validate(x) for x in raw]
         return AliquotPlanSaveResponse(entry_id=entry.id, lines=lines, line_count=len(lines))
 
+    def _mass_from_volume(
+        self, line: AliquotPlanLine, volume: float, concentration: float
+    ) -> Tuple[float, Optional[UUID]]:
+        """
+        (mass, unit) for volume × concentration.
+
+        With volume_unit_id and concentration_unit_id set, both are converted
+        to base units (L × g/L = g) with exact multipliers and the mass is
+        expressed in amount_unit_id, which is then required: several mass-type
+        units can carry multiplier 1 (the seeded cfu does), so there is no
+        single base mass unit to fall back on. Otherwise the v1 rule applies:
+        the numbers are assumed to share units.
+        """
+        if line.volume_unit_id is None or line.concentration_unit_id is None:
+            return float(volume) * float(concentration), line.amount_unit_id
+        mass_unit = line.amount_unit_id
+        if mass_unit is None:
+            raise HTTPException(
+                400,
+                detail="amount_unit_id is required when volume_unit_id and concentration_unit_id are set",
+            )
+        for unit_id, type_name in (
+            (line.volume_unit_id, "volume"),
+            (line.concentration_unit_id, "concentration"),
+            (mass_unit, "mass"),
+        ):
+            unit = get_unit(self.db, unit_id)
+            type_entry = list_entry(self.db, unit.type) if unit is not None else None
+            if type_entry is None or type_entry.name != type_name:
+                raise HTTPException(400, detail=f"Unit {unit_id} is not a {type_name} unit")
+        try:
+            table = unit_table(self.db)
+            mass = (
+                Decimal(str(volume)) * table.multiplier(line.volume_unit_id)
+                * Decimal(str(concentration)) * table.multiplier(line.concentration_unit_id)
+                / table.multiplier(mass_unit)
+            )
+        except ConversionError as e:
+            raise HTTPException(400, detail=str(e))
+        return float(mass), mass_unit
+
     def resolve_line(self, line: AliquotPlanLine) -> ResolvedTransfer:
         """Compute transfer_amount (mass or count) from method inputs. Never stores volume."""
         warnings: List[str] = []
@@ -141,8 +184,7 @@ class AliquotPlanService:
                     400,
                     detail="by_volume requires volume and concentration (mass = volume × conc)",
                 )
-            # amount = volume * concentration (same numeric base units assumed in v1)
-            amount = float(line.volume) * float(line.concentration)
+            amount, amount_unit = self._mass_from_volume(line, line.volume, line.concentration)
             conc = float(line.concentration)
             warnings.append("Volume not stored; mass computed as volume × concentration")
         elif method == AliquotMethod.target_volume:
@@ -151,7 +193,7 @@ class AliquotPlanService:
                     400,
                     detail="target_volume requires target_volume and concentration",
                 )
-            amount = float(line.target_volume) * float(line.concentration)
+            amount, amount_unit = self._mass_from_volume(line, line.target_volume, line.concentration)
             conc = float(line.concentration)
             warnings.append("Target volume converted to mass via concentration")
         elif method == AliquotMethod.target_concentration:
@@ -163,10 +205,10 @@ class AliquotPlanService:
             elif line.target_amount is not None:
                 amount = float(line.target_amount)
             elif line.volume is not None:
-                amount = float(line.volume) * conc
+                amount, amount_unit = self._mass_from_volume(line, line.volume, conc)
                 warnings.append("Mass from volume × target concentration")
             elif line.target_volume is not None:
-                amount = float(line.target_volume) * conc
+                amount, amount_unit = self._mass_from_volume(line, line.target_volume, conc)
                 warnings.append("Mass from target_volume × target concentration")
             else:
                 raise HTTPException(
@@ -296,8 +338,11 @@ class AliquotPlanService:
 
         pool_containers: Dict[str, UUID] = {}
         try:
+            auto_container_names = iter(self._reserve_dest_container_names(resolved))
             for r in resolved:
-                dest_sample, dest_c = self._execute_transfer(r, pool_containers)
+                dest_sample, dest_c = self._execute_transfer(
+                    r, pool_containers, auto_container_names
+                )
                 results.append(AliquotExecuteLineResult(
                     line_id=r.line_id,
                     source_sample_id=r.source_sample_id,
@@ -372,37 +417,43 @@ class AliquotPlanService:
         return content
 
     def _available_status_id(self) -> UUID:
-        sample_status_list = (
-            self.db.query(ListModel).filter(ListModel.name == "sample_status").first()
+        available_id = list_entry_id(
+            self.db, "sample_status", "Available for Testing", active_only=False
         )
-        if sample_status_list:
-            available = (
-                self.db.query(ListEntry)
-                .filter(
-                    ListEntry.list_id == sample_status_list.id,
-                    ListEntry.name == "Available for Testing",
-                )
-                .first()
-            )
-            if available:
-                return available.id
+        if available_id:
+            return available_id
         # Fallback: any list entry named Available for Testing
-        available = (
-            self.db.query(ListEntry)
-            .filter(ListEntry.name == "Available for Testing")
-            .first()
-        )
+        available = entries_named(self.db, "Available for Testing")
         if available:
-            return available.id
+            return available[0].id
         raise HTTPException(
             400,
             detail="Sample status 'Available for Testing' not found in configuration",
         )
 
+    def _reserve_dest_container_names(self, resolved: List[ResolvedTransfer]) -> List[str]:
+        """
+        Template names for every destination container execute will create, drawn as one
+        block. Empty when no container template is active (ALIQUOT-<hex> names are used).
+        """
+        needed = 0
+        seen_pools = set()
+        for r in resolved:
+            if r.pool_group:
+                if r.pool_group in seen_pools:
+                    continue
+                seen_pools.add(r.pool_group)
+            if not r.dest_container_id and not r.dest_container_name:
+                needed += 1
+        if not needed or not get_active_template(self.db, "container"):
+            return []
+        return generate_names(self.db, "container", needed)
+
     def _execute_transfer(
         self,
         r: ResolvedTransfer,
         pool_containers: Dict[str, UUID],
+        auto_container_names: Optional[Iterator[str]] = None,
     ) -> Tuple[Sample, Container]:
         parent = self.db.query(Sample).filter(Sample.id == r.source_sample_id).first()
         if not parent:
@@ -421,16 +472,23 @@ class AliquotPlanService:
                     ),
                 },
             )
-        current = float(content.amount)
-        if r.transfer_amount > current:
+        current = Decimal(str(content.amount))
+        need = Decimal(str(r.transfer_amount))
+        if r.amount_unit_id and content.amount_units and r.amount_unit_id != content.amount_units:
+            # Debit in the source's units (exact), e.g. a mg transfer from a g tube
+            try:
+                need = convert(need, r.amount_unit_id, content.amount_units, self.db, exact=True)
+            except ConversionError as e:
+                raise HTTPException(400, detail=f"Cannot debit source contents: {e}")
+        if need > current:
             raise HTTPException(
                 400,
                 detail=(
-                    f"Insufficient amount on source contents: have {current}, "
-                    f"need {r.transfer_amount}"
+                    f"Insufficient amount on source contents: have {float(current)}, "
+                    f"need {float(need)}"
                 ),
             )
-        content.amount = Decimal(str(current - r.transfer_amount))
+        content.amount = current - need
 
         # Destination container
         dest_c: Optional[Container] = None
@@ -457,7 +515,11 @@ class AliquotPlanService:
                     400,
                     detail="dest_container_type_id required when dest_container_id omitted",
                 )
-            name = r.dest_container_name or f"ALIQUOT-{uuid4().hex[:8]}"
+            name = (
+                r.dest_container_name
+                or (next(auto_container_names, None) if auto_container_names else None)
+                or f"ALIQUOT-{uuid4().hex[:8]}"
+            )
             dest_c = Container(
                 name=name,
                 type_id=type_id,
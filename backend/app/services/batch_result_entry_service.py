@@ -0,0 +1,218 @@
+"""
+Set-based batch result entry (US-28, POST /results/batch).
+
+The per-row path queried AnalysisAnalyte once per test, ran an existence
+SELECT per analyte, re-read results per test for completeness and ran one
+Result query per QC test. BatchResultEntryService does the same work in a
+fixed number of round trips, independent of plate size:
+
+  - analysis analytes and already-entered results are prefetched with one
+    IN query each and validated in memory,
+  - results are written with INSERT ... ON CONFLICT (test_id, analyte_id,
+    replicate) DO UPDATE, UPSERT_BATCH_SIZE rows per statement,
+  - QC tests without results are found with one anti-join.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, exists, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
+
+from app.schemas.result import AnalyteResultEntry, TestResultEntry
+from models.analysis import AnalysisAnalyte
+from models.result import Result
+from models.sample import Sample
+from models.test import Test
+
+# Rows per upsert statement; keeps each statement well under the bind-param limit
+UPSERT_BATCH_SIZE = 1000
+
+# Manual entry always writes the first replicate (as the per-row path did)
+MANUAL_REPLICATE = 1
+
+
+def _is_numeric(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+class BatchResultEntryService:
+    def __init__(self, db: Session, current_user_id: UUID) -> None:
+        self.db = db
+        self.current_user_id = current_user_id
+
+    def load_analysis_analytes(
+        self, analysis_ids: Set[UUID]
+    ) -> Dict[UUID, Dict[UUID, AnalysisAnalyte]]:
+        """analysis_id -> {analyte_id: AnalysisAnalyte}, one query for every analysis in the batch."""
+        by_analysis: Dict[UUID, Dict[UUID, AnalysisAnalyte]] = {
+            analysis_id: {} for analysis_id in analysis_ids
+        }
+        if not analysis_ids:
+            return by_analysis
+        rows = self.db.query(AnalysisAnalyte).options(
+            joinedload(AnalysisAnalyte.analyte)
+        ).filter(AnalysisAnalyte.analysis_id.in_(list(analysis_ids)))
+        for aa in rows:
+            by_analysis[aa.analysis_id][aa.analyte_id] = aa
+        return by_analysis
+
+    def load_entered_analytes(self, test_ids: Set[UUID]) -> Dict[UUID, Set[UUID]]:
+        """test_id -> analyte ids that already have an active result."""
+        entered: Dict[UUID, Set[UUID]] = {test_id: set() for test_id in test_ids}
+        if not test_ids:
+            return entered
+        rows = self.db.query(Result.test_id, Result.analyte_id).filter(
+            Result.test_id.in_(list(test_ids)),
+            Result.active == True
+        ).distinct()
+        for test_id, analyte_id in rows:
+            entered[test_id].add(analyte_id)
+        return entered
+
+    @staticmethod
+    def validate_entry(
+        test_id: UUID,
+        analyte_result: AnalyteResultEntry,
+        analyte_lookup: Dict[UUID, AnalysisAnalyte],
+    ) -> Optional[dict]:
+        """First validation error for one analyte result, in the per-row path's shape."""
+        analyte_id = analyte_result.analyte_id
+        analysis_analyte = analyte_lookup.get(analyte_id)
+
+        def error(message: str) -> dict:
+            return {"test_id": str(test_id), "analyte_id": str(analyte_id), "error": message}
+
+        if not analysis_analyte:
+            return error("Analyte not configured for this analysis")
+
+        raw = analyte_result.raw_result
+        reported = analyte_result.reported_result
+        if analysis_analyte.is_required and not raw and not reported:
+            name = analysis_analyte.reported_name or analysis_analyte.analyte.name
+            return error(f"Required analyte '{name}' must have a result")
+
+        if analysis_analyte.data_type != "numeric":
+            return None
+        if raw and not _is_numeric(raw):
+            return error(f"Raw result '{raw}' is not numeric")
+        if reported and not _is_numeric(reported):
+            return error(f"Reported result '{reported}' is not numeric")
+        if raw:
+            raw_val = float(raw)
+            if analysis_analyte.low_value is not None and raw_val < analysis_analyte.low_value:
+                return error(f"Raw result {raw_val} is below minimum {analysis_analyte.low_value}")
+            if analysis_analyte.high_value is not None and raw_val > analysis_analyte.high_value:
+                return error(f"Raw result {raw_val} is above maximum {analysis_analyte.high_value}")
+        return None
+
+    def plan(
+        self,
+        entries: Sequence[TestResultEntry],
+        test_lookup: Dict[UUID, Test],
+    ) -> Tuple[List[dict], List[dict], List[Test]]:
+        """
+        Validate every entry in memory.
+
+        Returns (validation_errors, result_rows, completed_tests): the rows to
+        upsert (last entry wins for a repeated test/analyte) and the tests that
+        will have every configured analyte entered once the rows are written.
+        """
+        requested = [test_lookup[e.test_id] for e in entries if e.test_id in test_lookup]
+        analytes_by_analysis = self.load_analysis_analytes({t.analysis_id for t in requested})
+        already_entered = self.load_entered_analytes({t.id for t in requested})
+
+        validation_errors: List[dict] = []
+        rows: Dict[Tuple[UUID, UUID], dict] = {}
+        entered_by_test: Dict[UUID, Set[UUID]] = {}
+        now = datetime.utcnow()
+
+        for entry in entries:
+            test = test_lookup.get(entry.test_id)
+            if not test:
+                validation_errors.append({
+                    "test_id": str(entry.test_id),
+                    "error": "Test not found in batch"
+                })
+                continue
+            analyte_lookup = analytes_by_analysis[test.analysis_id]
+            for analyte_result in entry.analyte_results:
+                error = self.validate_entry(entry.test_id, analyte_result, analyte_lookup)
+                if error:
+                    validation_errors.append(error)
+                    continue
+                rows[(entry.test_id, analyte_result.analyte_id)] = {
+                    "test_id": entry.test_id,
+                    "analyte_id": analyte_result.analyte_id,
+                    "replicate": MANUAL_REPLICATE,
+                    "raw_result": analyte_result.raw_result,
+                    "reported_result": analyte_result.reported_result,
+                    "qualifiers": analyte_result.qualifiers,
+                    "entry_date": now,
+                    "entered_by": self.current_user_id,
+                    "created_by": self.current_user_id,
+                    "modified_by": self.current_user_id,
+                    "modified_at": now,
+                }
+            entered_by_test.setdefault(entry.test_id, set()).update(
+                ar.analyte_id for ar in entry.analyte_results
+            )
+
+        completed_tests = []
+        for test_id, entered in entered_by_test.items():
+            configured = set(analytes_by_analysis[test_lookup[test_id].analysis_id])
+            if configured <= (already_entered[test_id] | entered):
+                completed_tests.append(test_lookup[test_id])
+        return validation_errors, list(rows.values()), completed_tests
+
+    def upsert_results(self, rows: List[dict]) -> None:
+        """Insert new results and overwrite (and reactivate) existing ones by conflict identity."""
+        if not rows:
+            return
+        stmt = pg_insert(Result.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Result.test_id, Result.analyte_id, Result.replicate],
+            set_={
+                "raw_result": stmt.excluded.raw_result,
+                "reported_result": stmt.excluded.reported_result,
+                "qualifiers": stmt.excluded.qualifiers,
+                "modified_by": stmt.excluded.modified_by,
+                "modified_at": stmt.excluded.modified_at,
+                "active": True,
+            },
+        )
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            self.db.execute(stmt, rows[start:start + UPSERT_BATCH_SIZE])
+
+    def find_qc_failures(self, sample_ids: Sequence[UUID]) -> List[dict]:
+        """Active tests on active QC samples that have no active result (one anti-join)."""
+        has_result = exists().where(and_(
+            Result.test_id == Test.id,
+            Result.active == True
+        ))
+        rows = self.db.execute(
+            select(Test.id, Test.sample_id)
+            .join(Sample, Sample.id == Test.sample_id)
+            .where(
+                Sample.id.in_(list(sample_ids)),
+                Sample.qc_type.isnot(None),
+                Sample.active == True,
+                Test.active == True,
+                ~has_result,
+            )
+        )
+        return [
+            {
+                "test_id": str(test_id),
+                "sample_id": str(sample_id),
+                "reason": "No results entered for QC sample"
+            }
+            for test_id, sample_id in rows
+        ]
@@ -0,0 +1,221 @@
+"""
+Set-based bulk accessioning engine (US-24, POST /samples/bulk-accession).
+
+The per-row path flushed twice per sample, drew one nextval (plus DDL and a
+uniqueness SELECT) per generated name and re-queried the battery for every
+sample. BulkAccessionEngine does the same work in a fixed number of round
+trips, independent of plate size:
+
+  - sample and container ids are allocated client-side (uuid4),
+  - generated names come from one sequence block and one uniqueness query,
+  - battery analyses are resolved once and merged with assigned_tests in memory,
+  - samples, containers, contents and tests are written as multi-row INSERTs
+    (SQLAlchemy insertmanyvalues, INSERT_BATCH_SIZE rows per statement).
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.name_generation import generate_names, sample_name_context
+from app.schemas.sample import BulkSampleAccessioningRequest
+from models.container import Container, Contents
+from models.sample import Sample
+from models.test import Test
+from models.test_battery import BatteryAnalysis, TestBattery
+
+# Rows per INSERT statement; keeps each statement well under the bind-param limit
+INSERT_BATCH_SIZE = 1000
+
+
+def _duplicates(values: Sequence[str]) -> List[str]:
+    seen = set()
+    dupes = []
+    for value in values:
+        if value in seen and value not in dupes:
+            dupes.append(value)
+        seen.add(value)
+    return dupes
+
+
+class BulkAccessionEngine:
+    def __init__(self, db: Session, current_user_id: UUID) -> None:
+        self.db = db
+        self.current_user_id = current_user_id
+
+    def resolve_analysis_ids(
+        self, battery_id: Optional[UUID], assigned_tests: Sequence[UUID]
+    ) -> List[UUID]:
+        """Battery analyses (in sequence order) followed by extra assigned analyses, deduplicated."""
+        analysis_ids: List[UUID] = []
+        if battery_id:
+            battery = self.db.query(TestBattery.id).filter(
+                TestBattery.id == battery_id,
+                TestBattery.active == True
+            ).first()
+            if not battery:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Test battery not found or inactive"
+                )
+            rows = self.db.query(BatteryAnalysis.analysis_id).filter(
+                BatteryAnalysis.battery_id == battery_id
+            ).order_by(BatteryAnalysis.sequence).all()
+            if not rows:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Test battery has no analyses assigned"
+                )
+            analysis_ids.extend(row.analysis_id for row in rows)
+        for analysis_id in assigned_tests or []:
+            if analysis_id not in analysis_ids:
+                analysis_ids.append(analysis_id)
+        return analysis_ids
+
+    def resolve_sample_names(
+        self, bulk_data: BulkSampleAccessioningRequest, project_id: UUID
+    ) -> List[str]:
+        """Explicit names, prefix+counter names, then template names from one sequence block."""
+        needs_template = [
+            i for i, unique in enumerate(bulk_data.uniques)
+            if not unique.name and not bulk_data.auto_name_prefix
+        ]
+        generated = iter(
+            generate_names(
+                self.db,
+                'sample',
+                len(needs_template),
+                sample_name_context(
+                    self.db,
+                    project_id=str(project_id),
+                    received_date=bulk_data.received_date,
+                ),
+            )
+            if needs_template else []
+        )
+
+        names: List[str] = []
+        auto_name_counter = bulk_data.auto_name_start or 1
+        for unique in bulk_data.uniques:
+            if unique.name:
+                names.append(unique.name)
+            elif bulk_data.auto_name_prefix:
+                names.append(f"{bulk_data.auto_name_prefix}{auto_name_counter}")
+                auto_name_counter += 1
+            else:
+                names.append(next(generated))
+        return names
+
+    def check_conflicts(
+        self,
+        sample_names: Sequence[str],
+        container_names: Sequence[str],
+        client_sample_ids: Sequence[str],
+    ) -> None:
+        """Reject names already used in the request or by active rows (one query per kind)."""
+        checks = (
+            ("sample names", Sample.name, Sample, sample_names),
+            ("container names", Container.name, Container, container_names),
+            ("client_sample_ids", Sample.client_sample_id, Sample, client_sample_ids),
+        )
+        for label, column, model, values in checks:
+            if not values:
+                continue
+            duplicates = _duplicates(values)
+            if not duplicates:
+                existing = self.db.query(column).filter(
+                    column.in_(list(values)),
+                    model.active == True
+                ).all()
+                duplicates = [row[0] for row in existing if row[0]]
+            if duplicates:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Duplicate {label} found: {', '.join(duplicates)}"
+                )
+
+    def _insert(self, table, rows: List[Dict]) -> None:
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            self.db.execute(insert(table), rows[start:start + INSERT_BATCH_SIZE])
+
+    def create(
+        self,
+        bulk_data: BulkSampleAccessioningRequest,
+        *,
+        project_id: UUID,
+        sample_names: Sequence[str],
+        analysis_ids: Sequence[UUID],
+        received_status_id: UUID,
+        in_process_status_id: UUID,
+    ) -> List[UUID]:
+        """Write samples, containers, contents and tests; returns sample ids in request order."""
+        # Pending ORM work (auto-created project, project_users) must exist before the core INSERTs
+        self.db.flush()
+
+        user_id = self.current_user_id
+        # created_at / modified_at use the column default now(), rendered inline per row
+        audit = {"active": True, "created_by": user_id, "modified_by": user_id}
+        sample_rows: List[Dict] = []
+        container_rows: List[Dict] = []
+        contents_rows: List[Dict] = []
+        test_rows: List[Dict] = []
+
+        for unique, sample_name in zip(bulk_data.uniques, sample_names):
+            sample_id = uuid4()
+            container_id = uuid4()
+            sample_rows.append({
+                "id": sample_id,
+                "name": sample_name,
+                "description": unique.description,
+                "due_date": bulk_data.due_date,
+                "received_date": bulk_data.received_date,
+                "sample_type": bulk_data.sample_type,
+                "status": received_status_id,
+                "matrix": bulk_data.matrix,
+                "temperature": unique.temperature,
+                "project_id": project_id,
+                "qc_type": bulk_data.qc_type,
+                "client_sample_id": unique.client_sample_id,
+                **audit,
+            })
+            container_rows.append({
+                "id": container_id,
+                "name": unique.container_name,
+                "type_id": bulk_data.container_type_id,
+                "row": 1,
+                "column": 1,
+                **audit,
+            })
+            contents_rows.append({"container_id": container_id, "sample_id": sample_id})
+            for analysis_id in analysis_ids:
+                test_rows.append({
+                    "id": uuid4(),
+                    "name": f"{sample_name}_test_{analysis_id}",
+                    "sample_id": sample_id,
+                    "analysis_id": analysis_id,
+                    "status": in_process_status_id,
+                    "technician_id": user_id,
+                    **audit,
+                })
+
+        self._insert(Sample.__table__, sample_rows)
+        self._insert(Container.__table__, container_rows)
+        self._insert(Contents.__table__, contents_rows)
+        if test_rows:
+            self._insert(Test.__table__, test_rows)
+        return [row["id"] for row in sample_rows]
+
+    def load_samples(self, sample_ids: Sequence[UUID]) -> List[Sample]:
+        """Fetch created samples (with project, for SampleResponse) in request order."""
+        by_id: Dict[UUID, Sample] = {}
+        for start in range(0, len(sample_ids), INSERT_BATCH_SIZE):
+            chunk = list(sample_ids[start:start + INSERT_BATCH_SIZE])
+            for sample in self.db.query(Sample).options(joinedload(Sample.project)).filter(
+                Sample.id.in_(chunk)
+            ):
+                by_id[sample.id] = sample
+        return [by_id[sample_id] for sample_id in sample_ids if sample_id in by_id]
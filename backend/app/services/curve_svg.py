@@ -0,0 +1,399 @@
+"""
+Dose-response curve SVGs rendered in Python: a port of the r-calculator's
+ggplot renderers (services/r-calculator/R/svg_thumbnail.R and svg_detail.R).
+
+The curve is drawn from the stored fit parameters with the model used to fit
+them (native_fit.py):
+
+    f(x) = bottom + (top - bottom) / (1 + (x / potency)^hill_slope)
+
+SVG is assembled from string templates with NumPy doing the curve and
+coordinate maths, so a thumbnail costs well under a millisecond. Batches of
+PARALLEL_MIN_THUMBNAILS or more are spread over the native fit process pool.
+
+Thumbnails (200x120, no axes) are kept under THUMBNAIL_MAX_BYTES: curve
+resolution and coordinate precision drop step by step until the SVG fits,
+then the CI band and finally the data points are left out.
+
+Where this differs from R:
+  - The full-size SVG draws the stored fit instead of refitting all points,
+    and shades the potency's 95% CI.
+  - 5PL curves are drawn as 4PL (the asymmetry parameter is not stored).
+"""
+from __future__ import annotations
+
+import math
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from app.core.config import NATIVE_FIT_WORKERS, THUMBNAIL_MAX_BYTES
+
+THUMB_WIDTH, THUMB_HEIGHT, THUMB_MARGIN = 200, 120, 4
+DETAIL_WIDTH, DETAIL_HEIGHT = 600, 400
+
+CATEGORY_COLORS = {
+    "SIGMOID": "#2563eb",
+    "INACTIVE": "#6b7280",
+    "NOISY": "#f59e0b",
+    "CANNOT_FIT": "#ef4444",
+    "PARTIAL_HIGH": "#f97316",
+    "PARTIAL_LOW": "#f97316",
+    "INVERSE": "#8b5cf6",
+    "HOOK_EFFECT": "#ec4899",
+}
+DEFAULT_COLOR = "#2563eb"
+EXCLUDED_COLOR = "#d1d5db"
+DETAIL_EXCLUDED_COLOR = "#9ca3af"
+POTENCY_COLOR = "#ef4444"
+
+# Categories whose thumbnail shows the points only (svg_thumbnail.R)
+NO_CURVE_CATEGORIES = frozenset({"CANNOT_FIT", "INACTIVE"})
+
+# (curve samples, coordinate decimals, CI band, data points), tried in order
+# until the thumbnail fits the byte budget
+_THUMB_LEVELS = (
+    (100, 1, True, True),
+    (50, 1, True, True),
+    (50, 0, True, True),
+    (25, 0, False, True),
+    (25, 0, False, False),
+)
+
+# Batches smaller than this render inline; pool dispatch costs more
+PARALLEL_MIN_THUMBNAILS = 2000
+
+_THUMB_TEMPLATE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="200" height="120" viewBox="0 0 200 120">'
+    '<rect width="200" height="120" fill="#fff"/>{body}</svg>'
+)
+# Round-capped zero-length segments render as dots in a single path
+_DOTS_TEMPLATE = '<path d="{d}" stroke="{color}" stroke-width="{size}" stroke-linecap="round"/>'
+_LINE_TEMPLATE = '<path d="{d}" fill="none" stroke="{color}" stroke-width="{width}"{extra}/>'
+_BAND_TEMPLATE = '<rect x="{x}" y="{y}" width="{w}" height="{h}" fill="{color}" fill-opacity="{opacity}"/>'
+
+FitParams = Mapping[str, Any]
+Point = Mapping[str, Any]
+
+
+# ── Geometry ──────────────────────────────────────────────────────────────────
+
+
+def _float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def curve_params(fit: FitParams) -> Optional[Tuple[float, float, float, float]]:
+    """(hill_slope, bottom, top, potency) when the fit can be drawn, else None."""
+    if fit.get("success") is False:
+        return None
+    b, c, d, e = (_float(fit.get(k)) for k in ("hill_slope", "bottom", "top", "potency"))
+    if b is None or c is None or d is None or e is None or e <= 0:
+        return None
+    return b, c, d, e
+
+
+def predict(params: Tuple[float, float, float, float], log10_x: np.ndarray) -> np.ndarray:
+    b, c, d, e = params
+    with np.errstate(over="ignore"):
+        return c + (d - c) / (1.0 + np.power(10.0, b * (log10_x - math.log10(e))))
+
+
+def _split_points(
+    points: Sequence[Point], excluded_point_ids: Iterable[str]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """log10(conc), response and an excluded mask for the plottable points."""
+    excluded = {str(pid) for pid in excluded_point_ids}
+    rows = [
+        (math.log10(float(p["conc"])), float(p["response"]), str(p.get("point_id")) in excluded)
+        for p in points
+        if p.get("conc") is not None and float(p["conc"]) > 0 and p.get("response") is not None
+    ]
+    if not rows:
+        return np.empty(0), np.empty(0), np.empty(0, bool)
+    log_x, y, mask = zip(*rows)
+    return np.asarray(log_x), np.asarray(y), np.asarray(mask, bool)
+
+
+def _span(lo: float, hi: float, pad: float) -> Tuple[float, float]:
+    if hi - lo < 1e-9:
+        lo, hi = lo - 1.0, hi + 1.0
+    extra = (hi - lo) * pad
+    return lo - extra, hi + extra
+
+
+class _Frame:
+    """Maps data coordinates (log10 conc, response) onto a pixel box."""
+
+    def __init__(self, x_range, y_range, left, top, width, height):
+        self.x0, self.x1 = x_range
+        self.y0, self.y1 = y_range
+        self.left, self.top, self.width, self.height = left, top, width, height
+
+    def px(self, x):
+        return self.left + (np.asarray(x, float) - self.x0) / (self.x1 - self.x0) * self.width
+
+    def py(self, y):
+        return self.top + (self.y1 - np.asarray(y, float)) / (self.y1 - self.y0) * self.height
+
+
+def _ranges(
+    log_x: np.ndarray, y: np.ndarray, params, samples: int
+) -> Tuple[Tuple[float, float], Tuple[float, float], Optional[np.ndarray], Optional[np.ndarray]]:
+    """Axis ranges plus the sampled curve, spanning the tested concentrations."""
+    if log_x.size:
+        x_lo, x_hi = float(log_x.min()), float(log_x.max())
+    elif params:
+        x_lo = x_hi = math.log10(params[3])
+    else:
+        x_lo, x_hi = 0.0, 1.0
+    curve_x = curve_y = None
+    y_values = [y] if y.size else []
+    if params:
+        if x_hi - x_lo < 1e-9:
+            x_lo, x_hi = x_lo - 1.0, x_hi + 1.0
+        curve_x = np.linspace(x_lo, x_hi, samples)
+        curve_y = predict(params, curve_x)
+        y_values.append(curve_y)
+    if y_values:
+        all_y = np.concatenate(y_values)
+        y_lo, y_hi = float(all_y.min()), float(all_y.max())
+    else:
+        y_lo, y_hi = 0.0, 100.0
+    return _span(x_lo, x_hi, 0.04), _span(y_lo, y_hi, 0.05), curve_x, curve_y
+
+
+def _path(xs: np.ndarray, ys: np.ndarray, decimals: int) -> str:
+    coords = [f"{x:.{decimals}f} {y:.{decimals}f}" for x, y in zip(xs.tolist(), ys.tolist())]
+    return "M" + "L".join(coords) if coords else ""
+
+
+def _dots(xs: np.ndarray, ys: np.ndarray, decimals: int) -> str:
+    return "".join(f"M{x:.{decimals}f} {y:.{decimals}f}h0" for x, y in zip(xs.tolist(), ys.tolist()))
+
+
+def _ci_band(fit: FitParams, frame: _Frame) -> Optional[Tuple[float, float]]:
+    """Pixel x extent of the potency CI, clipped to the plot; None if undrawable."""
+    lo, hi = _float(fit.get("ci_low_95")), _float(fit.get("ci_high_95"))
+    if lo is None or hi is None or lo <= 0 or hi <= lo:
+        return None
+    x_lo = float(np.clip(frame.px(math.log10(lo)), frame.left, frame.left + frame.width))
+    x_hi = float(np.clip(frame.px(math.log10(hi)), frame.left, frame.left + frame.width))
+    return (x_lo, x_hi) if x_hi > x_lo else None
+
+
+# ── Thumbnail ─────────────────────────────────────────────────────────────────
+
+
+def thumbnail_svg(
+    points: Sequence[Point],
+    fit: FitParams,
+    curve_category: str = "SIGMOID",
+    excluded_point_ids: Iterable[str] = (),
+    max_bytes: int = THUMBNAIL_MAX_BYTES,
+) -> str:
+    """200x120 thumbnail: points, fitted curve and CI band, within max_bytes."""
+    log_x, y, excluded = _split_points(points, excluded_point_ids)
+    params = None if curve_category in NO_CURVE_CATEGORIES else curve_params(fit)
+    color = CATEGORY_COLORS.get(curve_category, DEFAULT_COLOR)
+
+    svg = ""
+    for samples, decimals, band, with_points in _THUMB_LEVELS:
+        x_range, y_range, curve_x, curve_y = _ranges(log_x, y, params, samples)
+        frame = _Frame(
+            x_range, y_range, THUMB_MARGIN, THUMB_MARGIN,
+            THUMB_WIDTH - 2 * THUMB_MARGIN, THUMB_HEIGHT - 2 * THUMB_MARGIN,
+        )
+        parts = []
+        ci = _ci_band(fit, frame) if band and params else None
+        if ci:
+            parts.append(_BAND_TEMPLATE.format(
+                x=f"{ci[0]:.{decimals}f}", y=THUMB_MARGIN, w=f"{ci[1] - ci[0]:.{decimals}f}",
+                h=THUMB_HEIGHT - 2 * THUMB_MARGIN, color=color, opacity=".12",
+            ))
+        if with_points:
+            px, py = frame.px(log_x), frame.py(y)
+            if excluded.any():
+                parts.append(_DOTS_TEMPLATE.format(
+                    d=_dots(px[excluded], py[excluded], decimals), color=EXCLUDED_COLOR, size=3
+                ))
+            if (~excluded).any():
+                parts.append(_DOTS_TEMPLATE.format(
+                    d=_dots(px[~excluded], py[~excluded], decimals), color=color, size=3
+                ))
+        if curve_x is not None:
+            parts.append(_LINE_TEMPLATE.format(
+                d=_path(frame.px(curve_x), frame.py(curve_y), decimals),
+                color=color, width="1.1", extra="",
+            ))
+        svg = _THUMB_TEMPLATE.format(body="".join(parts))
+        if len(svg) <= max_bytes:
+            break
+    return svg
+
+
+def _thumbnail_job(job: Tuple[Sequence[Point], FitParams, str]) -> str:
+    points, fit, category = job
+    return thumbnail_svg(points, fit, category)
+
+
+def render_thumbnails(
+    jobs: Sequence[Tuple[Sequence[Point], FitParams, str]],
+    max_workers: int = NATIVE_FIT_WORKERS,
+) -> List[str]:
+    """
+    Thumbnails for (points, fit, curve_category) jobs, in order.
+
+    Large batches are rendered in the native fit process pool.
+    """
+    if max_workers <= 1 or len(jobs) < PARALLEL_MIN_THUMBNAILS:
+        return [_thumbnail_job(job) for job in jobs]
+
+    from app.services.native_fit import discard_process_pool, process_pool
+
+    chunksize = max(1, len(jobs) // (max_workers * 4))
+    try:
+        return list(process_pool(max_workers).map(_thumbnail_job, jobs, chunksize=chunksize))
+    except BrokenProcessPool:
+        discard_process_pool()
+        return [_thumbnail_job(job) for job in jobs]
+
+
+# ── Full size (PDF export) ────────────────────────────────────────────────────
+
+_DETAIL_LEFT, _DETAIL_RIGHT, _DETAIL_TOP, _DETAIL_BOTTOM = 64, 16, 40, 80
+_FONT = 'font-family="Helvetica,Arial,sans-serif"'
+
+
+def _nice_step(span: float, target: int = 5) -> float:
+    raw = span / target
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def _ticks(lo: float, hi: float, step: float) -> List[float]:
+    first = math.ceil(lo / step - 1e-9)
+    last = math.floor(hi / step + 1e-9)
+    return [round(i * step, 10) for i in range(first, last + 1)]
+
+
+def _conc_label(log10_x: float) -> str:
+    return f"{10 ** log10_x:g}"
+
+
+def detail_svg(
+    points: Sequence[Point],
+    fit: FitParams,
+    excluded_point_ids: Iterable[str] = (),
+    x_label: str = "Concentration",
+    y_label: str = "% Inhibition",
+    title: str = "",
+) -> str:
+    """Full-size SVG with axes, legend, CI band and potency marker (PDF export hook)."""
+    log_x, y, excluded = _split_points(points, excluded_point_ids)
+    params = curve_params(fit)
+    x_range, y_range, curve_x, curve_y = _ranges(log_x, y, params, 200)
+    plot_w = DETAIL_WIDTH - _DETAIL_LEFT - _DETAIL_RIGHT
+    plot_h = DETAIL_HEIGHT - _DETAIL_TOP - _DETAIL_BOTTOM
+    frame = _Frame(x_range, y_range, _DETAIL_LEFT, _DETAIL_TOP, plot_w, plot_h)
+    bottom_px = _DETAIL_TOP + plot_h
+
+    parts = [
+        f'<rect width="{DETAIL_WIDTH}" height="{DETAIL_HEIGHT}" fill="#fff"/>',
+        f'<rect x="{_DETAIL_LEFT}" y="{_DETAIL_TOP}" width="{plot_w}" height="{plot_h}" '
+        f'fill="#fff" stroke="#333" stroke-width="1"/>',
+    ]
+
+    # Gridlines and tick labels: decades on x (sub-decade steps for narrow ranges)
+    x_step = 1.0 if x_range[1] - x_range[0] >= 2 else _nice_step(x_range[1] - x_range[0])
+    grid, labels = [], []
+    for tick in _ticks(*x_range, x_step):
+        px = float(frame.px(tick))
+        grid.append(f"M{px:.1f} {_DETAIL_TOP}V{bottom_px}")
+        labels.append(
+            f'<text x="{px:.1f}" y="{bottom_px + 16}" text-anchor="middle">{_conc_label(tick)}</text>'
+        )
+    for tick in _ticks(*y_range, _nice_step(y_range[1] - y_range[0])):
+        py = float(frame.py(tick))
+        grid.append(f"M{_DETAIL_LEFT} {py:.1f}H{_DETAIL_LEFT + plot_w}")
+        labels.append(
+            f'<text x="{_DETAIL_LEFT - 6}" y="{py + 4:.1f}" text-anchor="end">{tick:g}</text>'
+        )
+    parts.append(f'<path d="{"".join(grid)}" stroke="#ebebeb" stroke-width="1"/>')
+    parts.append(f'<g {_FONT} font-size="11" fill="#4d4d4d">{"".join(labels)}</g>')
+
+    if params:
+        ci = _ci_band(fit, frame)
+        if ci:
+            parts.append(_BAND_TEMPLATE.format(
+                x=f"{ci[0]:.1f}", y=_DETAIL_TOP, w=f"{ci[1] - ci[0]:.1f}", h=plot_h,
+                color=DEFAULT_COLOR, opacity=".1",
+            ))
+        parts.append(_LINE_TEMPLATE.format(
+            d=_path(frame.px(curve_x), frame.py(curve_y), 1), color=DEFAULT_COLOR, width="2", extra="",
+        ))
+
+    px, py = frame.px(log_x), frame.py(y)
+    if (~excluded).any():
+        parts.append(_DOTS_TEMPLATE.format(
+            d=_dots(px[~excluded], py[~excluded], 1), color=DEFAULT_COLOR, size=8
+        ))
+    if excluded.any():
+        crosses = "".join(
+            f"M{x - 4:.1f} {y - 4:.1f}l8 8M{x - 4:.1f} {y + 4:.1f}l8 -8"
+            for x, y in zip(px[excluded].tolist(), py[excluded].tolist())
+        )
+        parts.append(_LINE_TEMPLATE.format(d=crosses, color=DETAIL_EXCLUDED_COLOR, width="2", extra=""))
+
+    if params:
+        potency_x = math.log10(params[3])
+        if x_range[0] <= potency_x <= x_range[1]:
+            vx = float(frame.px(potency_x))
+            parts.append(_LINE_TEMPLATE.format(
+                d=f"M{vx:.1f} {_DETAIL_TOP}V{bottom_px}", color=POTENCY_COLOR, width="1.5",
+                extra=' stroke-dasharray="6 4"',
+            ))
+            parts.append(
+                f'<text x="{vx + 6:.1f}" y="{_DETAIL_TOP + 16}" {_FONT} font-size="12" '
+                f'fill="{POTENCY_COLOR}">IC50 = {params[3]:.3g}</text>'
+            )
+
+    # Axis titles, chart title, legend
+    legend_y = DETAIL_HEIGHT - 14
+    mid_x = _DETAIL_LEFT + plot_w / 2
+    parts.append(
+        f'<g {_FONT} fill="#000">'
+        f'<text x="{mid_x:.1f}" y="{bottom_px + 36}" font-size="13" text-anchor="middle">{escape(x_label)}</text>'
+        f'<text transform="translate(18 {_DETAIL_TOP + plot_h / 2:.1f}) rotate(-90)" font-size="13" '
+        f'text-anchor="middle">{escape(y_label)}</text>'
+        f'<text x="{_DETAIL_LEFT}" y="{_DETAIL_TOP - 14}" font-size="15">{escape(title)}</text>'
+        f'<text x="{mid_x - 40:.1f}" y="{legend_y + 4}" font-size="12">Used</text>'
+        f'<text x="{mid_x + 36:.1f}" y="{legend_y + 4}" font-size="12">Excluded</text>'
+        f'</g>'
+    )
+    parts.append(_DOTS_TEMPLATE.format(d=f"M{mid_x - 52:.1f} {legend_y}h0", color=DEFAULT_COLOR, size=8))
+    parts.append(_LINE_TEMPLATE.format(
+        d=f"M{mid_x + 20:.1f} {legend_y - 4}l8 8M{mid_x + 20:.1f} {legend_y + 4}l8 -8",
+        color=DETAIL_EXCLUDED_COLOR, width="2", extra="",
+    ))
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{DETAIL_WIDTH}" height="{DETAIL_HEIGHT}" '
+        f'viewBox="0 0 {DETAIL_WIDTH} {DETAIL_HEIGHT}">{"".join(parts)}</svg>'
+    )
+
+
+def fit_params(result: Any) -> Dict[str, Optional[float]]:
+    """Drawable fit parameters from a DoseResponseResult row (Numeric columns → float)."""
+    return {
+        key: _float(getattr(result, key))
+        for key in ("potency", "hill_slope", "bottom", "top", "ci_low_95", "ci_high_95")
+    }
@@ -11,8 +11,10 @@ Responsibilities:
   6. Group by replicate_group, average replicates per concentration level
   7. Apply lims_run_data_exclusions (soft knockout)
   8. Enforce 10% knockout rule (warning, not a block)
-  9. POST all compounds to r-calculator in one batch (synchronous, 60s timeout)
-  10. Write dose_response_results in a single DB transaction
+  9. Fit all compounds in one batch: POST to r-calculator (synchronous, 60s
+     timeout), or in-process when DOSE_RESPONSE_FIT_BACKEND=native
+  10. Render thumbnails the fit did not return (curve_svg.render_thumbnails)
+  11. Write dose_response_results in a single DB transaction
       (all-or-nothing: if any DB write fails, the whole batch is rolled back)
 
 R never touches the database. FastAPI owns data access and normalization.
@@ -22,12 +24,20 @@ from __future__ import annotations
 import logging
 import uuid
 from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+import numpy as np
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.config import DOSE_RESPONSE_FIT_BACKEND
+from app.core.events import FIT, publish_event
+from app.services.curve_svg import render_thumbnails
+from app.services.native_fit import NativeFitClient
 from app.services.r_calculator_client import RCalculatorClient
 from models.dose_response import (
     CurveCategory,
@@ -43,22 +53,146 @@ logger = logging.getLogger(__name__)
 
 MAX_KNOCKOUT_PCT = 10.0
 
+FitClient = Union[RCalculatorClient, NativeFitClient]
+
+
+@dataclass
+class CompoundRows:
+    """One compound's test wells from a run, bucketed in a single pass."""
+
+    # Non-excluded wells with a concentration, in row order
+    conc: List[float] = field(default_factory=list)
+    signal: List[float] = field(default_factory=list)
+    point_ids: List[str] = field(default_factory=list)
+    # Wells with a concentration (excluded or not), for the knockout rule
+    concentration_rows: int = 0
+    excluded_concentration_rows: int = 0
+    excluded_rows: int = 0
+    replicate_group: Optional[str] = None
+    concentration_unit: Optional[str] = None
+
+
+def bucket_run_rows(
+    data_rows: Iterable[LimsRunData],
+    samples_by_id: Mapping[uuid.UUID, Sample],
+    qc_entry_by_id: Mapping[uuid.UUID, str],
+    excluded_data_ids: Set[str],
+    well_def_by_pos: Mapping[str, TemplateWellDefinition],
+    result_col: Optional[str],
+    sample_id_filter: Optional[uuid.UUID] = None,
+) -> Tuple[List[float], List[float], Dict[uuid.UUID, CompoundRows]]:
+    """
+    Split a run's rows into positive/negative control signals and per-compound
+    test wells, reading each row's signal and well definition once.
+    Excluded control wells are dropped; excluded test wells are only counted.
+    """
+    pos_signals: List[float] = []
+    neg_signals: List[float] = []
+    compounds: Dict[uuid.UUID, CompoundRows] = defaultdict(CompoundRows)
+
+    for row in data_rows:
+        if not row.sample_id:
+            continue
+        sample = samples_by_id.get(row.sample_id)
+        if not sample:
+            continue
+        signal = DoseResponseFitService._extract_signal(row, result_col)
+        if signal is None:
+            continue
+
+        excluded = str(row.id) in excluded_data_ids
+        qc_name = qc_entry_by_id.get(sample.qc_type)
+        if qc_name == "positive_control":
+            if not excluded:
+                pos_signals.append(signal)
+            continue
+        if qc_name == "negative_control":
+            if not excluded:
+                neg_signals.append(signal)
+            continue
+        if sample_id_filter and row.sample_id != sample_id_filter:
+            continue
+
+        bucket = compounds[row.sample_id]
+        well_def = well_def_by_pos.get(row.well_position or "")
+        has_conc = well_def is not None and well_def.concentration_value is not None
+        if excluded:
+            bucket.excluded_rows += 1
+        if not has_conc:
+            continue
+        bucket.concentration_rows += 1
+        if excluded:
+            bucket.excluded_concentration_rows += 1
+            continue
+        bucket.conc.append(float(well_def.concentration_value))
+        bucket.signal.append(signal)
+        bucket.point_ids.append(str(row.id))
+        bucket.replicate_group = well_def.replicate_group
+        bucket.concentration_unit = well_def.concentration_unit
+
+    return pos_signals, neg_signals, dict(compounds)
+
+
+def average_replicates(
+    compound: CompoundRows, pos_mean: float, neg_mean: float
+) -> List[Dict]:
+    """
+    Normalize to % inhibition, (signal - neg_mean) / (pos_mean - neg_mean) * 100,
+    and average replicates per concentration level (ascending). Each point
+    keeps the first replicate's point_id as its representative.
+    """
+    conc = np.asarray(compound.conc, dtype=float)
+    response = (np.asarray(compound.signal, dtype=float) - neg_mean) / (pos_mean - neg_mean) * 100.0
+    levels, first, inverse, counts = np.unique(
+        conc, return_index=True, return_inverse=True, return_counts=True
+    )
+    means = np.bincount(inverse, weights=response, minlength=levels.size) / counts
+    return [
+        {"conc": float(level), "response": float(mean), "point_id": compound.point_ids[i]}
+        for level, mean, i in zip(levels, means, first)
+    ]
+
+
+@lru_cache(maxsize=1)
+def default_fit_client() -> FitClient:
+    """
+    The fitting backend configured by DOSE_RESPONSE_FIT_BACKEND ("r" or
+    "native"), shared per process so its connection or worker pool is reused.
+    """
+    if DOSE_RESPONSE_FIT_BACKEND == "native":
+        return NativeFitClient()
+    if DOSE_RESPONSE_FIT_BACKEND == "r":
+        return RCalculatorClient()
+    raise ValueError(
+        f"DOSE_RESPONSE_FIT_BACKEND must be 'r' or 'native', got {DOSE_RESPONSE_FIT_BACKEND!r}"
+    )
+
 
 class DoseResponseFitService:
     def __init__(
         self,
         db: Session,
         current_user: User,
-        r_client: Optional[RCalculatorClient] = None,
+        r_client: Optional[FitClient] = None,
     ) -> None:
         self.db = db
         self.current_user = current_user
-        self.r_client = r_client or RCalculatorClient()
+        self.r_client = r_client or default_fit_client()
 
     # ── Public API ────────────────────────────────────────────────────────────
 
     _FITTABLE_STATUSES = {"running", "results_received", "complete"}  # LimsRunStatus is str,Enum
 
+    def check_fittable(self, run_id: uuid.UUID) -> LimsRun:
+        """
+        The cheap preconditions of trigger_fit/trigger_refit, checked before a
+        fit job is queued. Raises 404, 422 (status) or 409 (in progress).
+        """
+        run = self._get_run_or_404(run_id)
+        self._check_run_status(run)
+        self._check_not_in_progress(run)
+        return run
+
     def trigger_fit(self, run_id: uuid.UUID) -> Dict:
         """
         Main entry point. Fits all non-control compounds in the run.
@@ -66,7 +200,7 @@ class DoseResponseFitService:
 
         Raises 409 if fit_in_progress for this run.
         Raises 422 if run is not in a fittable status, controls are missing, or normalization is invalid.
-        Raises 503 on R service failure.
+        Raises 503 on fitting backend failure.
         """
         run = self._get_run_or_404(run_id)
         self._check_run_status(run)
@@ -119,6 +253,13 @@ class DoseResponseFitService:
     def _set_fit_in_progress(self, run: LimsRun, value: bool) -> None:
         run.fit_in_progress = value
         self.db.flush()
+        publish_event(
+            self.db,
+            FIT,
+            {"run_id": run.id, "fit_in_progress": value},
+            user_id=self.current_user.id,
+            client_id=self.current_user.client_id,
+        )
         self.db.commit()
 
     def _run_fit(
@@ -152,9 +293,6 @@ class DoseResponseFitService:
         samples_by_id: Dict[uuid.UUID, Sample] = {}
         if sample_ids:
             samples = self.db.query(Sample).filter(Sample.id.in_(sample_ids)).all()
-            # qc_type is a UUID FK to list_entries — we need the list entry value
-            # Load via join to get the actual string value
-            from models.list import ListEntry
             for s in samples:
                 samples_by_id[s.id] = s
 
@@ -181,40 +319,23 @@ class DoseResponseFitService:
         # ── Step 1: Identify control wells via sample.qc_type ─────────────────
         # sample.qc_type is a UUID FK to list_entries. We match by list entry name.
         # Control identification uses lims_run_data.sample_id → samples.qc_type → list_entries.name
-        from models.list import ListEntry
-        qc_list_entries = (
-            self.db.query(ListEntry)
-            .filter(ListEntry.name.in_(["positive_control", "negative_control"]))
-            .all()
+        from app.core.reference_cache import entries_named
+        qc_entry_by_id: Dict[uuid.UUID, str] = {
+            e.id: e.name
+            for name in ("positive_control", "negative_control")
+            for e in entries_named(self.db, name)
+        }
+
+        # ── Steps 1 + 4: one pass buckets controls and test wells by sample ───
+        pos_control_signals, neg_control_signals, compounds = bucket_run_rows(
+            data_rows,
+            samples_by_id,
+            qc_entry_by_id,
+            excluded_data_ids,
+            well_def_by_pos,
+            dr_config.get("result_column"),
+            sample_id_filter,
         )
-        qc_entry_by_id: Dict[uuid.UUID, str] = {e.id: e.name for e in qc_list_entries}
-
-        pos_control_signals: List[float] = []
-        neg_control_signals: List[float] = []
-        test_data_rows: List[LimsRunData] = []
-
-        result_col = dr_config.get("result_column")
-
-        for row in data_rows:
-            if not row.sample_id:
-                continue
-            sample = samples_by_id.get(row.sample_id)
-            if not sample:
-                continue
-
-            signal = self._extract_signal(row, result_col)
-            if signal is None:
-                continue
-
-            qc_name = qc_entry_by_id.get(sample.qc_type)
-            if qc_name == "positive_control":
-                if str(row.id) not in excluded_data_ids:
-                    pos_control_signals.append(signal)
-            elif qc_name == "negative_control":
-                if str(row.id) not in excluded_data_ids:
-                    neg_control_signals.append(signal)
-            else:
-                test_data_rows.append(row)
 
         # ── Step 2: Validate controls ──────────────────────────────────────────
         if not pos_control_signals:
@@ -251,41 +372,8 @@ class DoseResponseFitService:
             },
         )
 
-        # ── Step 3: Normalize to % inhibition ────────────────────────────────
-        # % inhibition = (signal - neg_mean) / (pos_mean - neg_mean) * 100
-        def normalize(signal: float) -> float:
-            return (signal - neg_mean) / (pos_mean - neg_mean) * 100.0
-
-        # ── Step 4: Group test wells by compound, pair with concentrations ────
-        # Group by sample_id → replicate_group (from template_well_definitions)
-        # Then group by concentration_value → average replicates
-        compound_data: Dict[uuid.UUID, Dict] = defaultdict(lambda: {"points_by_conc": defaultdict(list)})
-
-        for row in test_data_rows:
-            if str(row.id) in excluded_data_ids:
-                continue
-            if sample_id_filter and row.sample_id != sample_id_filter:
-                continue
-
-            well_def = well_def_by_pos.get(row.well_position or "")
-            if not well_def:
-                continue
-            if well_def.concentration_value is None:
-                continue
-
-            signal = self._extract_signal(row, result_col)
-            if signal is None:
-                continue
-
-            pct_inh = normalize(signal)
-            conc = float(well_def.concentration_value)
-            compound_data[row.sample_id]["points_by_conc"][conc].append({
-                "response": pct_inh,
-                "point_id": str(row.id),
-            })
-            compound_data[row.sample_id]["replicate_group"] = well_def.replicate_group
-            compound_data[row.sample_id]["concentration_unit"] = well_def.concentration_unit
-
+        # Compounds with at least one usable (non-excluded) concentration point
+        compound_data = {sid: c for sid, c in compounds.items() if c.conc}
         if not compound_data:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -293,7 +381,7 @@ class DoseResponseFitService:
             )
 
         # Validate concentration unit uniformity across all compounds
-        conc_units = {cdata.get("concentration_unit") for cdata in compound_data.values()}
+        conc_units = {cdata.concentration_unit for cdata in compound_data.values()}
         conc_units.discard(None)
         if len(conc_units) > 1:
             raise HTTPException(
@@ -301,43 +389,14 @@ class DoseResponseFitService:
                 detail=f"Mixed concentration units detected: {sorted(conc_units)}. All template wells must use the same unit.",
             )
 
-        # ── Step 5: Build compound payloads for R ─────────────────────────────
+        # ── Steps 3 + 5: Normalize, average replicates, build fit payloads ────
         r_compounds = []
         warnings = []
 
         for sid, cdata in compound_data.items():
-            points_by_conc = cdata["points_by_conc"]
-
-            # Average replicates per concentration level
-            averaged_points = []
-            total_reps = 0
-            for conc, reps in sorted(points_by_conc.items()):
-                total_reps += len(reps)
-                avg_response = sum(r["response"] for r in reps) / len(reps)
-                averaged_points.append({
-                    "conc": conc,
-                    "response": avg_response,
-                    "point_id": reps[0]["point_id"],  # representative point_id
-                })
-
-            # Check excluded replicates for 10% rule
-            # Count all reps for this compound (including excluded)
-            all_reps_for_compound = sum(
-                1
-                for row2 in test_data_rows
-                if row2.sample_id == sid
-                for v in [well_def_by_pos.get(row2.well_position or "")]
-                if v and v.concentration_value is not None
-            )
-            excluded_for_compound = sum(
-                1 for row2 in test_data_rows
-                if row2.sample_id == sid and str(row2.id) in excluded_data_ids
-                and (lambda v: v and v.concentration_value is not None)(
-                    well_def_by_pos.get(row2.well_position or "")
-                )
-            )
-            if all_reps_for_compound > 0:
-                knockout_pct = excluded_for_compound / all_reps_for_compound * 100
+            # 10% rule: excluded share of this compound's concentration wells
+            if cdata.concentration_rows > 0:
+                knockout_pct = cdata.excluded_concentration_rows / cdata.concentration_rows * 100
                 if knockout_pct > MAX_KNOCKOUT_PCT:
                     warnings.append({
                         "sample_id": str(sid),
@@ -346,7 +405,7 @@ class DoseResponseFitService:
 
             r_compounds.append({
                 "sample_id": str(sid),
-                "points": averaged_points,
+                "points": average_replicates(cdata, pos_mean, neg_mean),
                 "model": model,
                 "constraints": constraints,
             })
@@ -354,10 +413,9 @@ class DoseResponseFitService:
         r_config = {
             "r_squared_threshold": r_sq_threshold,
             "inactive_threshold": inactive_threshold,
-            "concentration_unit": (
-                list(compound_data.values())[0].get("concentration_unit", "unknown")
-                if compound_data else "unknown"
-            ),
+            "concentration_unit": next(iter(compound_data.values())).concentration_unit,
+            # Thumbnails are rendered here (curve_svg.py), not by ggplot in R
+            "render_thumbnails": False,
         }
 
         logger.info(
@@ -365,9 +423,19 @@ class DoseResponseFitService:
             extra={"run_id": str(run.id), "compound_count": len(r_compounds)},
         )
 
-        # ── Step 6: POST to R service ─────────────────────────────────────────
+        # ── Step 6: Fit (R service or in-process, per DOSE_RESPONSE_FIT_BACKEND) ─
         r_results = self.r_client.fit(r_compounds, r_config)
 
+        missing = [r_res for r_res in r_results if not r_res.get("thumbnail_svg")]
+        if missing:
+            points_by_sid = {c["sample_id"]: c["points"] for c in r_compounds}
+            thumbnails = render_thumbnails([
+                (points_by_sid.get(r_res["sample_id"], []), r_res, r_res["curve_category"])
+                for r_res in missing
+            ])
+            for r_res, svg in zip(missing, thumbnails):
+                r_res["thumbnail_svg"] = svg
+
         # ── Step 7: Write results (all-or-nothing transaction) ────────────────
         fitted = 0
         failed = 0
@@ -393,15 +461,9 @@ class DoseResponseFitService:
         new_rows = []
         for r_res in r_results:
             sid = uuid.UUID(r_res["sample_id"])
-            points_used = sum(
-                len(reps)
-                for reps in compound_data[sid]["points_by_conc"].values()
-            ) if sid in compound_data else None
-
-            points_excluded = sum(
-                1 for row2 in test_data_rows
-                if row2.sample_id == sid and str(row2.id) in excluded_data_ids
-            )
+            cdata = compound_data.get(sid)
+            points_used = len(cdata.conc) if cdata else None
+            points_excluded = cdata.excluded_rows if cdata else 0
 
             # Determine fit_version
             prior = next((o for o in old_results if o.sample_id == sid), None)
@@ -0,0 +1,222 @@
+"""
+Full-size dose-response SVGs (PDF export hook), cached on disk by render inputs.
+
+SVGs are drawn by curve_svg.detail_svg() from the stored fit parameters. A
+render is keyed by renderer version, result id, fit_version, title, axis
+labels and the run's exclusion set, so the cache key doubles as a strong ETag
+and a hit costs two small queries. Run-level inputs (control normalization,
+well concentrations, data rows) are loaded once per run and only on a miss.
+
+After a fit, prerender_svgs_background() renders every uncached curve of the
+run so the first export skips loading the run's data rows.
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.reference_cache import entries_named
+from app.core.svg_cache import render_key, svg_cache
+from app.services.curve_svg import detail_svg, fit_params
+from app.services.dose_response_fit import DoseResponseFitService
+from models.dose_response import DoseResponseResult, LimsRunDataExclusion
+from models.flexible_experiment import LimsRun, LimsRunData
+from models.sample import Sample
+from models.template_well import TemplateWellDefinition
+
+logger = logging.getLogger(__name__)
+
+X_LABEL = "Concentration"
+Y_LABEL = "% Inhibition"
+# Bump when detail_svg() output changes so cached renders are not reused
+RENDERER_VERSION = "py1"
+
+
+@dataclass
+class SvgRender:
+    key: str
+    cached: Optional[str] = None
+    payload: Optional[Dict[str, Any]] = None  # detail_svg() kwargs when not cached
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.key[:32]}"'
+
+
+def render_svg(request: SvgRender) -> str:
+    """Return the cached SVG, or render and cache it."""
+    if request.cached is not None:
+        return request.cached
+    svg = detail_svg(**request.payload)
+    svg_cache.put(request.key, svg)
+    return svg
+
+
+class DoseResponseSvgService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def render_requests(
+        self, run: LimsRun, results: Sequence[DoseResponseResult]
+    ) -> List[SvgRender]:
+        """Cache key plus cached SVG or R payload for each result, in order."""
+        excluded_ids = sorted(
+            str(exc.lims_run_data_id)
+            for exc in self.db.query(LimsRunDataExclusion)
+            .join(LimsRunData, LimsRunDataExclusion.lims_run_data_id == LimsRunData.id)
+            .filter(LimsRunData.lims_run_id == run.id)
+            .all()
+        )
+        sample_ids = {r.sample_id for r in results}
+        names = {
+            s.id: s.name
+            for s in self.db.query(Sample).filter(Sample.id.in_(sample_ids)).all()
+        } if sample_ids else {}
+
+        renders: List[SvgRender] = []
+        points_for: Optional[Callable[[uuid.UUID], List[Dict]]] = None
+        for result in results:
+            title = names.get(result.sample_id) or str(result.sample_id)
+            key = render_key(
+                RENDERER_VERSION, result.id, result.fit_version, title, X_LABEL, Y_LABEL, excluded_ids
+            )
+            cached = svg_cache.get(key)
+            if cached is not None:
+                renders.append(SvgRender(key=key, cached=cached))
+                continue
+            if points_for is None:
+                points_for = self._load_points(run, set(excluded_ids))
+            renders.append(SvgRender(key=key, payload={
+                "points": points_for(result.sample_id),
+                "fit": fit_params(result),
+                "excluded_point_ids": excluded_ids,
+                "x_label": X_LABEL,
+                "y_label": Y_LABEL,
+                "title": title,
+            }))
+        return renders
+
+    def _load_points(
+        self, run: LimsRun, excluded_ids: set
+    ) -> Callable[[uuid.UUID], List[Dict]]:
+        """Load the run's rows once; return sample_id → normalized points (excluded included)."""
+        template_def = (run.experiment_template.template_definition or {})
+        dr_config = template_def.get("dose_response_config", {})
+        result_col = dr_config.get("result_column")
+
+        well_defs = {
+            wd.well_position: wd
+            for wd in self.db.query(TemplateWellDefinition)
+            .filter(TemplateWellDefinition.template_id == run.experiment_template_id)
+            .all()
+        }
+        all_run_rows = (
+            self.db.query(LimsRunData)
+            .filter(LimsRunData.lims_run_id == run.id)
+            .all()
+        )
+        all_sample_ids = {r.sample_id for r in all_run_rows if r.sample_id}
+        samples_map = {
+            s.id: s for s in self.db.query(Sample).filter(Sample.id.in_(all_sample_ids)).all()
+        } if all_sample_ids else {}
+        qc_by_id = {
+            e.id: e.name
+            for name in ("positive_control", "negative_control")
+            for e in entries_named(self.db, name)
+        }
+
+        # Normalize to % inhibition from the run's (non-excluded) control wells
+        pos_signals: List[float] = []
+        neg_signals: List[float] = []
+        rows_by_sample: Dict[uuid.UUID, List[LimsRunData]] = defaultdict(list)
+        for r in all_run_rows:
+            if not r.sample_id:
+                continue
+            rows_by_sample[r.sample_id].append(r)
+            if str(r.id) in excluded_ids:
+                continue
+            s = samples_map.get(r.sample_id)
+            if not s:
+                continue
+            sig = DoseResponseFitService._extract_signal(r, result_col)
+            if sig is None:
+                continue
+            qc_name = qc_by_id.get(s.qc_type)
+            if qc_name == "positive_control":
+                pos_signals.append(sig)
+            elif qc_name == "negative_control":
+                neg_signals.append(sig)
+
+        scale: Optional[tuple] = None
+        if pos_signals and neg_signals:
+            pos_mean = sum(pos_signals) / len(pos_signals)
+            neg_mean = sum(neg_signals) / len(neg_signals)
+            if pos_mean != neg_mean:
+                scale = (neg_mean, pos_mean - neg_mean)
+
+        def _norm(sig: float) -> float:
+            return (sig - scale[0]) / scale[1] * 100.0 if scale else sig
+
+        def points_for(sample_id: uuid.UUID) -> List[Dict]:
+            points = []
+            for row in rows_by_sample.get(sample_id, ()):
+                wd = well_defs.get(row.well_position or "")
+                if not wd or wd.concentration_value is None:
+                    continue
+                sig = DoseResponseFitService._extract_signal(row, result_col)
+                points.append({
+                    "conc": float(wd.concentration_value),
+                    "response": _norm(sig) if sig is not None else 0.0,
+                    "point_id": str(row.id),
+                })
+            return points
+
+        return points_for
+
+    def pending_renders(
+        self, run_id: uuid.UUID, sample_id: Optional[uuid.UUID] = None
+    ) -> List[SvgRender]:
+        """Uncached renders for the run's latest results (optionally one compound)."""
+        run = self.db.query(LimsRun).filter(LimsRun.id == run_id).first()
+        if not run:
+            return []
+        q = self.db.query(DoseResponseResult).filter(
+            DoseResponseResult.lims_run_id == run_id,
+            DoseResponseResult.superseded_by.is_(None),
+        )
+        if sample_id:
+            q = q.filter(DoseResponseResult.sample_id == sample_id)
+        return [r for r in self.render_requests(run, q.all()) if r.cached is None]
+
+
+def prerender_svgs_background(
+    run_id: uuid.UUID,
+    sample_id: Optional[uuid.UUID],
+    user_id: uuid.UUID,
+    client_id: Optional[uuid.UUID],
+) -> None:
+    """Background task after a fit: fill the SVG cache for the run's new curves."""
+    if not svg_cache.enabled:
+        return
+    from app.database import BackgroundSessionLocal, set_rls_context
+
+    db = BackgroundSessionLocal()
+    try:
+        set_rls_context(db, user_id=str(user_id), client_id=str(client_id) if client_id else None)
+        pending = DoseResponseSvgService(db).pending_renders(run_id, sample_id)
+        db.rollback()
+    except Exception:
+        db.rollback()
+        logger.exception("SVG pre-render failed to load run", extra={"run_id": str(run_id)})
+        return
+    finally:
+        db.close()
+
+    for request in pending:
+        render_svg(request)
+    logger.info("SVG pre-render complete", extra={"run_id": str(run_id), "rendered": len(pending)})
@@ -0,0 +1,240 @@
+"""
+SQL-side prioritization for GET /samples/eligible.
+
+The previous implementation loaded every eligible sample, computed the
+expiration / due fields in Python, sorted the whole list and then sliced a
+page. EligibleSamplesQuery does it in one statement:
+
+  - effective due date, expiration date (date_sampled + min shelf_life over
+    open tests), days_until_* and the expired/overdue flags are SQL
+    expressions,
+  - expired / overdue / visible totals are window counts over the full
+    eligible set (so they are unaffected by paging),
+  - rows are ordered by (days_until_expiration, days_until_due, id) with
+    NULLs mapped to NULL_SORT_KEY, which makes the order a plain row-value
+    comparison; ?cursor= continues after the last row's key (keyset), ?page=
+    still works as OFFSET.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Integer, bindparam, func, literal_column, or_, select, true, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.reference_cache import list_entry_ids
+from models.analysis import Analysis
+from models.project import Project
+from models.sample import Sample
+from models.test import Test
+
+# Sorts NULL days_until_* last (ASC NULLS LAST) while keeping keyset comparisons total
+NULL_SORT_KEY = 2147483647
+
+# Days ahead at which an unexpired sample gets an expiration warning
+EXPIRING_SOON_DAYS = 3
+
+TERMINAL_TEST_STATUSES = ("Complete", "Completed", "Cancelled", "Canceled")
+
+_SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class EligiblePage:
+    rows: List[dict]
+    total: int
+    warnings: List[str] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def _whole_days(later, now):
+    """floor((later - now) in days), matching timedelta.days."""
+    return func.floor(func.extract("epoch", later - now) / _SECONDS_PER_DAY).cast(Integer)
+
+
+class EligibleSamplesQuery:
+    def __init__(self, db: Session, *, now: Optional[datetime] = None) -> None:
+        self.db = db
+        self.now = now or datetime.utcnow()
+
+    def _terminal_status_ids(self) -> List[UUID]:
+        return list_entry_ids(self.db, "test_status", TERMINAL_TEST_STATUSES)
+
+    def _open_tests(self, analysis_ids: Sequence[UUID], excluded_status_ids: Sequence[UUID]):
+        conditions = [Test.active == True]
+        if analysis_ids:
+            conditions.append(Test.analysis_id.in_(list(analysis_ids)))
+        if excluded_status_ids:
+            conditions.append(~Test.status.in_(list(excluded_status_ids)))
+        return conditions
+
+    def _ranked(
+        self,
+        *,
+        analysis_ids: Sequence[UUID],
+        project_id: Optional[UUID],
+        include_expired: bool,
+    ):
+        excluded_status_ids = self._terminal_status_ids()
+        open_tests = self._open_tests(analysis_ids, excluded_status_ids)
+
+        # Most restrictive (shortest) shelf life over the sample's open tests
+        shelf = (
+            select(Test.sample_id, func.min(Analysis.shelf_life).label("min_shelf_life"))
+            .join(Analysis, Test.analysis_id == Analysis.id)
+            .where(Analysis.active == True, *open_tests)
+            .group_by(Test.sample_id)
+            .subquery("shelf")
+        )
+
+        effective_due = func.coalesce(Sample.due_date, Project.due_date)
+        # shelf_life 0/NULL means "does not expire", as before
+        shelf_life_days = func.nullif(shelf.c.min_shelf_life, 0)
+        expiration = Sample.date_sampled + shelf_life_days * literal_column("interval '1 day'")
+        now = bindparam("eligible_now", self.now, type_=DateTime)
+
+        conditions = [Sample.active == True]
+        if project_id:
+            conditions.append(Sample.project_id == project_id)
+        if analysis_ids:
+            has_open_test = select(Test.id).where(Test.sample_id == Sample.id, *open_tests).exists()
+            conditions.append(has_open_test)
+
+        eligible = (
+            select(
+                Sample.id,
+                Sample.name,
+                Sample.description,
+                Sample.due_date,
+                Sample.received_date,
+                Sample.date_sampled,
+                Sample.sample_type,
+                Sample.status,
+                Sample.matrix,
+                Sample.project_id,
+                Sample.qc_type,
+                Project.name.label("project_name"),
+                Project.due_date.label("project_due_date"),
+                shelf.c.min_shelf_life.label("shelf_life"),
+                effective_due.label("effective_due_date"),
+                _whole_days(expiration, now).label("days_until_expiration"),
+                _whole_days(effective_due, now).label("days_until_due"),
+            )
+            .join(Project, Sample.project_id == Project.id)
+            .outerjoin(shelf, Sample.id == shelf.c.sample_id)
+            .where(*conditions)
+            .subquery("eligible")
+        )
+
+        e = eligible.c
+        is_expired = e.days_until_expiration < 0
+        is_overdue = e.days_until_due < 0
+        if include_expired:
+            visible = true()
+        else:
+            visible = or_(e.days_until_expiration.is_(None), e.days_until_expiration >= 0)
+
+        return select(
+            *e,
+            func.coalesce(e.days_until_expiration, NULL_SORT_KEY).label("expiration_key"),
+            func.coalesce(e.days_until_due, NULL_SORT_KEY).label("due_key"),
+            visible.label("visible"),
+            func.count().filter(is_expired).over().label("expired_count"),
+            func.count().filter(is_overdue).over().label("overdue_count"),
+            func.count().filter(visible).over().label("visible_count"),
+        ).subquery("ranked")
+
+    def page(
+        self,
+        *,
+        analysis_ids: Sequence[UUID] = (),
+        project_id: Optional[UUID] = None,
+        include_expired: bool = False,
+        page: int = 1,
+        size: int = 10,
+        cursor: Optional[str] = None,
+    ) -> EligiblePage:
+        """One page of eligible samples plus whole-set totals and warnings."""
+        ranked = self._ranked(
+            analysis_ids=analysis_ids, project_id=project_id, include_expired=include_expired
+        )
+        r = ranked.c
+        sort_key = (r.expiration_key, r.due_key, r.id)
+        stmt = select(ranked).where(r.visible).order_by(*sort_key).limit(size)
+        if cursor:
+            expiration_key, due_key, last_id = decode_cursor(cursor, 3)
+            try:
+                if not all(isinstance(key, int) for key in (expiration_key, due_key)):
+                    raise ValueError("cursor keys must be integers")
+                last_id = UUID(str(last_id))
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            stmt = stmt.where(tuple_(*sort_key) > tuple_(expiration_key, due_key, last_id))
+        else:
+            stmt = stmt.offset((page - 1) * size)
+
+        rows = self.db.execute(stmt).mappings().all()
+        if rows:
+            counts = rows[0]
+        else:
+            # Past the last page: totals still come from the window counts
+            counts = self.db.execute(select(ranked).limit(1)).mappings().first() or {}
+
+        warnings = []
+        if counts.get("expired_count"):
+            warnings.append(f"{counts['expired_count']} expired sample(s) found")
+        if counts.get("overdue_count"):
+            warnings.append(f"{counts['overdue_count']} overdue sample(s) found")
+
+        next_cursor = None
+        if len(rows) == size:
+            last = rows[-1]
+            next_cursor = encode_cursor((last["expiration_key"], last["due_key"], last["id"]))
+
+        return EligiblePage(
+            rows=[self._response_row(row) for row in rows],
+            total=counts.get("visible_count", 0),
+            warnings=warnings,
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def _response_row(row) -> Dict:
+        days_until_expiration = row["days_until_expiration"]
+        days_until_due = row["days_until_due"]
+        is_expired = days_until_expiration is not None and days_until_expiration < 0
+        expiration_warning = None
+        if is_expired:
+            expiration_warning = f"Sample expired {abs(days_until_expiration)} days ago"
+        elif days_until_expiration is not None and days_until_expiration <= EXPIRING_SOON_DAYS:
+            expiration_warning = f"Sample expires in {days_until_expiration} days"
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "due_date": row["due_date"],
+            "received_date": row["received_date"],
+            "date_sampled": row["date_sampled"],
+            "sample_type": row["sample_type"],
+            "status": row["status"],
+            "matrix": row["matrix"],
+            "project_id": row["project_id"],
+            "qc_type": row["qc_type"],
+            "days_until_expiration": days_until_expiration,
+            "days_until_due": days_until_due,
+            "is_expired": is_expired,
+            "is_overdue": days_until_due is not None and days_until_due < 0,
+            "expiration_warning": expiration_warning,
+            "shelf_life": row["shelf_life"],
+            "project_name": row["project_name"],
+            "project_due_date": row["project_due_date"],
+            "effective_due_date": row["effective_due_date"],
+        }
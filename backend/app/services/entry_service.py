@@ -16,6 +16,7 @@ from decimal import Decimal
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
 
+from app.core.reference_cache import list_entry
 from app.repositories.entry_repository import EntryRepository
 from app.schemas.entry import (
     EntryCreate,
@@ -46,7 +47,6 @@ from models.entry import (
 )
 from models.sample import Sample
 from models.experiment import ExperimentSampleExecution
-from models.list import ListEntry
 from models.user import User
 
 
@@ -748,7 +748,7 @@ class EntryService:
         display = None
         value = raw
         if meta['data_type'] == 'list' and raw is not None:
-            le = self.db.query(ListEntry).filter(ListEntry.id == raw).first()
+            le = list_entry(self.db, raw)
             display = le.name if le else str(raw)
             value = str(raw)
         elif isinstance(raw, (datetime, date)):
@@ -766,7 +766,7 @@ class EntryService:
         if not v:
             return EntryGridCell(value=None, display=None, value_type=data_type)
         if data_type in ('list', 'lookup') and v.value_list_entry_id:
-            le = self.db.query(ListEntry).filter(ListEntry.id == v.value_list_entry_id).first()
+            le = list_entry(self.db, v.value_list_entry_id)
             return EntryGridCell(
                 value=str(v.value_list_entry_id),
                 display=le.name if le else str(v.value_list_entry_id),
@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.core.reference_cache import entries_named, list_entry, list_entry_id
 from app.repositories.experiment_repository import ExperimentRepository
 from app.schemas.experiment import (
     ExperimentTemplateCreate,
@@ -29,7 +30,6 @@ from models.experiment import ExperimentTemplate, Experiment, ExperimentDetail,
 from models.container import Container, Contents
 from models.sample import Sample
 from models.user import User
-from models.list import List as ListModel, ListEntry
 from models.entry import ELNProcessStep, ELNProcessSample
 
 # Decision #24 — sample must be Available for Testing (list entry name)
@@ -56,18 +56,12 @@ class ExperimentService:
 
     def _available_for_testing_status_ids(self) -> set:
         """ListEntry ids whose name is Available for Testing (prefer sample_status list)."""
-        q = (
-            self.db.query(ListEntry.id)
-            .join(ListModel, ListModel.id == ListEntry.list_id)
-            .filter(ListEntry.name == AVAILABLE_FOR_TESTING_STATUS_NAME)
-        )
-        ids = {row[0] for row in q.all()}
-        return ids
+        return {entry.id for entry in entries_named(self.db, AVAILABLE_FOR_TESTING_STATUS_NAME)}
 
     def _sample_status_name(self, sample: Sample) -> Optional[str]:
         if not sample.status:
             return None
-        le = self.db.query(ListEntry).filter(ListEntry.id == sample.status).first()
+        le = list_entry(self.db, sample.status)
         return le.name if le else None
 
     def ensure_available_for_testing(self, sample_id: UUID) -> bool:
@@ -88,19 +82,11 @@ class ExperimentService:
         if sample.status in available_ids:
             return False
         # Prefer canonical Available for Testing from sample_status list
-        target = (
-            self.db.query(ListEntry)
-            .join(ListModel, ListModel.id == ListEntry.list_id)
-            .filter(
-                ListModel.name == "sample_status",
-                ListEntry.name == AVAILABLE_FOR_TESTING_STATUS_NAME,
-            )
-            .first()
+        target_id = list_entry_id(
+            self.db, "sample_status", AVAILABLE_FOR_TESTING_STATUS_NAME, active_only=False
         )
-        if not target:
+        if not target_id:
             target_id = next(iter(available_ids))
-        else:
-            target_id = target.id
         sample.status = target_id
         sample.modified_by = self._user_id()
         self.db.flush()
@@ -6,24 +6,37 @@ Rules:
 - Deviations produce hard_errors with line, column (source_col), and issue.
 - well_col / sample_col are optional LIMS hints only — not assumed for every instrument.
 - Never raise uncaught validation errors during test/import (return report instead).
+
+A config is compiled once into a ParsePlan (one converter per column, header
+checks precomputed). Plans for stored data parsers are cached per
+(parser id, version); a version's config never changes — edits create a new version.
 """
 from __future__ import annotations
 
+import codecs
 import csv
 import io
+import itertools
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, List, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 from pydantic import ValidationError
 
 from app.schemas.flexible_experiment import LimsRunDataRow, ParserConfig
+from models.flexible_experiment import DataParser
 
 # LIMS DB / LimsRunDataRow constraint when denormalizing well_col into well_position
 WELL_POSITION_MAX_LEN = 10
 # Cap errors so one huge file does not flood the UI
 MAX_HARD_ERRORS = 50
 MAX_WARNINGS = 50
+# Bytes decoded per step when parsing from a stream
+READ_CHUNK_BYTES = 64 * 1024
+# Compiled plans kept for stored data parsers (keyed by parser id + version)
+PARSE_PLAN_CACHE_SIZE = 128
 
 
 @dataclass
@@ -44,6 +57,17 @@ class FileReport:
     row_count: int = 0
 
 
+def hard_errors_exception(hard: List[str]) -> HTTPException:
+    """422 for an import that hit hard parse errors (first 20 listed)."""
+    detail = "; ".join(hard[:20])
+    if len(hard) > 20:
+        detail += f" … (+{len(hard) - 20} more)"
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=detail,
+    )
+
+
 def _err(line: Optional[int], column: Optional[str], issue: str) -> str:
     """Standard diagnostic: line / column / issue."""
     parts = []
@@ -55,19 +79,164 @@ def _err(line: Optional[int], column: Optional[str], issue: str) -> str:
     return f"{prefix}: {issue}" if prefix else issue
 
 
+class _DecodeFailed(Exception):
+    def __init__(self, position: int, reason: str) -> None:
+        super().__init__(reason)
+        self.position = position
+        self.reason = reason
+
+    def diagnostic(self, encoding: str) -> str:
+        return _err(
+            None,
+            None,
+            f"file is not valid {encoding} (decode error at byte {self.position}: {self.reason})",
+        )
+
+
+def _iter_decoded_lines(stream: BinaryIO, encoding: str) -> Iterator[str]:
+    """
+    Decode stream incrementally and yield lines split on "\\n" (newline kept),
+    matching csv.reader over io.StringIO(whole_text). Raises LookupError for an
+    unknown encoding and _DecodeFailed with the absolute byte offset.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    consumed = 0
+    pending = ""
+    while True:
+        chunk = stream.read(READ_CHUNK_BYTES)
+        # Bytes of an incomplete sequence carried over from the previous chunk
+        held = len(decoder.getstate()[0])
+        try:
+            text = decoder.decode(chunk, final=not chunk)
+        except UnicodeDecodeError as e:
+            raise _DecodeFailed(consumed - held + e.start, e.reason) from None
+        pending += text
+        if "\n" in pending:
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        if not chunk:
+            break
+        consumed += len(chunk)
+    if pending:
+        yield pending
+
+
+_BOOLEAN_TEXT = {
+    **dict.fromkeys(("true", "1", "yes", "y", "t"), True),
+    **dict.fromkeys(("false", "0", "no", "n", "f"), False),
+}
+
+
+def _to_bool(value: str) -> bool:
+    result = _BOOLEAN_TEXT.get(value.lower())
+    if result is None:
+        raise ValueError(value)
+    return result
+
+
+# Converter per data_type for non-empty, stripped cell text (None: keep the text)
+_CONVERTERS: Dict[str, Optional[Callable[[str], Any]]] = {
+    "string": None,
+    "float": float,
+    "integer": int,
+    "boolean": _to_bool,
+}
+_EXPECTED = {
+    "float": "number (float) expected",
+    "integer": "integer expected",
+    "boolean": "boolean expected (true/false/0/1)",
+}
+
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    source_col: str
+    field_name: str
+    data_type: str
+    convert: Optional[Callable[[str], Any]]
+
+
+@dataclass(frozen=True)
+class ParsePlan:
+    """A ParserConfig compiled once: one converter per column, header checks precomputed."""
+    config: ParserConfig
+    # One entry per distinct source_col (its last definition), in config order
+    columns: Tuple[ColumnPlan, ...]
+    required: frozenset
+
+    def cells(self, positions: Dict[str, List[int]], width: int) -> Tuple[tuple, ...]:
+        """(field_name, cell index, converter, column) per column for rows of width cells."""
+        return tuple(
+            (c.field_name, _cell_index(positions[c.source_col], width), c.convert, c)
+            for c in self.columns
+        )
+
+
+def _cell_index(indexes: List[int], width: int) -> int:
+    """
+    Cell read for a header at indexes in a row of width cells. As with
+    dict(zip(headers, row)), a repeated header reads its last occurrence within
+    the row; width (out of range) when the row is too short to have any.
+    """
+    within = [i for i in indexes if i < width]
+    return within[-1] if within else width
+
+
+def compile_parser_config(parser_config: dict | ParserConfig) -> ParsePlan:
+    """Validate a parser config and compile it. Raises ValidationError."""
+    config = (
+        parser_config
+        if isinstance(parser_config, ParserConfig)
+        else ParserConfig.model_validate(parser_config)
+    )
+    by_source = {col.source_col: col for col in config.columns}
+    return ParsePlan(
+        config=config,
+        columns=tuple(
+            ColumnPlan(col.source_col, col.field_name, col.data_type, _CONVERTERS[col.data_type])
+            for col in by_source.values()
+        ),
+        required=frozenset(by_source),
+    )
+
+
+_plan_cache: "OrderedDict[Hashable, ParsePlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def _cached_plan(key: Hashable, parser_config: dict) -> ParsePlan:
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+    plan = compile_parser_config(parser_config)
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        while len(_plan_cache) > PARSE_PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
 class InstrumentDataService:
     """
     Parses a text table using a parser_config and returns rows + diagnostics.
 
     Usage:
         service = InstrumentDataService(parser_config_dict)
+        service = InstrumentDataService.for_parser(data_parser)  # cached plan
         rows, warnings, hard = service.parse(file_bytes)
         report = service.parse_report(file_bytes)
+        for row in service.iter_rows(binary_stream, hard, warnings): ...
     """
 
-    def __init__(self, parser_config: dict) -> None:
+    def __init__(self, parser_config: dict, *, cache_key: Optional[Hashable] = None) -> None:
         try:
-            self._config = ParserConfig.model_validate(parser_config)
+            if cache_key is None:
+                self._plan = compile_parser_config(parser_config)
+            else:
+                self._plan = _cached_plan(cache_key, parser_config)
         except ValidationError as e:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -78,6 +247,12 @@ class InstrumentDataService:
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=f"Invalid parser config: {e}",
             )
+        self._config = self._plan.config
+
+    @classmethod
+    def for_parser(cls, parser: DataParser) -> "InstrumentDataService":
+        """Service for a stored data parser; its plan is compiled once per (id, version)."""
+        return cls(parser.parser_config, cache_key=(parser.id, parser.version))
 
     def parse(
         self,
@@ -90,15 +265,13 @@ class InstrumentDataService:
         Returns (rows, warnings, hard_errors).
         If raise_on_hard and hard_errors, raises 422 (import path).
         """
-        rows, warnings, hard = self._parse_internal(file_bytes, max_rows=max_rows)
+        parsed, warnings, hard = self._parse_internal(file_bytes, max_rows=max_rows)
         if raise_on_hard and hard:
-            detail = "; ".join(hard[:20])
-            if len(hard) > 20:
-                detail += f" … (+{len(hard) - 20} more)"
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=detail,
-            )
+            raise hard_errors_exception(hard)
+        rows = [
+            LimsRunDataRow(well_position=well_position, row_data=row_data)
+            for well_position, row_data in parsed
+        ]
         return rows, warnings, hard
 
     def parse_report(
@@ -109,7 +282,7 @@ class InstrumentDataService:
         preview_cap: int = 10,
     ) -> ParseReport:
         rows, warnings, hard = self._parse_internal(file_bytes, max_rows=max_rows)
-        preview = [r.row_data for r in rows[:preview_cap]]
+        preview = [row_data for _, row_data in rows[:preview_cap]]
         return ParseReport(
             ok=len(hard) == 0,
             hard_errors=hard,
@@ -133,28 +306,100 @@ class InstrumentDataService:
         file_bytes: bytes,
         *,
         max_rows: Optional[int] = None,
-    ) -> Tuple[List[LimsRunDataRow], List[str], List[str]]:
+    ) -> Tuple[List[Tuple[Optional[str], dict]], List[str], List[str]]:
+        """Returns ((well_position, row_data) per row, warnings, hard_errors)."""
         hard_errors: list[str] = []
         warnings: list[str] = []
         encoding = self._config.encoding or "utf-8"
         try:
-            text = file_bytes.decode(encoding, errors="strict")
+            # In-memory input: an undecodable file yields only the decode error
+            file_bytes.decode(encoding, errors="strict")
         except LookupError:
-            hard_errors.append(_err(None, None, f"unknown encoding '{encoding}'"))
-            return [], warnings, hard_errors
+            pass  # reported by iter_rows
         except UnicodeDecodeError as e:
-            hard_errors.append(
-                _err(
-                    None,
-                    None,
-                    f"file is not valid {encoding} (decode error at byte {e.start}: {e.reason})",
-                )
-            )
+            hard_errors.append(_DecodeFailed(e.start, e.reason).diagnostic(encoding))
             return [], warnings, hard_errors
+        rows = list(
+            self._iter_cells(io.BytesIO(file_bytes), hard_errors, warnings, max_rows=max_rows)
+        )
+        return rows, warnings, hard_errors
+
+    def iter_rows(
+        self,
+        stream: BinaryIO,
+        hard_errors: List[str],
+        warnings: List[str],
+        *,
+        max_rows: Optional[int] = None,
+    ) -> Iterator[LimsRunDataRow]:
+        """
+        Yield rows one at a time from a binary stream, decoding incrementally.
+
+        Diagnostics are appended to hard_errors / warnings as parsing proceeds,
+        so callers must exhaust the generator before inspecting them. Memory is
+        bounded by one READ_CHUNK_BYTES chunk plus the current line.
+        """
+        cells = self._iter_cells(stream, hard_errors, warnings, max_rows=max_rows)
+        for well_position, row_data in cells:
+            yield LimsRunDataRow(well_position=well_position, row_data=row_data)
+
+    def iter_records(
+        self,
+        stream: BinaryIO,
+        hard_errors: List[str],
+        warnings: List[str],
+        *,
+        max_rows: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        iter_rows as plain lims_run_data dicts for bulk import. Skips building a
+        LimsRunDataRow per row; the plan already enforces its constraints.
+        """
+        cells = self._iter_cells(stream, hard_errors, warnings, max_rows=max_rows)
+        for well_position, row_data in cells:
+            yield {
+                "container_id": None,
+                "well_position": well_position,
+                "sample_id": None,
+                "row_data": row_data,
+            }
+
+    def _iter_cells(
+        self,
+        stream: BinaryIO,
+        hard_errors: List[str],
+        warnings: List[str],
+        *,
+        max_rows: Optional[int] = None,
+    ) -> Iterator[Tuple[Optional[str], dict]]:
+        encoding = self._config.encoding or "utf-8"
+        try:
+            lines = _iter_decoded_lines(stream, encoding)
+            next_line = next(lines, None)
+        except LookupError:
+            hard_errors.append(_err(None, None, f"unknown encoding '{encoding}'"))
+            return
+        except _DecodeFailed as e:
+            hard_errors.append(e.diagnostic(encoding))
+            return
+        if next_line is not None:
+            lines = itertools.chain([next_line], lines)
 
         delimiter = self._config.delimiter if self._config.delimiter is not None else ","
-        reader = csv.reader(io.StringIO(text), delimiter=delimiter)
+        reader = csv.reader(lines, delimiter=delimiter)
+        try:
+            yield from self._iter_parsed(reader, hard_errors, warnings, max_rows=max_rows)
+        except _DecodeFailed as e:
+            hard_errors.append(e.diagnostic(encoding))
 
+    def _iter_parsed(
+        self,
+        reader,
+        hard_errors: List[str],
+        warnings: List[str],
+        *,
+        max_rows: Optional[int] = None,
+    ) -> Iterator[Tuple[Optional[str], dict]]:
         line_no = 0
         # skip_rows: lines discarded before header
         for _ in range(self._config.skip_rows):
@@ -165,7 +410,7 @@ class InstrumentDataService:
                 hard_errors.append(
                     _err(None, None, f"file ended while applying skip_rows={self._config.skip_rows}")
                 )
-                return [], warnings, hard_errors
+                return
 
         # header_row: extra discarded lines after skip_rows (0 = next line is header)
         for _ in range(self._config.header_row):
@@ -176,7 +421,7 @@ class InstrumentDataService:
                 hard_errors.append(
                     _err(None, None, f"file ended while applying header_row={self._config.header_row}")
                 )
-                return [], warnings, hard_errors
+                return
 
         try:
             headers = [h.strip() for h in next(reader)]
@@ -184,14 +429,13 @@ class InstrumentDataService:
             header_line = line_no
         except StopIteration:
             hard_errors.append(_err(None, None, "file empty after skip_rows/header_row; no header line"))
-            return [], warnings, hard_errors
+            return
 
         if not any(headers):
             hard_errors.append(_err(header_line, None, "header line is empty"))
-            return [], warnings, hard_errors
+            return
 
-        expected_source_cols = {col.source_col for col in self._config.columns}
-        missing_cols = sorted(expected_source_cols - set(headers))
+        missing_cols = sorted(self._plan.required - set(headers))
         if missing_cols:
             hard_errors.append(
                 _err(
@@ -201,7 +445,7 @@ class InstrumentDataService:
                     f"found headers: {headers}",
                 )
             )
-            return [], warnings, hard_errors
+            return
 
         # Optional LIMS hints must name a column that exists if set
         well_col = self._config.well_col
@@ -223,41 +467,59 @@ class InstrumentDataService:
                 )
             )
         if hard_errors:
-            return [], warnings, hard_errors
+            return
 
-        col_map = {col.source_col: col for col in self._config.columns}
-        rows: list[LimsRunDataRow] = []
+        positions: Dict[str, List[int]] = {}
+        for i, h in enumerate(headers):
+            positions.setdefault(h, []).append(i)
+        # (cells, well index) per row width; cells past the header are ignored
+        header_width = len(headers)
+        layouts: Dict[int, tuple] = {}
+        emitted = 0
 
         for raw_row in reader:
             line_no += 1
-            if max_rows and len(rows) >= max_rows:
+            if max_rows and emitted >= max_rows:
                 break
-            if not any(cell.strip() if isinstance(cell, str) else cell for cell in raw_row):
+            if not any(map(str.strip, raw_row)):
                 continue  # blank line
 
-            row_dict = dict(zip(headers, raw_row))
+            width = min(len(raw_row), header_width)
+            layout = layouts.get(width)
+            if layout is None:
+                layout = layouts[width] = (
+                    self._plan.cells(positions, width),
+                    _cell_index(positions[well_col], width) if well_col else None,
+                )
+            cells, well_index = layout
             row_data: dict[str, Any] = {}
             row_failed = False
 
-            for source_col, col_def in col_map.items():
-                raw_val = (row_dict.get(source_col) or "").strip()
-                try:
-                    row_data[col_def.field_name] = _coerce(raw_val, col_def.data_type)
-                except ValueError as ve:
-                    row_failed = True
-                    self._add_hard(
-                        hard_errors,
-                        _err(
-                            line_no,
-                            source_col,
-                            f"{ve} (data_type={col_def.data_type}, value={raw_val!r})",
-                        ),
-                    )
+            for field_name, index, convert, column in cells:
+                raw_val = raw_row[index].strip() if index < width else ""
+                if not raw_val:
+                    row_data[field_name] = None  # null cell
+                elif convert is None:
+                    row_data[field_name] = raw_val
+                else:
+                    try:
+                        row_data[field_name] = convert(raw_val)
+                    except ValueError:
+                        row_failed = True
+                        self._add_hard(
+                            hard_errors,
+                            _err(
+                                line_no,
+                                column.source_col,
+                                f"{_EXPECTED[column.data_type]}, got {raw_val!r} "
+                                f"(data_type={column.data_type}, value={raw_val!r})",
+                            ),
+                        )
 
             # Optional: denormalize well into LimsRunData.well_position (only if well_col set)
             well_position: Optional[str] = None
-            if well_col:
-                well_raw = (row_dict.get(well_col) or "").strip()
+            if well_index is not None:
+                well_raw = raw_row[well_index].strip() if well_index < width else ""
                 if well_raw:
                     if len(well_raw) > WELL_POSITION_MAX_LEN:
                         row_failed = True
@@ -277,26 +539,13 @@ class InstrumentDataService:
 
             if row_failed:
                 continue
+            emitted += 1
+            yield well_position, row_data
 
-            try:
-                rows.append(
-                    LimsRunDataRow(
-                        well_position=well_position,
-                        row_data=row_data,
-                    )
-                )
-            except ValidationError as e:
-                for err in e.errors():
-                    loc = ".".join(str(x) for x in err.get("loc", ()))
-                    self._add_hard(
-                        hard_errors,
-                        _err(line_no, loc or None, err.get("msg", "validation error")),
-                    )
-
-        if not rows and not hard_errors:
+        if not emitted and not hard_errors:
             hard_errors.append(_err(None, None, "no data rows found after header"))
 
-        return rows, warnings, hard_errors
+
 
 
 class ParserEngine:
@@ -346,32 +595,3 @@ class ParserEngine:
                     )
                 )
         return reports
-
-
-def _coerce(value: str, data_type: str) -> Any:
-    """
-    Coerce cell text to the type declared in the parser definition.
-    Empty string → None (null cell). Raises ValueError with a short reason.
-    """
-    if value == "":
-        return None
-    if data_type == "float":
-        try:
-            return float(value)
-        except ValueError:
-            raise ValueError(f"number (float) expected, got {value!r}") from None
-    if data_type == "integer":
-        try:
-            # allow "12.0" only if integral? keep strict int()
-            return int(value)
-        except ValueError:
-            raise ValueError(f"integer expected, got {value!r}") from None
-    if data_type == "boolean":
-        low = value.lower()
-        if low in ("true", "1", "yes", "y", "t"):
-            return True
-        if low in ("false", "0", "no", "n", "f"):
-            return False
-        raise ValueError(f"boolean expected (true/false/0/1), got {value!r}")
-    # string
-    return value
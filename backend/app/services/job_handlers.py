@@ -0,0 +1,148 @@
+"""
+Job kinds run by the worker (python -m app.worker), keyed by jobs.kind.
+
+Each handler receives a JobContext whose session is bound to the job
+creator's RLS context, does its work, and returns a JSON-able result that is
+stored on the job. Raising HTTPException 4xx fails the job permanently; any
+other exception is retried with backoff (job_queue.fail()).
+
+Handlers reuse the service methods the routes used to call inline, so their
+validation and error details are unchanged; the route now checks the cheap
+preconditions and answers 202 with the job.
+"""
+from __future__ import annotations
+
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.services.job_queue import JobContext, JobProgress
+from models.job import Job
+from models.user import User
+
+DOSE_RESPONSE_FIT = "dose_response.fit"
+LIMS_RUN_IMPORT = "lims_run.import"
+LIMS_RUN_IMPORT_ROWS = "lims_run.import_rows"
+LIMS_RUN_PUBLISH = "lims_run.publish"
+SOP_PARSE_EXTRACT = "sop_parse.extract"
+
+JobHandler = Callable[[JobContext], Optional[Dict[str, Any]]]
+
+
+def _dose_response_fit(ctx: JobContext) -> Dict[str, Any]:
+    from app.schemas.dose_response import FitResponse
+    from app.services.dose_response_fit import DoseResponseFitService
+    from app.services.dose_response_svg import prerender_svgs_background
+
+    run_id = uuid.UUID(ctx.payload["run_id"])
+    sample_id = uuid.UUID(ctx.payload["sample_id"]) if ctx.payload.get("sample_id") else None
+    svc = DoseResponseFitService(ctx.db, ctx.user)
+
+    ctx.progress.update(0, 2, "Fitting curves")
+    if sample_id:
+        result = svc.trigger_refit(run_id, sample_id)
+    else:
+        result = svc.trigger_fit(run_id)
+    ctx.progress.update(1, 2, "Rendering SVGs")
+    prerender_svgs_background(run_id, sample_id, ctx.user.id, ctx.user.client_id)
+    ctx.progress.update(2, 2, "Done")
+    return FitResponse(**result).model_dump(mode="json")
+
+
+def _uuid_or_none(value: Optional[str]) -> Optional[uuid.UUID]:
+    return uuid.UUID(value) if value else None
+
+
+def _lims_run_import(ctx: JobContext) -> Dict[str, Any]:
+    from app.services.job_uploads import open_upload
+    from app.services.lims_run_service import LimsRunService
+
+    # The upload was staged in job_upload_chunks by the route; the sweep drops it after the job
+    stream = open_upload(ctx.db, uuid.UUID(ctx.payload["upload_id"]))
+    ctx.progress.update(0, 1, "Importing")
+    result = LimsRunService(ctx.db, current_user=ctx.user).import_file(
+        uuid.UUID(ctx.payload["run_id"]),
+        stream,
+        instrument_id=_uuid_or_none(ctx.payload.get("instrument_id")),
+        cro_source_id=_uuid_or_none(ctx.payload.get("cro_source_id")),
+        parser_id=_uuid_or_none(ctx.payload.get("parser_id")),
+        filename=ctx.payload.get("filename"),
+    )
+    ctx.progress.update(1, 1, f"Imported {result.imported} rows")
+    return result.model_dump(mode="json")
+
+
+def _lims_run_import_rows(ctx: JobContext) -> Dict[str, Any]:
+    from app.schemas.flexible_experiment import LimsRunDataRow
+    from app.services.lims_run_service import LimsRunService
+
+    rows = [LimsRunDataRow.model_validate(row) for row in ctx.payload["rows"]]
+    ctx.progress.update(0, 1, "Importing")
+    result = LimsRunService(ctx.db, current_user=ctx.user).import_data(uuid.UUID(ctx.payload["run_id"]), rows)
+    ctx.progress.update(1, 1, f"Imported {result.imported} rows")
+    return result.model_dump(mode="json")
+
+
+def _lims_run_publish(ctx: JobContext) -> Dict[str, Any]:
+    from app.services.lims_run_service import LimsRunService
+
+    ctx.progress.update(0, 1, "Promoting results")
+    run = LimsRunService(ctx.db, current_user=ctx.user).publish_run(uuid.UUID(ctx.payload["run_id"]))
+    ctx.progress.update(1, 1, "Published")
+    return {"run_id": str(run.id), "status": run.status}
+
+
+def _sop_parse_extract(ctx: JobContext) -> Dict[str, Any]:
+    from app.services.sop_parse_service import SOPParseService
+
+    sop_parse_job_id = uuid.UUID(ctx.payload["sop_parse_job_id"])
+    ctx.progress.update(0, 1, "Extracting")
+    # Records its own outcome on the sop_parse_jobs row (polled via GET /sop-parse/{id})
+    SOPParseService.run_extraction_background(
+        job_id=sop_parse_job_id,
+        sop_text=ctx.payload["sop_text"],
+        instrument_text=ctx.payload["instrument_text"],
+    )
+    ctx.progress.update(1, 1, "Done")
+    return {"sop_parse_job_id": str(sop_parse_job_id)}
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    DOSE_RESPONSE_FIT: _dose_response_fit,
+    LIMS_RUN_IMPORT: _lims_run_import,
+    LIMS_RUN_IMPORT_ROWS: _lims_run_import_rows,
+    LIMS_RUN_PUBLISH: _lims_run_publish,
+    SOP_PARSE_EXTRACT: _sop_parse_extract,
+}
+
+
+def execute_job(db: Session, job: Job, progress: Optional[JobProgress] = None) -> Optional[Dict[str, Any]]:
+    """
+    Run job's handler on db as the job's creator. Does not record the outcome
+    or commit beyond what the handler commits; the worker does that.
+    """
+    from app.database import set_rls_context
+
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown job kind '{job.kind}'",
+        )
+    user = None
+    if job.created_by:
+        set_rls_context(
+            db,
+            user_id=str(job.created_by),
+            client_id=str(job.client_id) if job.client_id else None,
+        )
+        user = db.get(User, job.created_by)
+    return handler(JobContext(
+        db=db,
+        job_id=job.id,
+        payload=dict(job.payload or {}),
+        user=user,
+        progress=progress or JobProgress(),
+    ))
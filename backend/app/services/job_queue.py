@@ -0,0 +1,347 @@
+"""
+Durable Postgres-backed job queue.
+
+API side: JobQueue(db).enqueue() inserts a queued row in the caller's
+transaction and commits; routes answer 202 with the job, and clients poll
+GET /v1/jobs/{id}.
+
+Worker side (app/worker.py) uses the module functions:
+  - claim_next(): picks the highest-priority due job with
+    SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers dequeue
+    without blocking each other. A per-client transaction-scoped advisory
+    lock makes the JOB_TENANT_CONCURRENCY check exact across workers.
+  - heartbeat(): refreshes heartbeat_at and flushes progress while running.
+  - complete() / fail(): record the outcome. HTTPException 4xx is a
+    permanent failure; anything else is retried after
+    JOB_RETRY_BASE_SECONDS * 2^(attempt-1), capped at JOB_RETRY_MAX_SECONDS.
+  - requeue_stale(): running jobs whose worker stopped heartbeating go back
+    to the queue (or fail when out of attempts).
+
+Outcome writes are conditional on worker_id, so a worker that lost its job
+to requeue_stale() cannot overwrite the new attempt. Every status change, and
+every heartbeat that carries new progress, publishes a "job" event to the
+creator (GET /v1/events) in the same transaction.
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_BASE_SECONDS,
+    JOB_RETRY_MAX_SECONDS,
+    JOB_STALE_SECONDS,
+    JOB_TENANT_CONCURRENCY,
+)
+from app.core.events import JOB, publish_event
+from app.core.rbac import is_system_client_or_admin
+from models.job import Job, JobStatus
+from models.user import User
+
+# Advisory lock namespace for per-client claim serialization (pg_advisory_xact_lock(int, int))
+TENANT_LOCK_NAMESPACE = 7201
+# Clients found at their concurrency limit are skipped; give up after this many
+MAX_CLAIM_PROBES = 8
+
+
+class JobQueue:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        *,
+        user: Optional[User],
+        priority: int = 0,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        dedupe_key: Optional[str] = None,
+    ) -> Job:
+        """
+        Queue a job to run as `user` and commit.
+
+        Raises 409 if a queued or running job already holds dedupe_key.
+        """
+        if dedupe_key and self._active_with_key(dedupe_key):
+            raise self._duplicate(dedupe_key)
+        job = Job(
+            kind=kind,
+            payload=jsonable_encoder(payload),
+            priority=priority,
+            max_attempts=max_attempts,
+            dedupe_key=dedupe_key,
+            client_id=user.client_id if user else None,
+            created_by=user.id if user else None,
+        )
+        self.db.add(job)
+        try:
+            self.db.flush()
+        except IntegrityError:
+            # Lost a race with another request for the same key
+            self.db.rollback()
+            raise self._duplicate(dedupe_key)
+        publish_job_event(self.db, job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get_for_user(self, job_id: uuid.UUID, user: User) -> Job:
+        """A job is visible to its creator and to Administrators / System client users."""
+        job = self.db.get(Job, job_id)
+        if not job or (job.created_by != user.id and not is_system_client_or_admin(user)):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        return job
+
+    def _active_with_key(self, dedupe_key: str) -> Optional[Job]:
+        return (
+            self.db.query(Job)
+            .filter(
+                Job.dedupe_key == dedupe_key,
+                Job.status.in_((JobStatus.queued, JobStatus.running)),
+            )
+            .first()
+        )
+
+    @staticmethod
+    def _duplicate(dedupe_key: Optional[str]) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A job for this operation is already queued or running ({dedupe_key}).",
+        )
+
+
+# ── Progress ──────────────────────────────────────────────────────────────────
+
+
+class JobProgress:
+    """Progress reported by a running handler; the worker's heartbeat persists it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value: Tuple[Optional[int], Optional[int], Optional[str]] = (None, None, None)
+
+    def update(self, current: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        with self._lock:
+            self._value = (current, total, message)
+
+    def snapshot(self) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+        with self._lock:
+            return self._value
+
+
+@dataclass
+class JobContext:
+    """What a handler gets: a session bound to the creator's RLS context."""
+
+    db: Session
+    job_id: uuid.UUID
+    payload: Dict[str, Any]
+    user: Optional[User]
+    progress: JobProgress
+
+
+def publish_job_event(db: Session, job: Job) -> None:
+    """Announce job's current state to its creator, in db's transaction."""
+    publish_event(
+        db,
+        JOB,
+        {
+            "job_id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "attempts": job.attempts,
+            "progress_current": job.progress_current,
+            "progress_total": job.progress_total,
+            "progress_message": job.progress_message,
+        },
+        user_id=job.created_by,
+    )
+
+
+# ── Worker side ───────────────────────────────────────────────────────────────
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def claim_next(
+    db: Session, worker_id: str, *, tenant_limit: int = JOB_TENANT_CONCURRENCY
+) -> Optional[Job]:
+    """Claim and commit the next due job as running, or return None."""
+    skip_clients: set = set()
+    for _ in range(MAX_CLAIM_PROBES):
+        q = (
+            db.query(Job)
+            .filter(Job.status == JobStatus.queued, Job.run_after <= func.now())
+        )
+        if skip_clients:
+            q = q.filter((Job.client_id.is_(None)) | (Job.client_id.notin_(skip_clients)))
+        job = (
+            q.order_by(Job.priority.desc(), Job.run_after, Job.created_at)
+            .with_for_update(skip_locked=True)
+            .limit(1)
+            .first()
+        )
+        if job is None:
+            db.rollback()
+            return None
+
+        if job.client_id is not None and tenant_limit > 0:
+            # Serialize claimers per client so the running count below is exact
+            db.execute(select(func.pg_advisory_xact_lock(
+                TENANT_LOCK_NAMESPACE, func.hashtext(str(job.client_id))
+            )))
+            running = (
+                db.query(func.count(Job.id))
+                .filter(Job.client_id == job.client_id, Job.status == JobStatus.running)
+                .scalar()
+            )
+            if running >= tenant_limit:
+                skip_clients.add(job.client_id)
+                db.rollback()
+                continue
+
+        now = _now()
+        job.status = JobStatus.running
+        job.attempts += 1
+        job.worker_id = worker_id
+        job.started_at = now
+        job.heartbeat_at = now
+        job.error = None
+        publish_job_event(db, job)
+        db.commit()
+        return job
+    db.rollback()
+    return None
+
+
+def _owned(db: Session, job_id: uuid.UUID, worker_id: str) -> Optional[Job]:
+    return (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.worker_id == worker_id, Job.status == JobStatus.running)
+        .with_for_update()
+        .first()
+    )
+
+
+def _apply_progress(job: Job, progress: Optional[JobProgress]) -> bool:
+    """Copy progress onto job; True if it changed."""
+    if progress is None:
+        return False
+    current, total, message = progress.snapshot()
+    if current is None or (job.progress_current, job.progress_total, job.progress_message) == (
+        current, total, message
+    ):
+        return False
+    job.progress_current, job.progress_total, job.progress_message = current, total, message
+    return True
+
+
+def heartbeat(
+    db: Session, job_id: uuid.UUID, worker_id: str, progress: Optional[JobProgress] = None
+) -> bool:
+    """Refresh heartbeat_at and progress; False if the job is no longer ours."""
+    job = _owned(db, job_id, worker_id)
+    if job is None:
+        db.rollback()
+        return False
+    job.heartbeat_at = _now()
+    if _apply_progress(job, progress):
+        publish_job_event(db, job)
+    db.commit()
+    return True
+
+
+def complete(
+    db: Session,
+    job_id: uuid.UUID,
+    worker_id: str,
+    result: Optional[Dict[str, Any]],
+    progress: Optional[JobProgress] = None,
+) -> None:
+    job = _owned(db, job_id, worker_id)
+    if job is None:
+        db.rollback()
+        return
+    _apply_progress(job, progress)
+    job.status = JobStatus.succeeded
+    job.result = jsonable_encoder(result) if result is not None else None
+    job.finished_at = _now()
+    publish_job_event(db, job)
+    db.commit()
+
+
+def error_payload(exc: BaseException) -> Dict[str, Any]:
+    if isinstance(exc, HTTPException):
+        return {"status_code": exc.status_code, "detail": jsonable_encoder(exc.detail)}
+    return {"status_code": 500, "detail": f"{type(exc).__name__}: {exc}"}
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Client errors (4xx) would fail again; everything else may be transient."""
+    return not (isinstance(exc, HTTPException) and exc.status_code < 500)
+
+
+def retry_delay(attempts: int) -> float:
+    return min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+
+
+def fail(
+    db: Session,
+    job_id: uuid.UUID,
+    worker_id: str,
+    exc: BaseException,
+    progress: Optional[JobProgress] = None,
+) -> JobStatus:
+    """Record a failed attempt; requeue with backoff when retryable. Returns the new status."""
+    job = _owned(db, job_id, worker_id)
+    if job is None:
+        db.rollback()
+        return JobStatus.running
+    _apply_progress(job, progress)
+    job.error = error_payload(exc)
+    if is_retryable(exc) and job.attempts < job.max_attempts:
+        job.status = JobStatus.queued
+        job.run_after = _now() + timedelta(seconds=retry_delay(job.attempts))
+        job.worker_id = None
+    else:
+        job.status = JobStatus.failed
+        job.finished_at = _now()
+    publish_job_event(db, job)
+    db.commit()
+    return job.status
+
+
+def requeue_stale(db: Session, *, stale_seconds: float = JOB_STALE_SECONDS) -> Iterable[uuid.UUID]:
+    """Return running jobs with a stale heartbeat to the queue (or fail them); ids touched."""
+    cutoff = _now() - timedelta(seconds=stale_seconds)
+    stale = (
+        db.query(Job)
+        .filter(Job.status == JobStatus.running, Job.heartbeat_at < cutoff)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for job in stale:
+        job.error = {"status_code": 500, "detail": f"Worker {job.worker_id} stopped responding"}
+        job.worker_id = None
+        if job.attempts < job.max_attempts:
+            job.status = JobStatus.queued
+            job.run_after = _now()
+        else:
+            job.status = JobStatus.failed
+            job.finished_at = _now()
+        publish_job_event(db, job)
+    db.commit()
+    return [job.id for job in stale]
@@ -0,0 +1,86 @@
+"""
+Files handed to queued jobs (job_upload_chunks).
+
+A route that accepts an upload for background work calls stage_upload() before
+JobQueue.enqueue(): the file is copied into JOB_UPLOAD_CHUNK_BYTES rows in the
+request's transaction, so the chunks and the job commit together and a worker
+on any host can read them back with open_upload(). Neither side holds more
+than one chunk in memory.
+
+Chunks live as long as a queued or running job's payload names their
+upload_id, so a retried attempt reads the same file; after that the worker
+sweep's prune_uploads() deletes them.
+"""
+from __future__ import annotations
+
+import io
+import uuid
+from typing import BinaryIO, Optional
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import JOB_UPLOAD_CHUNK_BYTES
+from models.job import JobUploadChunk
+
+
+def stage_upload(db: Session, stream: BinaryIO, *, chunk_bytes: int = JOB_UPLOAD_CHUNK_BYTES) -> uuid.UUID:
+    """Copy stream into job_upload_chunks (flushed, not committed); returns the upload id."""
+    upload_id = uuid.uuid4()
+    seq = 0
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        # Core insert: ORM objects would keep every chunk in the identity map
+        db.execute(insert(JobUploadChunk).values(upload_id=upload_id, seq=seq, data=data))
+        seq += 1
+    return upload_id
+
+
+class _UploadChunks(io.RawIOBase):
+    """Raw stream over an upload's chunks, fetched one row at a time in seq order."""
+
+    def __init__(self, db: Session, upload_id: uuid.UUID) -> None:
+        self._db = db
+        self._upload_id = upload_id
+        self._seq = 0
+        self._chunk = b""
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._offset >= len(self._chunk):
+            data: Optional[bytes] = self._db.execute(
+                select(JobUploadChunk.data).where(
+                    JobUploadChunk.upload_id == self._upload_id,
+                    JobUploadChunk.seq == self._seq,
+                )
+            ).scalar_one_or_none()
+            if data is None:
+                return 0
+            self._chunk = bytes(data)
+            self._offset = 0
+            self._seq += 1
+        n = min(len(buffer), len(self._chunk) - self._offset)
+        buffer[:n] = self._chunk[self._offset:self._offset + n]
+        self._offset += n
+        return n
+
+
+def open_upload(db: Session, upload_id: uuid.UUID) -> BinaryIO:
+    """Binary file object reading a staged upload back through db."""
+    return io.BufferedReader(_UploadChunks(db, upload_id), buffer_size=JOB_UPLOAD_CHUNK_BYTES)
+
+
+def prune_uploads(db: Session) -> int:
+    """Delete chunks no queued/running job refers to (job worker sweep); returns rows deleted."""
+    result = db.execute(text(
+        "DELETE FROM job_upload_chunks c WHERE NOT EXISTS ("
+        " SELECT 1 FROM jobs j WHERE j.status IN ('queued', 'running')"
+        " AND j.payload->>'upload_id' = c.upload_id::text)"
+    ))
+    db.commit()
+    return result.rowcount
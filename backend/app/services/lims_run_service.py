@@ -23,11 +23,13 @@ from __future__ import annotations
 import csv
 import io
 import uuid
-from typing import List, Optional, Tuple
+from typing import BinaryIO, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.config import LIMS_IMPORT_COPY_ROWS
+from app.core.events import IMPORT, PROMOTION, publish_event, publish_event_now
 from app.repositories.flexible_experiment_repository import (
     LimsRunDataRepository,
     LimsRunRepository,
@@ -42,8 +44,9 @@ from app.schemas.flexible_experiment import (
 )
 from app.schemas.data_parser import ImportFileResponse, LimsRunImportRead
 from app.services.data_parser_service import DataParserService
-from app.services.instrument_data_service import InstrumentDataService
+from app.services.instrument_data_service import InstrumentDataService, hard_errors_exception
 from models.flexible_experiment import (
+    DataParser,
     LimsRun,
     LimsRunStatus,
     LimsRunData,
@@ -84,6 +87,17 @@ class LimsRunService:
                 self.db.refresh(obj)
         self.db.commit()
 
+    def _event_audience(self) -> dict:
+        # Runs are visible across the caller's client (lims_runs RLS)
+        return {
+            "user_id": self._user_id(),
+            "client_id": self.current_user.client_id if self.current_user else None,
+        }
+
+    def _publish_run_event(self, type: str, data: dict) -> None:
+        """Event for GET /v1/events, sent when this transaction commits."""
+        publish_event(self.db, type, data, **self._event_audience())
+
     # ---------- CRUD ----------
 
     def create_run(self, data: LimsRunCreate) -> LimsRun:
@@ -323,13 +337,8 @@ class LimsRunService:
         run = self.get_run(run_id)
         return self._transition(run, LimsRunStatus.complete)
 
-    def publish_run(self, run_id: uuid.UUID) -> LimsRun:
-        """
-        complete → published. Caller must have verified experiment:publish permission.
-
-        When analysis_id is set, promotes lims_run_data → tests/results in the same
-        transaction (P3). Conflicts with other runs abort publish.
-        """
+    def check_publishable(self, run_id: uuid.UUID) -> LimsRun:
+        """complete → published is allowed and analysis_id is set (400 otherwise)."""
         run = self.get_run(run_id)
         current = LimsRunStatus(run.status)
         transitions = self._lifecycle_transitions(run)
@@ -338,16 +347,26 @@ class LimsRunService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot transition from '{current.value}' to 'published'",
             )
-
-        from app.services.result_promotion_service import ResultPromotionService
-
-        promo = ResultPromotionService(self.db, current_user=self.current_user)
-        # Plan first (may create tests via ensure); apply if analysis set
         if not run.analysis_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="analysis_id is required to publish",
             )
+        return run
+
+    def publish_run(self, run_id: uuid.UUID) -> LimsRun:
+        """
+        complete → published. Caller must have verified experiment:publish permission.
+
+        When analysis_id is set, promotes lims_run_data → tests/results in the same
+        transaction (P3). Conflicts with other runs abort publish.
+        """
+        run = self.check_publishable(run_id)
+
+        from app.services.result_promotion_service import ResultPromotionService
+
+        promo = ResultPromotionService(self.db, current_user=self.current_user)
+        # Plan first (may create tests via ensure); apply if analysis set
         plan = promo.plan_promotion(run)
         if plan.conflict_count:
             raise HTTPException(
@@ -366,6 +385,15 @@ class LimsRunService:
         promo.apply_plan(run, plan)
 
         self.run_repo.update_status(run, LimsRunStatus.published, self._user_id())
+        self._publish_run_event(
+            PROMOTION,
+            {
+                "run_id": run.id,
+                "status": LimsRunStatus.published,
+                "create_count": plan.create_count,
+                "update_count": plan.update_count,
+            },
+        )
         self._commit_refresh(run)
         return run
 
@@ -399,19 +427,11 @@ class LimsRunService:
         Import pre-parsed rows. Prefer import_file() for CSV with parser resolution.
         Still requires analysis + instrument|CRO + active parser when source provided.
         """
-        run = self.get_run(run_id)
-        self._assert_import_allowed(run)
-        if not run.analysis_id:
-            raise HTTPException(400, "Run requires analysis_id before import")
-
+        _, parser = self.check_importable(
+            run_id, instrument_id=instrument_id, cro_source_id=cro_source_id, parser_id=parser_id
+        )
         import_id = None
-        if instrument_id or cro_source_id or parser_id:
-            parser = self.data_parser_svc.resolve_for_import(
-                analysis_id=run.analysis_id,
-                instrument_id=instrument_id,
-                cro_source_id=cro_source_id,
-                parser_id=parser_id,
-            )
+        if parser is not None:
             imp = self._create_import_event(
                 run_id=run_id,
                 instrument_id=instrument_id or parser.instrument_id,
@@ -444,6 +464,10 @@ class LimsRunService:
         ]
         created_rows = self.data_repo.bulk_create(run_id, row_dicts, self._user_id())
         self.db.flush()
+        self._publish_run_event(
+            IMPORT,
+            {"run_id": run_id, "import_id": import_id, "status": "complete", "rows": len(created_rows)},
+        )
         self.db.commit()
 
         return ImportDataResponse(
@@ -455,31 +479,28 @@ class LimsRunService:
     def import_file(
         self,
         run_id: uuid.UUID,
-        file_bytes: bytes,
+        stream: BinaryIO,
         *,
         instrument_id: Optional[uuid.UUID] = None,
         cro_source_id: Optional[uuid.UUID] = None,
         parser_id: Optional[uuid.UUID] = None,
         filename: Optional[str] = None,
     ) -> ImportFileResponse:
-        """Parse file with resolved data parser and import rows."""
-        run = self.get_run(run_id)
-        self._assert_import_allowed(run)
-        if not run.analysis_id:
-            raise HTTPException(400, "Run requires analysis_id before import")
+        """
+        Parse a file stream with the resolved data parser and import rows.
 
-        parser = self.data_parser_svc.resolve_for_import(
-            analysis_id=run.analysis_id,
+        Rows are parsed one at a time and COPYed into lims_run_data in chunks of
+        LIMS_IMPORT_COPY_ROWS, so memory stays flat regardless of file size.
+        Any hard parse error rolls the whole import back (422), as before.
+        """
+        _, parser = self.check_importable(
+            run_id,
             instrument_id=instrument_id,
             cro_source_id=cro_source_id,
             parser_id=parser_id,
+            require_parser=True,
         )
-        rows, warnings, _hard = InstrumentDataService(parser.parser_config).parse(
-            file_bytes, raise_on_hard=True
-        )
-        if not rows:
-            raise HTTPException(422, "No rows imported")
-
+        parse_svc = InstrumentDataService.for_parser(parser)
         imp = self._create_import_event(
             run_id=run_id,
             instrument_id=instrument_id or parser.instrument_id,
@@ -487,21 +508,51 @@ class LimsRunService:
             parser_id=parser.id,
             filename=filename,
         )
-        row_dicts = [
-            {
-                "container_id": row.container_id,
-                "well_position": row.well_position,
-                "sample_id": row.sample_id,
-                "row_data": row.row_data,
-                "import_id": imp.id,
-            }
-            for row in rows
-        ]
-        created = self.data_repo.bulk_create(run_id, row_dicts, self._user_id())
-        self.db.flush()
+
+        hard: List[str] = []
+        warnings: List[str] = []
+        row_dicts = (
+            row
+            for row in parse_svc.iter_records(stream, hard, warnings)
+            # Keep parsing to report every error, but stop writing after the first
+            if not hard
+        )
+        import_id = imp.id
+        audience = self._event_audience()
+
+        def on_chunk(written: int) -> None:
+            # The import is one transaction; progress has to go out on its own
+            publish_event_now(
+                IMPORT,
+                {"run_id": run_id, "import_id": import_id, "status": "running", "rows": written},
+                **audience,
+            )
+
+        imported = self.data_repo.copy_rows(
+            run_id,
+            row_dicts,
+            import_id=import_id,
+            created_by=self._user_id(),
+            chunk_rows=LIMS_IMPORT_COPY_ROWS,
+            on_chunk=on_chunk,
+        )
+        if hard or not imported:
+            self.db.rollback()
+            publish_event_now(
+                IMPORT,
+                {"run_id": run_id, "import_id": import_id, "status": "failed", "rows": 0},
+                **audience,
+            )
+            if hard:
+                raise hard_errors_exception(hard)
+            raise HTTPException(422, "No rows imported")
+
+        self._publish_run_event(
+            IMPORT, {"run_id": run_id, "import_id": import_id, "status": "complete", "rows": imported}
+        )
         self.db.commit()
         return ImportFileResponse(
-            imported=len(created),
+            imported=imported,
             skipped=0,
             warnings=warnings,
             import_id=imp.id,
@@ -536,6 +587,33 @@ class LimsRunService:
             )
         return out
 
+    def check_importable(
+        self,
+        run_id: uuid.UUID,
+        *,
+        instrument_id: Optional[uuid.UUID] = None,
+        cro_source_id: Optional[uuid.UUID] = None,
+        parser_id: Optional[uuid.UUID] = None,
+        require_parser: bool = False,
+    ) -> Tuple[LimsRun, Optional[DataParser]]:
+        """
+        Run accepts data (status + analysis_id) and, when a source is given or
+        require_parser is set, the active parser for it; 400/404 otherwise.
+        """
+        run = self.get_run(run_id)
+        self._assert_import_allowed(run)
+        if not run.analysis_id:
+            raise HTTPException(400, "Run requires analysis_id before import")
+        parser = None
+        if require_parser or instrument_id or cro_source_id or parser_id:
+            parser = self.data_parser_svc.resolve_for_import(
+                analysis_id=run.analysis_id,
+                instrument_id=instrument_id,
+                cro_source_id=cro_source_id,
+                parser_id=parser_id,
+            )
+        return run, parser
+
     def _assert_import_allowed(self, run: LimsRun) -> None:
         _import_allowed = {LimsRunStatus.running, LimsRunStatus.results_received}
         if run.status not in _import_allowed:
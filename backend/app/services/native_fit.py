@@ -0,0 +1,518 @@
+"""
+In-process dose-response curve fitting: a NumPy port of the r-calculator
+service (services/r-calculator/R/fit.R and R/category.R).
+
+Selected with DOSE_RESPONSE_FIT_BACKEND=native. NativeFitClient.fit() takes
+the same compounds/config payload as RCalculatorClient.fit() and returns the
+same result dicts, so DoseResponseFitService does not care which backend ran.
+Compounds are fitted in parallel in a process pool, and each result carries
+its thumbnail SVG (curve_svg.py), rendered in the same worker.
+
+Models are drc's log-logistic family
+
+    f(x) = c + (d - c) / (1 + exp(b * (log(x) - log(e))))^f
+
+with b = hill_slope, c = bottom, d = top, e = IC50 and f = asymmetry:
+
+  4PL     LL.4   b, c, d, e
+  3PL_FB  LL.3   bottom fixed at 0
+  3PL_FT  LL.3u  top fixed at 100 (drc's default is 1; responses here are
+                 % inhibition)
+  5PL     LL.5   b, c, d, e, f
+
+Where this differs from R:
+  - 3PL fits report the fixed asymptote instead of NA.
+  - The profiled CI is a likelihood-ratio interval for e (chi-square, 1 df).
+    When it does not close within PROFILE_MAX_LOG_SPAN of the estimate, the
+    vcov interval (e ± 1.96·SE) is returned, as R does when confint() fails.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.core.config import NATIVE_FIT_WORKERS
+from app.services.curve_svg import thumbnail_svg
+
+logger = logging.getLogger(__name__)
+
+MIN_POINTS = 4
+HOOK_MIN_POINTS = 5
+HOOK_DROP_THRESHOLD_PCT = 15.0
+DEFAULT_R_SQUARED_THRESHOLD = 0.9
+DEFAULT_INACTIVE_THRESHOLD = 20.0
+
+FIXED_BOTTOM = 0.0
+FIXED_TOP = 100.0
+
+Z_95 = 1.96
+CHI2_1DF_95 = 3.841458820694124
+
+LM_MAX_ITERATIONS = 500
+LM_TOLERANCE = 1e-10
+# Information matrices worse conditioned than this are reported as failed fits
+MAX_CONDITION_NUMBER = 1e10
+# Give up profiling (fall back to vcov) past 4 decades either side of the IC50
+PROFILE_MAX_LOG_SPAN = math.log(1e4)
+PROFILE_BISECTIONS = 30
+
+# Batches smaller than this are fitted inline; pool dispatch costs more
+PARALLEL_MIN_COMPOUNDS = 8
+
+# Parameter vector layout: b, c, d, log(e), log(f)
+B, C, D, LOG_E, LOG_F = range(5)
+
+_FREE_PARAMETERS: Dict[str, Tuple[int, ...]] = {
+    "4PL": (B, C, D, LOG_E),
+    "3PL_FB": (B, D, LOG_E),
+    "3PL_FT": (B, C, LOG_E),
+    "5PL": (B, C, D, LOG_E, LOG_F),
+}
+
+_QUALITY_FLAGS = {
+    "SIGMOID": "valid",
+    "PARTIAL_HIGH": "gt_max_conc",
+    "PARTIAL_LOW": "lt_min_conc",
+    "INACTIVE": "inactive",
+    "CANNOT_FIT": "cannot_calculate",
+}
+
+
+class FitError(Exception):
+    """The model could not be fitted; reported as success=False, CANNOT_FIT."""
+
+
+# ── Model ─────────────────────────────────────────────────────────────────────
+
+
+def _predict(theta: np.ndarray, log_x: np.ndarray) -> np.ndarray:
+    b, c, d, log_e, log_f = theta
+    softplus = np.logaddexp(0.0, b * (log_x - log_e))  # log(1 + exp(z))
+    return c + (d - c) * np.exp(-math.exp(log_f) * softplus)
+
+
+def _jacobian(theta: np.ndarray, log_x: np.ndarray) -> np.ndarray:
+    """d(prediction)/d(b, c, d, log e, log f), one row per point."""
+    b, c, d, log_e, log_f = theta
+    z = b * (log_x - log_e)
+    softplus = np.logaddexp(0.0, z)
+    sigmoid = np.exp(z - softplus)
+    f = math.exp(log_f)
+    g = np.exp(-f * softplus)
+    dy_dz = -(d - c) * f * g * sigmoid
+    return np.column_stack((
+        dy_dz * (log_x - log_e),
+        1.0 - g,
+        g,
+        -dy_dz * b,
+        -(d - c) * g * softplus * f,
+    ))
+
+
+def _least_squares(
+    theta0: np.ndarray,
+    free: Sequence[int],
+    log_x: np.ndarray,
+    y: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+) -> Tuple[np.ndarray, float]:
+    """
+    Levenberg-Marquardt over the free parameters, projected onto the bounds.
+    Parameters held at a bound by the descent direction sit out the step, so
+    an active constraint does not stall the others.
+    """
+    theta = np.clip(theta0, lower, upper)
+    resid = y - _predict(theta, log_x)
+    rss = float(resid @ resid)
+    damping = 1e-3
+    for _ in range(LM_MAX_ITERATIONS):
+        jac_all = _jacobian(theta, log_x)
+        descent = jac_all.T @ resid
+        moving = [
+            i for i in free
+            if not (theta[i] <= lower[i] and descent[i] < 0)
+            and not (theta[i] >= upper[i] and descent[i] > 0)
+        ]
+        if not moving:
+            return theta, rss
+        jac = jac_all[:, moving]
+        jtj = jac.T @ jac
+        grad = descent[moving]
+        scale = np.diag(np.maximum(np.diag(jtj), 1e-12))
+        while damping < 1e12:
+            try:
+                step = np.linalg.solve(jtj + damping * scale, grad)
+            except np.linalg.LinAlgError:
+                damping *= 10
+                continue
+            candidate = theta.copy()
+            candidate[moving] += step
+            candidate = np.clip(candidate, lower, upper)
+            cand_resid = y - _predict(candidate, log_x)
+            cand_rss = float(cand_resid @ cand_resid)
+            if math.isfinite(cand_rss) and cand_rss <= rss:
+                break
+            damping *= 10
+        else:
+            return theta, rss  # no downhill step left: at a (bounded) minimum
+        converged = rss - cand_rss <= LM_TOLERANCE * (rss + LM_TOLERANCE)
+        theta, resid, rss = candidate, cand_resid, cand_rss
+        damping = max(damping / 10, 1e-12)
+        if converged:
+            return theta, rss
+    raise FitError("Convergence failed. The model was not fit!")
+
+
+def _start_values(
+    log_x: np.ndarray, y: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> np.ndarray:
+    """
+    c at the low-dose end and d at the high-dose end, then b and e from a
+    linear fit of the logit-transformed responses against log(x).
+    """
+    order = np.argsort(log_x, kind="stable")
+    lo, hi = float(y.min()), float(y.max())
+    pad = max(hi - lo, 1e-6) * 0.01
+    if y[order[-1]] >= y[order[0]]:
+        c0, d0 = lo - pad, hi + pad
+    else:
+        c0, d0 = hi + pad, lo - pad
+    c0 = float(np.clip(c0, lower[C], upper[C]))
+    d0 = float(np.clip(d0, lower[D], upper[D]))
+
+    b0, log_e0 = -1.0, float(np.median(log_x))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (d0 - y) / (y - c0)
+    usable = np.isfinite(ratio) & (ratio > 0)
+    if usable.sum() >= 2 and np.ptp(log_x[usable]) > 0:
+        slope, intercept = np.polyfit(log_x[usable], np.log(ratio[usable]), 1)
+        if slope != 0 and math.isfinite(slope):
+            b0, log_e0 = float(slope), float(-intercept / slope)
+    return np.array([b0, c0, d0, log_e0, 0.0])
+
+
+# ── Confidence intervals ──────────────────────────────────────────────────────
+
+
+def _profile_rss(
+    warm: np.ndarray,
+    log_e: float,
+    free: Sequence[int],
+    log_x: np.ndarray,
+    y: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+) -> Tuple[np.ndarray, float]:
+    start = warm.copy()
+    start[LOG_E] = log_e
+    others = [i for i in free if i != LOG_E]
+    return _least_squares(start, others, log_x, y, lower, upper)
+
+
+def _profiled_interval(
+    theta: np.ndarray,
+    rss: float,
+    free: Sequence[int],
+    log_x: np.ndarray,
+    y: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    step: float,
+) -> Optional[Tuple[float, float]]:
+    """95% likelihood-ratio interval for e, or None if it does not close."""
+    # n·log(RSS(e)/RSS) = chi-square(1) at the interval ends
+    limit = rss * math.exp(CHI2_1DF_95 / y.size)
+    ends = []
+    for direction in (-1.0, 1.0):
+        inner, inner_theta = 0.0, theta
+        outer, offset = None, step
+        while offset <= PROFILE_MAX_LOG_SPAN:
+            profiled, level = _profile_rss(
+                inner_theta, theta[LOG_E] + direction * offset, free, log_x, y, lower, upper
+            )
+            if level > limit:
+                outer = offset
+                break
+            inner, inner_theta = offset, profiled
+            offset *= 2
+        if outer is None:
+            return None
+        for _ in range(PROFILE_BISECTIONS):
+            mid = (inner + outer) / 2
+            profiled, level = _profile_rss(
+                inner_theta, theta[LOG_E] + direction * mid, free, log_x, y, lower, upper
+            )
+            if level > limit:
+                outer = mid
+            else:
+                inner, inner_theta = mid, profiled
+        ends.append(theta[LOG_E] + direction * (inner + outer) / 2)
+    return math.exp(ends[0]), math.exp(ends[1])
+
+
+# ── Fit / categorize (fit.R, category.R) ──────────────────────────────────────
+
+
+def _bounds(model: str, constraints: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    lower = np.full(5, -np.inf)
+    upper = np.full(5, np.inf)
+    for index, name in ((C, "bottom"), (D, "top")):
+        limits = constraints.get(name) or {}
+        if limits.get("min") is not None:
+            lower[index] = float(limits["min"])
+        if limits.get("max") is not None:
+            upper[index] = float(limits["max"])
+    lower[LOG_F] = upper[LOG_F] = 0.0
+    if model == "3PL_FB":
+        lower[C] = upper[C] = FIXED_BOTTOM
+    elif model == "3PL_FT":
+        lower[D] = upper[D] = FIXED_TOP
+    elif model == "5PL":
+        lower[LOG_F], upper[LOG_F] = -np.inf, np.inf
+    return lower, upper
+
+
+def fit_compound(
+    conc: Sequence[float],
+    response: Sequence[float],
+    model: str = "4PL",
+    constraints: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Fit one compound. Same contract as fit_compound() in fit.R: success,
+    potency, hill_slope, bottom, top, r_squared, ci_low_95, ci_high_95,
+    ci_method; on failure success=False and error.
+    """
+    if len(conc) < MIN_POINTS:
+        return {
+            "success": False,
+            "error": f"Insufficient data points: {len(conc)} (minimum {MIN_POINTS} required)",
+        }
+    if model not in _FREE_PARAMETERS:
+        model = "4PL"  # fit.R's switch() default
+    try:
+        return _fit(np.asarray(conc, float), np.asarray(response, float), model, constraints or {})
+    except (FitError, np.linalg.LinAlgError, ValueError) as exc:
+        return {"success": False, "error": str(exc)}
+
+
+def _fit(
+    conc: np.ndarray, y: np.ndarray, model: str, constraints: Mapping[str, Any]
+) -> Dict[str, Any]:
+    if not (np.all(np.isfinite(conc)) and np.all(np.isfinite(y))):
+        raise FitError("Concentrations and responses must be finite")
+    if np.any(conc <= 0):
+        raise FitError("Concentrations must be positive")
+    log_x = np.log(conc)
+    free = _FREE_PARAMETERS[model]
+    lower, upper = _bounds(model, constraints)
+
+    theta, rss = _least_squares(_start_values(log_x, y, lower, upper), free, log_x, y, lower, upper)
+    jac = _jacobian(theta, log_x)[:, list(free)]
+    if not np.all(np.isfinite(jac)) or np.linalg.cond(jac) > MAX_CONDITION_NUMBER:
+        raise FitError("Convergence failed. The model was not fit!")
+
+    ss_tot = float(np.sum((y - y.mean()) ** 2))
+    r_squared = 1.0 if ss_tot == 0 else 1.0 - rss / ss_tot
+    potency = math.exp(theta[LOG_E])
+
+    ci_low = ci_high = ci_method = None
+    dof = y.size - len(free)
+    if dof > 0:
+        # SE of e by the delta method from the SE of log(e)
+        unscaled = np.linalg.inv(jac.T @ jac)
+        se_log_e = math.sqrt(rss / dof * unscaled[free.index(LOG_E), free.index(LOG_E)])
+        profiled = None
+        if rss > 0:
+            step = min(max(se_log_e, 0.01), 1.0)
+            try:
+                profiled = _profiled_interval(theta, rss, free, log_x, y, lower, upper, step)
+            except FitError:
+                profiled = None
+        if profiled is not None:
+            (ci_low, ci_high), ci_method = profiled, "profiled"
+        else:
+            se = potency * se_log_e
+            ci_low, ci_high, ci_method = potency - Z_95 * se, potency + Z_95 * se, "vcov"
+
+    return {
+        "success": True,
+        "potency": potency,
+        "hill_slope": float(theta[B]),
+        "bottom": float(theta[C]),
+        "top": float(theta[D]),
+        "r_squared": r_squared,
+        "ci_low_95": ci_low,
+        "ci_high_95": ci_high,
+        "ci_method": ci_method,
+    }
+
+
+def detect_hook_effect(
+    conc: Sequence[float],
+    response: Sequence[float],
+    drop_threshold_pct: float = HOOK_DROP_THRESHOLD_PCT,
+) -> bool:
+    """Mean response at the top 2 concentrations drops > drop_threshold_pct below the peak."""
+    if len(conc) < HOOK_MIN_POINTS:
+        return False
+    ordered = np.asarray(response, float)[np.argsort(np.asarray(conc, float), kind="stable")]
+    peak = float(ordered.max())
+    if peak == 0:
+        return False
+    drop_pct = (peak - float(ordered[-2:].mean())) / abs(peak) * 100
+    return drop_pct > drop_threshold_pct
+
+
+def assign_category(
+    fit: Mapping[str, Any],
+    conc: Sequence[float],
+    response: Sequence[float],
+    config: Mapping[str, Any],
+) -> str:
+    """Curve category, in category.R's priority order."""
+    r_sq_thresh = config.get("r_squared_threshold")
+    if r_sq_thresh is None:
+        r_sq_thresh = DEFAULT_R_SQUARED_THRESHOLD
+    inactive_thresh = config.get("inactive_threshold")
+    if inactive_thresh is None:
+        inactive_thresh = DEFAULT_INACTIVE_THRESHOLD
+
+    if not fit.get("success"):
+        return "CANNOT_FIT"
+    delta = fit["top"] - fit["bottom"]
+    if abs(delta) < inactive_thresh:
+        return "INACTIVE"
+    if delta < 0:
+        return "INVERSE"
+    if fit["potency"] > max(conc):
+        return "PARTIAL_HIGH"
+    if fit["potency"] < min(conc):
+        return "PARTIAL_LOW"
+    if detect_hook_effect(conc, response):
+        return "HOOK_EFFECT"
+    if fit["r_squared"] < r_sq_thresh:
+        return "NOISY"
+    return "SIGMOID"
+
+
+def derive_quality_flag(category: str) -> str:
+    return _QUALITY_FLAGS.get(category, "review_required")
+
+
+def fit_result(compound: Mapping[str, Any], config: Mapping[str, Any]) -> Dict[str, Any]:
+    """One element of the /fit response for one element of its compounds payload."""
+    points = compound.get("points") or []
+    conc = [float(p["conc"]) for p in points]
+    response = [float(p["response"]) for p in points]
+    fit = fit_compound(
+        conc, response, compound.get("model") or "4PL", compound.get("constraints") or {}
+    )
+    category = assign_category(fit, conc, response, config)
+    success = bool(fit.get("success"))
+    return {
+        "sample_id": compound.get("sample_id"),
+        "success": success,
+        "potency": fit["potency"] if success else None,
+        "potency_type": "IC50" if success else None,
+        "hill_slope": fit["hill_slope"] if success else None,
+        "top": fit["top"] if success else None,
+        "bottom": fit["bottom"] if success else None,
+        "r_squared": fit["r_squared"] if success else None,
+        "ci_low_95": fit["ci_low_95"] if success else None,
+        "ci_high_95": fit["ci_high_95"] if success else None,
+        "ci_method": fit["ci_method"] if success else None,
+        "curve_category": category,
+        "quality_flag": derive_quality_flag(category),
+        "thumbnail_svg": thumbnail_svg(points, fit, category),
+        "error": None if success else fit.get("error"),
+    }
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Shared worker pool for fitting and thumbnail rendering."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the API process holds DB connections and threads
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def discard_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+class NativeFitClient:
+    """In-process replacement for RCalculatorClient.fit()."""
+
+    def __init__(self, max_workers: int = NATIVE_FIT_WORKERS) -> None:
+        self._max_workers = max_workers
+
+    def health(self) -> Dict[str, Any]:
+        return {"status": "ok", "backend": "native", "numpy_version": np.__version__}
+
+    def fit(
+        self,
+        compounds: List[Dict[str, Any]],
+        config: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """
+        Fit every compound; results are in payload order.
+
+        Raises:
+            HTTPException 503 if a fitting worker process dies.
+        """
+        logger.info(
+            "Fitting compounds in-process",
+            extra={"compound_count": len(compounds), "workers": self._max_workers},
+        )
+        if self._max_workers <= 1 or len(compounds) < PARALLEL_MIN_COMPOUNDS:
+            results = [fit_result(c, config) for c in compounds]
+        else:
+            chunksize = max(1, len(compounds) // (self._max_workers * 4))
+            try:
+                results = list(
+                    process_pool(self._max_workers).map(
+                        fit_result, compounds, repeat(config), chunksize=chunksize
+                    )
+                )
+            except BrokenProcessPool:
+                discard_process_pool()
+                logger.error("Native fit worker process died", extra={"compound_count": len(compounds)})
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Calculation service error: fitting worker stopped unexpectedly",
+                )
+
+        logger.info(
+            "Native fit complete",
+            extra={
+                "total": len(results),
+                "succeeded": sum(1 for r in results if r["success"]),
+                "failed": sum(1 for r in results if not r["success"]),
+            },
+        )
+        return results
@@ -3,31 +3,76 @@ HTTP client for the r-calculator Plumber service.
 
 The r-calculator service lives on the internal Docker network.
 FastAPI never exposes it to the outside world.
+
+Plumber serves one request at a time, so a large fit is split into
+R_FIT_CHUNK_SIZE-compound chunks posted concurrently across every
+R_CALCULATOR_URLS instance over one keep-alive connection pool; adding
+instances divides fit wall time. Results come back in payload order.
 """
 from __future__ import annotations
 
 import logging
-import os
-from typing import Any, Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
 
 import httpx
 from fastapi import HTTPException, status
 
+from app.core.config import (
+    R_CALCULATOR_URLS,
+    R_FIT_CHUNK_SIZE,
+    R_FIT_CONCURRENCY_PER_ENDPOINT,
+    R_FIT_RETRIES,
+    R_FIT_TIMEOUT_SECONDS,
+)
+
 logger = logging.getLogger(__name__)
 
-R_CALCULATOR_URL = os.getenv("R_CALCULATOR_URL", "http://r-calculator:8000")
-FIT_TIMEOUT_SECONDS = 60.0
+R_CALCULATOR_URL = R_CALCULATOR_URLS[0]
+FIT_TIMEOUT_SECONDS = R_FIT_TIMEOUT_SECONDS
+CONNECT_TIMEOUT_SECONDS = 5.0
+# An instance that refused or dropped a connection is tried last for this long
+ENDPOINT_COOLDOWN_SECONDS = 10.0
 
 
 class RCalculatorClient:
-    """Thin httpx wrapper around the R/Plumber curve fitting service."""
+    """Pooled httpx client for one or more R/Plumber curve fitting instances."""
 
-    def __init__(self, base_url: str = R_CALCULATOR_URL) -> None:
-        self._base_url = base_url
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        *,
+        endpoints: Optional[Sequence[str]] = None,
+        chunk_size: int = R_FIT_CHUNK_SIZE,
+        concurrency_per_endpoint: int = R_FIT_CONCURRENCY_PER_ENDPOINT,
+        timeout: float = FIT_TIMEOUT_SECONDS,
+        retries: int = R_FIT_RETRIES,
+    ) -> None:
+        if endpoints is None:
+            endpoints = [base_url] if base_url else R_CALCULATOR_URLS
+        self._endpoints = [url.rstrip("/") for url in endpoints]
+        self._base_url = self._endpoints[0]
+        self._chunk_size = max(1, chunk_size)
+        self._timeout = timeout
+        self._retries = max(0, retries)
+        workers = len(self._endpoints) * max(1, concurrency_per_endpoint)
+        self._http = httpx.Client(
+            timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=workers + 1, max_keepalive_connections=workers + 1),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="r-fit")
+        self._cooldown_lock = threading.Lock()
+        self._cooling_until: Dict[str, float] = {}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
 
     def health(self) -> Dict[str, Any]:
         try:
-            resp = httpx.get(f"{self._base_url}/health", timeout=5.0)
+            resp = self._http.get(f"{self._base_url}/health", timeout=5.0)
             resp.raise_for_status()
             return resp.json()
         except httpx.HTTPError as exc:
@@ -42,7 +87,7 @@ class RCalculatorClient:
         config: Dict[str, Any],
     ) -> List[Dict[str, Any]]:
         """
-        POST /fit to the R service. Synchronous — blocks until all compounds are fitted.
+        POST /fit to the R service(s). Synchronous — blocks until all compounds are fitted.
 
         Args:
             compounds: List of compound dicts, each with:
@@ -51,87 +96,130 @@ class RCalculatorClient:
             config: Dict with r_squared_threshold, inactive_threshold, concentration_unit
 
         Returns:
-            List of fit result dicts from R.
+            List of fit result dicts from R, in the order of compounds.
 
         Raises:
-            HTTPException 503 on R service down or timeout.
+            HTTPException 503 when a chunk still fails after its retries
+            (R service down, timeout, or error status).
         """
-        payload = {"compounds": compounds, "config": config}
+        if not compounds:
+            return []
+        chunks = [
+            compounds[start:start + self._chunk_size]
+            for start in range(0, len(compounds), self._chunk_size)
+        ]
         logger.info(
             "Sending fit request to R service",
-            extra={"compound_count": len(compounds), "url": self._base_url},
+            extra={
+                "compound_count": len(compounds),
+                "chunks": len(chunks),
+                "endpoints": len(self._endpoints),
+            },
         )
-        try:
-            resp = httpx.post(
-                f"{self._base_url}/fit",
-                json=payload,
-                timeout=FIT_TIMEOUT_SECONDS,
+
+        if len(chunks) == 1:
+            results = self._fit_chunk(0, chunks[0], config)
+        else:
+            futures = [
+                self._executor.submit(self._fit_chunk, index, chunk, config)
+                for index, chunk in enumerate(chunks)
+            ]
+            results = []
+            try:
+                for future in futures:
+                    results.extend(future.result())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        logger.info(
+            "R service fit complete",
+            extra={
+                "total": len(results),
+                "succeeded": sum(1 for r in results if r.get("success")),
+                "failed": sum(1 for r in results if not r.get("success")),
+            },
+        )
+        return results
+
+    def _endpoint_order(self, index: int) -> List[str]:
+        """Round-robin from the chunk index; cooling-down instances go last."""
+        n = len(self._endpoints)
+        rotated = [self._endpoints[(index + i) % n] for i in range(n)]
+        now = time.monotonic()
+        with self._cooldown_lock:
+            return sorted(rotated, key=lambda url: self._cooling_until.get(url, 0.0) > now)
+
+    def _cool_down(self, url: str) -> None:
+        with self._cooldown_lock:
+            self._cooling_until[url] = time.monotonic() + ENDPOINT_COOLDOWN_SECONDS
+
+    def _fit_chunk(
+        self, index: int, chunk: List[Dict[str, Any]], config: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        payload = {"compounds": chunk, "config": config}
+        order = self._endpoint_order(index)
+        last_exc: Optional[httpx.HTTPError] = None
+        for attempt in range(self._retries + 1):
+            url = order[attempt % len(order)]
+            try:
+                resp = self._http.post(f"{url}/fit", json=payload)
+                resp.raise_for_status()
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code < 500:
+                    last_exc = exc
+                    break
+                last_exc = exc
+            except (httpx.TimeoutException, httpx.TransportError) as exc:
+                if not isinstance(exc, httpx.TimeoutException):
+                    self._cool_down(url)
+                last_exc = exc
+            else:
+                results = resp.json()
+                if len(results) != len(chunk):
+                    logger.error(
+                        "R service returned wrong result count",
+                        extra={"url": url, "expected": len(chunk), "got": len(results)},
+                    )
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=f"Calculation service error: expected {len(chunk)} results, got {len(results)}",
+                    )
+                return results
+            logger.warning(
+                "R service fit chunk failed",
+                extra={
+                    "url": url,
+                    "chunk": index,
+                    "attempt": attempt + 1,
+                    "compound_count": len(chunk),
+                    "error": type(last_exc).__name__,
+                },
             )
-            resp.raise_for_status()
-        except httpx.TimeoutException as exc:
+        raise self._unavailable(last_exc, len(chunk))
+
+    def _unavailable(self, exc: Optional[httpx.HTTPError], compound_count: int) -> HTTPException:
+        if isinstance(exc, httpx.TimeoutException):
             logger.warning(
                 "R service fit timed out",
-                extra={"timeout_s": FIT_TIMEOUT_SECONDS, "compound_count": len(compounds)},
+                extra={"timeout_s": self._timeout, "compound_count": compound_count},
             )
-            raise HTTPException(
+            return HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Curve fitting timed out. Try with fewer compounds or re-try later.",
             )
-        except httpx.ConnectError as exc:
-            logger.error("R service connection failed", extra={"error": str(exc)})
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Calculation service is unavailable. Contact your administrator.",
-            )
-        except httpx.HTTPStatusError as exc:
+        if isinstance(exc, httpx.HTTPStatusError):
             logger.error(
                 "R service returned error status",
                 extra={"status_code": exc.response.status_code},
             )
-            raise HTTPException(
+            return HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=f"Calculation service error: {exc.response.status_code}",
             )
-
-        results = resp.json()
-        logger.info(
-            "R service fit complete",
-            extra={
-                "total": len(results),
-                "succeeded": sum(1 for r in results if r.get("success")),
-                "failed": sum(1 for r in results if not r.get("success")),
-            },
+        logger.error("R service connection failed", extra={"error": str(exc)})
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Calculation service is unavailable. Contact your administrator.",
         )
-        return results
-
-    def full_svg(
-        self,
-        points: List[Dict[str, Any]],
-        model: str,
-        excluded_point_ids: List[str],
-        x_label: str,
-        y_label: str,
-        title: str,
-    ) -> str:
-        """POST /svg/full — returns a full-size SVG string for PDF export."""
-        payload = {
-            "points": points,
-            "model": model,
-            "excluded_point_ids": excluded_point_ids,
-            "x_label": x_label,
-            "y_label": y_label,
-            "title": title,
-        }
-        try:
-            resp = httpx.post(
-                f"{self._base_url}/svg/full",
-                json=payload,
-                timeout=30.0,
-            )
-            resp.raise_for_status()
-        except httpx.HTTPError as exc:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"SVG generation failed: {exc}",
-            )
-        return resp.json()["svg"]
@@ -7,6 +7,11 @@ Rules (open-questions/run-results.md):
 - Column → analyte via name or analyte_aliases (casefold)
 - raw_result only; lims_run_id lineage; replicate from JSONB or row order
 - Same lims_run_id → update; other lims_run_id → conflict fail
+
+Planning is set-based: tests, and existing results for the run's
+(test, analyte, replicate) keys, are loaded with one query each; apply_plan
+writes creates and updates as INSERT ... ON CONFLICT upserts of
+LIMS_PROMOTE_BATCH_SIZE rows.
 """
 from __future__ import annotations
 
@@ -15,14 +20,15 @@ import uuid
 from collections import defaultdict
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from fastapi import HTTPException, status
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.reference_cache import list_by_name, list_entries, list_entry_id
 from models.analysis import Analysis, Analyte, AnalysisAnalyte
 from models.flexible_experiment import LimsRun, LimsRunData
-from models.list import List as ListModel, ListEntry
 from models.result import Result
 from models.sample import Sample
 from models.test import Test
@@ -134,26 +140,17 @@ class ResultPromotionService:
         return lookup
 
     def _default_test_status_id(self) -> uuid.UUID:
-        lst = self.db.query(ListModel).filter(ListModel.name == "test_status").first()
-        if not lst:
+        if not list_by_name(self.db, "test_status"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="List 'test_status' not found; cannot create tests",
             )
         for preferred in ("In Process", "Assigned", "Pending", "Complete"):
-            entry = (
-                self.db.query(ListEntry)
-                .filter(ListEntry.list_id == lst.id, ListEntry.name == preferred)
-                .first()
-            )
-            if entry:
-                return entry.id
-        entry = (
-            self.db.query(ListEntry)
-            .filter(ListEntry.list_id == lst.id)
-            .order_by(ListEntry.name)
-            .first()
-        )
+            entry_id = list_entry_id(self.db, "test_status", preferred, active_only=False)
+            if entry_id:
+                return entry_id
+        entries = list_entries(self.db, "test_status")
+        entry = entries[0] if entries else None
         if not entry:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -161,84 +158,123 @@ class ResultPromotionService:
             )
         return entry.id
 
-    def ensure_test(
-        self,
-        sample_id: uuid.UUID,
-        analysis_id: uuid.UUID,
-        *,
-        cache: Dict[uuid.UUID, Test],
-    ) -> Test:
-        if sample_id in cache:
-            return cache[sample_id]
-        test = (
+    def load_tests(
+        self, sample_ids: Set[uuid.UUID], analysis_id: uuid.UUID
+    ) -> Dict[uuid.UUID, Test]:
+        """sample_id → active Test for this analysis, for every sample in one query."""
+        tests: Dict[uuid.UUID, Test] = {}
+        if not sample_ids:
+            return tests
+        rows = (
             self.db.query(Test)
             .filter(
-                Test.sample_id == sample_id,
+                Test.sample_id.in_(list(sample_ids)),
                 Test.analysis_id == analysis_id,
                 Test.active == True,  # noqa: E712
             )
-            .first()
+            .order_by(Test.created_at, Test.id)
         )
-        if test:
-            cache[sample_id] = test
-            return test
-
-        sample = self.db.query(Sample).filter(Sample.id == sample_id).first()
-        analysis = self.db.query(Analysis).filter(Analysis.id == analysis_id).first()
-        if not sample:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Sample {sample_id} not found",
-            )
-        if not analysis:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Analysis {analysis_id} not found",
-            )
+        for test in rows:
+            tests.setdefault(test.sample_id, test)
+        return tests
+
+    def _unique_test_names(self, base_names: List[str]) -> List[str]:
+        """Global-unique test names: one IN query, suffix probing only on collision."""
+        candidates = [base[:240] for base in base_names]
+        taken = {
+            name
+            for (name,) in self.db.query(Test.name).filter(Test.name.in_(candidates))
+        }
+        names: List[str] = []
+        for base, name in zip(base_names, candidates):
+            n = 0
+            while name in taken or (
+                n and self.db.query(Test.id).filter(Test.name == name).first()
+            ):
+                n += 1
+                name = f"{base[:220]}_{n}"
+            taken.add(name)
+            names.append(name)
+        return names
+
+    def ensure_tests(
+        self, sample_ids: Set[uuid.UUID], analysis_id: uuid.UUID
+    ) -> Tuple[Dict[uuid.UUID, Test], Dict[uuid.UUID, str]]:
+        """
+        Existing or newly created Test per sample (created tests flushed in one batch).
 
-        status_id = self._default_test_status_id()
-        base_name = f"{sample.name}_{analysis.name}"
-        name = base_name[:240]
-        # Ensure global unique name
-        n = 0
-        while self.db.query(Test.id).filter(Test.name == name).first():
-            n += 1
-            name = f"{base_name[:220]}_{n}"
-
-        test = Test(
-            name=name,
-            sample_id=sample_id,
-            analysis_id=analysis_id,
-            status=status_id,
-            test_date=datetime.now(),
-            technician_id=self._user_id(),
-            created_by=self._user_id(),
-            modified_by=self._user_id(),
+        Returns (tests, errors): errors maps sample_id → reason no test could be made.
+        """
+        tests = self.load_tests(sample_ids, analysis_id)
+        missing = [sid for sid in sample_ids if sid not in tests]
+        errors: Dict[uuid.UUID, str] = {}
+        if not missing:
+            return tests, errors
+
+        sample_names = dict(
+            self.db.query(Sample.id, Sample.name).filter(Sample.id.in_(missing))
         )
-        self.db.add(test)
-        self.db.flush()
-        cache[sample_id] = test
-        return test
+        analysis = self.db.query(Analysis.name).filter(Analysis.id == analysis_id).first()
+        status_id: Optional[uuid.UUID] = None
+        status_error: Optional[str] = None
+        if analysis and sample_names:
+            try:
+                status_id = self._default_test_status_id()
+            except HTTPException as e:
+                status_error = str(e.detail)
+
+        to_create: List[uuid.UUID] = []
+        for sid in missing:
+            if sid not in sample_names:
+                errors[sid] = f"Sample {sid} not found"
+            elif not analysis:
+                errors[sid] = f"Analysis {analysis_id} not found"
+            elif status_error:
+                errors[sid] = status_error
+            else:
+                to_create.append(sid)
+        if not to_create:
+            return tests, errors
 
-    def _get_or_none_test(
-        self,
-        sample_id: uuid.UUID,
-        analysis_id: uuid.UUID,
-        cache: Dict[uuid.UUID, Optional[Test]],
-    ) -> Optional[Test]:
-        if sample_id in cache:
-            return cache[sample_id]
-        test = (
-            self.db.query(Test)
-            .filter(
-                Test.sample_id == sample_id,
-                Test.analysis_id == analysis_id,
-                Test.active == True,  # noqa: E712
+        names = self._unique_test_names(
+            [f"{sample_names[sid]}_{analysis.name}" for sid in to_create]
+        )
+        now = datetime.now()
+        created = [
+            Test(
+                name=name,
+                sample_id=sid,
+                analysis_id=analysis_id,
+                status=status_id,
+                test_date=now,
+                technician_id=self._user_id(),
+                created_by=self._user_id(),
+                modified_by=self._user_id(),
             )
-            .first()
+            for sid, name in zip(to_create, names)
+        ]
+        self.db.add_all(created)
+        self.db.flush()
+        tests.update((test.sample_id, test) for test in created)
+        return tests, errors
+
+    def load_existing_results(
+        self, test_ids: Set[uuid.UUID], analyte_ids: Set[uuid.UUID]
+    ) -> Dict[Tuple[uuid.UUID, uuid.UUID, int], Optional[uuid.UUID]]:
+        """(test_id, analyte_id, replicate) → owning lims_run_id for active results (one query)."""
+        if not test_ids or not analyte_ids:
+            return {}
+        rows = self.db.query(
+            Result.test_id, Result.analyte_id, Result.replicate, Result.lims_run_id
+        ).filter(
+            Result.test_id.in_(list(test_ids)),
+            Result.analyte_id.in_(list(analyte_ids)),
+            Result.active == True,  # noqa: E712
         )
-        cache[sample_id] = test
-        return test
+        return {
+            (test_id, analyte_id, replicate): lims_run_id
+            for test_id, analyte_id, replicate, lims_run_id in rows
+        }
 
     def plan_promotion(self, run: LimsRun, *, dry_run: bool = False) -> PromotePlan:
         """
@@ -267,11 +303,25 @@ class ResultPromotionService:
             .all()
         )
 
+        # Tests for every sample in the run, resolved (or created) in bulk
+        sample_ids = {
+            row.sample_id
+            for row in data_rows
+            if row.sample_id and isinstance(row.row_data or {}, dict)
+        }
+        test_errors: Dict[uuid.UUID, str] = {}
+        if dry_run:
+            tests = self.load_tests(sample_ids, run.analysis_id)
+        else:
+            tests, test_errors = self.ensure_tests(sample_ids, run.analysis_id)
+        existing_results = self.load_existing_results(
+            {t.id for t in tests.values()},
+            {analyte.id for analyte, _ in lookup.values()},
+        )
+
         # Order-based replicate counters when JSONB has no replicate
         order_counters: Dict[Tuple[uuid.UUID, uuid.UUID], int] = defaultdict(int)
         seen_unresolved: set = set()
-        test_cache: Dict[uuid.UUID, Test] = {}
-        dry_test_cache: Dict[uuid.UUID, Optional[Test]] = {}
 
         for row in data_rows:
             if not row.sample_id:
@@ -303,19 +353,10 @@ class ResultPromotionService:
                         explicit_rep = None
                     break
 
-            test: Optional[Test] = None
-            if dry_run:
-                test = self._get_or_none_test(
-                    row.sample_id, run.analysis_id, dry_test_cache
-                )
-            else:
-                try:
-                    test = self.ensure_test(
-                        row.sample_id, run.analysis_id, cache=test_cache
-                    )
-                except HTTPException as e:
-                    plan.errors.append(str(e.detail))
-                    continue
+            if row.sample_id in test_errors:
+                plan.errors.append(test_errors[row.sample_id])
+                continue
+            test: Optional[Test] = tests.get(row.sample_id)
 
             for key, value in row_data.items():
                 # Structural / non-analyte keys — ignore silently (not "unresolved")
@@ -350,21 +391,9 @@ class ResultPromotionService:
                     order_counters[(row.sample_id, analyte.id)] += 1
                     replicate = order_counters[(row.sample_id, analyte.id)]
 
-                existing = None
-                if test is not None:
-                    existing = (
-                        self.db.query(Result)
-                        .filter(
-                            Result.test_id == test.id,
-                            Result.analyte_id == analyte.id,
-                            Result.replicate == replicate,
-                            Result.active == True,  # noqa: E712
-                        )
-                        .first()
-                    )
-
-                if existing:
-                    if existing.lims_run_id == run.id:
+                result_key = (test.id, analyte.id, replicate) if test is not None else None
+                if result_key in existing_results:
+                    if existing_results[result_key] == run.id:
                         action = "update"
                         plan.update_count += 1
                     else:
@@ -411,7 +440,7 @@ class ResultPromotionService:
         return plan
 
     def apply_plan(self, run: LimsRun, plan: PromotePlan) -> None:
-        """Write results from plan; assumes plan has no conflicts. Does not commit."""
+        """Upsert results from plan in batches; assumes plan has no conflicts. Does not commit."""
         if plan.conflict_count:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -439,8 +468,9 @@ class ResultPromotionService:
         # Use local now() — ResultResponse validator rejects utcnow() as "future"
         # when the host timezone is behind UTC (see schemas/result.py).
         now = datetime.now()
-        pending = 0
 
+        # Last item wins for a repeated (test, analyte, replicate) key
+        rows: Dict[Tuple[uuid.UUID, uuid.UUID, int], Dict[str, Any]] = {}
         for item in plan.items:
             if item.action not in ("create", "update"):
                 continue
@@ -448,45 +478,50 @@ class ResultPromotionService:
                 continue
             test_id = uuid.UUID(item.test_id)
             analyte_id = uuid.UUID(item.analyte_id)
-
-            if item.action == "update":
-                existing = (
-                    self.db.query(Result)
-                    .filter(
-                        Result.test_id == test_id,
-                        Result.analyte_id == analyte_id,
-                        Result.replicate == item.replicate,
-                        Result.lims_run_id == run.id,
-                    )
-                    .first()
-                )
-                if existing:
-                    existing.raw_result = item.raw_result
-                    existing.modified_by = user_id
-                    existing.modified_at = now
-                    existing.entered_by = user_id
-                    existing.entry_date = now
-            else:
-                res = Result(
-                    test_id=test_id,
-                    analyte_id=analyte_id,
-                    raw_result=item.raw_result,
-                    replicate=item.replicate,
-                    lims_run_id=run.id,
-                    entry_date=now,
-                    entered_by=user_id,
-                    created_by=user_id,
-                    modified_by=user_id,
-                )
-                self.db.add(res)
-
-            pending += 1
-            if pending >= self.batch_size:
-                self.db.flush()
-                pending = 0
-
-        if pending:
-            self.db.flush()
+            rows[(test_id, analyte_id, item.replicate)] = {
+                "test_id": test_id,
+                "analyte_id": analyte_id,
+                "replicate": item.replicate,
+                "raw_result": item.raw_result,
+                "lims_run_id": run.id,
+                "entry_date": now,
+                "entered_by": user_id,
+                "created_by": user_id,
+                "modified_by": user_id,
+            }
+        if not rows:
+            return
+
+        stmt = pg_insert(Result.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Result.test_id, Result.analyte_id, Result.replicate],
+            set_={
+                "raw_result": stmt.excluded.raw_result,
+                "entered_by": stmt.excluded.entered_by,
+                "entry_date": stmt.excluded.entry_date,
+                "modified_by": stmt.excluded.modified_by,
+                "modified_at": now,
+                "active": True,
+            },
+            # Only rows this run owns; anything else is a conflict (checked below)
+            where=Result.__table__.c.lims_run_id == stmt.excluded.lims_run_id,
+        ).returning(Result.__table__.c.id)
+
+        values = list(rows.values())
+        written = 0
+        for start in range(0, len(values), self.batch_size):
+            written += len(self.db.execute(stmt, values[start:start + self.batch_size]).all())
+        if written != len(values):
+            # Slot held by another owner that the plan did not see (e.g. an inactive manual result)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "code": "promotion_conflict",
+                    "message": "Cannot promote: results already exist from another run or manual entry",
+                    "errors": [],
+                    "conflict_count": len(values) - written,
+                },
+            )
 
     def promote_on_publish(self, run: LimsRun) -> PromotePlan:
         """
@@ -496,6 +531,6 @@ class ResultPromotionService:
         plan = self.plan_promotion(run)
         if not run.analysis_id:
             return plan
-        # Ensure tests were flushed during plan (ensure_test flushes)
+        # Ensure tests were flushed during plan (ensure_tests flushes)
         self.apply_plan(run, plan)
         return plan
@@ -2,11 +2,13 @@
 SOPParseService — creates and manages SOP parse jobs.
 
 Background task flow:
-    1. POST /sop-parse: create job (status=pending), kick off background task
-    2. Background task: set status=processing → call Claude API
+    1. POST /sop-parse: create job (status=pending), queue a sop_parse.extract
+       job (app/services/job_handlers.py)
+    2. Job worker: set status=processing → call Claude API
     3. On success: set status=complete, store result JSONB
     4. On failure: set status=failed, store error_message
-    5. GET /sop-parse/:id: poll status
+    5. GET /sop-parse/:id: current status; each change is also pushed as a
+       sop_parse event on GET /v1/events
 
 Claude extraction prompt produces:
     {
@@ -15,8 +17,9 @@ Claude extraction prompt produces:
       "worklist_config": WorklistConfig dict
     }
 
-Background tasks use their own SessionLocal() to avoid sharing a session with the
-HTTP request that spawned them (per design doc decision).
+Background tasks use their own BackgroundSessionLocal() to avoid sharing a session
+with the HTTP request that spawned them (per design doc decision); that sessionmaker
+is bound to the separate background pool so extraction never competes with requests.
 """
 from __future__ import annotations
 
@@ -29,6 +32,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.config import ANTHROPIC_API_KEY
+from app.core.events import SOP_PARSE, publish_event
 from app.repositories.flexible_experiment_repository import (
     SopParseJobRepository,
     InstrumentParserRepository,
@@ -229,6 +233,16 @@ class SOPParseService:
             "robot_worklist_config_id": worklist_config_id,
         }
 
+    @staticmethod
+    def _publish_status(db: Session, job: SopParseJob) -> None:
+        """sop_parse event to the job's creator (GET /v1/events) on commit."""
+        publish_event(
+            db,
+            SOP_PARSE,
+            {"sop_parse_job_id": job.id, "status": job.status},
+            user_id=job.created_by,
+        )
+
     @staticmethod
     def run_extraction_background(
         job_id: uuid.UUID,
@@ -244,16 +258,17 @@ class SOPParseService:
           [Claude API call — no DB connection held]
           Session 2: write result (complete or failed), then release connection.
         """
-        from app.database import SessionLocal
+        from app.database import BackgroundSessionLocal
 
         # ── Session 1: mark processing ──────────────────────────────────────
-        db = SessionLocal()
+        db = BackgroundSessionLocal()
         try:
             repo = SopParseJobRepository(db)
             job = repo.get_by_id(job_id)
             if not job:
                 return
             repo.mark_processing(job)
+            SOPParseService._publish_status(db, job)
             db.commit()
         except Exception:
             db.rollback()
@@ -300,7 +315,7 @@ class SOPParseService:
                 error_message = f"Unexpected error: {str(e)}"
 
         # ── Session 2: write result ──────────────────────────────────────────
-        db = SessionLocal()
+        db = BackgroundSessionLocal()
         try:
             repo = SopParseJobRepository(db)
             job = repo.get_by_id(job_id)
@@ -310,6 +325,7 @@ class SOPParseService:
                 repo.mark_failed(job, error_message)
             else:
                 repo.mark_complete(job, result)
+            SOPParseService._publish_status(db, job)
             db.commit()
         except Exception:
             db.rollback()
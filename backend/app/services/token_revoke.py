@@ -6,12 +6,16 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import jti_denylist
 from models.revoked_token import RevokedToken
 
 
 def is_token_revoked(db: Session, jti: str) -> bool:
     if not jti:
         return False
+    # Bloom miss = definitely not revoked; skip the per-request denylist query
+    if not jti_denylist.might_be_revoked(db, jti):
+        return False
     try:
         row = db.query(RevokedToken).filter(RevokedToken.jti == jti).first()
     except Exception:
@@ -31,6 +35,7 @@ def revoke_token(
     exp = expires_at or (datetime.now(timezone.utc))
     if exp.tzinfo is None:
         exp = exp.replace(tzinfo=timezone.utc)
+    jti_denylist.add(jti)
     existing = db.query(RevokedToken).filter(RevokedToken.jti == jti).first()
     if existing:
         return
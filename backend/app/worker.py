@@ -0,0 +1,218 @@
+"""
+Job worker: python -m app.worker
+
+Runs JOB_WORKER_CONCURRENCY job threads against the jobs table. Each thread
+claims the next due job (job_queue.claim_next), executes its handler on a
+fresh session as the job's creator while a heartbeat thread keeps
+heartbeat_at and progress current, then records success or failure. Any
+number of worker processes can run side by side, on any host.
+
+The main thread sweeps every JOB_STALE_SECONDS / 2: stale jobs back to the
+queue, events past EVENTS_RETENTION_SECONDS out of the events table, and
+staged uploads no queued or running job refers to any more.
+
+SIGTERM/SIGINT stop claiming new jobs and let running ones finish.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import socket
+import threading
+import uuid
+from typing import List, Optional
+
+from app.core.config import (
+    JOB_HEARTBEAT_SECONDS,
+    JOB_POLL_SECONDS,
+    JOB_STALE_SECONDS,
+    JOB_WORKER_CONCURRENCY,
+    validate_security_config,
+)
+from app.core.events import prune_events
+from app.services import job_queue
+from app.services.job_handlers import execute_job
+from app.services.job_queue import JobProgress
+from app.services.job_uploads import prune_uploads
+
+logger = logging.getLogger("app.worker")
+
+
+class JobWorker:
+    def __init__(
+        self,
+        session_factory=None,
+        *,
+        concurrency: int = JOB_WORKER_CONCURRENCY,
+        poll_seconds: float = JOB_POLL_SECONDS,
+        heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS,
+        name: Optional[str] = None,
+    ) -> None:
+        if session_factory is None:
+            from app.database import SessionLocal as session_factory
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        for i in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._loop, args=(f"{self.name}/{i}",), name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self.stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_forever(self) -> None:
+        self.start()
+        try:
+            while not self.stopping.wait(JOB_STALE_SECONDS / 2):
+                self._requeue_stale()
+                self._prune_events()
+                self._prune_uploads()
+        finally:
+            self.stop()
+
+    # ── Execution ─────────────────────────────────────────────────────────────
+
+    def _loop(self, worker_id: str) -> None:
+        while not self.stopping.is_set():
+            try:
+                ran = self.run_once(worker_id)
+            except Exception:
+                logger.exception("Job worker loop error", extra={"worker_id": worker_id})
+                ran = False
+            if not ran:
+                self.stopping.wait(self.poll_seconds)
+
+    def run_once(self, worker_id: str) -> bool:
+        """Claim and run one job; False when the queue had nothing due."""
+        db = self.session_factory()
+        try:
+            job = job_queue.claim_next(db, worker_id)
+            if job is None:
+                return False
+            job_id, kind, attempt = job.id, job.kind, job.attempts
+        finally:
+            db.close()
+
+        logger.info("Job started", extra={"job_id": str(job_id), "kind": kind, "attempt": attempt})
+        progress = JobProgress()
+        beat_stop = threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat, args=(job_id, worker_id, progress, beat_stop), daemon=True
+        )
+        beat.start()
+
+        result = None
+        error: Optional[BaseException] = None
+        db = self.session_factory()
+        try:
+            from models.job import Job
+
+            result = execute_job(db, db.get(Job, job_id), progress)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            error = exc
+        finally:
+            db.close()
+            beat_stop.set()
+            beat.join()
+
+        db = self.session_factory()
+        try:
+            if error is None:
+                job_queue.complete(db, job_id, worker_id, result, progress)
+                logger.info("Job succeeded", extra={"job_id": str(job_id), "kind": kind})
+            else:
+                outcome = job_queue.fail(db, job_id, worker_id, error, progress)
+                log = logger.warning if outcome.value == "queued" else logger.error
+                log(
+                    "Job attempt failed",
+                    extra={
+                        "job_id": str(job_id),
+                        "kind": kind,
+                        "attempt": attempt,
+                        "status": outcome.value,
+                        "error": job_queue.error_payload(error)["detail"],
+                    },
+                )
+        finally:
+            db.close()
+        return True
+
+    def _heartbeat(
+        self, job_id: uuid.UUID, worker_id: str, progress: JobProgress, stop: threading.Event
+    ) -> None:
+        while not stop.wait(self.heartbeat_seconds):
+            db = self.session_factory()
+            try:
+                if not job_queue.heartbeat(db, job_id, worker_id, progress):
+                    return
+            except Exception:
+                logger.exception("Job heartbeat failed", extra={"job_id": str(job_id)})
+            finally:
+                db.close()
+
+    def _requeue_stale(self) -> None:
+        db = self.session_factory()
+        try:
+            requeued = job_queue.requeue_stale(db)
+            if requeued:
+                logger.warning("Requeued stale jobs", extra={"job_ids": [str(i) for i in requeued]})
+        except Exception:
+            logger.exception("Stale job sweep failed")
+        finally:
+            db.close()
+
+    def _prune_events(self) -> None:
+        db = self.session_factory()
+        try:
+            prune_events(db)
+        except Exception:
+            logger.exception("Event prune failed")
+        finally:
+            db.close()
+
+    def _prune_uploads(self) -> None:
+        db = self.session_factory()
+        try:
+            prune_uploads(db)
+        except Exception:
+            logger.exception("Job upload prune failed")
+        finally:
+            db.close()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    validate_security_config()
+    worker = JobWorker()
+
+    def _shutdown(signum, frame):
+        logger.info("Job worker stopping", extra={"signal": signum})
+        worker.stopping.set()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+    logger.info("Job worker starting", extra={"worker": worker.name, "concurrency": worker.concurrency})
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
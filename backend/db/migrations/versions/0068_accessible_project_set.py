@@ -0,0 +1,367 @@
+"""Per-transaction accessible-project set for RLS (replaces per-row has_project_access).
+
+Revision ID: 0068
+Revises: 0067
+Create Date: 2026-10-16
+
+Policies from 0029/0064 call is_admin() and has_project_access() once per
+candidate row; each call re-selects users, roles, projects, client_projects
+and project_users. Listing 50k results as a lab tech spent nearly all of its
+time there.
+
+- accessible_project_ids() computes the caller's project ids once per
+  transaction (same rules as 0065) and caches them in transaction-local GUCs
+  (app.accessible_project_ids, keyed by app.accessible_projects_user).
+  NULL means unrestricted (Administrator / System-client users).
+- Statement-level triggers on users, projects, client_projects and
+  project_users clear the cache, so access granted mid-transaction (e.g. bulk
+  accession auto-creating a project) is visible to the next statement.
+- Policies use (SELECT accessible_project_ids()): Postgres evaluates the
+  scalar subquery once per statement as an InitPlan, leaving an index-friendly
+  project_id = ANY($n) instead of a per-row function call.
+- has_project_access(uuid) keeps its signature for app code and delegates to
+  the cached set; samples(project_id) / tests(sample_id) are indexed since 0005.
+"""
+from alembic import op
+
+revision = "0068"
+down_revision = "0067"
+branch_labels = None
+depends_on = None
+
+
+ACCESSIBLE_PROJECT_IDS_FUNCTION = """
+CREATE OR REPLACE FUNCTION accessible_project_ids()
+RETURNS UUID[] AS $$
+DECLARE
+    uid UUID := current_user_id();
+    cached TEXT := current_setting('app.accessible_project_ids', true);
+    ids UUID[];
+    user_client_id UUID;
+    user_role TEXT;
+    system_client_id UUID := '00000000-0000-0000-0000-000000000001'::UUID;
+BEGIN
+    IF cached IS NOT NULL AND cached <> ''
+       AND current_setting('app.accessible_projects_user', true) = uid::TEXT THEN
+        IF cached = '*' THEN
+            RETURN NULL;
+        END IF;
+        RETURN cached::UUID[];
+    END IF;
+
+    SELECT u.client_id, r.name
+      INTO user_client_id, user_role
+      FROM users u
+      JOIN roles r ON r.id = u.role_id
+     WHERE u.id = uid;
+
+    IF user_role = 'Administrator' OR user_client_id = system_client_id THEN
+        ids := NULL;
+    ELSIF user_role = 'Client' THEN
+        -- Client-role portal: client_projects / same client, plus explicit assignment
+        SELECT COALESCE(array_agg(p.id), '{}')
+          INTO ids
+          FROM projects p
+         WHERE (
+                user_client_id IS NOT NULL
+                AND (
+                    p.client_id = user_client_id
+                    OR EXISTS (
+                        SELECT 1 FROM client_projects cp
+                        WHERE cp.id = p.client_project_id
+                          AND cp.client_id = user_client_id
+                    )
+                )
+               )
+            OR EXISTS (
+                SELECT 1 FROM project_users pu
+                WHERE pu.project_id = p.id
+                  AND pu.user_id = uid
+            );
+    ELSE
+        -- Lab Technician / Lab Manager / other: assignment via project_users only
+        SELECT COALESCE(array_agg(pu.project_id), '{}')
+          INTO ids
+          FROM project_users pu
+         WHERE pu.user_id = uid;
+    END IF;
+
+    PERFORM set_config('app.accessible_projects_user', uid::TEXT, true);
+    PERFORM set_config('app.accessible_project_ids', COALESCE(ids::TEXT, '*'), true);
+    RETURN ids;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+INVALIDATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION invalidate_accessible_project_ids()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM set_config('app.accessible_project_ids', '', true);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+HAS_PROJECT_ACCESS_FUNCTION = """
+CREATE OR REPLACE FUNCTION has_project_access(project_uuid UUID)
+RETURNS BOOLEAN AS $$
+DECLARE
+    ids UUID[] := accessible_project_ids();
+BEGIN
+    RETURN ids IS NULL OR project_uuid = ANY(ids);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+# Tables whose changes can alter a user's accessible set
+INVALIDATING_TABLES = ("users", "projects", "client_projects", "project_users")
+
+
+def project_scope(column: str) -> str:
+    """Policy predicate: column is in the caller's accessible set (evaluated once per statement)."""
+    return (
+        f"((SELECT accessible_project_ids()) IS NULL "
+        f"OR {column} = ANY ((SELECT accessible_project_ids())))"
+    )
+
+
+def _samples_exists(alias_predicate: str) -> str:
+    return (
+        "EXISTS (SELECT 1 FROM samples s "
+        f"WHERE {alias_predicate} AND {project_scope('s.project_id')})"
+    )
+
+
+SAMPLE_SCOPE = project_scope("project_id")
+TEST_SCOPE = _samples_exists("s.id = tests.sample_id")
+RESULT_SCOPE = (
+    "EXISTS (SELECT 1 FROM tests t JOIN samples s ON t.sample_id = s.id "
+    f"WHERE t.id = results.test_id AND {project_scope('s.project_id')})"
+)
+BATCH_SCOPE = (
+    "EXISTS (SELECT 1 FROM batch_containers bc "
+    "JOIN contents ct ON bc.container_id = ct.container_id "
+    "JOIN samples s ON ct.sample_id = s.id "
+    f"WHERE bc.batch_id = batches.id AND {project_scope('s.project_id')})"
+)
+CONTAINER_SCOPE = (
+    "EXISTS (SELECT 1 FROM contents c JOIN samples s ON c.sample_id = s.id "
+    f"WHERE c.container_id = containers.id AND {project_scope('s.project_id')})"
+)
+CONTENTS_SCOPE = _samples_exists("s.id = contents.sample_id")
+CREATED_BY_ME = "created_by = (SELECT current_user_id())"
+
+NEW_POLICIES = (
+    ("projects_access", "projects", f"FOR ALL USING ({project_scope('id')})"),
+    ("samples_access", "samples", f"FOR ALL USING ({SAMPLE_SCOPE})"),
+    ("tests_access", "tests", f"FOR ALL USING ({TEST_SCOPE})"),
+    ("results_access", "results", f"FOR ALL USING ({RESULT_SCOPE})"),
+    ("batches_access", "batches", f"FOR ALL USING ({BATCH_SCOPE})"),
+    (
+        "containers_select",
+        "containers",
+        f"FOR SELECT USING ({CREATED_BY_ME} OR {CONTAINER_SCOPE})",
+    ),
+    (
+        "containers_insert",
+        "containers",
+        f"FOR INSERT WITH CHECK ((SELECT is_admin()) OR {CREATED_BY_ME})",
+    ),
+    (
+        "containers_update",
+        "containers",
+        f"FOR UPDATE USING ({CONTAINER_SCOPE}) "
+        f"WITH CHECK ({CREATED_BY_ME} OR {CONTAINER_SCOPE})",
+    ),
+    ("containers_delete", "containers", f"FOR DELETE USING ({CONTAINER_SCOPE})"),
+    (
+        "contents_access",
+        "contents",
+        f"FOR ALL USING ({CONTENTS_SCOPE}) WITH CHECK ({CONTENTS_SCOPE})",
+    ),
+)
+
+
+# Policy bodies from 0029 / 0064 (downgrade)
+def _legacy_exists(joins: str, predicate: str) -> str:
+    return f"EXISTS (SELECT 1 FROM {joins} WHERE {predicate} AND has_project_access(s.project_id))"
+
+
+LEGACY_CONTAINER_SCOPE = _legacy_exists(
+    "contents c JOIN samples s ON c.sample_id = s.id", "c.container_id = containers.id"
+)
+LEGACY_CONTENTS_SCOPE = _legacy_exists("samples s", "s.id = contents.sample_id")
+
+OLD_POLICIES = (
+    ("projects_access", "projects", "FOR ALL USING (is_admin() OR has_project_access(id))"),
+    ("samples_access", "samples", "FOR ALL USING (is_admin() OR has_project_access(project_id))"),
+    (
+        "tests_access",
+        "tests",
+        "FOR ALL USING (is_admin() OR "
+        + _legacy_exists("samples s", "s.id = tests.sample_id") + ")",
+    ),
+    (
+        "results_access",
+        "results",
+        "FOR ALL USING (is_admin() OR "
+        + _legacy_exists("tests t JOIN samples s ON t.sample_id = s.id", "t.id = results.test_id")
+        + ")",
+    ),
+    (
+        "batches_access",
+        "batches",
+        "FOR ALL USING (is_admin() OR "
+        + _legacy_exists(
+            "batch_containers bc JOIN containers c ON bc.container_id = c.id "
+            "JOIN contents ct ON c.id = ct.container_id JOIN samples s ON ct.sample_id = s.id",
+            "bc.batch_id = batches.id",
+        )
+        + ")",
+    ),
+    (
+        "containers_select",
+        "containers",
+        "FOR SELECT USING (is_admin() OR created_by = current_user_id() OR "
+        + LEGACY_CONTAINER_SCOPE + ")",
+    ),
+    (
+        "containers_insert",
+        "containers",
+        "FOR INSERT WITH CHECK (is_admin() OR created_by = current_user_id())",
+    ),
+    (
+        "containers_update",
+        "containers",
+        f"FOR UPDATE USING (is_admin() OR {LEGACY_CONTAINER_SCOPE}) "
+        "WITH CHECK (is_admin() OR created_by = current_user_id() OR "
+        + LEGACY_CONTAINER_SCOPE + ")",
+    ),
+    (
+        "containers_delete",
+        "containers",
+        f"FOR DELETE USING (is_admin() OR {LEGACY_CONTAINER_SCOPE})",
+    ),
+    (
+        "contents_access",
+        "contents",
+        f"FOR ALL USING (is_admin() OR {LEGACY_CONTENTS_SCOPE}) "
+        f"WITH CHECK (is_admin() OR {LEGACY_CONTENTS_SCOPE})",
+    ),
+)
+
+# has_project_access body from 0065 (downgrade)
+OLD_HAS_PROJECT_ACCESS_FUNCTION = """
+CREATE OR REPLACE FUNCTION has_project_access(project_uuid UUID)
+RETURNS BOOLEAN AS $$
+DECLARE
+    project_client_project_id UUID;
+    project_client_id UUID;
+    user_client_id UUID;
+    user_role TEXT;
+    system_client_id UUID;
+BEGIN
+    IF is_admin() THEN
+        RETURN TRUE;
+    END IF;
+
+    system_client_id := '00000000-0000-0000-0000-000000000001'::UUID;
+
+    SELECT u.client_id, r.name
+      INTO user_client_id, user_role
+      FROM users u
+      JOIN roles r ON r.id = u.role_id
+     WHERE u.id = current_user_id();
+
+    -- Org-wide lab employees on System client
+    IF user_client_id = system_client_id THEN
+        RETURN TRUE;
+    END IF;
+
+    SELECT p.client_project_id, p.client_id
+      INTO project_client_project_id, project_client_id
+      FROM projects p
+     WHERE p.id = project_uuid;
+
+    -- Client-role portal: tenant isolation via client_projects / same client
+    IF user_role = 'Client' THEN
+        IF project_client_project_id IS NOT NULL AND user_client_id IS NOT NULL THEN
+            IF EXISTS (
+                SELECT 1 FROM client_projects cp
+                WHERE cp.id = project_client_project_id
+                  AND cp.client_id = user_client_id
+            ) THEN
+                RETURN TRUE;
+            END IF;
+        END IF;
+
+        IF project_client_id IS NOT NULL AND user_client_id IS NOT NULL THEN
+            IF project_client_id = user_client_id THEN
+                RETURN TRUE;
+            END IF;
+        END IF;
+
+        RETURN EXISTS (
+            SELECT 1 FROM project_users pu
+            WHERE pu.project_id = project_uuid
+              AND pu.user_id = current_user_id()
+        );
+    END IF;
+
+    -- Lab Technician / Lab Manager / other: assignment via project_users only
+    RETURN EXISTS (
+        SELECT 1 FROM project_users pu
+        WHERE pu.project_id = project_uuid
+          AND pu.user_id = current_user_id()
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+GRANT_FUNCTIONS = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'lims_app') THEN
+        GRANT EXECUTE ON FUNCTION {functions} TO lims_app;
+    END IF;
+END $$;
+"""
+
+
+def _replace_policies(policies) -> None:
+    for name, table, body in policies:
+        op.execute(f"DROP POLICY IF EXISTS {name} ON {table};")
+        op.execute(f"CREATE POLICY {name} ON {table} {body};")
+
+
+def upgrade() -> None:
+    op.execute(ACCESSIBLE_PROJECT_IDS_FUNCTION)
+    op.execute(INVALIDATE_FUNCTION)
+    op.execute(HAS_PROJECT_ACCESS_FUNCTION)
+    for table in INVALIDATING_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_invalidate_accessible_projects
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION invalidate_accessible_project_ids();
+            """
+        )
+    op.execute(
+        GRANT_FUNCTIONS.format(
+            functions="accessible_project_ids(), has_project_access(UUID)"
+        )
+    )
+
+    _replace_policies(NEW_POLICIES)
+
+
+def downgrade() -> None:
+    _replace_policies(OLD_POLICIES)
+
+    op.execute(OLD_HAS_PROJECT_ACCESS_FUNCTION)
+    op.execute(GRANT_FUNCTIONS.format(functions="has_project_access(UUID)"))
+    for table in INVALIDATING_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_invalidate_accessible_projects ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS invalidate_accessible_project_ids();")
+    op.execute("DROP FUNCTION IF EXISTS accessible_project_ids();")
@@ -0,0 +1,396 @@
+"""Trigger-maintained project_id / client_id on tests, results and contents.
+
+Revision ID: 0069
+Revises: 0068
+Create Date: 2026-10-16
+
+tests, results and contents carry no project, so every RLS check on them (and
+on containers / batches through contents) joined back to samples. 0069 stores
+the owning sample's project_id and that project's client_id on each row and
+rewrites the policies to filter on the local column:
+
+- BEFORE INSERT / UPDATE OF sample_id (tests, contents) or test_id (results)
+  triggers fill the columns from the parent row.
+- Moving a sample to another project cascades to its tests, contents and
+  results; changing a project's client cascades client_id.
+- A trailing BEFORE UPDATE trigger keeps modified_at when only these derived
+  columns change, so backfill and cascades don't look like user edits.
+- Backfill runs outside the migration transaction in keyset batches of
+  BACKFILL_BATCH_SIZE (each batch commits), walking a temporary partial index
+  on the rows still to fill, and the composite indexes are built
+  CONCURRENTLY, so no long-held locks on large tables.
+
+batch_containers is not denormalized: a container can hold samples from
+several projects, so batches_access goes through contents.project_id.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+
+revision = "0069"
+down_revision = "0068"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+SCOPED_TABLES = ("tests", "results", "contents")
+
+INDEXES = (
+    ("idx_tests_project_id_sample_id", "tests", "project_id, sample_id"),
+    ("idx_results_project_id_test_id", "results", "project_id, test_id"),
+    ("idx_contents_project_id_container_id", "contents", "project_id, container_id"),
+    ("idx_contents_container_id_project_id", "contents", "container_id, project_id"),
+)
+
+FILL_FROM_SAMPLE_FUNCTION = """
+CREATE OR REPLACE FUNCTION fill_scope_from_sample()
+RETURNS TRIGGER AS $$
+BEGIN
+    SELECT s.project_id, p.client_id
+      INTO NEW.project_id, NEW.client_id
+      FROM samples s
+      JOIN projects p ON p.id = s.project_id
+     WHERE s.id = NEW.sample_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+FILL_FROM_TEST_FUNCTION = """
+CREATE OR REPLACE FUNCTION fill_scope_from_test()
+RETURNS TRIGGER AS $$
+BEGIN
+    SELECT t.project_id, t.client_id
+      INTO NEW.project_id, NEW.client_id
+      FROM tests t
+     WHERE t.id = NEW.test_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+CASCADE_SAMPLE_FUNCTION = """
+CREATE OR REPLACE FUNCTION cascade_sample_scope()
+RETURNS TRIGGER AS $$
+DECLARE
+    new_client_id UUID;
+BEGIN
+    SELECT p.client_id INTO new_client_id FROM projects p WHERE p.id = NEW.project_id;
+    UPDATE tests SET project_id = NEW.project_id, client_id = new_client_id
+     WHERE sample_id = NEW.id;
+    UPDATE contents SET project_id = NEW.project_id, client_id = new_client_id
+     WHERE sample_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+CASCADE_TEST_FUNCTION = """
+CREATE OR REPLACE FUNCTION cascade_test_scope()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE results SET project_id = NEW.project_id, client_id = NEW.client_id
+     WHERE test_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+CASCADE_PROJECT_CLIENT_FUNCTION = """
+CREATE OR REPLACE FUNCTION cascade_project_client()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE tests SET client_id = NEW.client_id WHERE project_id = NEW.id;
+    UPDATE results SET client_id = NEW.client_id WHERE project_id = NEW.id;
+    UPDATE contents SET client_id = NEW.client_id WHERE project_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+"""
+
+# Compares the row minus the derived and audit columns
+KEEP_MODIFIED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION keep_modified_at_for_scope_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF to_jsonb(NEW) - 'project_id' - 'client_id' - 'modified_at'
+       = to_jsonb(OLD) - 'project_id' - 'client_id' - 'modified_at' THEN
+        NEW.modified_at := OLD.modified_at;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+FUNCTIONS = (
+    FILL_FROM_SAMPLE_FUNCTION,
+    FILL_FROM_TEST_FUNCTION,
+    CASCADE_SAMPLE_FUNCTION,
+    CASCADE_TEST_FUNCTION,
+    CASCADE_PROJECT_CLIENT_FUNCTION,
+    KEEP_MODIFIED_AT_FUNCTION,
+)
+
+TRIGGERS = (
+    (
+        "tests_fill_scope", "tests",
+        "BEFORE INSERT OR UPDATE OF sample_id ON tests FOR EACH ROW "
+        "EXECUTE FUNCTION fill_scope_from_sample()",
+    ),
+    (
+        "contents_fill_scope", "contents",
+        "BEFORE INSERT OR UPDATE OF sample_id ON contents FOR EACH ROW "
+        "EXECUTE FUNCTION fill_scope_from_sample()",
+    ),
+    (
+        "results_fill_scope", "results",
+        "BEFORE INSERT OR UPDATE OF test_id ON results FOR EACH ROW "
+        "EXECUTE FUNCTION fill_scope_from_test()",
+    ),
+    (
+        "samples_cascade_scope", "samples",
+        "AFTER UPDATE OF project_id ON samples FOR EACH ROW "
+        "WHEN (OLD.project_id IS DISTINCT FROM NEW.project_id) "
+        "EXECUTE FUNCTION cascade_sample_scope()",
+    ),
+    # OLD.project_id IS NULL only during backfill, which fills results itself
+    (
+        "tests_cascade_scope", "tests",
+        "AFTER UPDATE OF project_id ON tests FOR EACH ROW "
+        "WHEN (OLD.project_id IS NOT NULL AND OLD.project_id IS DISTINCT FROM NEW.project_id) "
+        "EXECUTE FUNCTION cascade_test_scope()",
+    ),
+    (
+        "projects_cascade_client", "projects",
+        "AFTER UPDATE OF client_id ON projects FOR EACH ROW "
+        "WHEN (OLD.client_id IS DISTINCT FROM NEW.client_id) "
+        "EXECUTE FUNCTION cascade_project_client()",
+    ),
+    # Same-event triggers fire in name order: must sort after *_update_modified_at (0002)
+    (
+        "tests_update_scope_keep_modified_at", "tests",
+        "BEFORE UPDATE OF project_id, client_id ON tests FOR EACH ROW "
+        "EXECUTE FUNCTION keep_modified_at_for_scope_update()",
+    ),
+    (
+        "results_update_scope_keep_modified_at", "results",
+        "BEFORE UPDATE OF project_id, client_id ON results FOR EACH ROW "
+        "EXECUTE FUNCTION keep_modified_at_for_scope_update()",
+    ),
+)
+
+BACKFILLS = (
+    (
+        "tests",
+        "id",
+        """
+        UPDATE tests t
+           SET project_id = s.project_id, client_id = p.client_id
+          FROM samples s JOIN projects p ON p.id = s.project_id
+         WHERE t.sample_id = s.id AND t.id = ANY(CAST(:keys AS uuid[]))
+        """,
+    ),
+    (
+        "results",
+        "id",
+        """
+        UPDATE results r
+           SET project_id = t.project_id, client_id = t.client_id
+          FROM tests t
+         WHERE r.test_id = t.id AND r.id = ANY(CAST(:keys AS uuid[]))
+        """,
+    ),
+    (
+        "contents",
+        "sample_id",
+        """
+        UPDATE contents c
+           SET project_id = s.project_id, client_id = p.client_id
+          FROM samples s JOIN projects p ON p.id = s.project_id
+         WHERE c.sample_id = s.id AND c.sample_id = ANY(CAST(:keys AS uuid[]))
+        """,
+    ),
+)
+
+
+def project_scope(column: str) -> str:
+    """Policy predicate: column is in the caller's accessible set (0068)."""
+    return (
+        f"((SELECT accessible_project_ids()) IS NULL "
+        f"OR {column} = ANY ((SELECT accessible_project_ids())))"
+    )
+
+
+CONTAINER_SCOPE = (
+    "EXISTS (SELECT 1 FROM contents c "
+    f"WHERE c.container_id = containers.id AND {project_scope('c.project_id')})"
+)
+BATCH_SCOPE = (
+    "EXISTS (SELECT 1 FROM batch_containers bc "
+    "JOIN contents ct ON ct.container_id = bc.container_id "
+    f"WHERE bc.batch_id = batches.id AND {project_scope('ct.project_id')})"
+)
+CREATED_BY_ME = "created_by = (SELECT current_user_id())"
+
+NEW_POLICIES = (
+    ("tests_access", "tests", f"FOR ALL USING ({project_scope('project_id')})"),
+    ("results_access", "results", f"FOR ALL USING ({project_scope('project_id')})"),
+    ("batches_access", "batches", f"FOR ALL USING ({BATCH_SCOPE})"),
+    (
+        "containers_select",
+        "containers",
+        f"FOR SELECT USING ({CREATED_BY_ME} OR {CONTAINER_SCOPE})",
+    ),
+    (
+        "containers_update",
+        "containers",
+        f"FOR UPDATE USING ({CONTAINER_SCOPE}) "
+        f"WITH CHECK ({CREATED_BY_ME} OR {CONTAINER_SCOPE})",
+    ),
+    ("containers_delete", "containers", f"FOR DELETE USING ({CONTAINER_SCOPE})"),
+    (
+        "contents_access",
+        "contents",
+        f"FOR ALL USING ({project_scope('project_id')}) "
+        f"WITH CHECK ({project_scope('project_id')})",
+    ),
+)
+
+
+# Policy bodies from 0068 (downgrade)
+def _sample_exists(predicate: str, joins: str = "samples s") -> str:
+    return f"EXISTS (SELECT 1 FROM {joins} WHERE {predicate} AND {project_scope('s.project_id')})"
+
+
+OLD_CONTAINER_SCOPE = _sample_exists(
+    "c.container_id = containers.id", "contents c JOIN samples s ON c.sample_id = s.id"
+)
+OLD_CONTENTS_SCOPE = _sample_exists("s.id = contents.sample_id")
+
+OLD_POLICIES = (
+    ("tests_access", "tests", f"FOR ALL USING ({_sample_exists('s.id = tests.sample_id')})"),
+    (
+        "results_access",
+        "results",
+        "FOR ALL USING ("
+        + _sample_exists("t.id = results.test_id", "tests t JOIN samples s ON t.sample_id = s.id")
+        + ")",
+    ),
+    (
+        "batches_access",
+        "batches",
+        "FOR ALL USING ("
+        + _sample_exists(
+            "bc.batch_id = batches.id",
+            "batch_containers bc JOIN contents ct ON bc.container_id = ct.container_id "
+            "JOIN samples s ON ct.sample_id = s.id",
+        )
+        + ")",
+    ),
+    (
+        "containers_select",
+        "containers",
+        f"FOR SELECT USING ({CREATED_BY_ME} OR {OLD_CONTAINER_SCOPE})",
+    ),
+    (
+        "containers_update",
+        "containers",
+        f"FOR UPDATE USING ({OLD_CONTAINER_SCOPE}) "
+        f"WITH CHECK ({CREATED_BY_ME} OR {OLD_CONTAINER_SCOPE})",
+    ),
+    ("containers_delete", "containers", f"FOR DELETE USING ({OLD_CONTAINER_SCOPE})"),
+    (
+        "contents_access",
+        "contents",
+        f"FOR ALL USING ({OLD_CONTENTS_SCOPE}) WITH CHECK ({OLD_CONTENTS_SCOPE})",
+    ),
+)
+
+
+def _replace_policies(policies) -> None:
+    for name, table, body in policies:
+        op.execute(f"DROP POLICY IF EXISTS {name} ON {table};")
+        op.execute(f"CREATE POLICY {name} ON {table} {body};")
+
+
+def _backfill(conn, table: str, key: str, update_sql: str) -> None:
+    """
+    Keyset-walk table by key, updating BACKFILL_BATCH_SIZE keys per statement.
+
+    A temporary partial index on key over the rows still to fill lets each
+    batch start where the last one stopped instead of rescanning the table.
+    """
+    index = f"tmp_{table}_{key}_scope_backfill"
+    conn.execute(
+        sa.text(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} "
+            f"ON {table} ({key}) WHERE project_id IS NULL"
+        )
+    )
+    try:
+        _backfill_batches(conn, table, key, update_sql)
+    finally:
+        conn.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {index}"))
+
+
+def _backfill_batches(conn, table: str, key: str, update_sql: str) -> None:
+    next_keys = sa.text(
+        f"SELECT DISTINCT {key} FROM {table} "
+        f"WHERE project_id IS NULL AND {key} > :after ORDER BY {key} LIMIT :n"
+    )
+    update = sa.text(update_sql)
+    after = "00000000-0000-0000-0000-000000000000"
+    while True:
+        keys = [str(k) for k in conn.execute(next_keys, {"after": after, "n": BACKFILL_BATCH_SIZE}).scalars()]
+        if not keys:
+            return
+        # autocommit_block: each batch UPDATE commits on its own
+        conn.execute(update, {"keys": keys})
+        after = keys[-1]
+
+
+def upgrade() -> None:
+    for table in SCOPED_TABLES:
+        op.add_column(
+            table,
+            sa.Column("project_id", PostgresUUID(as_uuid=True), sa.ForeignKey("projects.id"), nullable=True),
+        )
+        op.add_column(
+            table,
+            sa.Column("client_id", PostgresUUID(as_uuid=True), sa.ForeignKey("clients.id"), nullable=True),
+        )
+
+    # Triggers first, so rows written during the backfill are already filled
+    for function in FUNCTIONS:
+        op.execute(function)
+    for name, table, body in TRIGGERS:
+        op.execute(f"CREATE TRIGGER {name} {body};")
+
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        for table, key, update_sql in BACKFILLS:
+            _backfill(conn, table, key, update_sql)
+        for name, table, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+    _replace_policies(NEW_POLICIES)
+
+
+def downgrade() -> None:
+    _replace_policies(OLD_POLICIES)
+
+    for name, table, _body in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS keep_modified_at_for_scope_update();")
+    op.execute("DROP FUNCTION IF EXISTS cascade_project_client();")
+    op.execute("DROP FUNCTION IF EXISTS cascade_test_scope();")
+    op.execute("DROP FUNCTION IF EXISTS cascade_sample_scope();")
+    op.execute("DROP FUNCTION IF EXISTS fill_scope_from_test();")
+    op.execute("DROP FUNCTION IF EXISTS fill_scope_from_sample();")
+
+    for name, _table, _columns in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for table in SCOPED_TABLES:
+        op.drop_column(table, "client_id")
+        op.drop_column(table, "project_id")
@@ -0,0 +1,42 @@
+"""Partial indexes for the SQL-side GET /samples/eligible query.
+
+Revision ID: 0070
+Revises: 0069
+Create Date: 2026-10-16
+
+The eligible-samples query aggregates min(analyses.shelf_life) over each
+sample's active, open tests and pages over active samples. Expiration depends
+on that aggregate and on now(), so it can't be an expression index; instead:
+
+- tests (sample_id) INCLUDE (analysis_id, status) WHERE active lets the
+  shelf-life aggregate and the test_ids EXISTS filter run index-only.
+- samples (project_id) WHERE active covers the ?project_id= filter.
+
+Both are built CONCURRENTLY outside the migration transaction.
+"""
+from alembic import op
+
+revision = "0070"
+down_revision = "0069"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    (
+        "idx_tests_active_sample_id_open",
+        "tests (sample_id) INCLUDE (analysis_id, status) WHERE active",
+    ),
+    ("idx_samples_active_project_id", "samples (project_id) WHERE active"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _definition in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
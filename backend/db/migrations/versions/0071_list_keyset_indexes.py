@@ -0,0 +1,40 @@
+"""Sort-key indexes for keyset pagination on list endpoints.
+
+Revision ID: 0071
+Revises: 0070
+Create Date: 2026-10-16
+
+GET /samples, /tests, /results/ and /batches now order by (created_at, id)
+and GET /help by (section, created_at, id), so both OFFSET pages and
+?cursor= row-value comparisons can walk an index instead of sorting the
+filtered set. /projects orders by (name, id) and is already covered by the
+unique index on name.
+
+Built CONCURRENTLY outside the migration transaction.
+"""
+from alembic import op
+
+revision = "0071"
+down_revision = "0070"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("idx_samples_created_at_id", "samples", "created_at, id"),
+    ("idx_tests_created_at_id", "tests", "created_at, id"),
+    ("idx_results_created_at_id", "results", "created_at, id"),
+    ("idx_batches_created_at_id", "batches", "created_at, id"),
+    ("idx_help_entries_section_created_at_id", "help_entries", "section, created_at, id"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _columns in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
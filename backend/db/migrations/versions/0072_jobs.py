@@ -0,0 +1,103 @@
+"""Durable job queue: jobs table.
+
+Revision ID: 0072
+Revises: 0071
+Create Date: 2026-10-17
+
+Long-running work (dose-response fits, run publish/promotion, SOP extraction)
+is queued here and executed by `python -m app.worker` processes, which claim
+rows with SELECT ... FOR UPDATE SKIP LOCKED.
+
+Like login_throttle and revoked_tokens this is an infrastructure table with
+no RLS: workers dequeue across every tenant, then run each job under its
+creator's RLS context. The API only exposes a job to its creator (or an
+Administrator).
+
+  - ix_jobs_dequeue: partial index matching the claim ORDER BY
+  - ix_jobs_running_client: per-tenant running counts (concurrency limit)
+  - uq_jobs_active_dedupe_key: at most one queued/running job per key
+    (e.g. one fit per run)
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0072"
+down_revision = "0071"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TYPE job_status AS ENUM (
+            'queued', 'running', 'succeeded', 'failed'
+        );
+    """)
+    op.create_table(
+        "jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("kind", sa.String(64), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column(
+            "status",
+            postgresql.ENUM("queued", "running", "succeeded", "failed", name="job_status", create_type=False),
+            nullable=False,
+            server_default="queued",
+        ),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("dedupe_key", sa.String(255), nullable=True),
+        # Retry with backoff
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("run_after", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        # Execution
+        sa.Column("worker_id", sa.String(255), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("progress_current", sa.Integer(), nullable=True),
+        sa.Column("progress_total", sa.Integer(), nullable=True),
+        sa.Column("progress_message", sa.Text(), nullable=True),
+        sa.Column("result", postgresql.JSONB(), nullable=True),
+        sa.Column("error", postgresql.JSONB(), nullable=True),
+        # Tenant + audit
+        sa.Column("client_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"]),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("""
+        CREATE INDEX ix_jobs_dequeue ON jobs (priority DESC, run_after, created_at)
+        WHERE status = 'queued';
+    """)
+    op.execute("""
+        CREATE INDEX ix_jobs_running_client ON jobs (client_id)
+        WHERE status = 'running';
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX uq_jobs_active_dedupe_key ON jobs (dedupe_key)
+        WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running');
+    """)
+    op.create_index("ix_jobs_created_by", "jobs", ["created_by"])
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'lims_app') THEN
+                GRANT SELECT, INSERT, UPDATE, DELETE ON jobs TO lims_app;
+            END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_created_by", table_name="jobs")
+    op.execute("DROP INDEX IF EXISTS uq_jobs_active_dedupe_key;")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_running_client;")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_dequeue;")
+    op.drop_table("jobs")
+    op.execute("DROP TYPE IF EXISTS job_status;")
@@ -0,0 +1,53 @@
+"""Server-sent events log: events table.
+
+Revision ID: 0073
+Revises: 0072
+Create Date: 2026-10-17
+
+Progress events for jobs, fits, imports, promotions and SOP parses
+(app/core/events.py). Each row is written in the publishing transaction
+together with a pg_notify on the lims_events channel, so every API worker's
+broker sees it once it commits. GET /v1/events streams live notifications
+and replays rows after Last-Event-ID on reconnect; the job worker prunes rows
+older than EVENTS_RETENTION_SECONDS.
+
+No RLS, like jobs: rows carry only ids and status, and the stream filters
+them per caller by user_id / client_id.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0073"
+down_revision = "0072"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "events",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("type", sa.String(32), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("client_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("data", postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_events_created_at", "events", ["created_at"])
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'lims_app') THEN
+                GRANT SELECT, INSERT, DELETE ON events TO lims_app;
+            END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_created_at", table_name="events")
+    op.drop_table("events")
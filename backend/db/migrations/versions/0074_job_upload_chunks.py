@@ -0,0 +1,49 @@
+"""Files handed to queued jobs: job_upload_chunks table.
+
+Revision ID: 0074
+Revises: 0073
+Create Date: 2026-10-17
+
+POST /v1/lims-runs/{id}/import-file used to parse the upload inline. It now
+stores the file here, in JOB_UPLOAD_CHUNK_BYTES pieces ordered by seq, in the
+same transaction that queues the lims_run.import job, so a worker on any host
+can stream it back (app/services/job_uploads.py). Retries read the same
+chunks; the job worker sweep deletes them once their job is no longer queued
+or running.
+
+No RLS, like jobs: an upload is only reachable through its job's payload, and
+the job runs under its creator's RLS context.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0074"
+down_revision = "0073"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_upload_chunks",
+        sa.Column("upload_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.PrimaryKeyConstraint("upload_id", "seq"),
+    )
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'lims_app') THEN
+                GRANT SELECT, INSERT, DELETE ON job_upload_chunks TO lims_app;
+            END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_upload_chunks")
@@ -70,3 +70,8 @@ from .entry import (
 from .dose_response import DoseResponseResult, LimsRunDataExclusion
 from .template_well import TemplateWellDefinition
 
+# Durable job queue (python -m app.worker)
+from .job import Job, JobStatus, JobUploadChunk
+
+# Server-sent events log (GET /v1/events)
+from .event import Event
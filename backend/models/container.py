@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Numeric, Integer, Table
+from sqlalchemy import Column, String, DateTime, FetchedValue, ForeignKey, Boolean, Numeric, Integer, Table
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -51,6 +51,15 @@ class Contents(Base):
     concentration_units = Column(PostgresUUID(as_uuid=True), ForeignKey('units.id'), nullable=True)
     amount = Column(Numeric(15, 6), nullable=True)
     amount_units = Column(PostgresUUID(as_uuid=True), ForeignKey('units.id'), nullable=True)
+    # Owning sample's project and that project's client, maintained by DB triggers (0069)
+    project_id = Column(
+        PostgresUUID(as_uuid=True), ForeignKey('projects.id'), nullable=True,
+        server_default=FetchedValue(), server_onupdate=FetchedValue(),
+    )
+    client_id = Column(
+        PostgresUUID(as_uuid=True), ForeignKey('clients.id'), nullable=True,
+        server_default=FetchedValue(), server_onupdate=FetchedValue(),
+    )
     
     # Relationships
     container = relationship("Container", back_populates="contents")
@@ -0,0 +1,24 @@
+"""
+Server-sent events log (app/core/events.py, stream: GET /v1/events).
+
+Rows are short-lived: they exist so a reconnecting client can replay what it
+missed (Last-Event-ID), and are pruned after EVENTS_RETENTION_SECONDS.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Identity, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PostgresUUID
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class Event(Base):
+    __tablename__ = "events"
+
+    # Monotonic; doubles as the SSE event id
+    id = Column(BigInteger, Identity(), primary_key=True)
+    type = Column(String(32), nullable=False)  # job | fit | import | promotion | sop_parse
+    # Visibility: the user, anyone in the client, or (both null) administrators only
+    user_id = Column(PostgresUUID(as_uuid=True), nullable=True)
+    client_id = Column(PostgresUUID(as_uuid=True), nullable=True)
+    data = Column(JSONB, nullable=False, default=dict)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
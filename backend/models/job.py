@@ -0,0 +1,86 @@
+"""
+Durable job queue (app/services/job_queue.py, worker: python -m app.worker).
+
+Status lifecycle:
+    queued ──► running ──► succeeded
+      ▲           │
+      └───────────┤  retryable failure with attempts left (run_after = backoff)
+                  └──► failed
+"""
+import enum
+import uuid
+
+from sqlalchemy import Column, DateTime, Enum as SAEnum, ForeignKey, Index, Integer, LargeBinary, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PostgresUUID
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index(
+            "ix_jobs_dequeue", text("priority DESC"), "run_after", "created_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index("ix_jobs_running_client", "client_id", postgresql_where=text("status = 'running'")),
+        Index(
+            "uq_jobs_active_dedupe_key", "dedupe_key", unique=True,
+            postgresql_where=text("dedupe_key IS NOT NULL AND status IN ('queued', 'running')"),
+        ),
+    )
+
+    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(64), nullable=False)  # key of app.services.job_handlers.JOB_HANDLERS
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(
+        SAEnum(JobStatus, name="job_status"),
+        nullable=False,
+        default=JobStatus.queued,
+    )
+    priority = Column(Integer, nullable=False, default=0)  # higher runs first
+    # At most one queued/running job per key (e.g. "dose_response.fit:<run_id>")
+    dedupe_key = Column(String(255), nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    worker_id = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    progress_current = Column(Integer, nullable=True)
+    progress_total = Column(Integer, nullable=True)
+    progress_message = Column(Text, nullable=True)
+    result = Column(JSONB, nullable=True)
+    error = Column(JSONB, nullable=True)  # {"status_code": int, "detail": ...}
+
+    # Tenant for per-client concurrency limits; jobs run under created_by's RLS context
+    client_id = Column(PostgresUUID(as_uuid=True), ForeignKey("clients.id"), nullable=True)
+    created_by = Column(PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class JobUploadChunk(Base):
+    """
+    A file handed to a job (e.g. a lims_run.import upload), stored in order in
+    JOB_UPLOAD_CHUNK_BYTES pieces so a worker on any host can stream it back
+    (app/services/job_uploads.py). Rows are staged in the enqueueing
+    transaction and deleted once no queued/running job references upload_id.
+    """
+
+    __tablename__ = "job_upload_chunks"
+
+    upload_id = Column(PostgresUUID(as_uuid=True), primary_key=True)
+    seq = Column(Integer, primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,6 +1,6 @@
 """Result model — instance of an analyte value on a test (not a named entity)."""
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Integer, Text
+from sqlalchemy import Column, String, DateTime, FetchedValue, ForeignKey, Boolean, Integer, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -15,6 +15,10 @@ class Result(Base):
     Identity for promote conflicts: (test_id, analyte_id, replicate) + lims_run_id ownership.
     """
     __tablename__ = 'results'
+    __table_args__ = (
+        # Conflict identity (migration 0053); target of ON CONFLICT upserts
+        UniqueConstraint('test_id', 'analyte_id', 'replicate', name='uq_results_test_analyte_replicate'),
+    )
 
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     description = Column(Text, nullable=True)
@@ -43,6 +47,15 @@ class Result(Base):
     )
     # Distinguishes multi-row same analyte (default 1; order-based if import has no replicate)
     replicate = Column(Integer, nullable=False, server_default='1', default=1)
+    # Owning sample's project and that project's client, maintained by DB triggers (0069)
+    project_id = Column(
+        PostgresUUID(as_uuid=True), ForeignKey('projects.id'), nullable=True,
+        server_default=FetchedValue(), server_onupdate=FetchedValue(),
+    )
+    client_id = Column(
+        PostgresUUID(as_uuid=True), ForeignKey('clients.id'), nullable=True,
+        server_default=FetchedValue(), server_onupdate=FetchedValue(),
+    )
 
     # Relationships
     test = relationship("Test", back_populates="results")
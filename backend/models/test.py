@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, DateTime, FetchedValue, ForeignKey, Boolean
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,6 +16,15 @@ class Test(BaseModel):
     test_date = Column(DateTime)
     technician_id = Column(PostgresUUID(as_uuid=True), ForeignKey('users.id'))
     custom_attributes = Column(JSONB, nullable=True, server_default='{}')
+    # Owning sample's project and that project's client, maintained by DB triggers (0069)
+    project_id = Column(
+        PostgresUUID(as_uuid=True), ForeignKey('projects.id'), nullable=True,
+        server_default=FetchedValue(), server_onupdate=FetchedValue(),
+    )
+    client_id = Column(
+        PostgresUUID(as_uuid=True), ForeignKey('clients.id'), nullable=True,
+        server_default=FetchedValue(), server_onupdate=FetchedValue(),
+    )
     
     # Relationships
     sample = relationship("Sample", back_populates="tests")
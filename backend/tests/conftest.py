@@ -8,6 +8,8 @@ import os
 os.environ.setdefault("ENVIRONMENT", "test")
 os.environ.setdefault("ALLOW_INSECURE_DEFAULTS", "true")
 os.environ.setdefault("SECRET_KEY", "pytest-secret-key-not-for-production")
+# The app engine isn't the test container; invalidation is exercised directly
+os.environ.setdefault("REFERENCE_CACHE_LISTEN", "false")
 
 import pytest
 from fastapi.testclient import TestClient
@@ -17,6 +19,8 @@ from testcontainers.postgres import PostgresContainer
 
 from app.main import app
 from app.database import get_db
+from app.core.auth_cache import invalidate_all as invalidate_auth_cache
+from app.core.reference_cache import reference_cache
 from models.base import Base
 from models.user import User, Role, Permission, role_permissions
 from models.client import Client
@@ -29,6 +33,31 @@ import models  # noqa: F401
 POSTGRES_IMAGE = "postgres:15"
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="also run wall-clock benchmarks (@pytest.mark.benchmark)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: wall-clock timing comparison; skipped unless --benchmark"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Timings depend on the machine, so benchmarks stay out of the default run."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="wall-clock benchmark; run with --benchmark")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
+
+
 @pytest.fixture(scope="session")
 def pg_container():
     """Start a PostgreSQL 15 container once per test session."""
@@ -142,6 +171,14 @@ def db_session(db_engine):
     connection.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_reference_cache():
+    """Reference data is loaded inside each test's rolled-back transaction; never reuse it."""
+    reference_cache.invalidate()
+    yield
+    reference_cache.invalidate()
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """FastAPI test client with DB session override."""
@@ -152,9 +189,27 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # Per-process auth cache would otherwise leak user/role snapshots across tests
+    invalidate_auth_cache()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    invalidate_auth_cache()
+
+
+@pytest.fixture(scope="function")
+def run_job(db_session):
+    """Run the job behind a 202 response in-test, as the worker would; returns job.result."""
+    from uuid import UUID
+    from app.services.job_handlers import execute_job
+    from models.job import Job
+
+    def _run(response):
+        assert response.status_code == 202, response.text
+        job = db_session.get(Job, UUID(response.json()["id"]))
+        return execute_job(db_session, job)
+
+    return _run
 
 
 @pytest.fixture(scope="function")
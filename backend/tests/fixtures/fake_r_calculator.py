@@ -0,0 +1,96 @@
+"""Local stand-in for the r-calculator Plumber service (GET /health, POST /fit).
+
+Like Plumber it fits one request at a time, taking delay_per_compound seconds
+per compound, so wall-time comparisons across instances are meaningful.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_fit_result(compound):
+    return {
+        "sample_id": compound["sample_id"],
+        "success": True,
+        "potency": 100.0,
+        "potency_type": "IC50",
+        "hill_slope": -1.0,
+        "top": 100.0,
+        "bottom": 0.0,
+        "r_squared": 0.99,
+        "ci_low_95": 90.0,
+        "ci_high_95": 110.0,
+        "ci_method": "vcov",
+        "curve_category": "SIGMOID",
+        "quality_flag": "valid",
+        "thumbnail_svg": None,
+        "error": None,
+    }
+
+
+class FakeRCalculator:
+    def __init__(self, delay_per_compound=0.0):
+        self.delay_per_compound = delay_per_compound
+        self.fail_next = 0        # answer this many /fit requests with 500
+        self.hang_next = 0.0      # stall the next /fit request this many seconds
+        self.connections = 0
+        self.fit_batches = []     # sample_ids per /fit request, in arrival order
+        self._busy = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                fake.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._reply(200, {"status": "ok", "drc_version": "fake", "r_version": "fake"})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                compounds = body["compounds"]
+                with fake._busy:
+                    if fake.hang_next:
+                        hang, fake.hang_next = fake.hang_next, 0.0
+                        time.sleep(hang)
+                    if fake.fail_next:
+                        fake.fail_next -= 1
+                        self._reply(500, {"error": "fake failure"})
+                        return
+                    fake.fit_batches.append([c["sample_id"] for c in compounds])
+                    time.sleep(fake.delay_per_compound * len(compounds))
+                self._reply(200, [fake_fit_result(c) for c in compounds])
+
+        return Handler
@@ -207,6 +207,92 @@ class TestAliquotPlanExecute:
         assert body["success_count"] == 1
         assert body["results"][0]["transfer_amount"] == 20.0
 
+    def _seed_volume_units(self, db_session):
+        """mL / g/L / mg units of fresh volume, concentration and mass types."""
+        from app.core.reference_cache import reference_cache
+        from models.list import List, ListEntry
+        from models.unit import Unit
+
+        types_list = List(name=f"unit_types_{uuid4().hex[:6]}")
+        db_session.add(types_list)
+        db_session.flush()
+        types = {}
+        for name in ("volume", "concentration", "mass"):
+            types[name] = ListEntry(list_id=types_list.id, name=name)
+            db_session.add(types[name])
+        db_session.flush()
+        units = {}
+        for name, multiplier, type_name in (
+            ("mL", "0.001", "volume"),
+            ("g/L", "1", "concentration"),
+            ("mg", "0.001", "mass"),
+        ):
+            units[name] = Unit(
+                name=f"{name}-{uuid4().hex[:6]}",
+                multiplier=Decimal(multiplier),
+                type=types[type_name].id,
+            )
+            db_session.add(units[name])
+        db_session.commit()
+        # Seeded behind the admin routers' backs; drop cached lists/units
+        reference_cache.invalidate()
+        return units
+
+    def _dry_run_by_volume(self, client, auth_headers, entry_id, sample, tube, ctype, units, **extra):
+        # 2 mL × 10 g/L
+        line = {
+            "method": "by_volume",
+            "source_sample_id": str(sample.id),
+            "source_container_id": str(tube.id),
+            "volume": 2,
+            "volume_unit_id": str(units["mL"].id),
+            "concentration": 10,
+            "concentration_unit_id": str(units["g/L"].id),
+            "dest_container_type_id": str(ctype.id),
+            **extra,
+        }
+        r = client.post(
+            f"/v1/entries/{entry_id}/execute",
+            json={"dry_run": True, "lines": [line]},
+            headers=auth_headers,
+        )
+        assert r.status_code == 200, r.text
+        return r.json()["results"][0]
+
+    def test_method_resolve_by_volume_converts_units(
+        self, client, auth_headers, plan_entry, db_session, test_admin_user, test_org
+    ):
+        exp_id = plan_entry["experiment"]["id"]
+        sample, tube, ctype = self._seed_sample_with_content(
+            db_session, test_admin_user, test_org, experiment_id=exp_id
+        )
+        units = self._seed_volume_units(db_session)
+
+        # 2 mL × 10 g/L = 0.02 g = 20 mg
+        result = self._dry_run_by_volume(
+            client, auth_headers, plan_entry["entry"]["id"], sample, tube, ctype, units,
+            amount_unit_id=str(units["mg"].id),
+        )
+        assert result["status"] == "dry_run"
+        assert result["transfer_amount"] == pytest.approx(20.0)
+        assert result["amount_unit_id"] == str(units["mg"].id)
+
+    def test_method_resolve_by_volume_requires_amount_unit(
+        self, client, auth_headers, plan_entry, db_session, test_admin_user, test_org
+    ):
+        """No fallback base mass unit: several mass units (g, cfu) have multiplier 1"""
+        exp_id = plan_entry["experiment"]["id"]
+        sample, tube, ctype = self._seed_sample_with_content(
+            db_session, test_admin_user, test_org, experiment_id=exp_id
+        )
+        units = self._seed_volume_units(db_session)
+
+        result = self._dry_run_by_volume(
+            client, auth_headers, plan_entry["entry"]["id"], sample, tube, ctype, units
+        )
+        assert result["status"] == "error"
+        assert "amount_unit_id is required" in result["message"]
+
     def test_execute_by_mass_reduces_source(
         self, client, auth_headers, plan_entry, db_session, test_admin_user, test_org
     ):
@@ -0,0 +1,117 @@
+"""
+Per-process auth context cache and jti denylist Bloom filter.
+"""
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.auth_cache import AuthContextCache, BloomFilter, JtiDenylist
+
+
+class TestBloomFilter:
+    def test_added_items_are_members(self):
+        bloom = BloomFilter(capacity=100)
+        jtis = [str(uuid.uuid4()) for _ in range(100)]
+        for jti in jtis:
+            bloom.add(jti)
+        assert all(jti in bloom for jti in jtis)
+
+    def test_false_positive_rate_is_bounded(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for _ in range(1000):
+            bloom.add(str(uuid.uuid4()))
+        hits = sum(str(uuid.uuid4()) in bloom for _ in range(5000))
+        assert hits < 5000 * 0.05
+
+
+class TestAuthContextCache:
+    def test_permissions_round_trip_and_role_invalidation(self):
+        cache = AuthContextCache(ttl_seconds=60, max_entries=10)
+        role_id = uuid.uuid4()
+        cache.put_permissions(role_id, ["sample:read"], generation=cache.generation)
+        assert cache.get_permissions(role_id) == ("sample:read",)
+
+        cache.invalidate_role(role_id)
+        assert cache.get_permissions(role_id) is None
+
+    def test_fill_started_before_invalidation_is_dropped(self):
+        cache = AuthContextCache(ttl_seconds=60, max_entries=10)
+        role_id = uuid.uuid4()
+        generation = cache.generation
+        cache.invalidate_role(role_id)
+        cache.put_permissions(role_id, ["sample:read"], generation=generation)
+        assert cache.get_permissions(role_id) is None
+
+    def test_entries_expire_after_ttl(self):
+        cache = AuthContextCache(ttl_seconds=0.01, max_entries=10)
+        role_id = uuid.uuid4()
+        cache.put_permissions(role_id, ["sample:read"], generation=cache.generation)
+        time.sleep(0.02)
+        assert cache.get_permissions(role_id) is None
+
+    def test_zero_ttl_disables_cache(self):
+        cache = AuthContextCache(ttl_seconds=0, max_entries=10)
+        role_id = uuid.uuid4()
+        cache.put_permissions(role_id, ["sample:read"], generation=cache.generation)
+        assert cache.get_permissions(role_id) is None
+
+
+class TestJtiDenylist:
+    def test_disabled_denylist_always_defers_to_table(self):
+        denylist = JtiDenylist(refresh_seconds=0)
+        assert denylist.might_be_revoked(db=None, jti="anything") is True
+
+
+class TestAuthPathQueries:
+    def _count_statements(self, db_session: Session, fn):
+        statements = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", _before)
+        try:
+            fn()
+        finally:
+            event.remove(bind, "before_cursor_execute", _before)
+        return statements
+
+    def test_warm_auth_path_skips_user_permission_and_denylist_queries(
+        self, client: TestClient, db_session: Session, test_user
+    ):
+        login = client.post(
+            "/auth/login", json={"username": "testuser", "password": "testpassword"}
+        )
+        token = login.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.cookies.clear()
+
+        assert client.get("/auth/me", headers=headers).status_code == 200
+        db_session.expunge_all()
+
+        statements = self._count_statements(
+            db_session, lambda: client.get("/auth/me", headers=headers)
+        )
+        lowered = [s.lower() for s in statements]
+        assert not any("from users" in s for s in lowered)
+        assert not any("from permissions" in s for s in lowered)
+        assert not any("from revoked_tokens" in s for s in lowered)
+
+    def test_role_permission_update_is_visible_immediately(
+        self, client: TestClient, db_session: Session, test_admin_user, admin_token
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        assert client.get("/users", headers=headers).status_code == 200
+
+        r = client.put(
+            f"/roles/{test_admin_user.role_id}/permissions",
+            headers=headers,
+            json={"permission_ids": []},
+        )
+        assert r.status_code == 200
+
+        assert client.get("/users", headers=headers).status_code == 403
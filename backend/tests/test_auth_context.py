@@ -0,0 +1,54 @@
+"""
+Request-scoped AuthContext shared by RBAC dependencies and routers.
+"""
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.core.security import AuthContext
+
+
+def _ctx(*names):
+    return AuthContext(
+        user=None,
+        user_id=uuid.uuid4(),
+        role_name="Lab Technician",
+        client_id=None,
+        permission_names=tuple(names),
+        permissions=frozenset(names),
+    )
+
+
+class TestAuthContext:
+    def test_membership_helpers(self):
+        ctx = _ctx("sample:read", "result:enter")
+        assert ctx.has("sample:read")
+        assert not ctx.has("config:edit")
+        assert ctx.has_any(["config:edit", "result:enter"])
+        assert not ctx.has_any(["config:edit"])
+        assert ctx.missing(["sample:read", "batch:manage", "config:edit"]) == [
+            "batch:manage",
+            "config:edit",
+        ]
+
+
+class TestPermissionQueryHeader:
+    def test_stacked_permission_checks_query_at_most_once(
+        self, client: TestClient, test_admin_user, admin_token
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        cold = client.get("/users", headers=headers)
+        assert cold.status_code == 200
+        assert int(cold.headers["X-Permission-Queries"]) <= 1
+
+        warm = client.get("/lists", headers=headers)
+        assert warm.status_code == 200
+        assert warm.headers["X-Permission-Queries"] == "0"
+
+    def test_router_permission_checks_reuse_context(
+        self, client: TestClient, test_admin_user, admin_token
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        r = client.get("/help", headers=headers)
+        assert r.status_code == 200
+        assert int(r.headers["X-Permission-Queries"]) <= 1
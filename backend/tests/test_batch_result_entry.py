@@ -0,0 +1,207 @@
+"""
+POST /results/batch: set-based validation and upsert (BatchResultEntryService).
+
+The scaling test builds 96/384/1536-well plates and checks that the number of
+statements the endpoint issues does not grow with plate size. The wall-clock
+check is a benchmark and only runs with ``pytest --benchmark``.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from models.analysis import Analysis, Analyte, AnalysisAnalyte
+from models.container import Container, Contents
+from models.result import Result
+from models.sample import Sample
+from models.test import Test
+
+
+class TestBatchResultEntryScaling:
+    """POST /results/batch issues a bounded number of statements regardless of plate size"""
+
+    def _plate(self, db_session, user, wells, analytes, tag):
+        """Batch of `wells` single-sample containers, one test each, built with core inserts"""
+        from datetime import datetime
+        from uuid import uuid4
+        from sqlalchemy import insert
+        from models.batch import Batch, BatchContainer
+        from models.client import Client
+        from models.container import ContainerType
+        from models.list import List, ListEntry
+        from models.project import Project
+
+        def entry(list_name, name):
+            existing = db_session.query(ListEntry).filter(ListEntry.name == name).first()
+            if existing:
+                return existing
+            lst = db_session.query(List).filter(List.name == list_name).first()
+            if not lst:
+                lst = List(name=list_name, created_by=user.id, modified_by=user.id)
+                db_session.add(lst)
+                db_session.flush()
+            created = ListEntry(list_id=lst.id, name=name, created_by=user.id, modified_by=user.id)
+            db_session.add(created)
+            db_session.flush()
+            return created
+
+        in_process = entry("test_status", "In Process")
+        complete = entry("test_status", "Complete")
+        received = entry("sample_status", "Received")
+        kind = entry("sample_type", "Plasma")
+        client_entity = Client(name=f"Plate Client {tag}", billing_info={})
+        db_session.add(client_entity)
+        db_session.flush()
+        project = Project(
+            name=f"Plate Project {tag}", start_date=datetime.utcnow(),
+            client_id=client_entity.id, status=received.id
+        )
+        container_type = ContainerType(name=f"Well {tag}", capacity=0.2, material="PP", dimensions="8x12")
+        batch = Batch(name=f"Plate Batch {tag}", status=received.id, created_by=user.id, modified_by=user.id)
+        db_session.add_all([project, container_type, batch])
+        db_session.flush()
+
+        analysis = Analysis(name=f"Plate Assay {tag}", created_by=user.id, modified_by=user.id)
+        db_session.add(analysis)
+        db_session.flush()
+        for i, analyte in enumerate(analytes):
+            db_session.add(AnalysisAnalyte(
+                analysis_id=analysis.id, analyte_id=analyte.id, data_type="numeric",
+                low_value=0, high_value=1000, is_required=(i == 0), reported_name=analyte.name
+            ))
+
+        samples, containers, contents, tests, links = [], [], [], [], []
+        for well in range(wells):
+            sample_id, container_id, test_id = uuid4(), uuid4(), uuid4()
+            samples.append({
+                "id": sample_id, "name": f"P{tag}-S{well}", "project_id": project.id,
+                "sample_type": kind.id, "status": received.id, "matrix": kind.id,
+            })
+            containers.append({"id": container_id, "name": f"P{tag}-C{well}", "type_id": container_type.id})
+            contents.append({"container_id": container_id, "sample_id": sample_id})
+            links.append({"batch_id": batch.id, "container_id": container_id})
+            tests.append({
+                "id": test_id, "name": f"P{tag}-T{well}", "sample_id": sample_id,
+                "analysis_id": analysis.id, "status": in_process.id,
+            })
+        for model, rows in (
+            (Sample, samples), (Container, containers), (Contents, contents),
+            (BatchContainer, links), (Test, tests),
+        ):
+            db_session.execute(insert(model.__table__), rows)
+        db_session.commit()
+        return batch, [row["id"] for row in tests], complete
+
+    def _post_plate(self, client, admin_token, test_admin_user, db_session, wells, analytes):
+        """Enter every result of a fresh `wells` plate; returns the statements issued"""
+        from sqlalchemy import event
+
+        batch, test_ids, complete = self._plate(db_session, test_admin_user, wells, analytes, wells)
+        payload = {
+            "batch_id": str(batch.id),
+            "results": [
+                {
+                    "test_id": str(test_id),
+                    "analyte_results": [
+                        {"analyte_id": str(a.id), "raw_result": "12.5", "reported_result": "12.5"}
+                        for a in analytes
+                    ],
+                }
+                for test_id in test_ids
+            ],
+        }
+        statements = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", _before)
+        try:
+            response = client.post(
+                "/results/batch", json=payload, headers={"Authorization": f"Bearer {admin_token}"}
+            )
+        finally:
+            event.remove(bind, "before_cursor_execute", _before)
+        assert response.status_code == 200, response.text
+
+        assert db_session.query(Result).filter(
+            Result.test_id.in_(test_ids), Result.active == True
+        ).count() == wells * len(analytes)
+        assert db_session.query(Test).filter(
+            Test.id.in_(test_ids), Test.status == complete.id
+        ).count() == wells
+        return statements
+
+    def _analytes(self, db_session, tag):
+        analytes = [Analyte(name=f"Plate Analyte {tag} {i}") for i in range(4)]
+        db_session.add_all(analytes)
+        db_session.flush()
+        return analytes
+
+    def test_statement_count_is_flat_across_plate_sizes(
+        self, client: TestClient, admin_token, test_admin_user, db_session
+    ):
+        analytes = self._analytes(db_session, "count")
+        counts = {
+            wells: len(self._post_plate(client, admin_token, test_admin_user, db_session, wells, analytes))
+            for wells in (96, 384, 1536)
+        }
+        # Only the chunked upsert and the test status UPDATE grow with plate size
+        assert counts[96] < 30
+        assert counts[1536] < counts[96] + 15
+
+    @pytest.mark.benchmark
+    def test_1536_well_plate_wall_clock(
+        self, client: TestClient, admin_token, test_admin_user, db_session
+    ):
+        """Benchmark (--benchmark): a 1536-well plate is entered in seconds"""
+        import time
+
+        analytes = self._analytes(db_session, "wall")
+        started = time.perf_counter()
+        self._post_plate(client, admin_token, test_admin_user, db_session, 1536, analytes)
+        assert time.perf_counter() - started < 10
+
+    def test_reentry_overwrites_existing_result(
+        self, client: TestClient, admin_token, test_admin_user, db_session
+    ):
+        analyte = Analyte(name="Plate Analyte Reentry")
+        db_session.add(analyte)
+        db_session.flush()
+        batch, (test_id,), _ = self._plate(db_session, test_admin_user, 1, [analyte], 96)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        for value in ("1.0", "2.0"):
+            response = client.post("/results/batch", headers=headers, json={
+                "batch_id": str(batch.id),
+                "results": [{"test_id": str(test_id), "analyte_results": [
+                    {"analyte_id": str(analyte.id), "raw_result": value}
+                ]}],
+            })
+            assert response.status_code == 200, response.text
+
+        results = db_session.query(Result).filter(Result.test_id == test_id).all()
+        assert [(r.replicate, r.raw_result) for r in results] == [(1, "2.0")]
+
+    def test_validation_errors_keep_shape_and_write_nothing(
+        self, client: TestClient, admin_token, test_admin_user, db_session
+    ):
+        analyte = Analyte(name="Plate Analyte Invalid")
+        db_session.add(analyte)
+        db_session.flush()
+        batch, (test_id,), _ = self._plate(db_session, test_admin_user, 1, [analyte], 96)
+
+        response = client.post("/results/batch", headers={"Authorization": f"Bearer {admin_token}"}, json={
+            "batch_id": str(batch.id),
+            "results": [{"test_id": str(test_id), "analyte_results": [
+                {"analyte_id": str(analyte.id), "raw_result": "abc"}
+            ]}],
+        })
+        assert response.status_code == 400
+        detail = response.json()["detail"]
+        assert detail["message"] == "Validation errors found"
+        assert detail["errors"] == [{
+            "test_id": str(test_id),
+            "analyte_id": str(analyte.id),
+            "error": "Raw result 'abc' is not numeric",
+        }]
+        assert db_session.query(Result).filter(Result.test_id == test_id).count() == 0
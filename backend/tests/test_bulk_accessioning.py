@@ -395,3 +395,99 @@ class TestBulkAccessioning:
         assert len(contents) == 1
         assert contents[0].container_id == containers[0].id
 
+
+    def _bulk_payload(self, test_data, count, prefix, **extra):
+        payload = {
+            "due_date": (datetime.utcnow() + timedelta(days=7)).isoformat(),
+            "received_date": datetime.utcnow().isoformat(),
+            "sample_type": str(test_data["sample_type"].id),
+            "matrix": str(test_data["matrix"].id),
+            "project_id": str(test_data["project"].id),
+            "container_type_id": str(test_data["container_type"].id),
+            "uniques": [
+                {"name": f"{prefix}-{i:05d}", "container_name": f"{prefix}-C-{i:05d}"}
+                for i in range(count)
+            ],
+        }
+        payload.update(extra)
+        return payload
+
+    def test_bulk_accession_rejects_duplicates_within_request(self, client: TestClient, admin_token, test_data):
+        """Repeated names in one request are reported before any insert"""
+        payload = self._bulk_payload(test_data, 2, "DUP")
+        payload["uniques"][1]["name"] = payload["uniques"][0]["name"]
+        response = client.post(
+            "/samples/bulk-accession",
+            json=payload,
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 400
+        assert "Duplicate sample names" in response.json()["detail"]
+
+    @pytest.fixture
+    def bench_analysis(self, db_session: Session, test_admin_user):
+        analysis = Analysis(
+            name="Bench Analysis",
+            method="Bench",
+            turnaround_time=7,
+            cost=1.0,
+            created_by=test_admin_user.id,
+            modified_by=test_admin_user.id
+        )
+        db_session.add(analysis)
+        db_session.commit()
+        return analysis
+
+    def _accession_counting_statements(self, client, admin_token, db_session, payload):
+        from sqlalchemy import event
+
+        statements = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", _before)
+        try:
+            response = client.post(
+                "/samples/bulk-accession",
+                json=payload,
+                headers={"Authorization": f"Bearer {admin_token}"}
+            )
+        finally:
+            event.remove(bind, "before_cursor_execute", _before)
+        assert response.status_code == 200, response.text
+        assert len(response.json()) == len(payload["uniques"])
+        return statements
+
+    def test_bulk_accession_round_trips_do_not_scale_with_plate_size(
+        self, client: TestClient, admin_token, test_data, bench_analysis, db_session: Session
+    ):
+        """384 and 10k samples (one test each) in a bounded number of statements"""
+        counts = {}
+        for count in (384, 10000):
+            payload = self._bulk_payload(
+                test_data, count, f"BENCH{count}", assigned_tests=[str(bench_analysis.id)]
+            )
+            counts[count] = len(
+                self._accession_counting_statements(client, admin_token, db_session, payload)
+            )
+
+        # Only the chunked INSERT/SELECT statements grow (one per 1000 rows per table)
+        assert counts[384] < 40
+        assert counts[10000] < counts[384] + 60
+        assert db_session.query(Test).filter(Test.analysis_id == bench_analysis.id).count() == 10384
+
+    @pytest.mark.benchmark
+    def test_bulk_accession_10k_samples_wall_clock(
+        self, client: TestClient, admin_token, test_data, bench_analysis, db_session: Session
+    ):
+        """Benchmark (--benchmark): a 10k-sample accession finishes in seconds"""
+        import time
+
+        payload = self._bulk_payload(
+            test_data, 10000, "WALL", assigned_tests=[str(bench_analysis.id)]
+        )
+        started = time.perf_counter()
+        self._accession_counting_statements(client, admin_token, db_session, payload)
+        assert time.perf_counter() - started < 15
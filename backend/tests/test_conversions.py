@@ -7,7 +7,7 @@ from app.core.conversions import (
     convert_to_base_unit, convert_from_base_unit,
     calculate_volume_from_concentration_and_amount,
     calculate_pooled_concentration, calculate_pooled_volume,
-    validate_result_value, ConversionError
+    validate_result_value, ConversionError, convert_many, unit_table
 )
 
 
@@ -146,6 +146,62 @@ class TestPooledCalculations:
             calculate_pooled_volume([], [], db_session)
 
 
+class TestConvertMany:
+    """Array conversion against a units snapshot (no database)"""
+
+    @pytest.fixture
+    def units(self, monkeypatch):
+        from uuid import uuid4
+        from app.core import reference_cache as reference_module
+        from app.core.reference_cache import UNITS, UnitSnapshot
+
+        mass, volume = uuid4(), uuid4()
+        snapshot = {}
+        for name, multiplier, unit_type, active in (
+            ("g", "1", mass, True),
+            ("mg", "0.001", mass, True),
+            ("ug", "0.000001", mass, True),
+            ("mL", "0.001", volume, True),
+            ("old_mg", "0.001", mass, False),
+        ):
+            unit = UnitSnapshot(uuid4(), name, Decimal(multiplier), unit_type, active)
+            snapshot[unit.id] = unit
+        monkeypatch.setitem(reference_module._LOADERS, UNITS, lambda db: dict(snapshot))
+        return {u.name: u.id for u in snapshot.values()}
+
+    def test_mixed_source_units_to_one_target(self, units):
+        result = convert_many(
+            [1000.0, 2.0, 500000.0], [units["mg"], units["g"], units["ug"]], units["mg"], None
+        )
+        assert result.tolist() == pytest.approx([1000.0, 2000.0, 500.0])
+
+    def test_none_target_returns_base_units(self, units):
+        result = convert_many([250.0, 750.0], units["mg"], None, None)
+        assert result.tolist() == pytest.approx([0.25, 0.75])
+
+    def test_exact_mode_returns_decimals(self, units):
+        result = convert_many(["0.1", "0.2"], units["mg"], units["g"], None, exact=True)
+        assert result == [Decimal("0.0001"), Decimal("0.0002")]
+
+    def test_incompatible_types_report_index(self, units):
+        with pytest.raises(ConversionError) as exc:
+            convert_many([1.0, 1.0], [units["mg"], units["mL"]], units["g"], None)
+        assert exc.value.index == 1
+
+    def test_inactive_unit_is_not_convertible(self, units):
+        with pytest.raises(ConversionError) as exc:
+            convert_many([1.0], [units["old_mg"]], None, None)
+        assert exc.value.index == 0
+
+    def test_table_is_reused_until_units_are_invalidated(self, units):
+        from app.core.reference_cache import UNITS, reference_cache
+
+        first = unit_table(None)
+        assert unit_table(None) is first
+        reference_cache.invalidate(UNITS)
+        assert unit_table(None) is not first
+
+
 class TestResultValidation:
     """Test result validation functions"""
     
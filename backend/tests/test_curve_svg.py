@@ -0,0 +1,134 @@
+"""
+Python SVG renderer for dose-response curves (thumbnails and PDF export).
+
+The throughput benchmark renders 94-compound plates' worth of thumbnails
+serially; the process pool only adds to that for batches past
+PARALLEL_MIN_THUMBNAILS.
+"""
+import math
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from app.services import curve_svg
+from app.services.curve_svg import (
+    EXCLUDED_COLOR,
+    detail_svg,
+    predict,
+    render_thumbnails,
+    thumbnail_svg,
+)
+from app.services.native_fit import B, C, D, LOG_E, LOG_F, _predict
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+FIT = {
+    "success": True,
+    "potency": 100.0,
+    "hill_slope": -1.2,
+    "bottom": 2.0,
+    "top": 98.0,
+    "ci_low_95": 80.0,
+    "ci_high_95": 125.0,
+}
+
+
+def _points(n=8, excluded=()):
+    conc = np.logspace(0, 4, n)
+    response = predict((FIT["hill_slope"], FIT["bottom"], FIT["top"], FIT["potency"]), np.log10(conc))
+    return [
+        {"conc": float(c), "response": float(r), "point_id": f"p{i}"}
+        for i, (c, r) in enumerate(zip(conc, response))
+    ]
+
+
+def _parse(svg):
+    return ET.fromstring(svg)
+
+
+class TestCurveModel:
+    def test_matches_native_fit_model(self):
+        theta = np.zeros(5)
+        theta[[B, C, D, LOG_E, LOG_F]] = [-1.2, 2.0, 98.0, math.log(100.0), 0.0]
+        conc = np.logspace(-1, 5, 13)
+        expected = _predict(theta, np.log(conc))
+        got = predict((-1.2, 2.0, 98.0, 100.0), np.log10(conc))
+        assert np.allclose(got, expected)
+
+    def test_midpoint_at_potency(self):
+        assert predict((-1.2, 2.0, 98.0, 100.0), np.array([2.0]))[0] == 50.0
+
+
+class TestThumbnail:
+    def test_well_formed_with_fixed_size(self):
+        root = _parse(thumbnail_svg(_points(), FIT))
+        assert root.tag == f"{SVG_NS}svg"
+        assert root.get("width") == "200"
+        assert root.get("height") == "120"
+
+    def test_draws_points_curve_and_ci_band(self):
+        root = _parse(thumbnail_svg(_points(), FIT))
+        paths = root.findall(f"{SVG_NS}path")
+        assert any(p.get("fill") == "none" for p in paths)            # curve
+        assert any(p.get("stroke-linecap") == "round" for p in paths)  # points
+        assert len(root.findall(f"{SVG_NS}rect")) == 2                 # background + CI band
+
+    def test_no_curve_for_inactive(self):
+        root = _parse(thumbnail_svg(_points(), FIT, curve_category="INACTIVE"))
+        assert not any(p.get("fill") == "none" for p in root.findall(f"{SVG_NS}path"))
+
+    def test_failed_fit_shows_points_only(self):
+        svg = thumbnail_svg(_points(), {"success": False}, curve_category="CANNOT_FIT")
+        paths = _parse(svg).findall(f"{SVG_NS}path")
+        assert [p.get("stroke") for p in paths] == ["#ef4444"]
+
+    def test_excluded_points_are_grey(self):
+        svg = thumbnail_svg(_points(), FIT, excluded_point_ids=["p0", "p1"])
+        greys = [p for p in _parse(svg).findall(f"{SVG_NS}path") if p.get("stroke") == EXCLUDED_COLOR]
+        assert len(greys) == 1
+        assert greys[0].get("d").count("h0") == 2
+
+    def test_stays_within_byte_budget(self):
+        points = _points(n=400)
+        full = thumbnail_svg(points, FIT, max_bytes=10**6)
+        assert len(full) > 3000
+        small = thumbnail_svg(points, FIT, max_bytes=3000)
+        assert len(small) <= 3000
+        _parse(small)
+
+    def test_default_budget_fits_a_1536_well_compound(self):
+        assert len(thumbnail_svg(_points(n=16), FIT)) <= curve_svg.THUMBNAIL_MAX_BYTES
+
+
+class TestDetail:
+    def test_labels_title_and_potency(self):
+        svg = detail_svg(
+            _points(), FIT, excluded_point_ids=["p3"], x_label="Concentration (nM)",
+            title="Cmpd <A&B>",
+        )
+        root = _parse(svg)
+        texts = [t.text for t in root.iter(f"{SVG_NS}text")]
+        assert "Cmpd <A&B>" in texts
+        assert "Concentration (nM)" in texts
+        assert "IC50 = 100" in texts
+        assert {"Used", "Excluded"} <= set(texts)
+
+    def test_renders_without_fit(self):
+        root = _parse(detail_svg(_points(), {"potency": None}))
+        assert not any("IC50" in (t.text or "") for t in root.iter(f"{SVG_NS}text"))
+
+
+class TestBatchRendering:
+    def test_process_pool_matches_inline(self, monkeypatch):
+        jobs = [(_points(), FIT, "SIGMOID") for _ in range(12)]
+        monkeypatch.setattr(curve_svg, "PARALLEL_MIN_THUMBNAILS", 4)
+        assert render_thumbnails(jobs, max_workers=2) == render_thumbnails(jobs, max_workers=1)
+
+    def test_thousands_of_thumbnails_per_second(self):
+        jobs = [(_points(), dict(FIT, potency=10.0 ** (1 + i % 3)), "SIGMOID") for i in range(2000)]
+        started = time.perf_counter()
+        svgs = render_thumbnails(jobs, max_workers=1)
+        elapsed = time.perf_counter() - started
+        assert len(svgs) == 2000
+        assert len(svgs) / elapsed > 1000
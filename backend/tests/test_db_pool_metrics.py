@@ -0,0 +1,126 @@
+"""
+Connection pool instrumentation and GET /admin/metrics/db-pool.
+"""
+import threading
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core import db_metrics
+from app.core.db_metrics import (
+    DbRouteLabelMiddleware,
+    Histogram,
+    TimedQueuePool,
+    instrument_engine,
+    render_prometheus,
+)
+from app.core.routing import DbOffloadRoute
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+    db_metrics._registry.pop("test", None)
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        hist = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            hist.observe(value)
+        snap = hist.snapshot()
+        assert [b["count"] for b in snap["buckets"]] == [1, 3]
+        assert snap["count"] == 4
+
+
+class TestPoolInstrumentation:
+    def test_wait_timeouts_and_hold_times_are_recorded(self, sqlite_engine):
+        metrics = instrument_engine(sqlite_engine, "test")
+        held = sqlite_engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            sqlite_engine.connect()
+        held.close()
+
+        snap = db_metrics.pool_snapshot()["test"]
+        assert snap["timeouts"] == 1
+        assert snap["wait_seconds"]["count"] == 2
+        assert snap["checkouts"] == 1
+        assert snap["hold_seconds_by_route"]["background"]["count"] == 1
+        assert snap["pool_size"] == 1 and snap["checked_out"] == 0
+        assert metrics is sqlite_engine.pool.metrics
+
+    def test_metrics_survive_dispose(self, sqlite_engine):
+        metrics = instrument_engine(sqlite_engine, "test")
+        sqlite_engine.dispose()
+        with sqlite_engine.connect():
+            pass
+        assert sqlite_engine.pool.metrics is metrics
+        assert metrics.checkouts == 1
+
+    def test_hold_time_is_labelled_with_route_template(self, sqlite_engine):
+        instrument_engine(sqlite_engine, "test")
+        app = FastAPI()
+        router = APIRouter(route_class=DbOffloadRoute)
+
+        @router.get("/items/{item_id}")
+        async def read_item(item_id: int):
+            with sqlite_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return {"thread": threading.current_thread().name}
+
+        class _Passthrough(BaseHTTPMiddleware):
+            async def dispatch(self, request, call_next):
+                return await call_next(request)
+
+        app.include_router(router)
+        app.add_middleware(_Passthrough)
+        app.add_middleware(DbRouteLabelMiddleware)
+
+        with TestClient(app) as tc:
+            assert tc.get("/items/1").status_code == 200
+            assert tc.get("/items/2").status_code == 200
+
+        routes = db_metrics.pool_snapshot()["test"]["hold_seconds_by_route"]
+        assert routes["GET /items/{item_id}"]["count"] == 2
+
+    def test_prometheus_rendering(self, sqlite_engine):
+        instrument_engine(sqlite_engine, "test")
+        with sqlite_engine.connect():
+            pass
+        body = render_prometheus(db_metrics.pool_snapshot())
+        assert 'nimble_db_pool_checked_out{pool="test"} 0' in body
+        assert 'nimble_db_pool_wait_seconds_bucket{pool="test",le="+Inf"} 1' in body
+        assert 'nimble_db_connection_hold_seconds_count{pool="test",route="background"} 1' in body
+
+
+class TestDbPoolEndpoint:
+    def test_requires_config_edit(self, client: TestClient, client_user_token):
+        r = client.get(
+            "/admin/metrics/db-pool",
+            headers={"Authorization": f"Bearer {client_user_token}"},
+        )
+        assert r.status_code == 403
+
+    def test_reports_app_and_background_pools(self, client: TestClient, admin_token):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        r = client.get("/admin/metrics/db-pool", headers=headers)
+        assert r.status_code == 200
+        pools = r.json()["pools"]
+        assert {"app", "background"} <= set(pools)
+        assert "wait_seconds" in pools["app"]
+
+        prom = client.get("/admin/metrics/db-pool?format=prometheus", headers=headers)
+        assert prom.status_code == 200
+        assert prom.headers["content-type"].startswith("text/plain")
+        assert 'nimble_db_pool_size{pool="background"}' in prom.text
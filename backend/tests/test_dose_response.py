@@ -1,5 +1,6 @@
 """
-Dose-response integration tests (22 cases).
+Dose-response integration tests (22 cases), plus payload-assembly tests on
+synthetic plates that need no database.
 
 Uses db_session (testcontainers PostgreSQL, create_all schema, per-test rollback).
 DoseResponseFitService is tested directly for logic cases; HTTP layer tested via
@@ -7,16 +8,23 @@ the `client` fixture for review/exclusion/summary endpoints.
 
 R calculator is always mocked via a MagicMock injected into DoseResponseFitService.
 """
+import time
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
-from app.services.dose_response_fit import DoseResponseFitService
+from app.services.dose_response_fit import (
+    DoseResponseFitService,
+    average_replicates,
+    bucket_run_rows,
+)
+from app.services.native_fit import NativeFitClient
 from models.client import Client
 from models.dose_response import CurveCategory, DoseResponseResult, LimsRunDataExclusion, ReviewStatus
 from models.experiment import ExperimentTemplate
@@ -547,6 +555,43 @@ def test_review_result_sets_status(client, db_session, test_admin_user, test_org
     assert result.reviewed_by == test_admin_user.id
 
 
+# ---------------------------------------------------------------------------
+# 13b. list_results links thumbnails; thumbnail endpoint honours ETags
+# ---------------------------------------------------------------------------
+
+def test_thumbnail_served_by_url_with_etag(client, db_session, test_admin_user, test_org, admin_token, dr_setup):
+    run = dr_setup["run"]
+    result = DoseResponseResult(
+        lims_run_id=run.id,
+        sample_id=dr_setup["test_sample"].id,
+        model="4PL",
+        curve_category=CurveCategory.SIGMOID,
+        quality_flag="ok",
+        fit_version=1,
+        thumbnail_svg="<svg>thumb</svg>",
+        client_id=test_org.id,
+    )
+    db_session.add(result)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    listed = client.get(f"/v1/lims-runs/{run.id}/dose-response/results", headers=headers)
+    assert listed.status_code == 200
+    row = listed.json()["results"][0]
+    assert "thumbnail_svg" not in row
+    url = row["thumbnail_url"]
+    assert url == f"/v1/lims-runs/{run.id}/dose-response/results/{result.id}/thumbnail.svg"
+
+    resp = client.get(url, headers=headers)
+    assert resp.status_code == 200
+    assert resp.text == "<svg>thumb</svg>"
+    assert resp.headers["content-type"].startswith("image/svg+xml")
+    assert "immutable" in resp.headers["cache-control"]
+
+    again = client.get(url, headers={**headers, "If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+
+
 # ---------------------------------------------------------------------------
 # 14. review_result — wrong run_id returns 404
 # ---------------------------------------------------------------------------
@@ -811,3 +856,93 @@ def test_trigger_fit_mixed_concentration_units(db_session, test_admin_user, test
         svc.trigger_fit(run.id)
     assert exc_info.value.status_code == 422
     assert "Mixed concentration units" in exc_info.value.detail
+
+
+# ---------------------------------------------------------------------------
+# Payload assembly (no database): synthetic 1536-well plates
+# ---------------------------------------------------------------------------
+
+_POS, _NEG = uuid.uuid4(), uuid.uuid4()
+
+
+def _synthetic_plate(compounds=94, levels=8, replicates=2, controls=16):
+    """1536 wells by default: 16 + 16 controls, 94 compounds x 8 levels x 2 replicates."""
+    rows, wells = [], {}
+    samples = {}
+    for qc_type, signal in ((_POS, 100.0), (_NEG, 0.0)):
+        sid = uuid.uuid4()
+        samples[sid] = SimpleNamespace(qc_type=qc_type)
+        for i in range(controls):
+            rows.append(SimpleNamespace(
+                id=uuid.uuid4(), sample_id=sid, well_position=f"CTL{qc_type.hex[:4]}{i}",
+                row_data={"signal": signal},
+            ))
+    for c in range(compounds):
+        sid = uuid.uuid4()
+        samples[sid] = SimpleNamespace(qc_type=None)
+        for level in range(levels):
+            conc = 10000 / 3 ** level
+            ic50 = 10 * (c + 1)
+            signal = 100.0 / (1 + ic50 / conc)
+            for rep in range(replicates):
+                pos = f"C{c}L{level}R{rep}"
+                wells[pos] = SimpleNamespace(
+                    concentration_value=Decimal(str(conc)), replicate_group=f"G{c}",
+                    concentration_unit="nM",
+                )
+                rows.append(SimpleNamespace(
+                    id=uuid.uuid4(), sample_id=sid, well_position=pos,
+                    row_data={"signal": signal + (rep - 0.5)},
+                ))
+    qc = {_POS: "positive_control", _NEG: "negative_control"}
+    return rows, samples, qc, wells
+
+
+def test_bucket_run_rows_counts_and_averages():
+    rows, samples, qc, wells = _synthetic_plate(compounds=2, levels=4, replicates=3, controls=2)
+    first = next(r for r in rows if samples[r.sample_id].qc_type is None)
+    excluded = {str(first.id)}
+    # A row whose well has no template definition is not a concentration point
+    rows.append(SimpleNamespace(
+        id=uuid.uuid4(), sample_id=first.sample_id, well_position="NOWELL", row_data={"signal": 1.0},
+    ))
+
+    pos, neg, compounds = bucket_run_rows(rows, samples, qc, excluded, wells, None)
+    assert pos == [100.0, 100.0] and neg == [0.0, 0.0]
+    bucket = compounds[first.sample_id]
+    assert len(bucket.conc) == 11
+    assert bucket.concentration_rows == 12
+    assert bucket.excluded_concentration_rows == 1
+    assert bucket.excluded_rows == 1
+
+    points = average_replicates(bucket, pos_mean=100.0, neg_mean=0.0)
+    assert [p["conc"] for p in points] == sorted(p["conc"] for p in points)
+    top = points[-1]
+    # Top-level replicates are signal - 0.5, + 0.5, + 1.5; the first is excluded
+    expected = 100.0 / (1 + 10 / 10000)
+    assert top["response"] == pytest.approx(expected + 1.0)
+    assert top["point_id"] == bucket.point_ids[0]
+
+    _, _, only = bucket_run_rows(rows, samples, qc, excluded, wells, None, sample_id_filter=first.sample_id)
+    assert list(only) == [first.sample_id]
+
+
+def test_1536_well_assembly_and_native_fit_benchmark():
+    rows, samples, qc, wells = _synthetic_plate()
+    assert len(rows) == 1536
+
+    started = time.perf_counter()
+    pos, neg, compounds = bucket_run_rows(rows, samples, qc, set(), wells, None)
+    pos_mean, neg_mean = sum(pos) / len(pos), sum(neg) / len(neg)
+    payload = [
+        {"sample_id": str(sid), "points": average_replicates(c, pos_mean, neg_mean), "model": "4PL"}
+        for sid, c in compounds.items()
+    ]
+    assembled = time.perf_counter() - started
+
+    results = NativeFitClient(max_workers=0).fit(payload, {})
+    assert len(payload) == 94
+    assert all(len(p["points"]) == 8 for p in payload)
+    assert all(r["success"] for r in results)
+    # Single pass: assembling a 1536-well plate is far below fitting cost
+    assert assembled < 0.25
@@ -0,0 +1,215 @@
+"""
+Server-sent events (app/core/events.py):
+  - SSE framing and per-caller visibility (no DB)
+  - event_stream: replay, live delivery, resync, keep-alive (stub broker)
+  - publish_event / replay_events against the events table
+"""
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from app.core import events
+from app.core.events import EventScope, format_sse, publish_event, replay_events
+from app.services.job_queue import JobQueue
+from models.event import Event
+
+
+def _event(event_id, *, user_id=None, client_id=None, type="job", data=None):
+    return {
+        "id": event_id,
+        "type": type,
+        "user_id": str(user_id) if user_id else None,
+        "client_id": str(client_id) if client_id else None,
+        "data": {"n": event_id} if data is None else data,
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Framing + visibility
+# ──────────────────────────────────────────────────────────────────────────────
+
+def test_format_sse_message():
+    assert format_sse("fit", {"run_id": "r1", "fit_in_progress": False}, 42) == (
+        'id: 42\nevent: fit\ndata: {"run_id":"r1","fit_in_progress":false}\n\n'
+    )
+    assert format_sse("reset", {}) == "event: reset\ndata: {}\n\n"
+
+
+def test_scope_allows_own_and_client_events():
+    me, my_client = uuid4(), uuid4()
+    scope = EventScope(me, my_client)
+    assert scope.allows(_event(1, user_id=me))
+    assert scope.allows(_event(2, user_id=uuid4(), client_id=my_client))
+    assert not scope.allows(_event(3, user_id=uuid4(), client_id=uuid4()))
+    assert not scope.allows(_event(4))
+
+
+def test_scope_without_client_sees_only_own_events():
+    me = uuid4()
+    scope = EventScope(me, None)
+    assert scope.allows(_event(1, user_id=me))
+    assert not scope.allows(_event(2, client_id=uuid4()))
+
+
+def test_admin_scope_sees_everything():
+    assert EventScope(uuid4(), None, everything=True).allows(_event(1))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Stream (stub broker, replay patched)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _StubBroker:
+    def __init__(self):
+        self.subscriptions = []
+
+    def subscribe(self, scope):
+        subscription = events._Subscription(scope, asyncio.get_running_loop())
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.remove(subscription)
+
+
+def _collect(monkeypatch, replays, live, *, after_id=10, count):
+    """Run event_stream; replays are successive _replay results, live items are pushed after the first replay."""
+    calls = []
+
+    def fake_replay(scope, after):
+        calls.append(after)
+        return replays.pop(0)
+
+    monkeypatch.setattr(events, "_replay", fake_replay)
+
+    async def run():
+        broker = _StubBroker()
+        stream = events.event_stream(
+            EventScope(uuid4(), None, everything=True), after_id, broker=broker, heartbeat_seconds=0.05
+        )
+        chunks = [await stream.__anext__(), await stream.__anext__()]  # retry + first replay item
+        for item in live:
+            broker.subscriptions[0]._deliver(item)
+        while len(chunks) < count:
+            chunks.append(await stream.__anext__())
+        await stream.aclose()
+        assert broker.subscriptions == []
+        return chunks
+
+    return asyncio.run(run()), calls
+
+
+def test_stream_replays_then_goes_live(monkeypatch):
+    chunks, calls = _collect(
+        monkeypatch,
+        replays=[([_event(11), _event(12)], False, 12)],
+        live=[_event(12), _event(13)],
+        count=4,
+    )
+    assert chunks[0] == f"retry: {events.RETRY_MS}\n\n"
+    assert [c.split("\n")[0] for c in chunks[1:]] == ["id: 11", "id: 12", "id: 13"]
+    assert calls == [10]
+
+
+def test_stream_delivers_lower_id_committed_after_replay(monkeypatch):
+    # 12 was inserted before 13 but committed after the replay read 13
+    chunks, _ = _collect(
+        monkeypatch,
+        replays=[([_event(11), _event(13)], False, 13)],
+        live=[_event(13), _event(12)],
+        count=4,
+    )
+    assert [c.split("\n")[0] for c in chunks[1:]] == ["id: 11", "id: 13", "id: 12"]
+
+
+def test_stream_resyncs_from_table(monkeypatch):
+    chunks, calls = _collect(
+        monkeypatch,
+        replays=[([_event(11)], False, 11), ([_event(12)], False, 12)],
+        # An event too large for pg_notify arrives without data
+        live=[{**_event(12), "data": None}],
+        count=3,
+    )
+    assert calls == [10, 11]
+    assert chunks[2].startswith("id: 12\n")
+
+
+def test_stream_sends_reset_when_events_were_lost(monkeypatch):
+    chunks, _ = _collect(monkeypatch, replays=[([], True, 99)], live=[], count=2)
+    assert chunks[1] == "id: 99\nevent: reset\ndata: {}\n\n"
+
+
+def test_stream_keeps_idle_connection_alive(monkeypatch):
+    chunks, _ = _collect(monkeypatch, replays=[([_event(11)], False, 11)], live=[], count=3)
+    assert chunks[2] == ": keep-alive\n\n"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Events table
+# ──────────────────────────────────────────────────────────────────────────────
+
+def test_replay_returns_visible_events_in_order(db_session):
+    me, my_client, other = uuid4(), uuid4(), uuid4()
+    start = events.latest_event_id(db_session)
+    mine = publish_event(db_session, events.FIT, {"run_id": "r1"}, user_id=me)
+    shared = publish_event(db_session, events.IMPORT, {"rows": 5}, user_id=other, client_id=my_client)
+    publish_event(db_session, events.JOB, {"job_id": "j1"}, user_id=other)
+
+    replayed, reset, last_id = replay_events(db_session, EventScope(me, my_client), start)
+    assert not reset
+    assert [e["id"] for e in replayed] == [mine, shared]
+    assert replayed[1]["data"] == {"rows": 5}
+    assert last_id == shared
+
+
+def test_replay_resets_after_pruned_gap(db_session):
+    me = uuid4()
+    first = publish_event(db_session, events.FIT, {}, user_id=me)
+    second = publish_event(db_session, events.FIT, {}, user_id=me)
+    third = publish_event(db_session, events.FIT, {}, user_id=me)
+    db_session.query(Event).filter(Event.id.in_([first, second])).delete(synchronize_session=False)
+    # Anything older than first is gone too; events between first and third may be missing
+    db_session.query(Event).filter(Event.id < first).delete(synchronize_session=False)
+
+    replayed, reset, last_id = replay_events(db_session, EventScope(me, None), first)
+    assert reset
+    assert replayed == []
+    assert last_id == third
+
+
+def test_replay_resets_when_client_is_too_far_behind(db_session):
+    me = uuid4()
+    start = events.latest_event_id(db_session)
+    for _ in range(3):
+        newest = publish_event(db_session, events.FIT, {}, user_id=me)
+    replayed, reset, last_id = replay_events(db_session, EventScope(me, None), start, limit=2)
+    assert reset and replayed == [] and last_id == newest
+
+
+def test_enqueue_publishes_job_event_to_creator(db_session, test_user):
+    start = events.latest_event_id(db_session)
+    job = JobQueue(db_session).enqueue("test.noop", {}, user=test_user)
+    replayed, _, _ = replay_events(db_session, EventScope(test_user.id, None), start)
+    assert [(e["type"], e["data"]["job_id"], e["data"]["status"]) for e in replayed] == [
+        ("job", str(job.id), "queued")
+    ]
+    # Job events are not shared with the creator's client
+    others, _, _ = replay_events(db_session, EventScope(uuid4(), test_user.client_id), start)
+    assert others == []
+
+
+def test_large_event_is_announced_without_data(db_session, monkeypatch):
+    sent = []
+    real_execute = db_session.execute
+
+    def spy(statement, params=None, *args, **kwargs):
+        if params and "payload" in params:
+            sent.append(json.loads(params["payload"]))
+        return real_execute(statement, params, *args, **kwargs)
+
+    monkeypatch.setattr(db_session, "execute", spy)
+    event_id = publish_event(db_session, events.JOB, {"blob": "x" * 10000}, user_id=uuid4())
+    assert sent[-1]["id"] == event_id and sent[-1]["data"] is None
+    assert db_session.get(Event, event_id).data == {"blob": "x" * 10000}
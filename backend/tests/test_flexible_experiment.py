@@ -239,12 +239,15 @@ class TestStatusTransitions:
         assert r.status_code == 200
         assert r.json()["status"] == "complete"
 
-    def test_complete_to_published(self, client, auth_headers, running_run):
+    def test_complete_to_published(self, client, auth_headers, running_run, run_job):
         run_id = running_run["id"]
         r = client.patch(f"/v1/lims-runs/{run_id}/review", headers=auth_headers)
         assert r.status_code == 200
         r = client.patch(f"/v1/lims-runs/{run_id}/complete", headers=auth_headers)
-        assert r.status_code == 200
+        assert r.json()["kind"] == "lims_run.publish"
+        assert r.json()["status"] == "queued"
+        assert run_job(r)["status"] == "published"
+        r = client.get(f"/v1/lims-runs/{run_id}", headers=auth_headers)
         assert r.json()["status"] == "published"
 
     def test_invalid_transition_draft_to_complete(self, client, auth_headers, draft_run):
@@ -273,7 +276,7 @@ class TestStatusTransitions:
 
 class TestInstrumentImport:
     def test_import_happy_path(self, client, auth_headers, running_run,
-                                template_with_parser, db_session):
+                                template_with_parser, db_session, run_job):
         """Import valid rows to a running run → rows persisted, counts returned."""
         run_id = running_run["id"]
         rows = [
@@ -285,8 +288,7 @@ class TestInstrumentImport:
             json={"rows": rows},
             headers=auth_headers,
         )
-        assert r.status_code == 200
-        data = r.json()
+        data = run_job(r)
         assert data["imported"] == 2
         assert data["skipped"] == 0
         assert len(data["rows"]) == 2
@@ -329,7 +331,7 @@ class TestInstrumentImport:
         assert r.status_code == 422
 
     def test_get_data_rows_after_import(self, client, auth_headers, running_run,
-                                         template_with_parser):
+                                         template_with_parser, run_job):
         """GET /data returns imported rows."""
         run_id = running_run["id"]
         rows = [{"well_position": "A1", "row_data": {"viability_pct": 88.0, "well": "A1"}}]
@@ -338,7 +340,7 @@ class TestInstrumentImport:
             json={"rows": rows},
             headers=auth_headers,
         )
-        assert r.status_code == 200
+        assert run_job(r)["imported"] == 1
 
         r = client.get(f"/v1/lims-runs/{run_id}/data", headers=auth_headers)
         assert r.status_code == 200
@@ -352,7 +354,7 @@ class TestInstrumentImport:
 # ──────────────────────────────────────────────────────────────────────────────
 
 class TestWorklistExport:
-    def _import_rows(self, client, auth_headers, run_id):
+    def _import_rows(self, client, auth_headers, run_id, run_job):
         rows = [
             {"well_position": "A1", "row_data": {
                 "viability_pct": 92.3, "well": "A1",
@@ -364,12 +366,12 @@ class TestWorklistExport:
             json={"rows": rows},
             headers=auth_headers,
         )
-        assert r.status_code == 200
+        assert run_job(r)["imported"] == 1
 
     def test_worklist_csv_columns(self, client, auth_headers, running_run,
-                                   template_with_parser_and_worklist, db_session):
+                                   template_with_parser_and_worklist, db_session, run_job):
         run_id = running_run["id"]
-        self._import_rows(client, auth_headers, run_id)
+        self._import_rows(client, auth_headers, run_id, run_job)
         r = client.get(f"/v1/lims-runs/{run_id}/worklist", headers=auth_headers)
         assert r.status_code == 200
         assert r.headers["content-type"].startswith("text/csv")
@@ -465,7 +467,7 @@ class TestSopParseJobs:
         assert r.status_code == 404
 
     def _make_session_factory(self, db_engine):
-        """Return a SessionLocal-compatible callable backed by the test engine."""
+        """Return a BackgroundSessionLocal-compatible callable backed by the test engine."""
         from sqlalchemy.orm import sessionmaker
         return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
 
@@ -498,7 +500,7 @@ class TestSopParseJobs:
         job_id = self._seed_job(db_engine)
         SessionFactory = self._make_session_factory(db_engine)
 
-        with patch("app.database.SessionLocal", SessionFactory), \
+        with patch("app.database.BackgroundSessionLocal", SessionFactory), \
              patch("app.services.sop_parse_service.ANTHROPIC_API_KEY", "fake-key"), \
              patch("anthropic.Anthropic") as mock_cls:
             mock_instance = MagicMock()
@@ -536,7 +538,7 @@ class TestSopParseJobs:
                 pass  # skip super().__init__ to avoid complex constructor
             message = "rate limit exceeded"
 
-        with patch("app.database.SessionLocal", SessionFactory), \
+        with patch("app.database.BackgroundSessionLocal", SessionFactory), \
              patch("app.services.sop_parse_service.ANTHROPIC_API_KEY", "fake-key"), \
              patch("anthropic.Anthropic") as mock_cls:
             mock_instance = MagicMock()
@@ -571,7 +573,7 @@ class TestSopParseJobs:
         bad_response.content = [MagicMock()]
         bad_response.content[0].text = "This is definitely not JSON }{{"
 
-        with patch("app.database.SessionLocal", SessionFactory), \
+        with patch("app.database.BackgroundSessionLocal", SessionFactory), \
              patch("app.services.sop_parse_service.ANTHROPIC_API_KEY", "fake-key"), \
              patch("anthropic.Anthropic") as mock_cls:
             mock_instance = MagicMock()
@@ -201,6 +201,60 @@ def test_get_help_entries_pagination(client: TestClient, db: Session, admin_toke
         assert len(data2["help_entries"]) <= 2
 
 
+def test_get_help_entries_cursor_matches_offset_pages(client: TestClient, db: Session, admin_token: str):
+    """Test that following next_cursor visits the same entries, in order, as page/size"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    for i in range(5):
+        response = client.post(
+            "/help/admin/help",
+            json={"section": "Cursor Paging", "content": f"Entry {i}"},
+            headers=headers
+        )
+        assert response.status_code == 201
+    
+    params = {"section": "Cursor Paging", "size": 2}
+    offset_ids = []
+    for page in (1, 2, 3):
+        response = client.get("/help", params={**params, "page": page}, headers=headers)
+        assert response.status_code == 200
+        offset_ids += [e["id"] for e in response.json()["help_entries"]]
+    assert len(offset_ids) == 5
+    
+    cursor_ids = []
+    cursor = None
+    while True:
+        response = client.get(
+            "/help", params={**params, "count": "none", **({"cursor": cursor} if cursor else {})}, headers=headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        cursor_ids += [e["id"] for e in data["help_entries"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert cursor_ids == offset_ids
+
+
+def test_get_help_entries_count_modes(client: TestClient, db: Session, admin_token: str):
+    """Test count=exact|estimate|none and that a malformed cursor is a 400"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    
+    exact = client.get("/help?count=exact", headers=headers).json()
+    assert isinstance(exact["total"], int)
+    
+    estimate = client.get("/help?count=estimate", headers=headers).json()
+    assert isinstance(estimate["total"], int)
+    assert estimate["total"] >= 0
+    
+    none = client.get("/help?count=none", headers=headers).json()
+    assert none["total"] is None
+    assert none["pages"] is None
+    
+    assert client.get("/help?count=bogus", headers=headers).status_code == 422
+    assert client.get("/help?cursor=not-a-cursor", headers=headers).status_code == 400
+
+
 def test_public_help_entries_visible_to_all(client: TestClient, db: Session, admin_token: str, client_user_token: str):
     """Test that help entries with role_filter=NULL are visible to all roles"""
     headers_admin = {"Authorization": f"Bearer {admin_token}"}
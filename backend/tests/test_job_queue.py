@@ -0,0 +1,339 @@
+"""
+Durable job queue (app/services/job_queue.py):
+  - Retry policy helpers (no DB)
+  - Enqueue + dedupe, GET /v1/jobs/{id} visibility
+  - Worker side on committed sessions: claim order, tenant limit,
+    fail/backoff, ownership, stale requeue
+  - Staged job uploads (app/services/job_uploads.py): read-back, prune
+"""
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+
+from app.services import job_queue
+from app.services.job_handlers import execute_job
+from app.services.job_queue import JobQueue
+from app.services.job_uploads import open_upload, prune_uploads, stage_upload
+from models.client import Client
+from models.job import Job, JobStatus, JobUploadChunk
+
+TEST_KIND = "test.noop"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Retry policy
+# ──────────────────────────────────────────────────────────────────────────────
+
+def test_retry_delay_backs_off_exponentially_to_cap(monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_RETRY_BASE_SECONDS", 5)
+    monkeypatch.setattr(job_queue, "JOB_RETRY_MAX_SECONDS", 300)
+    assert [job_queue.retry_delay(n) for n in (1, 2, 3)] == [5, 10, 20]
+    assert job_queue.retry_delay(20) == 300
+
+
+def test_client_errors_are_permanent():
+    assert not job_queue.is_retryable(HTTPException(status_code=422, detail="bad"))
+    assert job_queue.is_retryable(HTTPException(status_code=503, detail="down"))
+    assert job_queue.is_retryable(RuntimeError("connection reset"))
+
+
+def test_error_payload_keeps_http_detail():
+    exc = HTTPException(status_code=409, detail={"code": "promotion_conflict"})
+    assert job_queue.error_payload(exc) == {"status_code": 409, "detail": {"code": "promotion_conflict"}}
+    assert job_queue.error_payload(ValueError("nope")) == {"status_code": 500, "detail": "ValueError: nope"}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# API side (request transaction)
+# ──────────────────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def admin_headers(client, test_admin_user):
+    r = client.post("/auth/login", json={"username": "admin", "password": "adminpassword"})
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.fixture
+def user_headers(client, test_user):
+    r = client.post("/auth/login", json={"username": "testuser", "password": "testpassword"})
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def test_enqueue_records_creator_and_client(db_session, test_user):
+    job = JobQueue(db_session).enqueue(TEST_KIND, {"n": 1}, user=test_user, priority=3)
+    assert job.status == JobStatus.queued
+    assert job.created_by == test_user.id
+    assert job.client_id == test_user.client_id
+    assert job.priority == 3
+    assert job.attempts == 0
+
+
+def test_enqueue_duplicate_key_conflicts(db_session, test_user):
+    queue = JobQueue(db_session)
+    queue.enqueue(TEST_KIND, {}, user=test_user, dedupe_key="test:run-1")
+    with pytest.raises(HTTPException) as exc:
+        queue.enqueue(TEST_KIND, {}, user=test_user, dedupe_key="test:run-1")
+    assert exc.value.status_code == 409
+    # Other keys are independent
+    queue.enqueue(TEST_KIND, {}, user=test_user, dedupe_key="test:run-2")
+
+
+def test_finished_job_releases_dedupe_key(db_session, test_user):
+    queue = JobQueue(db_session)
+    job = queue.enqueue(TEST_KIND, {}, user=test_user, dedupe_key="test:run-3")
+    job.status = JobStatus.succeeded
+    db_session.flush()
+    queue.enqueue(TEST_KIND, {}, user=test_user, dedupe_key="test:run-3")
+
+
+def test_get_job_visible_to_creator_and_admin(client, db_session, test_user, user_headers, admin_headers):
+    job = JobQueue(db_session).enqueue(TEST_KIND, {}, user=test_user)
+
+    r = client.get(f"/v1/jobs/{job.id}", headers=user_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["status"] == "queued"
+    assert r.json()["kind"] == TEST_KIND
+
+    r = client.get(f"/v1/jobs/{job.id}", headers=admin_headers)
+    assert r.status_code == 200
+
+
+def test_get_job_hidden_from_other_users(client, db_session, test_admin_user, user_headers):
+    job = JobQueue(db_session).enqueue(TEST_KIND, {}, user=test_admin_user)
+    r = client.get(f"/v1/jobs/{job.id}", headers=user_headers)
+    assert r.status_code == 404
+    r = client.get(f"/v1/jobs/{uuid4()}", headers=user_headers)
+    assert r.status_code == 404
+
+
+def test_unknown_kind_fails_permanently(db_session, test_user):
+    job = JobQueue(db_session).enqueue("test.missing", {}, user=test_user)
+    with pytest.raises(HTTPException) as exc:
+        execute_job(db_session, job)
+    assert exc.value.status_code == 422
+    assert not job_queue.is_retryable(exc.value)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Worker side (committed sessions, as the worker uses)
+# ──────────────────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def worker_sessions(db_engine):
+    """Sessions that really commit, like the worker's; jobs/clients they create are deleted after."""
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+    yield Session
+    db = Session()
+    try:
+        db.query(Job).filter(Job.kind.like("test.%")).delete(synchronize_session=False)
+        db.query(Client).filter(Client.name.like("JobQueue Test%")).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _add_job(Session, **fields):
+    db = Session()
+    try:
+        job = Job(kind=TEST_KIND, payload={}, **fields)
+        db.add(job)
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def _add_client(Session):
+    db = Session()
+    try:
+        org = Client(name=f"JobQueue Test {uuid4().hex[:8]}")
+        db.add(org)
+        db.commit()
+        return org.id
+    finally:
+        db.close()
+
+
+def _get(Session, job_id):
+    db = Session()
+    try:
+        return db.get(Job, job_id)
+    finally:
+        db.close()
+
+
+def _claim(Session, worker_id="w1", **kwargs):
+    db = Session()
+    try:
+        job = job_queue.claim_next(db, worker_id, **kwargs)
+        return job.id if job else None
+    finally:
+        db.close()
+
+
+def test_claim_takes_highest_priority_first(worker_sessions):
+    low = _add_job(worker_sessions, priority=-10)
+    high = _add_job(worker_sessions, priority=5)
+
+    assert _claim(worker_sessions) == high
+    assert _claim(worker_sessions) == low
+    assert _claim(worker_sessions) is None
+
+    claimed = _get(worker_sessions, high)
+    assert claimed.status == JobStatus.running
+    assert claimed.attempts == 1
+    assert claimed.worker_id == "w1"
+    assert claimed.heartbeat_at is not None
+
+
+def test_claim_skips_jobs_not_yet_due(worker_sessions):
+    _add_job(worker_sessions, run_after=datetime.now(timezone.utc) + timedelta(minutes=5))
+    assert _claim(worker_sessions) is None
+
+
+def test_claim_respects_tenant_concurrency(worker_sessions):
+    busy, other = _add_client(worker_sessions), _add_client(worker_sessions)
+    _add_job(worker_sessions, client_id=busy, status=JobStatus.running, worker_id="w0")
+    _add_job(worker_sessions, client_id=busy, priority=10)
+    waiting = _add_job(worker_sessions, client_id=other)
+
+    # busy already runs one job; with a limit of 1 the higher-priority job waits
+    assert _claim(worker_sessions, tenant_limit=1) == waiting
+    assert _claim(worker_sessions, tenant_limit=1) is None
+
+
+def test_retryable_failure_requeues_with_backoff(worker_sessions):
+    job_id = _add_job(worker_sessions, max_attempts=2)
+    assert _claim(worker_sessions) == job_id
+
+    db = worker_sessions()
+    try:
+        outcome = job_queue.fail(db, job_id, "w1", RuntimeError("r-calculator timeout"))
+    finally:
+        db.close()
+    assert outcome == JobStatus.queued
+    job = _get(worker_sessions, job_id)
+    assert job.worker_id is None
+    assert job.run_after > datetime.now(timezone.utc)
+    assert job.error["status_code"] == 500
+
+    # Second attempt exhausts max_attempts
+    db = worker_sessions()
+    try:
+        db.query(Job).filter(Job.id == job_id).update({"run_after": datetime.now(timezone.utc)})
+        db.commit()
+    finally:
+        db.close()
+    assert _claim(worker_sessions) == job_id
+    db = worker_sessions()
+    try:
+        outcome = job_queue.fail(db, job_id, "w1", RuntimeError("r-calculator timeout"))
+    finally:
+        db.close()
+    assert outcome == JobStatus.failed
+    assert _get(worker_sessions, job_id).attempts == 2
+
+
+def test_client_error_fails_immediately(worker_sessions):
+    job_id = _add_job(worker_sessions)
+    _claim(worker_sessions)
+    db = worker_sessions()
+    try:
+        outcome = job_queue.fail(
+            db, job_id, "w1", HTTPException(status_code=422, detail="Cannot fit: run status is 'draft'.")
+        )
+    finally:
+        db.close()
+    assert outcome == JobStatus.failed
+    job = _get(worker_sessions, job_id)
+    assert job.error == {"status_code": 422, "detail": "Cannot fit: run status is 'draft'."}
+    assert job.finished_at is not None
+
+
+def test_only_owning_worker_records_outcome(worker_sessions):
+    job_id = _add_job(worker_sessions)
+    _claim(worker_sessions, worker_id="w1")
+
+    db = worker_sessions()
+    try:
+        assert not job_queue.heartbeat(db, job_id, "w2")
+        job_queue.complete(db, job_id, "w2", {"ok": False})
+        progress = job_queue.JobProgress()
+        progress.update(3, 4, "Fitting")
+        assert job_queue.heartbeat(db, job_id, "w1", progress)
+        job_queue.complete(db, job_id, "w1", {"ok": True})
+    finally:
+        db.close()
+    job = _get(worker_sessions, job_id)
+    assert job.status == JobStatus.succeeded
+    assert job.result == {"ok": True}
+    assert (job.progress_current, job.progress_total, job.progress_message) == (3, 4, "Fitting")
+
+
+def test_stale_running_job_is_requeued(worker_sessions):
+    stale_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+    requeue = _add_job(
+        worker_sessions, status=JobStatus.running, worker_id="dead", heartbeat_at=stale_at, attempts=1
+    )
+    exhausted = _add_job(
+        worker_sessions, status=JobStatus.running, worker_id="dead", heartbeat_at=stale_at,
+        attempts=3, max_attempts=3,
+    )
+    fresh = _add_job(
+        worker_sessions, status=JobStatus.running, worker_id="alive",
+        heartbeat_at=datetime.now(timezone.utc), attempts=1,
+    )
+
+    db = worker_sessions()
+    try:
+        touched = set(job_queue.requeue_stale(db, stale_seconds=60))
+    finally:
+        db.close()
+    assert touched == {requeue, exhausted}
+    assert _get(worker_sessions, requeue).status == JobStatus.queued
+    assert _get(worker_sessions, exhausted).status == JobStatus.failed
+    assert _get(worker_sessions, fresh).status == JobStatus.running
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Staged uploads
+# ──────────────────────────────────────────────────────────────────────────────
+
+def test_staged_upload_reads_back_in_order(db_session):
+    data = bytes(range(256)) * 10
+    upload_id = stage_upload(db_session, BytesIO(data), chunk_bytes=1000)
+    assert db_session.query(JobUploadChunk).filter_by(upload_id=upload_id).count() == 3
+
+    stream = open_upload(db_session, upload_id)
+    assert stream.read(10) == data[:10]
+    assert stream.read() == data[10:]
+    assert stream.read() == b""
+    # An empty upload stages no chunks and reads back empty
+    assert open_upload(db_session, stage_upload(db_session, BytesIO(b""))).read() == b""
+
+
+def test_prune_uploads_keeps_files_of_active_jobs(worker_sessions):
+    db = worker_sessions()
+    try:
+        active = stage_upload(db, BytesIO(b"queued"))
+        done = stage_upload(db, BytesIO(b"finished"))
+        db.add(Job(kind=TEST_KIND, payload={"upload_id": str(active)}))
+        db.add(Job(kind=TEST_KIND, payload={"upload_id": str(done)}, status=JobStatus.succeeded))
+        db.commit()
+
+        prune_uploads(db)
+        remaining = {
+            row.upload_id
+            for row in db.query(JobUploadChunk).filter(JobUploadChunk.upload_id.in_((active, done)))
+        }
+        assert remaining == {active}
+    finally:
+        db.query(JobUploadChunk).filter(JobUploadChunk.upload_id == active).delete(synchronize_session=False)
+        db.commit()
+        db.close()
@@ -16,7 +16,7 @@ from app.core.security import create_access_token
 from app.core.name_generation import (
     generate_name, generate_name_for_sample, generate_name_for_project,
     generate_name_for_batch, generate_name_for_analysis, generate_name_for_container,
-    check_name_uniqueness
+    check_name_uniqueness, generate_names, NameContext, _compile
 )
 from datetime import datetime
 from uuid import uuid4
@@ -489,6 +489,59 @@ class TestNameGeneration:
         assert len(seq_part) == 4
         assert seq_part.isdigit()
 
+    def test_generate_names_reserves_one_block(self, db_session: Session, test_admin_user):
+        """generate_names draws N sequence values and checks uniqueness in one query each"""
+        from sqlalchemy import event
+
+        template = NameTemplate(
+            id=uuid4(),
+            name="test_template",
+            entity_type="sample",
+            template="BLK-{PROJECT}-{SEQ}",
+            active=True,
+            seq_padding_digits=3,
+            created_by=test_admin_user.id,
+            modified_by=test_admin_user.id
+        )
+        db_session.add(template)
+        db_session.commit()
+
+        statements = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", _before)
+        try:
+            names = generate_names(
+                db_session, "sample", 50, NameContext(values={"project_name": "P1"})
+            )
+        finally:
+            event.remove(bind, "before_cursor_execute", _before)
+
+        assert len(names) == 50 and len(set(names)) == 50
+        assert all(n.startswith("BLK-P1-") for n in names)
+        seqs = [int(n.rsplit("-", 1)[1]) for n in names]
+        assert seqs == sorted(seqs)
+        assert sum("nextval" in s for s in statements) == 1
+        assert sum("= ANY" in s for s in statements) == 1
+
+
+class TestCompiledTemplate:
+    """Template parsing is done once per template version (no DB)"""
+
+    def test_render_fills_known_and_leaves_unknown_placeholders(self):
+        compiled = _compile("{CLIENT}-{YY}{MM}-{SEQ}-{note}", 3)
+        assert compiled.has_seq
+        assert compiled.render({"CLIENT": "ACME", "YY": "26", "MM": "03", "SEQ": "007"}) == (
+            "ACME-2603-007-{note}"
+        )
+
+    def test_compile_is_cached_per_template_version(self):
+        assert _compile("A-{SEQ}", 2) is _compile("A-{SEQ}", 2)
+        assert _compile("A-{SEQ}", 2) is not _compile("A-{SEQ}", 3)
+
 
 class TestSequenceStartEndpoint:
     """Test POST /admin/sequences/{entity_type}/start"""
@@ -0,0 +1,196 @@
+"""
+In-process curve fitting (app/services/native_fit.py), ported from the
+r-calculator testthat suite (services/r-calculator/tests/test_fit.R).
+"""
+import math
+
+import numpy as np
+import pytest
+
+from app.services.native_fit import (
+    NativeFitClient,
+    assign_category,
+    derive_quality_flag,
+    detect_hook_effect,
+    fit_compound,
+    fit_result,
+)
+
+# Same fixture as test_fit.R. Its responses cross 50% between 123 and 370 nM:
+# the least-squares 4PL IC50 is ~153 nM, not the nominal 100 in the R comment.
+KNOWN_CONC = [10000, 3333, 1111, 370, 123, 41, 14, 4.6]
+KNOWN_RESPONSE = [97.5, 95.1, 87.3, 69.4, 45.2, 20.1, 8.3, 3.1]
+KNOWN_IC50 = 153.13
+
+
+def _log_logistic(conc, b, c, d, e, f=1.0):
+    x = np.asarray(conc, float)
+    return c + (d - c) / (1 + np.exp(b * (np.log(x) - np.log(e)))) ** f
+
+
+def _rss(conc, response, b, c, d, e, f=1.0):
+    resid = np.asarray(response, float) - _log_logistic(conc, b, c, d, e, f)
+    return float(resid @ resid)
+
+
+class TestFitCompound:
+    def test_4pl_known_dataset(self):
+        result = fit_compound(KNOWN_CONC, KNOWN_RESPONSE, model="4PL")
+        assert result["success"]
+        assert abs(result["potency"] - KNOWN_IC50) / KNOWN_IC50 < 0.01
+        assert result["r_squared"] > 0.99
+        assert result["ci_low_95"] < result["potency"] < result["ci_high_95"]
+        assert result["ci_method"] in ("profiled", "vcov")
+
+    def test_4pl_is_a_least_squares_minimum(self):
+        result = fit_compound(KNOWN_CONC, KNOWN_RESPONSE, model="4PL")
+        params = [result[k] for k in ("hill_slope", "bottom", "top", "potency")]
+        best = _rss(KNOWN_CONC, KNOWN_RESPONSE, *params)
+        for i in range(4):
+            for factor in (0.99, 1.01):
+                nudged = list(params)
+                nudged[i] *= factor
+                assert _rss(KNOWN_CONC, KNOWN_RESPONSE, *nudged) >= best
+
+    @pytest.mark.parametrize(
+        "model,params",
+        [
+            ("4PL", dict(b=-1.3, c=2.0, d=95.0, e=40.0)),
+            ("3PL_FB", dict(b=-0.8, c=0.0, d=90.0, e=300.0)),
+            ("3PL_FT", dict(b=-1.1, c=5.0, d=100.0, e=12.0)),
+            ("5PL", dict(b=-1.5, c=1.0, d=98.0, e=60.0, f=0.6)),
+        ],
+    )
+    def test_recovers_exact_curves(self, model, params):
+        conc = [10000 / 3**i for i in range(10)]
+        response = _log_logistic(conc, **params)
+        result = fit_compound(conc, response.tolist(), model=model)
+        assert result["success"]
+        assert result["potency"] == pytest.approx(params["e"], rel=1e-4)
+        assert result["hill_slope"] == pytest.approx(params["b"], rel=1e-4)
+        assert result["bottom"] == pytest.approx(params["c"], abs=1e-3)
+        assert result["top"] == pytest.approx(params["d"], abs=1e-3)
+
+    def test_empty_and_short_inputs_fail_gracefully(self):
+        assert fit_compound([], [])["error"]
+        assert not fit_compound([100], [50])["success"]
+        three = fit_compound([100, 33, 11], [80, 50, 20])
+        assert not three["success"]
+        assert three["error"] == "Insufficient data points: 3 (minimum 4 required)"
+
+    def test_parameter_constraints_are_applied(self):
+        result = fit_compound(
+            KNOWN_CONC,
+            KNOWN_RESPONSE,
+            model="4PL",
+            constraints={"bottom": {"min": 0, "max": 20}, "top": {"min": 80, "max": 120}},
+        )
+        assert result["success"]
+        assert 0 <= result["bottom"] <= 20
+        assert 80 <= result["top"] <= 120
+
+    def test_binding_constraint_holds_at_bound(self):
+        result = fit_compound(
+            KNOWN_CONC, KNOWN_RESPONSE, constraints={"top": {"max": 90}}
+        )
+        assert result["top"] == pytest.approx(90)
+
+    def test_vcov_interval_when_profile_does_not_close(self):
+        # Only the bottom of the curve is sampled: the IC50 is barely identified
+        conc = [1, 2, 4, 8, 16]
+        response = [1.0, 2.1, 3.9, 8.2, 15.5]
+        result = fit_compound(conc, response)
+        if result["success"] and result["ci_method"] == "vcov":
+            se = (result["ci_high_95"] - result["potency"]) / 1.96
+            assert result["ci_low_95"] == pytest.approx(result["potency"] - 1.96 * se)
+
+    def test_non_positive_concentration_fails(self):
+        result = fit_compound([0, 1, 10, 100], [0, 10, 50, 90])
+        assert not result["success"]
+
+
+class TestCategories:
+    def test_partial_high_beats_noisy(self):
+        conc = [10, 3.3, 1.1, 0.37]
+        response = [30, 25, 20, 18]
+        config = {"r_squared_threshold": 0.9, "inactive_threshold": 10}
+        category = assign_category(fit_compound(conc, response), conc, response, config)
+        assert category != "NOISY"
+
+    def test_flat_response_is_inactive_or_cannot_fit(self):
+        response = [5, 6, 4, 5, 6, 5, 4, 5]
+        config = {"r_squared_threshold": 0.9, "inactive_threshold": 20}
+        fit = fit_compound(KNOWN_CONC, response)
+        assert assign_category(fit, KNOWN_CONC, response, config) in ("INACTIVE", "CANNOT_FIT")
+
+    def test_increasing_with_concentration_is_inverse(self):
+        response = [5, 10, 20, 40, 60, 75, 88, 95]
+        config = {"r_squared_threshold": 0.9, "inactive_threshold": 20}
+        fit = fit_compound(KNOWN_CONC, response)
+        assert assign_category(fit, KNOWN_CONC, response, config) == "INVERSE"
+
+    def test_known_dataset_is_sigmoid(self):
+        fit = fit_compound(KNOWN_CONC, KNOWN_RESPONSE)
+        assert assign_category(fit, KNOWN_CONC, KNOWN_RESPONSE, {}) == "SIGMOID"
+
+    def test_hook_effect_detection(self):
+        # test_fit.R's hook fixture peaks at 95 with 92.5 at the top two
+        # concentrations (a 2.6% drop), which category.R itself does not flag
+        assert not detect_hook_effect([10000, 3333, 1111, 370, 123], [90, 95, 85, 60, 20])
+        assert detect_hook_effect([10000, 3333, 1111, 370, 123], [60, 70, 95, 60, 20])
+        assert not detect_hook_effect([1000, 100, 10, 1], [90, 60, 30, 10])
+        assert not detect_hook_effect([10000, 3333, 1111, 370, 123], [95, 80, 55, 30, 10])
+
+    def test_quality_flags(self):
+        expected = {
+            "SIGMOID": "valid",
+            "PARTIAL_HIGH": "gt_max_conc",
+            "PARTIAL_LOW": "lt_min_conc",
+            "INACTIVE": "inactive",
+            "CANNOT_FIT": "cannot_calculate",
+            "NOISY": "review_required",
+            "INVERSE": "review_required",
+            "HOOK_EFFECT": "review_required",
+        }
+        for category, flag in expected.items():
+            assert derive_quality_flag(category) == flag
+
+
+class TestNativeFitClient:
+    @staticmethod
+    def _compounds(n_ok, n_empty):
+        points = [
+            {"conc": c, "response": r, "point_id": str(i)}
+            for i, (c, r) in enumerate(zip(KNOWN_CONC, KNOWN_RESPONSE))
+        ]
+        return [
+            {"sample_id": f"s{i}", "points": points if i < n_ok else [], "model": "4PL"}
+            for i in range(n_ok + n_empty)
+        ]
+
+    def test_result_shape_matches_r_service(self):
+        result = fit_result(self._compounds(1, 0)[0], {})
+        assert set(result) == {
+            "sample_id", "success", "potency", "potency_type", "hill_slope", "top",
+            "bottom", "r_squared", "ci_low_95", "ci_high_95", "ci_method",
+            "curve_category", "quality_flag", "thumbnail_svg", "error",
+        }
+        assert result["potency_type"] == "IC50"
+        assert result["error"] is None
+
+    def test_batch_of_ten_eight_succeed_two_fail(self):
+        results = NativeFitClient(max_workers=0).fit(self._compounds(8, 2), {})
+        assert [r["success"] for r in results] == [True] * 8 + [False] * 2
+        assert results[-1]["curve_category"] == "CANNOT_FIT"
+        assert results[-1]["quality_flag"] == "cannot_calculate"
+        assert results[-1]["potency"] is None
+
+    def test_process_pool_matches_inline(self):
+        compounds = self._compounds(10, 2)
+        inline = NativeFitClient(max_workers=0).fit(compounds, {})
+        pooled = NativeFitClient(max_workers=2).fit(compounds, {})
+        assert [r["sample_id"] for r in pooled] == [c["sample_id"] for c in compounds]
+        for a, b in zip(inline, pooled):
+            assert a["curve_category"] == b["curve_category"]
+            if a["success"]:
+                assert math.isclose(a["potency"], b["potency"], rel_tol=1e-12)
@@ -1,4 +1,20 @@
-"""Parser engine: definition-driven errors with line/column diagnostics."""
+"""
+Parser engine: definition-driven errors with line/column diagnostics.
+
+The throughput benchmark parses a 100k-row plate-reader export through the
+compiled plan (iter_records, the import path); it only runs with
+``pytest --benchmark``.
+"""
+import io
+import itertools
+import time
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import instrument_data_service
 from app.services.instrument_data_service import InstrumentDataService, ParserEngine
 
 
@@ -75,3 +91,198 @@ def test_fluidx_suite_still_clean():
     files = [(p.name, p.read_bytes()) for p in sorted(root.glob("test*.csv"))]
     reps = ParserEngine().run_test_suite(_cfg(), files)
     assert all(r.ok for r in reps)
+
+
+class _GeneratedPlate(io.RawIOBase):
+    """Readable stream of `rows` CSV lines produced on demand (never held in memory)."""
+
+    def __init__(self, rows: int):
+        self._lines = itertools.chain(
+            [b"Well,Value\n"],
+            (f"W{i % 9999},{i * 0.5}\n".encode() for i in range(rows)),
+        )
+        self._buf = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while len(self._buf) < len(b):
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buf += line
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+
+def _value_cfg():
+    return _cfg(
+        columns=[
+            {"source_col": "Well", "field_name": "well_position", "data_type": "string"},
+            {"source_col": "Value", "field_name": "raw_value", "data_type": "float"},
+        ],
+    )
+
+
+def test_iter_rows_matches_parse_across_chunk_boundaries(monkeypatch):
+    from app.services import instrument_data_service
+
+    monkeypatch.setattr(instrument_data_service, "READ_CHUNK_BYTES", 3)
+    data = 'Well,Value\r\nA01,1.5\r\n"B\n01",2\r\n\r\nC01,µ\r\nD01,4\n'.encode()
+    svc = InstrumentDataService(_value_cfg())
+    rows, warnings, hard = svc.parse(data, raise_on_hard=False)
+
+    streamed_hard, streamed_warnings = [], []
+    streamed = list(svc.iter_rows(io.BytesIO(data), streamed_hard, streamed_warnings))
+    assert streamed == rows
+    assert (streamed_warnings, streamed_hard) == (warnings, hard)
+    assert any("line 5" in e and "Value" in e for e in hard)
+
+
+def test_iter_rows_reports_absolute_decode_offset(monkeypatch):
+    from app.services import instrument_data_service
+
+    monkeypatch.setattr(instrument_data_service, "READ_CHUNK_BYTES", 4)
+    data = b"Well,Value\nA01,1\nB01,\xff\n"
+    hard = []
+    list(InstrumentDataService(_value_cfg()).iter_rows(io.BytesIO(data), hard, []))
+    assert hard[-1] == "file is not valid utf-8 (decode error at byte 21: invalid start byte)"
+
+
+def test_iter_rows_memory_is_flat_in_file_size():
+    svc = InstrumentDataService(_value_cfg())
+    peaks = {}
+    for rows in (20_000, 100_000):
+        hard = []
+        tracemalloc.start()
+        count = sum(1 for _ in svc.iter_rows(io.BufferedReader(_GeneratedPlate(rows)), hard, []))
+        peaks[rows] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert count == rows and not hard
+    # 5x the rows (both well past one read chunk), same working set
+    assert peaks[100_000] < peaks[20_000] * 1.1
+
+
+def test_short_rows_and_repeated_headers_match_dict_lookup():
+    cfg = _cfg(
+        well_col=None,
+        columns=[
+            {"source_col": "Well", "field_name": "well", "data_type": "string"},
+            {"source_col": "Value", "field_name": "value", "data_type": "integer"},
+            {"source_col": "Flag", "field_name": "flag", "data_type": "boolean"},
+        ],
+    )
+    csv = b"Well,Value,Value,Flag\nA01,1,2,Yes\nB01,3\n"
+    pr = InstrumentDataService(cfg).parse_report(csv)
+    assert pr.ok
+    # A repeated header reads its last cell within the row; cells past the end are null
+    assert pr.preview_rows == [
+        {"well": "A01", "value": 2, "flag": True},
+        {"well": "B01", "value": 3, "flag": None},
+    ]
+
+
+def test_boolean_and_integer_errors_keep_diagnostics():
+    cfg = _cfg(
+        well_col=None,
+        columns=[
+            {"source_col": "Count", "field_name": "count", "data_type": "integer"},
+            {"source_col": "Flag", "field_name": "flag", "data_type": "boolean"},
+        ],
+    )
+    pr = InstrumentDataService(cfg).parse_report(b"Count,Flag\n1.5,maybe\n")
+    assert pr.hard_errors[:2] == [
+        "line 2, column 'Count': integer expected, got '1.5' (data_type=integer, value='1.5')",
+        "line 2, column 'Flag': boolean expected (true/false/0/1), got 'maybe' "
+        "(data_type=boolean, value='maybe')",
+    ]
+
+
+def test_iter_records_matches_iter_rows():
+    data = b"Well,Value\nA01,1.5\n\nB01,\n"
+    svc = InstrumentDataService(_value_cfg())
+    rows = list(svc.iter_rows(io.BytesIO(data), [], []))
+    records = list(svc.iter_records(io.BytesIO(data), [], []))
+    assert records == [row.model_dump() for row in rows]
+
+
+def test_plan_is_compiled_once_per_parser_version(monkeypatch):
+    compiled = []
+    real_compile = instrument_data_service.compile_parser_config
+
+    def counting_compile(config):
+        compiled.append(config)
+        return real_compile(config)
+
+    monkeypatch.setattr(instrument_data_service, "compile_parser_config", counting_compile)
+    parser = SimpleNamespace(id=uuid.uuid4(), version=1, parser_config=_value_cfg())
+    first = InstrumentDataService.for_parser(parser)
+    again = InstrumentDataService.for_parser(parser)
+    assert first._plan is again._plan
+    assert len(compiled) == 1
+
+    newer = InstrumentDataService.for_parser(SimpleNamespace(**{**vars(parser), "version": 2}))
+    assert newer._plan is not first._plan
+    assert len(compiled) == 2
+
+
+def _plate_reader_export(rows: int) -> bytes:
+    lines = ["Well,Sample,Content,Raw 485,Raw 520,Ratio,Flag,Cycle"]
+    for i in range(rows):
+        well = f"{'ABCDEFGHIJKLMNOP'[(i // 24) % 16]}{i % 24 + 1:02d}"
+        raw_485, raw_520 = 1000 + i % 977, 2000 + i % 613
+        lines.append(
+            f"{well},S{i % 1000},Sample X{i % 7},{raw_485},{raw_520},"
+            f"{raw_485 / raw_520:.6f},{'true' if i % 5 else 'false'},{i % 40}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+_PLATE_READER_COLUMNS = [
+    {"source_col": "Well", "field_name": "well", "data_type": "string"},
+    {"source_col": "Sample", "field_name": "sample", "data_type": "string"},
+    {"source_col": "Content", "field_name": "content", "data_type": "string"},
+    {"source_col": "Raw 485", "field_name": "raw_485", "data_type": "float"},
+    {"source_col": "Raw 520", "field_name": "raw_520", "data_type": "float"},
+    {"source_col": "Ratio", "field_name": "ratio", "data_type": "float"},
+    {"source_col": "Flag", "field_name": "flag", "data_type": "boolean"},
+    {"source_col": "Cycle", "field_name": "cycle", "data_type": "integer"},
+]
+
+
+def test_plate_reader_export_records():
+    svc = InstrumentDataService(_cfg(columns=_PLATE_READER_COLUMNS))
+    hard = []
+    records = list(svc.iter_records(io.BytesIO(_plate_reader_export(1536)), hard, []))
+    assert len(records) == 1536 and not hard
+    assert records[25] == {
+        "container_id": None,
+        "well_position": "B02",
+        "sample_id": None,
+        "row_data": {
+            "well": "B02",
+            "sample": "S25",
+            "content": "Sample X4",
+            "raw_485": 1025.0,
+            "raw_520": 2025.0,
+            "ratio": float(f"{1025 / 2025:.6f}"),
+            "flag": False,
+            "cycle": 25,
+        },
+    }
+
+
+@pytest.mark.benchmark
+def test_plate_reader_export_throughput_benchmark():
+    """Benchmark (--benchmark): 100k-row export through iter_records, the import path"""
+    svc = InstrumentDataService(_cfg(columns=_PLATE_READER_COLUMNS))
+    data = _plate_reader_export(100_000)
+    hard = []
+    started = time.perf_counter()
+    count = sum(1 for _ in svc.iter_records(io.BytesIO(data), hard, []))
+    elapsed = time.perf_counter() - started
+    assert count == 100_000 and not hard
+    assert count / elapsed > 50_000
@@ -344,6 +344,11 @@ class TestProjectsAPI:
         data = response.json()
         assert data["page"] == 2
     
+    def test_get_projects_invalid_cursor(self, db_session, auth_headers):
+        """Test that a malformed cursor is a 400, not a 500"""
+        response = client.get("/projects/?cursor=not-a-cursor", headers=auth_headers)
+        assert response.status_code == 400
+    
     def test_get_project(self, db_session, auth_headers, sample_user, test_client, test_status):
         """Test getting a single project"""
         # Create a project
@@ -0,0 +1,98 @@
+"""
+Pooled, sharded r-calculator client against local fake R instances.
+
+The 1k-compound benchmark compares fit wall time on one instance against
+four: with Plumber fitting one request at a time, it should scale with the
+instance count.
+"""
+import time
+from contextlib import ExitStack
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.r_calculator_client import RCalculatorClient
+from tests.fixtures.fake_r_calculator import FakeRCalculator
+
+
+def _compounds(n):
+    return [{"sample_id": f"s{i}", "points": [], "model": "4PL"} for i in range(n)]
+
+
+def _client(fakes, **kwargs):
+    return RCalculatorClient(endpoints=[f.url for f in fakes], **kwargs)
+
+
+class TestShardedFit:
+    def test_results_merge_in_payload_order(self):
+        with FakeRCalculator() as a, FakeRCalculator() as b:
+            client = _client([a, b], chunk_size=3)
+            results = client.fit(_compounds(20), {})
+            client.close()
+        assert [r["sample_id"] for r in results] == [f"s{i}" for i in range(20)]
+        assert a.fit_batches and b.fit_batches
+        assert max(len(batch) for batch in a.fit_batches + b.fit_batches) == 3
+
+    def test_connections_are_reused_across_fits(self):
+        with FakeRCalculator() as fake:
+            client = _client([fake], chunk_size=100)
+            client.fit(_compounds(5), {})
+            client.fit(_compounds(5), {})
+            client.close()
+        assert fake.connections == 1
+
+    def test_failed_chunk_is_retried_on_another_instance(self):
+        with FakeRCalculator() as a, FakeRCalculator() as b:
+            a.fail_next = 1
+            client = _client([a, b], chunk_size=5, retries=1)
+            results = client.fit(_compounds(5), {})
+            client.close()
+        assert len(results) == 5
+        assert b.fit_batches == [[f"s{i}" for i in range(5)]]
+
+    def test_timed_out_chunk_is_retried(self):
+        with FakeRCalculator() as a, FakeRCalculator() as b:
+            a.hang_next = 1.0
+            client = _client([a, b], chunk_size=5, timeout=0.3, retries=1)
+            assert len(client.fit(_compounds(5), {})) == 5
+            client.close()
+
+    def test_exhausted_retries_raise_503(self):
+        with FakeRCalculator() as fake:
+            fake.fail_next = 3
+            client = _client([fake], chunk_size=5, retries=2)
+            with pytest.raises(HTTPException) as exc_info:
+                client.fit(_compounds(10), {})
+            client.close()
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.detail == "Calculation service error: 500"
+
+    def test_unreachable_instance_is_skipped(self):
+        with FakeRCalculator() as fake:
+            client = RCalculatorClient(
+                endpoints=["http://127.0.0.1:9", fake.url], chunk_size=2, retries=1
+            )
+            assert len(client.fit(_compounds(8), {})) == 8
+            client.close()
+        assert sum(len(batch) for batch in fake.fit_batches) == 8
+
+
+class TestShardingBenchmark:
+    def _wall_time(self, instances, n=1000):
+        with ExitStack() as stack:
+            fakes = [
+                stack.enter_context(FakeRCalculator(delay_per_compound=0.001))
+                for _ in range(instances)
+            ]
+            client = _client(fakes, chunk_size=25)
+            started = time.perf_counter()
+            results = client.fit(_compounds(n), {})
+            elapsed = time.perf_counter() - started
+            client.close()
+        assert len(results) == n
+        return elapsed
+
+    def test_four_instances_fit_1k_compounds_faster(self):
+        one = self._wall_time(1)
+        four = self._wall_time(4)
+        assert four < one / 2.5
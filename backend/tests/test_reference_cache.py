@@ -0,0 +1,239 @@
+"""
+Per-process reference-data cache (lists, units, container types, analyses).
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core import reference_cache as reference_module
+from app.core.conditional import etag_matches
+from app.core.reference_cache import (
+    LISTS,
+    ReferenceDataCache,
+    find_list_entry,
+    invalidate_reference_data,
+    list_entry_ids,
+)
+from models.list import List as ListModel, ListEntry
+
+
+class _CountingLoader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, db):
+        self.calls += 1
+        return {"fill": self.calls}
+
+
+def _statements_during(db_session: Session, fn):
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", _before)
+    try:
+        fn()
+    finally:
+        event.remove(bind, "before_cursor_execute", _before)
+    return statements
+
+
+@pytest.fixture
+def counting_loader(monkeypatch):
+    loader = _CountingLoader()
+    monkeypatch.setitem(reference_module._LOADERS, LISTS, loader)
+    return loader
+
+
+class TestReferenceDataCache:
+    def test_hit_skips_loader(self, counting_loader):
+        cache = ReferenceDataCache(ttl_seconds=60)
+        assert cache.get(None, LISTS) == {"fill": 1}
+        assert cache.get(None, LISTS) == {"fill": 1}
+        assert counting_loader.calls == 1
+
+    def test_invalidate_bumps_version_and_reloads(self, counting_loader):
+        cache = ReferenceDataCache(ttl_seconds=60)
+        cache.get(None, LISTS)
+        version = cache.version(LISTS)
+        cache.invalidate(LISTS)
+        assert cache.version(LISTS) == version + 1
+        assert cache.get(None, LISTS) == {"fill": 2}
+
+    def test_fill_started_before_invalidation_is_not_stored(self, monkeypatch):
+        cache = ReferenceDataCache(ttl_seconds=60)
+
+        def racing_loader(db):
+            # An admin write lands while this load is in flight
+            cache.invalidate(LISTS)
+            return {"stale": True}
+
+        monkeypatch.setitem(reference_module._LOADERS, LISTS, racing_loader)
+        assert cache.get(None, LISTS) == {"stale": True}
+        assert LISTS not in cache._entries
+
+    def test_entries_expire_after_ttl(self, counting_loader):
+        cache = ReferenceDataCache(ttl_seconds=0.01)
+        cache.get(None, LISTS)
+        time.sleep(0.02)
+        cache.get(None, LISTS)
+        assert counting_loader.calls == 2
+
+    def test_zero_ttl_disables_cache(self, counting_loader):
+        cache = ReferenceDataCache(ttl_seconds=0)
+        cache.get(None, LISTS)
+        cache.get(None, LISTS)
+        assert counting_loader.calls == 2
+
+
+class _PendingSession:
+    """Just enough Session for invalidate_reference_data: info + execute."""
+
+    def __init__(self):
+        self.info = {}
+
+    def execute(self, statement, params=None):
+        pass
+
+
+class TestPendingWrites:
+    @pytest.fixture
+    def cache(self, monkeypatch, counting_loader):
+        cache = ReferenceDataCache(ttl_seconds=60)
+        monkeypatch.setattr(reference_module, "reference_cache", cache)
+        return cache
+
+    def test_session_with_uncommitted_writes_reads_uncached(self, cache, counting_loader):
+        db = _PendingSession()
+        invalidate_reference_data(db, LISTS)
+        cache.get(db, LISTS)
+        cache.get(db, LISTS)
+        assert counting_loader.calls == 2
+        # A rolled-back row must never have been snapshotted
+        assert LISTS not in cache._entries
+
+        reference_module._forget_pending_writes(db)
+        assert cache.get(db, LISTS) == {"fill": 3}
+        assert cache.get(db, LISTS) == {"fill": 3}
+
+    def test_commit_invalidates_again(self, cache, counting_loader):
+        db = _PendingSession()
+        invalidate_reference_data(db, LISTS)
+        # Another session caches the pre-commit rows meanwhile
+        cache.get(None, LISTS)
+        version = cache.version(LISTS)
+        reference_module._invalidate_committed_writes(db)
+        assert cache.version(LISTS) == version + 1
+        assert cache.get(db, LISTS) == {"fill": 2}
+
+
+class TestReferenceLookups:
+    @pytest.fixture
+    def status_list(self, db_session: Session):
+        status_list = ListModel(name="cache_test_status", description="Cache test statuses")
+        db_session.add(status_list)
+        db_session.flush()
+        for name, active in (("Open", True), ("Closed", True), ("Retired", False)):
+            db_session.add(ListEntry(list_id=status_list.id, name=name, active=active))
+        db_session.flush()
+        return status_list
+
+    def test_lookups_by_name_respect_active(self, db_session: Session, status_list):
+        assert find_list_entry(db_session, "cache_test_status", "Open").list_id == status_list.id
+        assert find_list_entry(db_session, "cache_test_status", "Retired") is None
+        assert find_list_entry(db_session, "cache_test_status", "Retired", active_only=False)
+        ids = list_entry_ids(db_session, "cache_test_status", ["Closed", "Missing", "Open"])
+        assert [find_list_entry(db_session, "cache_test_status", n).id for n in ("Closed", "Open")] == ids
+
+    def test_warm_lookup_issues_no_queries(self, db_session: Session, status_list):
+        find_list_entry(db_session, "cache_test_status", "Open")
+        statements = _statements_during(
+            db_session, lambda: find_list_entry(db_session, "cache_test_status", "Closed")
+        )
+        assert statements == []
+
+    def test_invalidate_sends_notify_on_session(self, db_session: Session, status_list):
+        statements = _statements_during(
+            db_session, lambda: invalidate_reference_data(db_session, LISTS)
+        )
+        assert any("pg_notify" in s for s in statements)
+
+    def test_list_entry_update_is_visible_immediately(
+        self, client: TestClient, db_session: Session, status_list, admin_token
+    ):
+        open_entry = find_list_entry(db_session, "cache_test_status", "Open")
+        r = client.patch(
+            f"/lists/cache_test_status/entries/{open_entry.id}",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"name": "Reopened"},
+        )
+        assert r.status_code == 200
+        assert find_list_entry(db_session, "cache_test_status", "Open") is None
+        assert find_list_entry(db_session, "cache_test_status", "Reopened").id == open_entry.id
+
+
+class TestEtagMatches:
+    def test_weak_and_listed_validators_match(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"abd"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+
+class TestConditionalGet:
+    def test_lists_etag_round_trip_skips_database(
+        self, client: TestClient, db_session: Session, admin_token
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        first = client.get("/lists", headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert not etag.startswith("W/")
+        db_session.expunge_all()
+
+        responses = []
+        statements = _statements_during(
+            db_session,
+            lambda: responses.append(
+                client.get("/lists", headers={**headers, "If-None-Match": etag})
+            ),
+        )
+        assert responses[0].status_code == 304
+        assert responses[0].headers["etag"] == etag
+        assert not any("from lists" in s.lower() for s in statements)
+
+    def test_list_entry_change_changes_etag(
+        self, client: TestClient, db_session: Session, admin_token
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        status_list = ListModel(name="etag_test_list", description="ETag test")
+        db_session.add(status_list)
+        db_session.flush()
+        etag = client.get("/lists", headers=headers).headers["etag"]
+
+        r = client.post(
+            "/lists/etag_test_list/entries", headers=headers, json={"name": "New entry"}
+        )
+        assert r.status_code == 201
+
+        r = client.get("/lists", headers={**headers, "If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.headers["etag"] != etag
+        listed = next(l for l in r.json() if l["name"] == "etag_test_list")
+        assert [e["name"] for e in listed["entries"]] == ["New entry"]
+
+    def test_other_reference_endpoints_answer_304(self, client: TestClient, admin_token):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        for path in ("/units", "/analyses", "/analytes", "/test-batteries", "/containers/types"):
+            first = client.get(path, headers=headers)
+            assert first.status_code == 200, path
+            again = client.get(path, headers={**headers, "If-None-Match": first.headers["etag"]})
+            assert again.status_code == 304, path
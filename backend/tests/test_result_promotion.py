@@ -2,6 +2,7 @@
 import pytest
 from uuid import uuid4
 from datetime import datetime, timedelta
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 
@@ -127,6 +128,7 @@ class TestResultPromotion:
         template_id,
         db_session,
         test_admin_user,
+        run_job,
     ):
         from models.flexible_experiment import InstrumentParser
 
@@ -177,7 +179,7 @@ class TestResultPromotion:
             },
             headers=auth_headers,
         )
-        assert r.status_code == 200, r.text
+        assert run_job(r)["imported"] == 1
 
         # Preview (dry-run; known keys like units are silently ignored, not unresolved)
         r = client.get(f"/v1/lims-runs/{run_id}/promotion/preview", headers=auth_headers)
@@ -199,8 +201,7 @@ class TestResultPromotion:
         r = client.patch(f"/v1/lims-runs/{run_id}/review", headers=auth_headers)
         assert r.status_code == 200, r.text
         r = client.patch(f"/v1/lims-runs/{run_id}/complete", headers=auth_headers)
-        assert r.status_code == 200, r.text
-        assert r.json()["status"] == "published"
+        assert run_job(r)["status"] == "published"
 
         # Results exist
         r = client.get("/results/", headers=auth_headers, params={"page": 1, "size": 50})
@@ -211,7 +212,7 @@ class TestResultPromotion:
         assert "0.4" in raws
 
     def test_publish_without_analysis_no_promote(
-        self, client: TestClient, auth_headers, template_id
+        self, client: TestClient, auth_headers, template_id, run_job
     ):
         r = client.post(
             "/v1/lims-runs",
@@ -231,8 +232,7 @@ class TestResultPromotion:
         r = client.patch(f"/v1/lims-runs/{run_id}/review", headers=auth_headers)
         assert r.status_code == 200
         r = client.patch(f"/v1/lims-runs/{run_id}/complete", headers=auth_headers)
-        assert r.status_code == 200
-        assert r.json()["status"] == "published"
+        assert run_job(r)["status"] == "published"
 
     def test_conflict_blocks_publish(
         self,
@@ -243,6 +243,7 @@ class TestResultPromotion:
         template_id,
         db_session,
         test_admin_user,
+        run_job,
     ):
         """Manual/other-run result for same (test, analyte, rep) → 409 on publish."""
         from models.flexible_experiment import InstrumentParser
@@ -326,7 +327,7 @@ class TestResultPromotion:
             },
             headers=auth_headers,
         )
-        assert r.status_code == 200, r.text
+        assert run_job(r)["imported"] == 1
 
         preview = client.get(
             f"/v1/lims-runs/{run_id}/promotion/preview", headers=auth_headers
@@ -335,6 +336,105 @@ class TestResultPromotion:
 
         assert client.patch(f"/v1/lims-runs/{run_id}/review", headers=auth_headers).status_code == 200
         r = client.patch(f"/v1/lims-runs/{run_id}/complete", headers=auth_headers)
-        assert r.status_code == 409, r.text
-        body = r.json()["detail"]
-        assert body.get("code") == "promotion_conflict"
+        with pytest.raises(HTTPException) as exc:
+            run_job(r)
+        assert exc.value.status_code == 409
+        assert exc.value.detail.get("code") == "promotion_conflict"
+
+
+class TestPromotionScaling:
+    """plan_promotion / apply_plan issue a bounded number of statements per run."""
+
+    def _run_with_rows(self, db_session, test_admin_user, analysis_and_analyte, sample_id, wells):
+        from uuid import UUID
+        from sqlalchemy import insert
+        from models.experiment import ExperimentTemplate
+        from models.flexible_experiment import LimsRun, LimsRunData
+        from models.sample import Sample
+
+        template = ExperimentTemplate(
+            name=f"Tpl {uuid4().hex[:8]}",
+            template_definition={},
+            created_by=test_admin_user.id,
+            modified_by=test_admin_user.id,
+        )
+        db_session.add(template)
+        db_session.flush()
+        run = LimsRun(
+            name=f"RunS {uuid4().hex[:8]}",
+            experiment_template_id=template.id,
+            analysis_id=UUID(analysis_and_analyte["analysis_id"]),
+            created_by=test_admin_user.id,
+            modified_by=test_admin_user.id,
+        )
+        db_session.add(run)
+        db_session.flush()
+
+        # Plate of samples cloned from the fixture sample's project/types
+        proto = db_session.query(Sample).filter(Sample.id == UUID(sample_id)).one()
+        sample_rows = [
+            {
+                "id": uuid4(),
+                "name": f"W{wells}-{i}-{uuid4().hex[:6]}",
+                "sample_type": proto.sample_type,
+                "status": proto.status,
+                "matrix": proto.matrix,
+                "project_id": proto.project_id,
+            }
+            for i in range(wells)
+        ]
+        db_session.execute(insert(Sample.__table__), sample_rows)
+        db_session.execute(
+            insert(LimsRunData.__table__),
+            [
+                {
+                    "lims_run_id": run.id,
+                    "sample_id": row["id"],
+                    "row_data": {
+                        "Pb_ug_L": "1.5",
+                        analysis_and_analyte["arsenic_name"]: "0.2",
+                        "units": "ug/L",
+                    },
+                }
+                for row in sample_rows
+            ],
+        )
+        db_session.commit()
+        return run
+
+    def test_statement_count_does_not_scale_with_rows(
+        self, db_session, test_admin_user, analysis_and_analyte, sample_id
+    ):
+        from sqlalchemy import event
+        from app.services.result_promotion_service import ResultPromotionService
+
+        statements = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = db_session.get_bind()
+        counts = {}
+        for wells in (96, 384):
+            run = self._run_with_rows(
+                db_session, test_admin_user, analysis_and_analyte, sample_id, wells
+            )
+            promo = ResultPromotionService(db_session, test_admin_user, batch_size=1000)
+            statements.clear()
+            event.listen(bind, "before_cursor_execute", _before)
+            try:
+                preview = promo.plan_promotion(run, dry_run=True)
+                plan = promo.plan_promotion(run)
+                promo.apply_plan(run, plan)
+            finally:
+                event.remove(bind, "before_cursor_execute", _before)
+            assert preview.create_count == plan.create_count == wells * 2
+            counts[wells] = len(statements)
+
+            # Re-planning the same run sees its own results as updates
+            again = promo.plan_promotion(run)
+            assert again.update_count == wells * 2 and again.create_count == 0
+            promo.apply_plan(run, again)
+
+        # Only the chunked upserts could grow; 1000-row batches hold both plates
+        assert counts[384] <= counts[96] + 2
@@ -0,0 +1,408 @@
+"""
+RLS project scope: accessible_project_ids() computed once per transaction
+(0068) and trigger-maintained project_id / client_id on tests, results and
+contents (0069).
+
+The benchmark seeds 100k results, half on a project the lab tech is assigned
+to. The default run checks the 0029 results_access predicate (per-row
+is_admin() + 0065 has_project_access) and the 0068 and 0069 predicates see the
+same rows; comparing their EXPLAIN ANALYZE times is a benchmark that only runs
+with ``pytest --benchmark``.
+"""
+import importlib.util
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+SAMPLES = 2_000
+TESTS_PER_SAMPLE = 5
+RESULTS_PER_TEST = 10
+
+_VERSIONS = Path(__file__).resolve().parents[1] / "db" / "migrations" / "versions"
+
+
+def _load_migration(filename: str):
+    spec = importlib.util.spec_from_file_location(f"migration_{filename[:4]}", _VERSIONS / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+m0068 = _load_migration("0068_accessible_project_set.py")
+m0069 = _load_migration("0069_denormalized_project_scope.py")
+
+
+def _insert_user(conn, role_id, client_id, username):
+    from app.core.security import get_password_hash
+
+    user_id = uuid.uuid4()
+    conn.execute(
+        text(
+            """
+            INSERT INTO users (
+                id, name, username, email, password_hash, role_id, client_id,
+                active, must_change_password
+            )
+            VALUES (:id, :name, :name, :email, :pw, :role, :client, true, false)
+            """
+        ),
+        {
+            "id": str(user_id),
+            "name": username,
+            "email": f"{username}@test.com",
+            "pw": get_password_hash("LabTech1!xxxx"),
+            "role": str(role_id),
+            "client": str(client_id),
+        },
+    )
+    return user_id
+
+
+def _insert_project(conn, name, client_id, status_id):
+    project_id = uuid.uuid4()
+    conn.execute(
+        text(
+            """
+            INSERT INTO projects (
+                id, name, client_id, status, start_date, due_date,
+                active, created_at, modified_at
+            )
+            VALUES (
+                :id, :name, :client, :status, NOW(), NOW() + interval '30 days',
+                true, NOW(), NOW()
+            )
+            """
+        ),
+        {"id": str(project_id), "name": name, "client": str(client_id), "status": str(status_id)},
+    )
+    return project_id
+
+
+@pytest.fixture(scope="module")
+def scoped_data(migrated_engine):
+    """Two tenants, one project each; tech assigned to the first; 100k results across both."""
+    conn = migrated_engine.connect()
+    conn.execute(text("BEGIN"))
+
+    tech_role = conn.execute(text("SELECT id FROM roles WHERE name = 'Lab Technician'")).scalar_one()
+    client_role = conn.execute(text("SELECT id FROM roles WHERE name = 'Client'")).scalar()
+    list_entry = conn.execute(text("SELECT id FROM list_entries LIMIT 1")).scalar_one()
+    analysis = conn.execute(text("SELECT id FROM analyses LIMIT 1")).scalar_one()
+    analyte = conn.execute(text("SELECT id FROM analytes LIMIT 1")).scalar_one()
+
+    tenants = [uuid.uuid4(), uuid.uuid4()]
+    for i, tenant in enumerate(tenants):
+        conn.execute(
+            text(
+                "INSERT INTO clients (id, name, active, billing_info) "
+                "VALUES (:id, :name, true, '{}')"
+            ),
+            {"id": str(tenant), "name": f"RLS68 Tenant {i}"},
+        )
+
+    tech = _insert_user(conn, tech_role, tenants[0], "rls68_tech")
+    idle_tech = _insert_user(conn, tech_role, tenants[0], "rls68_idle")
+    client_user = (
+        _insert_user(conn, client_role, tenants[1], "rls68_client") if client_role else None
+    )
+    assigned = _insert_project(conn, "RLS68 Assigned", tenants[0], list_entry)
+    other = _insert_project(conn, "RLS68 Other", tenants[1], list_entry)
+    conn.execute(
+        text("INSERT INTO project_users (project_id, user_id, granted_at) VALUES (:p, :u, NOW())"),
+        {"p": str(assigned), "u": str(tech)},
+    )
+
+    conn.execute(
+        text(
+            """
+            INSERT INTO samples (
+                id, name, sample_type, status, matrix, project_id,
+                active, created_at, modified_at
+            )
+            SELECT gen_random_uuid(), 'rls68-' || g, :le, :le, :le,
+                   CASE WHEN g % 2 = 0 THEN CAST(:assigned AS uuid) ELSE CAST(:other AS uuid) END,
+                   true, NOW(), NOW()
+            FROM generate_series(1, :n) g
+            """
+        ),
+        {"le": str(list_entry), "assigned": str(assigned), "other": str(other), "n": SAMPLES},
+    )
+    conn.execute(
+        text(
+            """
+            INSERT INTO tests (
+                id, name, sample_id, analysis_id, status, active, created_at, modified_at
+            )
+            SELECT gen_random_uuid(), s.name || '-t' || g, s.id, :analysis, :le,
+                   true, NOW(), NOW()
+            FROM samples s, generate_series(1, :n) g
+            WHERE s.name LIKE 'rls68-%'
+            """
+        ),
+        {"analysis": str(analysis), "le": str(list_entry), "n": TESTS_PER_SAMPLE},
+    )
+    conn.execute(
+        text(
+            """
+            INSERT INTO results (
+                id, test_id, analyte_id, replicate, raw_result, entered_by,
+                entry_date, active, created_at, modified_at
+            )
+            SELECT gen_random_uuid(), t.id, :analyte, g, '1', :tech,
+                   NOW(), true, NOW(), NOW()
+            FROM tests t, generate_series(1, :n) g
+            WHERE t.name LIKE 'rls68-%'
+            """
+        ),
+        {"analyte": str(analyte), "tech": str(tech), "n": RESULTS_PER_TEST},
+    )
+    conn.execute(text("COMMIT"))
+    conn.execute(text("ANALYZE samples"))
+    conn.execute(text("ANALYZE tests"))
+    conn.execute(text("ANALYZE results"))
+    conn.commit()
+
+    yield {
+        "tenants": tenants,
+        "tech": tech,
+        "idle_tech": idle_tech,
+        "client_user": client_user,
+        "assigned": assigned,
+        "other": other,
+    }
+
+    conn.execute(text("BEGIN"))
+    conn.execute(
+        text(
+            "DELETE FROM results WHERE test_id IN "
+            "(SELECT id FROM tests WHERE name LIKE 'rls68-%')"
+        )
+    )
+    conn.execute(text("DELETE FROM tests WHERE name LIKE 'rls68-%'"))
+    conn.execute(text("DELETE FROM samples WHERE name LIKE 'rls68-%'"))
+    conn.execute(
+        text("DELETE FROM project_users WHERE project_id IN (:a, :b)"),
+        {"a": str(assigned), "b": str(other)},
+    )
+    conn.execute(text("DELETE FROM projects WHERE id IN (:a, :b)"), {"a": str(assigned), "b": str(other)})
+    conn.execute(text("DELETE FROM users WHERE username LIKE 'rls68_%'"))
+    conn.execute(text("DELETE FROM clients WHERE name LIKE 'RLS68 Tenant %'"))
+    conn.execute(text("COMMIT"))
+    conn.close()
+
+
+def _as_user(conn, user_id):
+    conn.execute(text("SET ROLE app_test_role"))
+    conn.execute(
+        text("SELECT set_config('app.current_user_id', :v, true)"),
+        {"v": str(user_id)},
+    )
+
+
+def _count(conn, sql, **params) -> int:
+    return conn.execute(text(sql), params).scalar_one()
+
+
+class TestAccessibleProjectSet:
+    def test_rls_counts_follow_project_users(self, migrated_engine, scoped_data):
+        per_project = SAMPLES // 2 * TESTS_PER_SAMPLE * RESULTS_PER_TEST
+        with migrated_engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            _as_user(conn, scoped_data["tech"])
+            assert _count(conn, "SELECT count(*) FROM results WHERE raw_result = '1'") == per_project
+            assert _count(
+                conn, "SELECT count(*) FROM samples WHERE project_id = :p", p=str(scoped_data["other"])
+            ) == 0
+            conn.execute(text("RESET ROLE"))
+            conn.execute(text("ROLLBACK"))
+
+    def test_client_role_sees_same_client_project(self, migrated_engine, scoped_data):
+        if not scoped_data["client_user"]:
+            pytest.skip("Client role not seeded")
+        with migrated_engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            _as_user(conn, scoped_data["client_user"])
+            visible = conn.execute(
+                text("SELECT has_project_access(CAST(:a AS uuid)), has_project_access(CAST(:o AS uuid))"),
+                {"a": str(scoped_data["assigned"]), "o": str(scoped_data["other"])},
+            ).one()
+            assert tuple(visible) == (False, True)
+            conn.execute(text("RESET ROLE"))
+            conn.execute(text("ROLLBACK"))
+
+    def test_grant_mid_transaction_invalidates_cache(self, migrated_engine, scoped_data):
+        sample_sql = "SELECT count(*) FROM samples WHERE project_id = :p"
+        project = str(scoped_data["assigned"])
+        with migrated_engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            _as_user(conn, scoped_data["idle_tech"])
+            assert _count(conn, sample_sql, p=project) == 0
+            conn.execute(text("RESET ROLE"))
+            conn.execute(
+                text("INSERT INTO project_users (project_id, user_id, granted_at) VALUES (:p, :u, NOW())"),
+                {"p": project, "u": str(scoped_data["idle_tech"])},
+            )
+            conn.execute(text("SET ROLE app_test_role"))
+            assert _count(conn, sample_sql, p=project) == SAMPLES // 2
+            conn.execute(text("RESET ROLE"))
+            conn.execute(text("ROLLBACK"))
+
+    def test_switching_user_in_transaction_recomputes(self, migrated_engine, scoped_data):
+        project = str(scoped_data["assigned"])
+        with migrated_engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            _as_user(conn, scoped_data["tech"])
+            assert conn.execute(text("SELECT has_project_access(CAST(:p AS uuid))"), {"p": project}).scalar()
+            _as_user(conn, scoped_data["idle_tech"])
+            assert not conn.execute(text("SELECT has_project_access(CAST(:p AS uuid))"), {"p": project}).scalar()
+            conn.execute(text("RESET ROLE"))
+            conn.execute(text("ROLLBACK"))
+
+
+def _execution_ms(conn, sql: str) -> float:
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Execution Time"]
+
+
+class TestPolicyCostAt100kRows:
+    def _predicates(self):
+        legacy_fn = m0068.OLD_HAS_PROJECT_ACCESS_FUNCTION.replace(
+            "CREATE OR REPLACE FUNCTION has_project_access",
+            "CREATE FUNCTION pg_temp.legacy_has_project_access",
+        )
+        legacy_sql = (
+            "SELECT count(*) FROM results WHERE is_admin() OR EXISTS ("
+            "SELECT 1 FROM tests t JOIN samples s ON t.sample_id = s.id "
+            "WHERE t.id = results.test_id AND pg_temp.legacy_has_project_access(s.project_id))"
+        )
+        set_sql = f"SELECT count(*) FROM results WHERE {m0068.RESULT_SCOPE}"
+        local_sql = f"SELECT count(*) FROM results WHERE {m0069.project_scope('project_id')}"
+        return legacy_fn, legacy_sql, set_sql, local_sql
+
+    def _run_as_tech(self, migrated_engine, scoped_data, fn):
+        # Superuser connection: RLS bypassed, so the predicates run explicitly
+        legacy_fn, legacy_sql, set_sql, local_sql = self._predicates()
+        with migrated_engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            conn.execute(text(legacy_fn))
+            conn.execute(
+                text("SELECT set_config('app.current_user_id', :v, true)"),
+                {"v": str(scoped_data["tech"])},
+            )
+            try:
+                return [fn(conn, sql) for sql in (legacy_sql, set_sql, local_sql)]
+            finally:
+                conn.execute(text("ROLLBACK"))
+
+    def test_predicates_see_the_same_results(self, migrated_engine, scoped_data):
+        legacy, accessible_set, local = self._run_as_tech(migrated_engine, scoped_data, _count)
+        assert legacy == accessible_set == local
+        assert local >= SAMPLES // 2 * TESTS_PER_SAMPLE * RESULTS_PER_TEST
+
+    @pytest.mark.benchmark
+    def test_new_results_predicate_is_cheaper(self, migrated_engine, scoped_data):
+        """Benchmark (--benchmark): EXPLAIN ANALYZE execution time of each predicate"""
+        legacy_ms, set_ms, local_ms = self._run_as_tech(migrated_engine, scoped_data, _execution_ms)
+        assert set_ms * 3 < legacy_ms
+        assert local_ms * 3 < legacy_ms
+
+
+def _relations(plan) -> set:
+    found = set()
+    if isinstance(plan, dict):
+        if "Relation Name" in plan:
+            found.add(plan["Relation Name"])
+        for value in plan.values():
+            found |= _relations(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            found |= _relations(value)
+    return found
+
+
+class TestDenormalizedProjectScope:
+    def test_children_carry_sample_project_and_client(self, migrated_engine, scoped_data):
+        with migrated_engine.connect() as conn:
+            mismatched = conn.execute(
+                text(
+                    """
+                    SELECT count(*)
+                    FROM results r
+                    JOIN tests t ON t.id = r.test_id
+                    JOIN samples s ON s.id = t.sample_id
+                    JOIN projects p ON p.id = s.project_id
+                    WHERE s.name LIKE 'rls68-%'
+                      AND (t.project_id IS DISTINCT FROM s.project_id
+                           OR r.project_id IS DISTINCT FROM s.project_id
+                           OR r.client_id IS DISTINCT FROM p.client_id)
+                    """
+                )
+            ).scalar_one()
+            assert mismatched == 0
+
+    def test_sample_move_cascades_and_keeps_modified_at(self, migrated_engine, scoped_data):
+        assigned = str(scoped_data["assigned"])
+        with migrated_engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            sample_id = conn.execute(
+                text("SELECT id FROM samples WHERE name = 'rls68-1'")
+            ).scalar_one()
+            before = conn.execute(
+                text(
+                    "SELECT r.id, r.modified_at FROM results r JOIN tests t ON t.id = r.test_id "
+                    "WHERE t.sample_id = :s"
+                ),
+                {"s": sample_id},
+            ).all()
+
+            conn.execute(
+                text("UPDATE samples SET project_id = :p WHERE id = :s"),
+                {"p": assigned, "s": sample_id},
+            )
+
+            after = conn.execute(
+                text(
+                    "SELECT r.id, r.modified_at, r.project_id, r.client_id, t.project_id "
+                    "FROM results r JOIN tests t ON t.id = r.test_id WHERE t.sample_id = :s"
+                ),
+                {"s": sample_id},
+            ).all()
+            assert len(after) == TESTS_PER_SAMPLE * RESULTS_PER_TEST
+            assert {str(row[2]) for row in after} == {assigned}
+            assert {str(row[4]) for row in after} == {assigned}
+            assert {row[3] for row in after} == {scoped_data["tenants"][0]}
+            assert {row[0]: row[1] for row in after} == dict(before)
+            conn.execute(text("ROLLBACK"))
+
+    def test_project_client_change_cascades(self, migrated_engine, scoped_data):
+        other = str(scoped_data["other"])
+        with migrated_engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            conn.execute(
+                text("UPDATE projects SET client_id = :c WHERE id = :p"),
+                {"c": str(scoped_data["tenants"][0]), "p": other},
+            )
+            clients = conn.execute(
+                text("SELECT DISTINCT client_id FROM results WHERE project_id = :p"),
+                {"p": other},
+            ).scalars().all()
+            assert clients == [scoped_data["tenants"][0]]
+            conn.execute(text("ROLLBACK"))
+
+    def test_results_policy_does_not_join_back_to_samples(self, migrated_engine, scoped_data):
+        with migrated_engine.connect() as conn:
+            conn.execute(text("BEGIN"))
+            _as_user(conn, scoped_data["tech"])
+            plan = conn.execute(text("EXPLAIN (FORMAT JSON) SELECT count(*) FROM results")).scalar_one()
+            conn.execute(text("RESET ROLE"))
+            conn.execute(text("ROLLBACK"))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        relations = _relations(plan)
+        assert "results" in relations
+        assert not relations & {"tests", "samples"}
@@ -0,0 +1,150 @@
+"""
+RLS GUC binding: one set_config round trip per transaction, none when already bound.
+
+The GET /samples benchmark compares statement counts for the legacy binder
+(two set_config statements + flush per call) against the combined binder.
+"""
+from typing import Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+import app.core.security as security_module
+from app.database import _bind_rls_gucs
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.info = {}
+        self.statements = []
+        self.transaction = object()
+        self.nested = False
+
+    def get_transaction(self):
+        return self.transaction
+
+    def in_nested_transaction(self):
+        return self.nested
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+
+
+class TestBindRlsGucs:
+    def test_user_and_client_bound_in_one_statement(self):
+        conn = _FakeConnection()
+        _bind_rls_gucs(conn, "u1", "c1")
+        assert len(conn.statements) == 1
+        sql, params = conn.statements[0]
+        assert "app.current_user_id" in sql and "app.client_id" in sql
+        assert params == {"uid": "u1", "cid": "c1"}
+
+    def test_same_values_in_same_transaction_are_skipped(self):
+        conn = _FakeConnection()
+        _bind_rls_gucs(conn, "u1", "c1")
+        _bind_rls_gucs(conn, "u1", "c1")
+        assert len(conn.statements) == 1
+
+    def test_new_transaction_rebinds(self):
+        conn = _FakeConnection()
+        _bind_rls_gucs(conn, "u1", "c1")
+        conn.transaction = object()
+        _bind_rls_gucs(conn, "u1", "c1")
+        assert len(conn.statements) == 2
+
+    def test_changed_values_rebind(self):
+        conn = _FakeConnection()
+        _bind_rls_gucs(conn, "u1", "c1")
+        _bind_rls_gucs(conn, "u2", "c1")
+        assert len(conn.statements) == 2
+
+    def test_user_only_does_not_touch_client_guc(self):
+        conn = _FakeConnection()
+        _bind_rls_gucs(conn, "u1", None)
+        sql, params = conn.statements[0]
+        assert "app.client_id" not in sql
+        assert params == {"uid": "u1"}
+
+    def test_savepoint_binding_is_not_trusted(self):
+        conn = _FakeConnection()
+        conn.nested = True
+        _bind_rls_gucs(conn, "u1", "c1")
+        _bind_rls_gucs(conn, "u1", "c1")
+        assert len(conn.statements) == 2
+
+    def test_missing_user_is_noop(self):
+        conn = _FakeConnection()
+        _bind_rls_gucs(conn, None, "c1")
+        assert conn.statements == []
+
+
+def _legacy_set_rls_context(db: Session, *, user_id: str, client_id: Optional[str] = None) -> None:
+    """Pre-change binder: two set_config round trips and a flush on every call."""
+    db.info["rls_user_id"] = str(user_id)
+    if client_id:
+        db.info["rls_client_id"] = str(client_id)
+    else:
+        db.info.pop("rls_client_id", None)
+    db.execute(
+        text("SELECT set_config('app.current_user_id', :v, true)"),
+        {"v": str(user_id)},
+    )
+    if client_id:
+        db.execute(
+            text("SELECT set_config('app.client_id', :v, true)"),
+            {"v": str(client_id)},
+        )
+    db.flush()
+
+
+class TestSamplesListStatementCount:
+    def _capture(self, db_session: Session, fn):
+        statements = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", _before)
+        try:
+            response = fn()
+        finally:
+            event.remove(bind, "before_cursor_execute", _before)
+        return response, statements
+
+    def test_get_samples_binds_gucs_once(
+        self, client: TestClient, db_session: Session, test_admin_user, admin_token, monkeypatch
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        # Warm the auth cache so both runs measure the same steady-state path
+        assert client.get("/samples", headers=headers).status_code == 200
+
+        monkeypatch.setattr(security_module, "set_rls_context", _legacy_set_rls_context)
+        before_resp, before = self._capture(
+            db_session, lambda: client.get("/samples", headers=headers)
+        )
+        monkeypatch.undo()
+        # The test session's transaction spans requests; start from a clean marker
+        db_session.connection().info.pop("rls_gucs_bound", None)
+
+        after_resp, after = self._capture(
+            db_session, lambda: client.get("/samples", headers=headers)
+        )
+        assert before_resp.status_code == after_resp.status_code == 200
+
+        before_gucs = [s for s in before if "set_config" in s]
+        after_gucs = [s for s in after if "set_config" in s]
+        assert len(after_gucs) == 1
+        assert len(after) < len(before)
+
+    def test_repeat_request_in_same_transaction_skips_binding(
+        self, client: TestClient, db_session: Session, test_admin_user, admin_token
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        assert client.get("/samples", headers=headers).status_code == 200
+
+        _, statements = self._capture(
+            db_session, lambda: client.get("/samples", headers=headers)
+        )
+        assert not any("set_config" in s for s in statements)
@@ -532,6 +532,74 @@ class TestEligibleSamplesEndpoint:
         assert "warnings" in data
         # Warnings should mention expiring samples
         assert len(data["warnings"]) >= 0  # May or may not have warnings depending on thresholds
+    
+    def test_cursor_pages_match_offset_pages(
+        self, client: TestClient, test_admin_user, prioritization_test_data, db_session
+    ):
+        """Test that walking next_cursor yields the same order as page/size, with totals per page"""
+        test_data = prioritization_test_data
+        project_id = str(test_data["project"].id)
+        for i in range(7):
+            self.create_sample_with_test(
+                db_session, test_data,
+                name=f"SAMPLE-CURSOR-{i:03d}",
+                date_sampled=datetime.utcnow() - timedelta(days=i % 3),
+                due_date=datetime.utcnow() + timedelta(days=i),
+                analysis=test_data["analysis"] if i % 2 else test_data["analysis_no_shelf"]
+            )
+        db_session.commit()
+        
+        auth_response = client.post(
+            "/auth/login",
+            json={"username": "admin", "password": "adminpassword"}
+        )
+        headers = {"Authorization": f"Bearer {auth_response.json()['access_token']}"}
+        
+        offset_ids = []
+        for page in (1, 2, 3):
+            response = client.get(
+                "/samples/eligible",
+                params={"project_id": project_id, "page": page, "size": 3},
+                headers=headers
+            )
+            assert response.status_code == 200
+            offset_ids += [s["id"] for s in response.json()["samples"]]
+        
+        cursor_ids = []
+        cursor = None
+        while True:
+            params = {"project_id": project_id, "size": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/samples/eligible", params=params, headers=headers)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == len(offset_ids)
+            cursor_ids += [s["id"] for s in data["samples"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        
+        assert cursor_ids == offset_ids
+        assert len(set(cursor_ids)) == len(cursor_ids)
+    
+    def test_invalid_cursor_rejected(
+        self, client: TestClient, test_admin_user, prioritization_test_data
+    ):
+        """Test that a malformed cursor is a 400, not a 500"""
+        auth_response = client.post(
+            "/auth/login",
+            json={"username": "admin", "password": "adminpassword"}
+        )
+        token = auth_response.json()["access_token"]
+        
+        for cursor in ("not-a-cursor", "WzEsIDJd", "WyJ4IiwgMSwgIm5vdC1hLXV1aWQiXQ"):
+            response = client.get(
+                "/samples/eligible",
+                params={"cursor": cursor},
+                headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 400
 
 
 class TestBatchValidationExpirationWarnings:
@@ -37,6 +37,21 @@ class TestS8UploadCap:
         assert ei.value.status_code == 413
         assert ei.value.detail["code"] == "upload_too_large"
 
+    def test_spooled_upload_capped_checks_size_without_reading(self):
+        from starlette.datastructures import UploadFile
+        from app.core.uploads import spooled_upload_capped
+        from fastapi import HTTPException
+
+        uf = UploadFile(filename="run.csv", file=io.BytesIO(b"x" * 11))
+        with pytest.raises(HTTPException) as ei:
+            spooled_upload_capped(uf, max_bytes=10)
+        assert ei.value.status_code == 413
+
+        uf.file.seek(5)
+        stream = spooled_upload_capped(uf, max_bytes=11)
+        assert stream is uf.file
+        assert stream.read() == b"x" * 11
+
 
 class TestS9ValidateAuth:
     def test_validate_requires_auth(self, client: TestClient):
@@ -0,0 +1,65 @@
+"""
+On-disk SVG render cache: content-addressed keys, atomic writes, LRU eviction.
+"""
+import os
+import uuid
+
+from app.core.svg_cache import SvgRenderCache, render_key
+
+
+def _age(cache, key, seconds_ago):
+    path = cache._path(key)
+    stamp = path.stat().st_mtime - seconds_ago
+    os.utime(path, (stamp, stamp))
+
+
+class TestRenderKey:
+    def test_stable_for_same_inputs(self):
+        result_id = uuid.uuid4()
+        assert render_key("full", result_id, 1, ["a", "b"]) == render_key("full", result_id, 1, ["a", "b"])
+
+    def test_changes_with_fit_version_and_exclusions(self):
+        result_id = uuid.uuid4()
+        base = render_key("full", result_id, 1, [])
+        assert render_key("full", result_id, 2, []) != base
+        assert render_key("full", result_id, 1, ["x"]) != base
+
+
+class TestSvgRenderCache:
+    def test_round_trip(self, tmp_path):
+        cache = SvgRenderCache(str(tmp_path), max_bytes=1024 * 1024)
+        key = render_key("k")
+        assert cache.get(key) is None
+        cache.put(key, "<svg>curve</svg>")
+        assert cache.get(key) == "<svg>curve</svg>"
+        assert not list(tmp_path.glob("*/*.tmp"))
+
+    def test_zero_bytes_disables(self, tmp_path):
+        cache = SvgRenderCache(str(tmp_path), max_bytes=0)
+        assert not cache.enabled
+        cache.put(render_key("k"), "<svg/>")
+        assert cache.get(render_key("k")) is None
+        assert not any(tmp_path.iterdir())
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        svg = "x" * 100
+        cache = SvgRenderCache(str(tmp_path), max_bytes=350)
+        keys = [render_key(i) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, svg)
+            _age(cache, key, 100 - i * 10)
+
+        # Reading the oldest entry makes it the most recently used
+        assert cache.get(keys[0]) == svg
+        cache.put(render_key(3), svg)
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is None
+        assert cache.get(keys[0]) == svg
+        assert cache.get(render_key(3)) == svg
+
+    def test_clear(self, tmp_path):
+        cache = SvgRenderCache(str(tmp_path), max_bytes=1024)
+        cache.put(render_key("k"), "<svg/>")
+        cache.clear()
+        assert cache.get(render_key("k")) is None
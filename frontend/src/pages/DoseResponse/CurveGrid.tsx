@@ -14,7 +14,7 @@ interface CurveResult {
   potency?: number;
   hill_slope?: number;
   r_squared?: number;
-  thumbnail_svg?: string;
+  thumbnail_url?: string;
   quality_flag?: string;
 }
 
@@ -3,6 +3,7 @@ import { Box, Typography, Chip, IconButton, Tooltip } from '@mui/material';
 import CheckCircleOutlineIcon from '@mui/icons-material/CheckCircleOutline';
 import CancelOutlinedIcon from '@mui/icons-material/CancelOutlined';
 import FlagOutlinedIcon from '@mui/icons-material/FlagOutlined';
+import { apiService } from '../../services/apiService';
 
 interface CurveResult {
   id: string;
@@ -13,7 +14,7 @@ interface CurveResult {
   potency?: number;
   hill_slope?: number;
   r_squared?: number;
-  thumbnail_svg?: string;
+  thumbnail_url?: string;
   quality_flag?: string;
 }
 
@@ -70,11 +71,13 @@ const CurveThumbnail: React.FC<Props> = ({ result, selected, onSelect, onReview
           flexShrink: 0,
         }}
       >
-        {result.thumbnail_svg ? (
+        {result.thumbnail_url ? (
           <Box
-            component="div"
-            dangerouslySetInnerHTML={{ __html: result.thumbnail_svg }}
-            sx={{ width: 200, height: 120, '& svg': { width: '100%', height: '100%' } }}
+            component="img"
+            src={apiService.apiUrl(result.thumbnail_url)}
+            alt=""
+            loading="lazy"
+            sx={{ width: 200, height: 120, objectFit: 'contain' }}
           />
         ) : (
           <Typography variant="caption" color="text.secondary">
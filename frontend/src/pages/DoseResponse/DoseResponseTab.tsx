@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect } from 'react';
 import {
   Box,
   Typography,
@@ -65,7 +65,6 @@ const DoseResponseTab: React.FC<Props> = ({ runId, runStatus }) => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [fitting, setFitting] = useState(false);
-  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
   const loadSummary = async () => {
     try {
@@ -85,23 +84,17 @@ const DoseResponseTab: React.FC<Props> = ({ runId, runStatus }) => {
     loadSummary().finally(() => setLoading(false));
   }, [runId]);
 
-  // Poll while fit_in_progress
+  // While fit_in_progress, refresh on this run's fit events
   useEffect(() => {
-    if (summary?.fit_in_progress) {
-      pollRef.current = setInterval(async () => {
-        const s = await loadSummary();
-        if (s && !s.fit_in_progress) {
-          if (pollRef.current) clearInterval(pollRef.current);
-          // Auto-navigate to curator when done
-          navigate(`/runs/${runId}/dose-response`);
-        }
-      }, 3000);
-    } else {
-      if (pollRef.current) clearInterval(pollRef.current);
-    }
-    return () => {
-      if (pollRef.current) clearInterval(pollRef.current);
-    };
+    if (!summary?.fit_in_progress) return undefined;
+    return apiService.onEvent<{ run_id: string; fit_in_progress: boolean }>('fit', async (event) => {
+      if (event && event.run_id !== runId) return;
+      const s = await loadSummary();
+      if (s && !s.fit_in_progress) {
+        // Auto-navigate to curator when done
+        navigate(`/runs/${runId}/dose-response`);
+      }
+    });
   }, [summary?.fit_in_progress]);
 
   const handleFit = async () => {
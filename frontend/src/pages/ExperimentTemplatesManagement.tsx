@@ -674,24 +674,36 @@ const ExperimentTemplatesManagement: React.FC = () => {
       return;
     }
 
-    // Poll
+    // Wait for this job's sop_parse events; the tick drives the elapsed timer and
+    // the job is only refetched on the first tick and after an event
     setSopPhase('polling');
     let elapsed = 0;
     const MAX_WAIT = 120;
     const POLL_INTERVAL = 2000;
+    let changed = true;
+    const stopEvents = apiService.onEvent<{ sop_parse_job_id: string }>('sop_parse', (event) => {
+      if (!event || event.sop_parse_job_id === jobId) changed = true;
+    });
 
     const poll = async (): Promise<void> => {
       elapsed += POLL_INTERVAL / 1000;
       setSopElapsedSeconds(elapsed);
 
       if (elapsed >= MAX_WAIT) {
+        stopEvents();
         setSopPhase('timeout');
         return;
       }
+      if (!changed) {
+        setTimeout(poll, POLL_INTERVAL);
+        return;
+      }
+      changed = false;
 
       try {
         const job = await apiService.getSopParseJob(jobId);
         if (job.status === 'complete') {
+          stopEvents();
           setSopPhase('applying');
           try {
             const applied = await apiService.applySopParseJob(jobId);
@@ -715,13 +727,15 @@ const ExperimentTemplatesManagement: React.FC = () => {
           return;
         }
         if (job.status === 'failed') {
+          stopEvents();
           setSopUploadError('SOP extraction failed. Please fill in the template manually.');
           setSopPhase('idle');
           return;
         }
-        // Still pending/processing — keep polling
+        // Still pending/processing — keep waiting
         setTimeout(poll, POLL_INTERVAL);
       } catch {
+        stopEvents();
         setSopUploadError('Lost connection while polling. Please try again.');
         setSopPhase('idle');
       }
@@ -734,13 +748,26 @@ const ExperimentTemplatesManagement: React.FC = () => {
     setSopPhase('polling');
     setSopElapsedSeconds(0);
     if (sopJobId) {
-      // Resume polling from current job
+      // Resume waiting on the current job (refetch on its sop_parse events)
+      let changed = true;
+      const stopEvents = apiService.onEvent<{ sop_parse_job_id: string }>('sop_parse', (event) => {
+        if (!event || event.sop_parse_job_id === sopJobId) changed = true;
+      });
       const poll = async (): Promise<void> => {
         setSopElapsedSeconds((s) => s + 2);
-        if (!sopJobId) return;
+        if (!sopJobId) {
+          stopEvents();
+          return;
+        }
+        if (!changed) {
+          setTimeout(poll, 2000);
+          return;
+        }
+        changed = false;
         try {
           const job = await apiService.getSopParseJob(sopJobId);
           if (job.status === 'complete') {
+            stopEvents();
             setSopPhase('applying');
             const applied = await apiService.applySopParseJob(sopJobId);
             await loadTemplates();
@@ -751,12 +778,14 @@ const ExperimentTemplatesManagement: React.FC = () => {
             return;
           }
           if (job.status === 'failed') {
+            stopEvents();
             setSopUploadError('SOP extraction failed.');
             setSopPhase('idle');
             return;
           }
           setTimeout(poll, 2000);
         } catch {
+          stopEvents();
           setSopUploadError('Connection lost.');
           setSopPhase('idle');
         }
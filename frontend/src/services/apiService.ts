@@ -138,6 +138,37 @@ export interface BatchCompatibilityResult {
   warnings?: BatchCompatibilityWarning[];
 }
 
+/** A queued backend operation (GET /v1/jobs/{id}). */
+export interface Job<T = unknown> {
+  id: string;
+  kind: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  attempts: number;
+  max_attempts: number;
+  progress_current?: number | null;
+  progress_total?: number | null;
+  progress_message?: string | null;
+  result?: T | null;
+  error?: { status_code: number; detail: unknown } | null;
+}
+
+/** `job` event data from GET /v1/events. */
+export interface JobEvent {
+  job_id: string;
+  kind: string;
+  status: Job['status'];
+  attempts: number;
+  progress_current?: number | null;
+  progress_total?: number | null;
+  progress_message?: string | null;
+}
+
+/** Event data, or null when events may have been missed (refetch). */
+type EventHandler = (data: any | null) => void;
+
+// Without EventSource support, onEvent handlers get a null (refetch) this often
+const EVENT_FALLBACK_MS = 2000;
+
 /** Read a non-httpOnly cookie (CSRF double-submit). */
 function readCookie(name: string): string | null {
   if (typeof document === 'undefined') return null;
@@ -152,6 +183,9 @@ const MUTATING = new Set(['post', 'put', 'patch', 'delete']);
 
 export class ApiService {
   private api: AxiosInstance;
+  private eventSource: EventSource | null = null;
+  private eventTypes = new Set<string>();
+  private eventHandlers = new Map<string, Set<EventHandler>>();
 
   constructor() {
     // P4 / S10: cookie session via credentials; no localStorage JWT
@@ -746,11 +780,11 @@ export class ApiService {
     if (meta.instrument_id) form.append('instrument_id', meta.instrument_id);
     if (meta.cro_source_id) form.append('cro_source_id', meta.cro_source_id);
     if (meta.parser_id) form.append('parser_id', meta.parser_id);
-    const response: AxiosResponse = await this.api.post(
+    const response: AxiosResponse<Job> = await this.api.post(
       `/v1/lims-runs/${runId}/import-file`,
       form
     );
-    return response.data;
+    return this.waitForJob(response.data);
   }
 
   async getLimsRunImports(runId: string) {
@@ -2060,11 +2094,143 @@ export class ApiService {
     return response.data;
   }
 
-  async publishLimsRun(id: string) {
-    const response: AxiosResponse = await this.api.patch(`/v1/lims-runs/${id}/complete`);
+  async getJob<T = unknown>(id: string): Promise<Job<T>> {
+    const response: AxiosResponse<Job<T>> = await this.api.get(`/v1/jobs/${id}`);
     return response.data;
   }
 
+  /**
+   * Subscribe to one event type of the server-sent stream at GET /v1/events
+   * (job, fit, import, promotion, sop_parse). The handler gets each event's
+   * data, or null when events may have been missed (stream opened, reset or
+   * closed, or no EventSource support) and state should be refetched. All
+   * subscriptions share one stream, which closes with the last of them.
+   * Returns the unsubscribe function.
+   */
+  onEvent<T = any>(type: string, handler: (data: T | null) => void): () => void {
+    let handlers = this.eventHandlers.get(type);
+    if (!handlers) {
+      handlers = new Set();
+      this.eventHandlers.set(type, handlers);
+    }
+    handlers.add(handler);
+    let fallback: ReturnType<typeof setInterval> | null = null;
+    if (typeof EventSource === 'undefined') {
+      fallback = setInterval(() => handler(null), EVENT_FALLBACK_MS);
+    } else {
+      this.listenForEvents(type);
+    }
+    return () => {
+      handlers!.delete(handler);
+      if (fallback) clearInterval(fallback);
+      const anyLeft = Array.from(this.eventHandlers.values()).some((set) => set.size > 0);
+      if (!anyLeft) this.closeEvents();
+    };
+  }
+
+  private listenForEvents(type: string) {
+    if (!this.eventSource) {
+      const source = new EventSource(this.apiUrl('/v1/events'), { withCredentials: true });
+      // A stream opened without Last-Event-ID starts at the newest event, so
+      // anything committed before it was live is missed: refetch on open
+      source.onopen = () => this.notifyAll(null);
+      source.addEventListener('reset', () => this.notifyAll(null));
+      source.onerror = () => {
+        // Reconnects (with Last-Event-ID) on its own unless the server refused it
+        if (source.readyState === EventSource.CLOSED) {
+          this.closeEvents();
+          this.notifyAll(null);
+        }
+      };
+      this.eventSource = source;
+    }
+    if (!this.eventTypes.has(type)) {
+      this.eventTypes.add(type);
+      this.eventSource.addEventListener(type, (event) => {
+        const data = JSON.parse((event as MessageEvent).data);
+        this.eventHandlers.get(type)?.forEach((handler) => handler(data));
+      });
+    }
+  }
+
+  private notifyAll(data: null) {
+    this.eventHandlers.forEach((handlers) => handlers.forEach((handler) => handler(data)));
+  }
+
+  private closeEvents() {
+    this.eventSource?.close();
+    this.eventSource = null;
+    this.eventTypes.clear();
+  }
+
+  /**
+   * Wait for a queued job to finish: refetches it when its job event reports
+   * succeeded/failed (or when events may have been missed). Resolves with
+   * job.result; a failed job rejects in axios error shape
+   * ({ response: { status, data: { detail } } }) so callers handle it exactly
+   * like the synchronous endpoint's error.
+   */
+  async waitForJob<T = unknown>(job: Job<T>): Promise<T> {
+    const finished = (j: Job<T>) => j.status === 'succeeded' || j.status === 'failed';
+    let current = job;
+    if (!finished(current)) {
+      current = await new Promise<Job<T>>((resolve, reject) => {
+        let done = false;
+        let inFlight = false;
+        let again = false;
+        const check = async (): Promise<void> => {
+          if (done) return;
+          if (inFlight) {
+            again = true;
+            return;
+          }
+          inFlight = true;
+          try {
+            const latest = await this.getJob<T>(job.id);
+            if (finished(latest)) {
+              done = true;
+              unsubscribe();
+              resolve(latest);
+            }
+          } catch (err) {
+            done = true;
+            unsubscribe();
+            reject(err);
+          } finally {
+            inFlight = false;
+            if (again) {
+              again = false;
+              check();
+            }
+          }
+        };
+        const unsubscribe = this.onEvent<JobEvent>('job', (event) => {
+          if (event === null) {
+            check();
+          } else if (event.job_id === job.id && (event.status === 'succeeded' || event.status === 'failed')) {
+            check();
+          }
+        });
+        // The job may have finished before the stream connected
+        check();
+      });
+    }
+    if (current.status === 'failed') {
+      throw {
+        response: {
+          status: current.error?.status_code ?? 500,
+          data: { detail: current.error?.detail },
+        },
+      };
+    }
+    return current.result as T;
+  }
+
+  async publishLimsRun(id: string) {
+    const response: AxiosResponse<Job> = await this.api.patch(`/v1/lims-runs/${id}/complete`);
+    return this.waitForJob(response.data);
+  }
+
   /** Dry-run of promote-on-publish (creates/updates/conflicts). */
   async getLimsRunPromotionPreview(id: string): Promise<PromotionPreview> {
     const response: AxiosResponse<PromotionPreview> = await this.api.get(
@@ -2086,13 +2252,13 @@ export class ApiService {
   // ── Dose Response ──────────────────────────────────────────────────────────
 
   async triggerDoseResponseFit(runId: string) {
-    const response: AxiosResponse = await this.api.post(`/v1/lims-runs/${runId}/dose-response/fit`);
-    return response.data;
+    const response: AxiosResponse<Job> = await this.api.post(`/v1/lims-runs/${runId}/dose-response/fit`);
+    return this.waitForJob(response.data);
   }
 
   async triggerDoseResponseRefit(runId: string, sampleId: string) {
-    const response: AxiosResponse = await this.api.post(`/v1/lims-runs/${runId}/dose-response/refit/${sampleId}`);
-    return response.data;
+    const response: AxiosResponse<Job> = await this.api.post(`/v1/lims-runs/${runId}/dose-response/refit/${sampleId}`);
+    return this.waitForJob(response.data);
   }
 
   async getDoseResponseSummary(runId: string) {
@@ -2111,6 +2277,11 @@ export class ApiService {
     return response.data;
   }
 
+  /** Absolute URL for an API path the backend returned (e.g. a result's thumbnail_url). */
+  apiUrl(path: string): string {
+    return `${API_BASE_URL}${path}`;
+  }
+
   async getDoseResponseResult(runId: string, resultId: string) {
     const response: AxiosResponse = await this.api.get(
       `/v1/lims-runs/${runId}/dose-response/results/${resultId}`